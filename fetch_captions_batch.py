@@ -16,10 +16,15 @@ New in v2:
   - Shorts detection: skips videos under 60s (rarely have captions).
   - Better backoff: exponential 5→60s, not flat 120s across 444 videos.
   - Instant skip on known-no-captions videos (transcript API returns block).
+  - --ytdlp-fallback: when the API is blocked, fetch the rest of the batch as
+    subtitles through one yt-dlp process per 50 videos instead of aborting.
 """
-import argparse, json, os, re, sys, time, subprocess
+import argparse, os, re, sys, time, subprocess
 
+from suxxtext.metadata import load_history
 from suxxtext.paths import sanitize_filename
+from suxxtext.ratelimit import CAPTIONS, DOWNLOAD, METADATA, per_second, rate_limiter
+from suxxtext.subtitles import DEFAULT_SUBTITLE_CHUNK, fetch_subtitles_bulk
 from suxxtext.youtube import resolve_yt_dlp
 
 # ── Config ─────────────────────────────────────────────────────────────────
@@ -42,6 +47,7 @@ def fetch_via_transcript_api(video_id):
     from youtube_transcript_api._errors import TranscriptsDisabled, NoTranscriptFound
     api = YouTubeTranscriptApi()
     for attempt in range(MAX_RETRIES):
+        rate_limiter().acquire(CAPTIONS)
         try:
             snippets = api.fetch(video_id)
             return (" ".join(seg.text for seg in snippets) if snippets else None, False)
@@ -62,6 +68,7 @@ def fetch_via_transcript_api(video_id):
 def has_captions_via_ytdlp(video_id):
     """Quick check using yt-dlp --list-subs with cookies. Returns bool."""
     url = f"https://www.youtube.com/watch?v={video_id}"
+    rate_limiter().acquire(METADATA)
     try:
         r = subprocess.run(
             [*YT_DLP, *COOKIE_OPTS, "--skip-download", "--list-subs", url],
@@ -84,6 +91,7 @@ def fetch_via_whisper_cpu(video_id, output_path, workdir="/tmp/yt_whisper"):
 
     # Download audio
     print(f"  🎧 Downloading audio...", file=sys.stderr)
+    rate_limiter().acquire(DOWNLOAD)
     r = subprocess.run(
         [*YT_DLP, *COOKIE_OPTS, "-x", "--audio-format", "mp3",
          "-o", f"{workdir}/%(id)s.%(ext)s", url],
@@ -112,11 +120,16 @@ def fetch_via_whisper_cpu(video_id, output_path, workdir="/tmp/yt_whisper"):
 
 def main():
     parser = argparse.ArgumentParser(description="Fetch captions for a batch of YouTube videos")
-    parser.add_argument("--json", required=True, help="Path to channel JSON file with entries[]")
+    parser.add_argument("--json", required=True, help="Channel *-full-history.json (entries[]) or *-videos.jsonl metadata store")
     parser.add_argument("--limit", type=int, default=10, help="Videos to process (default: 10)")
     parser.add_argument("--delay", type=float, default=10.0, help="Delay between requests (default: 10s)")
     parser.add_argument("--offset", type=int, default=0, help="Start index")
     parser.add_argument("--whisper", action="store_true", help="Fall back to Whisper CPU if no captions")
+    parser.add_argument(
+        "--ytdlp-fallback",
+        action="store_true",
+        help="When the caption API is blocked, fetch the remaining videos' subtitles in bulk via yt-dlp",
+    )
     parser.add_argument(
         "--cookies-from-browser",
         default=None,
@@ -128,10 +141,13 @@ def main():
     global COOKIE_OPTS
     if args.cookies_from_browser:
         COOKIE_OPTS = ["--cookies-from-browser", args.cookies_from_browser]
+    # --delay is the minimum spacing between caption requests and between
+    # Whisper audio downloads (token buckets), not a sleep after every video:
+    # skips and Shorts cost nothing. yt-dlp metadata calls keep their 1/s.
+    rate_limiter().configure(CAPTIONS, per_second(args.delay))
+    rate_limiter().configure(DOWNLOAD, per_second(args.delay))
 
-    with open(args.json) as f:
-        data = json.load(f)
-    entries = data.get("entries", data if isinstance(data, list) else [])
+    entries, _ = load_history(args.json)
     total = len(entries)
 
     base_dir = os.path.dirname(os.path.abspath(args.json))
@@ -179,6 +195,32 @@ def main():
         if was_blocked:
             consecutive_429s += 1
             print(f"  ⚠  BLOCKED ({consecutive_429s}/{CONSECUTIVE_429_LIMIT})", file=sys.stderr)
+            if consecutive_429s >= CONSECUTIVE_429_LIMIT and args.ytdlp_fallback:
+                print(f"\n⛔ {CONSECUTIVE_429_LIMIT} consecutive 429s — switching to bulk yt-dlp subtitles.", file=sys.stderr)
+                rest = {
+                    v["id"]: v for v in batch[idx:]
+                    if v.get("id") and v["id"] not in existing_ids and not is_short(v)
+                }
+                browser = args.cookies_from_browser
+                ids = list(rest)
+                for start in range(0, len(ids), DEFAULT_SUBTITLE_CHUNK):
+                    chunk = ids[start:start + DEFAULT_SUBTITLE_CHUNK]
+                    results = fetch_subtitles_bulk(chunk, cookies_from_browser=browser, sleep_seconds=args.delay)
+                    for sub_id in chunk:
+                        v = rest[sub_id]
+                        sub_path = os.path.join(
+                            trans_dir,
+                            f"{sanitize_filename(v.get('title', '?'), 50)}_{v.get('view_count', 0) or 0}views_{sub_id}.txt",
+                        )
+                        text = (results[sub_id].get("full_text") or "").strip()
+                        if text:
+                            with open(sub_path, "w") as f:
+                                f.write(text)
+                            processed += 1
+                        else:
+                            no_cap += 1
+                print(f"  yt-dlp subtitles: {len(ids)} videos in {-(-len(ids) // DEFAULT_SUBTITLE_CHUNK)} run(s)", file=sys.stderr)
+                break
             if consecutive_429s >= CONSECUTIVE_429_LIMIT:
                 print(f"\n⛔ Aborting: {CONSECUTIVE_429_LIMIT} consecutive 429s — IP is blocked.", file=sys.stderr)
                 print(f"   Try again in a few hours, or use a VPN/proxy.")
@@ -218,8 +260,6 @@ def main():
                 no_cap += 1
                 print(f"  ⚡ no captions", file=sys.stderr)
 
-        time.sleep(args.delay)
-
     print(f"\n─── Batch complete ───")
     print(f"  Total: {len(batch)}")
     print(f"  New:   {processed}")
@@ -19,17 +19,20 @@ from __future__ import annotations
 import os
 import subprocess
 import sys
-import time
 from pathlib import Path
 
 ROOT = Path(__file__).resolve().parents[1]
 sys.path.insert(0, str(ROOT))
 os.chdir(ROOT)
 
-from suxxtext.paths import ensure_channel_dirs, sanitize_filename, transcript_exists_for_id
+from suxxtext.paths import TranscriptIndex, ensure_channel_dirs, sanitize_filename
+from suxxtext.ratelimit import DOWNLOAD, per_second, rate_limiter
 from suxxtext.whisper_runtime import ModelPool, transcribe_audio
 from suxxtext.youtube import extract_video_info, resolve_yt_dlp
 
+# Minimum seconds between download starts (shared token bucket, not a per-video sleep)
+RETRY_DOWNLOAD_INTERVAL = 5.0
+
 
 def main() -> int:
     if len(sys.argv) < 3:
@@ -53,13 +56,15 @@ def main() -> int:
     )
     print(f"mp3={mp3_dir} trans={trans_dir}", flush=True)
 
+    rate_limiter().configure(DOWNLOAD, per_second(RETRY_DOWNLOAD_INTERVAL))
+    index = TranscriptIndex.load(trans_dir)
     pool = ModelPool("base", 2)
     ok_n = err_n = skip_n = 0
 
     for i, vid in enumerate(ids, 1):
         url = f"https://www.youtube.com/watch?v={vid}"
         print(f"\n=== [{i}/{len(ids)}] {vid} ===", flush=True)
-        existing = transcript_exists_for_id(trans_dir, vid)
+        existing = index.find(vid)
         if existing:
             print(f"skip existing {existing}", flush=True)
             skip_n += 1
@@ -97,6 +102,7 @@ def main() -> int:
             url,
         ]
         print(f"download -> {mp3_path}", flush=True)
+        rate_limiter().acquire(DOWNLOAD)
         r = subprocess.run(cmd, capture_output=True, text=True)
         if r.returncode != 0:
             err_tail = (r.stderr or r.stdout or "")[-800:]
@@ -107,7 +113,6 @@ def main() -> int:
                     os.remove(mp3_path)
                 except OSError:
                     pass
-            time.sleep(6)
             continue
 
         print(f"transcribe -> {txt_path}", flush=True)
@@ -118,11 +123,11 @@ def main() -> int:
             ok, err = False, str(e)
         if ok:
             print(f"OK {vid}", flush=True)
+            index.add(vid, txt_path)
             ok_n += 1
         else:
             print(f"TRANSCRIBE FAIL {vid}: {err}", flush=True)
             err_n += 1
-        time.sleep(4)
 
     print(f"\n=== RETRY SUMMARY ok={ok_n} skip={skip_n} err={err_n} ===", flush=True)
     return 0 if err_n == 0 else 1
@@ -4,6 +4,7 @@ __version__ = "2.0.0"
 
 from suxxtext.paths import (
     CHANNELS_ROOT,
+    TranscriptIndex,
     ensure_channel_dirs,
     resolve_channel_folder,
     sanitize_filename,
@@ -12,6 +13,7 @@ from suxxtext.paths import (
 
 __all__ = [
     "CHANNELS_ROOT",
+    "TranscriptIndex",
     "ensure_channel_dirs",
     "resolve_channel_folder",
     "sanitize_filename",
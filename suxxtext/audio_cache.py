@@ -0,0 +1,199 @@
+"""Downloaded audio in ``channels/<Name>/mp3/``: reuse and a size cap.
+
+Every Whisper video downloads ``<title>_<views>_<id>.m4a``. This module
+decides what happens to that file afterwards, while the batch runs:
+
+* ``keep``: keep every file (the old behaviour).
+* ``delete``: remove the audio as soon as its transcript is written. Audio
+  of a failed transcription stays, so ``--resume`` can retry ASR.
+* ``lru``: keep recently used audio for reprocessing (e.g. a bigger model
+  later), evicting the least recently used files once ``mp3/`` exceeds the
+  byte cap.
+
+Audio that is downloaded but not yet transcribed is never evicted.
+
+:func:`reuse_audio` finds audio already on disk for a video id, even when the
+title or view count in the name has changed since, so it is not downloaded
+again. yt-dlp writes to ``*.part`` and renames only when it finishes, so any
+other file with a matching id is complete.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+CACHE_KEEP = "keep"
+CACHE_DELETE = "delete"
+CACHE_LRU = "lru"
+CACHE_POLICIES = (CACHE_KEEP, CACHE_DELETE, CACHE_LRU)
+DEFAULT_CACHE_GB = 20.0
+
+# yt-dlp's in-progress files
+_INCOMPLETE = (".part", ".ytdl", ".temp")
+
+
+def find_audio(mp3_dir: str, video_id: str) -> Optional[str]:
+    """Path of a complete audio file for ``video_id`` in ``mp3_dir``, or ``None``."""
+    if not video_id:
+        return None
+    best: Optional[Tuple[float, str]] = None
+    try:
+        with os.scandir(mp3_dir) as it:
+            for entry in it:
+                stem, ext = os.path.splitext(entry.name)
+                if ext in _INCOMPLETE or not stem.endswith("_" + video_id):
+                    continue
+                try:
+                    st = entry.stat()
+                except OSError:
+                    continue
+                if st.st_size > 0 and (best is None or st.st_mtime > best[0]):
+                    best = (st.st_mtime, entry.path)
+    except OSError:
+        return None
+    return best[1] if best else None
+
+
+def reuse_audio(mp3_dir: str, video_id: str, mp3_path: str) -> bool:
+    """``True`` if audio for ``video_id`` is on disk (renamed to ``mp3_path``)."""
+    if os.path.exists(mp3_path):
+        return True
+    found = find_audio(mp3_dir, video_id)
+    if found is None:
+        return False
+    try:
+        os.replace(found, mp3_path)
+    except OSError:
+        return False
+    return True
+
+
+class AudioCache:
+    """
+    Applies one eviction policy to one channel's ``mp3/`` folder.
+
+    The batch calls :meth:`reserve` before a download and :meth:`downloaded`
+    after it (or :meth:`hold` on reuse), then :meth:`finished` after the
+    transcription. Held files are never evicted, including one whose download
+    has just been renamed into place.
+    """
+
+    def __init__(
+        self,
+        mp3_dir: str,
+        policy: str = CACHE_KEEP,
+        max_bytes: int = 0,
+        logf: Any = None,
+    ):
+        if policy not in CACHE_POLICIES:
+            raise ValueError(f"unknown audio cache policy: {policy}")
+        self.mp3_dir = mp3_dir
+        self.policy = policy
+        self.max_bytes = max(0, int(max_bytes))
+        self.logf = logf
+        self.evicted = 0
+        self.freed_bytes = 0
+        self._lock = threading.Lock()
+        self._held: Dict[str, int] = {}
+
+    def reserve(self, path: str) -> None:
+        """A download into ``path`` is starting: hold it before it exists."""
+        path = os.path.abspath(path)
+        with self._lock:
+            self._held[path] = self._held.get(path, 0) + 1
+
+    def downloaded(self, path: str, ok: bool) -> None:
+        """The download :meth:`reserve` announced is over; failures drop the hold."""
+        if not ok:
+            self._unhold(path)
+            return
+        self._touch(path)
+        if self.policy == CACHE_LRU:
+            self.enforce()
+
+    def hold(self, path: str) -> None:
+        """Audio waiting for (or in) ASR: keep it, then check the cap."""
+        self.reserve(path)
+        self.downloaded(path, True)
+
+    def finished(self, path: str, ok: bool) -> None:
+        """ASR for ``path`` is over; ``ok`` when its transcript was written."""
+        path = os.path.abspath(path)
+        left = self._unhold(path)
+        if self.policy == CACHE_DELETE and ok and left <= 0:
+            self._remove(path, "transcribed")
+        elif self.policy == CACHE_LRU:
+            self._touch(path)
+            self.enforce()
+
+    def files(self) -> List[Tuple[float, int, str]]:
+        """``(last use, bytes, path)`` of the complete audio files, oldest first."""
+        out = []
+        try:
+            with os.scandir(self.mp3_dir) as it:
+                for entry in it:
+                    if not entry.is_file() or os.path.splitext(entry.name)[1] in _INCOMPLETE:
+                        continue
+                    try:
+                        st = entry.stat()
+                    except OSError:
+                        continue
+                    out.append((st.st_mtime, st.st_size, os.path.abspath(entry.path)))
+        except OSError:
+            pass
+        return sorted(out)
+
+    def usage(self) -> int:
+        return sum(size for _, size, _ in self.files())
+
+    def enforce(self) -> int:
+        """Evict least recently used audio until under the cap; returns bytes freed."""
+        if self.policy != CACHE_LRU or self.max_bytes <= 0:
+            return 0
+        files = self.files()
+        total = sum(size for _, size, _ in files)
+        freed = 0
+        for _, size, path in files:
+            if total <= self.max_bytes:
+                break
+            with self._lock:
+                if path in self._held:
+                    continue
+            if self._remove(path, "cache over cap"):
+                total -= size
+                freed += size
+        return freed
+
+    def _unhold(self, path: str) -> int:
+        path = os.path.abspath(path)
+        with self._lock:
+            left = self._held.get(path, 0) - 1
+            if left > 0:
+                self._held[path] = left
+            else:
+                self._held.pop(path, None)
+        return left
+
+    def _touch(self, path: str) -> None:
+        # mtime doubles as "last used" (atime is often disabled)
+        try:
+            os.utime(path, None)
+        except OSError:
+            pass
+
+    def _remove(self, path: str, why: str) -> bool:
+        try:
+            size = os.path.getsize(path)
+            os.remove(path)
+        except OSError:
+            return False
+        with self._lock:
+            self.evicted += 1
+            self.freed_bytes += size
+        if self.logf is not None:
+            self.logf.write(
+                f"Audio cache: removed {os.path.basename(path)} ({size / 1e6:.1f} MB, {why})\n"
+            )
+        return True
@@ -0,0 +1,898 @@
+"""
+Offline throughput benchmarks for the batch pipeline (no network, no GPU).
+
+Each benchmark drives the real orchestration code in ``suxxtext.jobs`` with
+fake caption / download / Whisper calls that only sleep, so numbers reflect
+scheduling and overlap, not YouTube or model speed.
+
+Usage:
+    python -m suxxtext.bench pipeline --videos 60 --miss-rate 0.3
+    python -m suxxtext.bench index --files 50000 --lookups 2000
+    python -m suxxtext.bench order --videos 40 --model_instances 2
+    python -m suxxtext.bench cpu --jobs 16 --model_instances 4
+    python -m suxxtext.bench cpu --audio sample.mp3 --model tiny --jobs 8
+    python -m suxxtext.bench ytdl --downloads 12 --workers 2 --size-kb 512
+    python -m suxxtext.bench predecode --files 12 --seconds 60 --predecode 2
+    python -m suxxtext.bench batch --files 8 --seconds 300 --batch 8
+    python -m suxxtext.bench batch --audio sample.mp3 --model tiny --batch 8
+
+``cpu`` is the exception: it compares the thread and process model pools on
+real CPU work, either a synthetic Python-heavy model (default) or
+faster-whisper on a local ``--audio`` file. ``ytdl`` runs real yt-dlp, both
+engines, against files served from a local HTTP server (generic extractor),
+so it measures per-download engine overhead without touching YouTube.
+``predecode`` decodes real (generated WAV) audio with PyAV and fakes only
+the GPU: inference sleeps ``--rtf`` seconds per audio second, so "model
+busy" is what GPU utilization would be. ``batch`` compares model copies
+with batched inference, on a fake shared GPU (each pass costs a fixed step
+plus a small per-chunk cost) or faster-whisper on a local ``--audio`` file.
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import os
+import random
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence
+from unittest import mock
+
+from suxxtext.paths import TranscriptIndex, sanitize_filename
+
+
+def synthetic_videos(n: int, seed: int = 0) -> List[dict]:
+    """Flat-listing-shaped entries with unique 11-char ids and durations."""
+    rng = random.Random(seed)
+    alphabet = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789_-"
+    videos = []
+    for i in range(n):
+        vid = "".join(rng.choice(alphabet) for _ in range(6)) + f"{i:05d}"
+        videos.append(
+            {
+                "id": vid,
+                "title": f"Synthetic video {i}",
+                "view_count": rng.randint(100, 1_000_000),
+                "duration": rng.choice([60, 300, 480, 900, 1800, 3600]),
+                "ie_key": "Youtube",
+            }
+        )
+    return videos
+
+
+class _FakePool:
+    def __init__(self, model_name: str, pool_size: int, load_seconds: float = 0.0):
+        time.sleep(load_seconds)
+        self.pool_size = pool_size
+        self._sem = threading.Semaphore(max(1, pool_size))
+
+    @contextlib.contextmanager
+    def get_model(self):
+        with self._sem:
+            yield "fake-model"
+
+
+def run_pipeline_once(
+    videos: List[dict],
+    *,
+    pipelined: bool,
+    miss_rate: float,
+    caption_seconds: float,
+    download_seconds: float,
+    whisper_seconds: float,
+    load_seconds: float,
+    workers: int,
+    model_instances: int,
+    seed: int = 0,
+) -> Dict[str, float]:
+    """One fake batch run; returns throughput numbers from ``BatchStats``."""
+    from suxxtext import jobs
+
+    rng = random.Random(seed)
+    misses = {v["id"] for v in videos if rng.random() < miss_rate}
+
+    def fake_fetch(video_id, languages=None):
+        time.sleep(caption_seconds)
+        if video_id in misses:
+            return {"error": "No transcript found for this video."}
+        return {"success": True, "full_text": "caption text " * 10, "language": "en"}
+
+    def fake_download(url, output_file, *a, **kw):
+        time.sleep(download_seconds)
+        Path(output_file).write_bytes(b"\0")
+        return True, None
+
+    def fake_transcribe(audio_file, model, output_file, lock=None):
+        time.sleep(whisper_seconds)
+        Path(output_file).write_text("whisper text\n", encoding="utf-8")
+        return True, None
+
+    with tempfile.TemporaryDirectory() as tmp:
+        mp3_dir = Path(tmp) / "mp3"
+        trans_dir = Path(tmp) / "transcriptions"
+        mp3_dir.mkdir()
+        trans_dir.mkdir()
+        with mock.patch.object(jobs, "fetch_captions", fake_fetch), mock.patch.object(
+            jobs, "download_audio", fake_download
+        ), mock.patch.object(jobs, "transcribe_audio", fake_transcribe), mock.patch.object(
+            jobs, "ModelPool", lambda name, n: _FakePool(name, n, load_seconds)
+        ), contextlib.redirect_stdout(io.StringIO()):
+            stats = jobs.run_batch_phases(
+                videos,
+                len(videos),
+                str(mp3_dir),
+                str(trans_dir),
+                io.StringIO(),
+                jobs.BatchOptions(
+                    pool_size=model_instances,
+                    max_workers=workers,
+                    caption_delay=0.0,
+                    pipelined=pipelined,
+                ),
+            )
+    return {
+        "time_to_first": stats.time_to_first or 0.0,
+        "time_to_first_whisper": stats.time_to_first_whisper or 0.0,
+        "wall": stats.wall_clock,
+        "captions": stats["captions"],
+        "whisper": stats["whisper"],
+        "errors": stats["error"],
+    }
+
+
+def bench_pipeline(args: argparse.Namespace) -> int:
+    videos = synthetic_videos(args.videos, args.seed)
+    rows = {}
+    for pipelined in (False, True):
+        rows["pipelined" if pipelined else "two-phase"] = run_pipeline_once(
+            videos,
+            pipelined=pipelined,
+            miss_rate=args.miss_rate,
+            caption_seconds=args.caption_seconds,
+            download_seconds=args.download_seconds,
+            whisper_seconds=args.whisper_seconds,
+            load_seconds=args.load_seconds,
+            workers=args.workers,
+            model_instances=args.model_instances,
+            seed=args.seed,
+        )
+    print(
+        f"pipeline bench: videos={args.videos} miss_rate={args.miss_rate} "
+        f"workers={args.workers} models={args.model_instances}"
+    )
+    print(
+        f"{'mode':<11} {'first(s)':>9} {'1st ASR(s)':>10} {'wall(s)':>9} "
+        f"{'captions':>9} {'whisper':>8} {'err':>4}"
+    )
+    for mode, r in rows.items():
+        print(
+            f"{mode:<11} {r['time_to_first']:>9.2f} {r['time_to_first_whisper']:>10.2f} "
+            f"{r['wall']:>9.2f} "
+            f"{r['captions']:>9} {r['whisper']:>8} {r['errors']:>4}"
+        )
+    base, new = rows["two-phase"]["wall"], rows["pipelined"]["wall"]
+    if new > 0:
+        print(f"speedup (wall): {base / new:.2f}x")
+    return 0
+
+
+def _legacy_skip_scan(trans_dir: str, video_ids: List[str]) -> int:
+    """The pre-index Phase 1 skip check: substring match against every file."""
+    existing = os.listdir(trans_dir)
+    hits = 0
+    for vid in video_ids:
+        for name in existing:
+            if vid in name and name.endswith(".txt"):
+                hits += 1
+                break
+    return hits
+
+
+def bench_index(args: argparse.Namespace) -> int:
+    archived = synthetic_videos(args.files, args.seed)
+    fresh = synthetic_videos(args.lookups, args.seed + 1)
+    rng = random.Random(args.seed)
+    # Half the lookups hit archived ids, half are new videos
+    lookups = [
+        archived[rng.randrange(len(archived))]["id"] if i % 2 == 0 else fresh[i]["id"]
+        for i in range(args.lookups)
+    ]
+    with tempfile.TemporaryDirectory(prefix="suxx-index-") as trans_dir:
+        for v in archived:
+            name = f"{sanitize_filename(v['title'], 50)}_{v['view_count']}views_{v['id']}.txt"
+            Path(trans_dir, name).touch()
+
+        t0 = time.perf_counter()
+        legacy_hits = _legacy_skip_scan(trans_dir, lookups)
+        legacy = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        index = TranscriptIndex.load(trans_dir)
+        build = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        index_hits = sum(1 for vid in lookups if index.find(vid))
+        lookup = time.perf_counter() - t0
+
+    print(f"index bench: files={args.files} lookups={args.lookups}")
+    print(f"{'method':<16} {'build(s)':>9} {'lookups(s)':>11} {'per lookup':>11} {'hits':>6}")
+    print(
+        f"{'substring scan':<16} {0.0:>9.3f} {legacy:>11.3f} "
+        f"{legacy / len(lookups) * 1e6:>9.1f}us {legacy_hits:>6}"
+    )
+    print(
+        f"{'id index':<16} {build:>9.3f} {lookup:>11.4f} "
+        f"{lookup / len(lookups) * 1e6:>9.2f}us {index_hits:>6}"
+    )
+    if build + lookup > 0:
+        print(f"speedup (incl. build): {legacy / (build + lookup):.0f}x")
+    return 0 if legacy_hits == index_hits else 1
+
+
+def run_order_once(
+    videos: List[dict],
+    order: str,
+    *,
+    seconds_per_audio_hour: float,
+    model_instances: int,
+    workers: int,
+) -> Dict[str, float]:
+    """
+    One Whisper-only two-phase run where fake ASR time scales with duration.
+    Returns predicted / actual makespan and completion times from the events.
+    """
+    from suxxtext import jobs
+    from suxxtext.events import EventSink, read_events
+    from suxxtext.schedule import video_duration
+
+    by_path: Dict[str, float] = {}
+
+    def fake_download(url, output_file, *a, **kw):
+        Path(output_file).write_bytes(b"\0")
+        return True, None
+
+    def fake_transcribe(audio_file, model, output_file, lock=None):
+        time.sleep(by_path.get(audio_file, 0.0))
+        Path(output_file).write_text("whisper text\n", encoding="utf-8")
+        return True, None
+
+    with tempfile.TemporaryDirectory() as tmp:
+        mp3_dir = Path(tmp) / "mp3"
+        trans_dir = Path(tmp) / "transcriptions"
+        mp3_dir.mkdir()
+        trans_dir.mkdir()
+        for v in videos:
+            mp3 = jobs._paths_for_video(v, str(mp3_dir), str(trans_dir))[3]
+            by_path[mp3] = video_duration(v) / 3600.0 * seconds_per_audio_hour
+        sink = EventSink(str(Path(tmp) / "events.jsonl"))
+        sink.emit("run_start", kind="batch", model="bench")
+        with mock.patch.object(jobs, "download_audio", fake_download), mock.patch.object(
+            jobs, "transcribe_audio", fake_transcribe
+        ), mock.patch.object(
+            jobs, "ModelPool", lambda name, n: _FakePool(name, n)
+        ), mock.patch.dict(
+            "suxxtext.schedule.DEFAULT_RTF", {"bench": seconds_per_audio_hour / 3600.0}
+        ), contextlib.redirect_stdout(io.StringIO()):
+            jobs.run_batch_phases(
+                videos,
+                len(videos),
+                str(mp3_dir),
+                str(trans_dir),
+                io.StringIO(),
+                jobs.BatchOptions(
+                    model_name="bench",
+                    pool_size=model_instances,
+                    max_workers=workers,
+                    prefer_captions=False,
+                    pipelined=False,
+                    order=order,
+                ),
+                events=sink,
+            )
+        sink.close()
+        rows, _ = read_events(sink.path)
+    span = next(r for r in rows if r.get("event") == "makespan")
+    starts = [r["ts"] for r in rows if r.get("event") == "start" and r.get("stage") == "transcribe"]
+    done = sorted(
+        r["ts"] - min(starts)
+        for r in rows
+        if r.get("event") == "done" and r.get("stage") == "transcribe"
+    )
+    return {"predicted": span["predicted"], "actual": span["actual"], "done_at": done}
+
+
+def bench_order(args: argparse.Namespace) -> int:
+    from suxxtext.schedule import ORDERS
+
+    videos = synthetic_videos(args.videos, args.seed)
+    rows = {
+        order: run_order_once(
+            videos,
+            order,
+            seconds_per_audio_hour=args.seconds_per_audio_hour,
+            model_instances=args.model_instances,
+            workers=args.workers,
+        )
+        for order in ORDERS
+    }
+    # "Overnight window": half of what the default order needs
+    window = rows["listing"]["actual"] / 2
+    print(
+        f"order bench: videos={args.videos} models={args.model_instances} "
+        f"{args.seconds_per_audio_hour}s per audio hour, window={window:.2f}s"
+    )
+    print(f"{'order':<9} {'predicted(s)':>12} {'actual(s)':>10} {'done in window':>15}")
+    for order, r in rows.items():
+        in_window = sum(1 for t in r["done_at"] if t <= window)
+        print(
+            f"{order:<9} {r['predicted']:>12.2f} {r['actual']:>10.2f} "
+            f"{in_window:>10}/{len(videos)}"
+        )
+    return 0
+
+
+class _BusyModel:
+    """
+    Stand-in Whisper model for the ``cpu`` bench: ``transcribe`` burns
+    ``work`` iterations of pure-Python CPU (holding the GIL, like decode and
+    segment handling), parsed from a ``busy:<work>`` model name.
+    """
+
+    def __init__(self, model_name: str, *args, **kwargs):
+        self.work = int(str(model_name).split(":", 1)[-1] or 0)
+
+    def transcribe(self, audio_file: str, **kwargs):
+        from suxxtext.whisper_runtime import Segment
+
+        acc = 0
+        for i in range(self.work):
+            acc = (acc + i * i) % 1_000_003
+        return [Segment(0.0, 1.0, f"busy {acc}")], None
+
+
+def _busy_loader(model_name: str, cpu_threads: int) -> _BusyModel:
+    return _BusyModel(model_name)
+
+
+def run_cpu_pool_once(
+    backend: str,
+    *,
+    model_name: str,
+    audio: Optional[str],
+    jobs: int,
+    model_instances: int,
+    cpu_threads: int,
+) -> Dict[str, float]:
+    """Transcribe ``jobs`` files through one pool backend; wall time and rate."""
+    from concurrent.futures import ThreadPoolExecutor
+
+    from suxxtext import whisper_runtime as wr
+
+    synthetic = audio is None
+    patches = contextlib.ExitStack()
+    with patches, tempfile.TemporaryDirectory() as tmp:
+        if synthetic:
+            audio = str(Path(tmp) / "fake.mp3")
+            Path(audio).write_bytes(b"\0")
+        with contextlib.redirect_stdout(io.StringIO()):
+            t0 = time.perf_counter()
+            if backend == wr.BACKEND_PROCESS:
+                pool = wr.ProcessModelPool(
+                    model_name,
+                    model_instances,
+                    cpu_threads=cpu_threads,
+                    loader=_busy_loader if synthetic else wr.load_cpu_model,
+                )
+            else:
+                if synthetic:
+                    patches.enter_context(mock.patch.object(wr, "WhisperModel", _BusyModel))
+                patches.enter_context(
+                    mock.patch.object(wr, "get_whisper_runtime", lambda: ("cpu", "int8"))
+                )
+                pool = wr.ModelPool(model_name, model_instances, cpu_threads=cpu_threads)
+            load = time.perf_counter() - t0
+
+        def one(i: int) -> bool:
+            with pool.get_model() as model:
+                ok, _ = wr.transcribe_audio(audio, model, str(Path(tmp) / f"{i}.txt"))
+            return ok
+
+        t0 = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=model_instances) as ex:
+            ok = sum(ex.map(one, range(jobs)))
+        wall = time.perf_counter() - t0
+        pool.close()
+    return {
+        "load": load,
+        "wall": wall,
+        "ok": ok,
+        "per_hour": ok / wall * 3600 if wall > 0 else 0.0,
+    }
+
+
+def bench_cpu(args: argparse.Namespace) -> int:
+    from suxxtext.whisper_runtime import BACKENDS
+
+    model_name = args.model if args.audio else f"busy:{args.work}"
+    rows = {
+        backend: run_cpu_pool_once(
+            backend,
+            model_name=model_name,
+            audio=args.audio,
+            jobs=args.jobs,
+            model_instances=args.model_instances,
+            cpu_threads=args.cpu_threads,
+        )
+        for backend in BACKENDS
+    }
+    print(
+        f"cpu pool bench: {model_name} jobs={args.jobs} models={args.model_instances} "
+        f"cores={os.cpu_count()} cpu_threads={args.cpu_threads or 'auto'}"
+    )
+    print(f"{'backend':<8} {'load(s)':>8} {'wall(s)':>8} {'ok':>4} {'transcripts/h':>14}")
+    for backend, r in rows.items():
+        print(
+            f"{backend:<8} {r['load']:>8.2f} {r['wall']:>8.2f} {r['ok']:>4} "
+            f"{r['per_hour']:>14.0f}"
+        )
+    if rows["thread"]["wall"] > 0 and rows["process"]["wall"] > 0:
+        print(f"speedup (process vs thread): {rows['thread']['wall'] / rows['process']['wall']:.2f}x")
+    return 0 if all(r["ok"] == args.jobs for r in rows.values()) else 1
+
+
+class _QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+class _QuietServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        pass  # yt-dlp's generic extractor probes a URL and drops the connection
+
+
+@contextlib.contextmanager
+def serve_directory(path: str) -> Iterator[str]:
+    """Serve ``path`` over HTTP on a free localhost port; yields the base URL."""
+    server = _QuietServer(("127.0.0.1", 0), partial(_QuietHandler, directory=path))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def run_ytdl_once(
+    engine: str, *, downloads: int, workers: int, size_kb: int
+) -> Dict[str, float]:
+    """Download ``downloads`` local files through one yt-dlp engine."""
+    from suxxtext import youtube
+    from suxxtext.ytdl_pool import YtdlPool
+
+    # Same yt-dlp for both engines, without the console progress bar
+    argv = [sys.executable, "-m", "yt_dlp", "--quiet", "--no-progress"]
+    pool = YtdlPool()
+    events = []
+    with tempfile.TemporaryDirectory() as tmp, contextlib.ExitStack() as stack:
+        src = Path(tmp) / "src"
+        src.mkdir()
+        payload = os.urandom(size_kb * 1024)
+        for i in range(downloads):
+            (src / f"clip{i}.m4a").write_bytes(payload)
+        base = stack.enter_context(serve_directory(str(src)))
+        stack.enter_context(mock.patch.object(youtube, "resolve_yt_dlp", lambda: argv))
+        stack.enter_context(mock.patch.object(youtube, "ytdl_pool", lambda: pool))
+        stack.enter_context(mock.patch.object(youtube, "_ENGINE", engine))
+
+        def one(i: int) -> bool:
+            ok, _ = youtube.download_audio(
+                f"{base}/clip{i}.m4a", str(Path(tmp) / f"out{i}.m4a"), progress=events.append
+            )
+            return ok and (Path(tmp) / f"out{i}.m4a").stat().st_size == len(payload)
+
+        t0 = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=workers) as ex:
+            ok = sum(ex.map(one, range(downloads)))
+        wall = time.perf_counter() - t0
+    pool.close()
+    return {
+        "wall": wall,
+        "ok": ok,
+        "per_download": wall * workers / downloads if downloads else 0.0,
+        "instances": pool.created,
+        "progress_events": len(events),
+    }
+
+
+def bench_ytdl(args: argparse.Namespace) -> int:
+    from suxxtext.youtube import ENGINE_INPROCESS, YTDL_ENGINES
+
+    rows = {
+        engine: run_ytdl_once(
+            engine, downloads=args.downloads, workers=args.workers, size_kb=args.size_kb
+        )
+        for engine in YTDL_ENGINES
+    }
+    print(
+        f"yt-dlp engine bench: downloads={args.downloads} workers={args.workers} "
+        f"size={args.size_kb} KiB (local HTTP, generic extractor)"
+    )
+    print(
+        f"{'engine':<11} {'wall(s)':>8} {'s/download':>11} {'ok':>4} "
+        f"{'instances':>10} {'progress':>9}"
+    )
+    for engine, r in rows.items():
+        print(
+            f"{engine:<11} {r['wall']:>8.2f} {r['per_download']:>11.3f} {r['ok']:>4} "
+            f"{r['instances']:>10} {r['progress_events']:>9}"
+        )
+    inproc = rows[ENGINE_INPROCESS]["wall"]
+    if inproc > 0:
+        print(f"speedup (inprocess vs subprocess): {rows['subprocess']['wall'] / inproc:.2f}x")
+    return 0 if all(r["ok"] == args.downloads for r in rows.values()) else 1
+
+
+class _DecodingPool:
+    """
+    Fake GPU models for the ``predecode`` bench. Given a path, ``transcribe``
+    decodes it inline like faster-whisper (CPU, while holding the model);
+    inference then sleeps ``rtf`` seconds per audio second.
+    """
+
+    def __init__(self, pool_size: int, rtf: float):
+        import queue
+
+        self.pool_size = pool_size
+        self.rtf = rtf
+        self.busy = 0.0
+        self._lock = threading.Lock()
+        self._models: "queue.Queue[_DecodingPool]" = queue.Queue()
+        for _ in range(pool_size):
+            self._models.put(self)
+
+    @contextlib.contextmanager
+    def get_model(self):
+        model = self._models.get()
+        try:
+            yield model
+        finally:
+            self._models.put(model)
+
+    def transcribe(self, audio, **kwargs):
+        from faster_whisper.audio import decode_audio
+
+        from suxxtext.whisper_runtime import Segment
+
+        if isinstance(audio, str):
+            audio = decode_audio(audio, sampling_rate=16000)
+        seconds = len(audio) / 16000
+        time.sleep(seconds * self.rtf)
+        with self._lock:
+            self.busy += seconds * self.rtf
+        return iter([Segment(0.0, seconds, " words")]), None
+
+    def close(self) -> None:
+        pass
+
+
+def _write_wav(path: str, seconds: float, rate: int = 44100) -> None:
+    """Stereo noise at ``rate`` Hz (decode + resample work like a real track)."""
+    import wave
+
+    import numpy as np
+
+    frames = int(seconds * rate)
+    pcm = (np.random.default_rng(0).standard_normal((frames, 2)) * 3000).astype("<i2")
+    with wave.open(path, "wb") as w:
+        w.setnchannels(2)
+        w.setsampwidth(2)
+        w.setframerate(rate)
+        w.writeframes(pcm.tobytes())
+
+
+def _cpu_seconds() -> float:
+    import resource  # Unix only: keeps `import suxxtext.bench` working on Windows
+
+    own = resource.getrusage(resource.RUSAGE_SELF)
+    kids = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return own.ru_utime + own.ru_stime + kids.ru_utime + kids.ru_stime
+
+
+def run_predecode_once(
+    source: str,
+    *,
+    files: int,
+    seconds: float,
+    rtf: float,
+    model_instances: int,
+    predecode: int,
+) -> Dict[str, float]:
+    """Whisper ``files`` copies of ``source`` through the real batch stages."""
+    from suxxtext import jobs
+
+    videos = synthetic_videos(files)
+    for v in videos:
+        v["duration"] = seconds
+    pool = _DecodingPool(model_instances, rtf)
+
+    def fake_download(url, output_file, *a, **kw):
+        shutil.copyfile(source, output_file)
+        return True, None
+
+    with tempfile.TemporaryDirectory() as tmp:
+        mp3_dir = Path(tmp) / "mp3"
+        trans_dir = Path(tmp) / "transcriptions"
+        mp3_dir.mkdir()
+        trans_dir.mkdir()
+        cpu0 = _cpu_seconds()
+        with mock.patch.object(jobs, "download_audio", fake_download), mock.patch.object(
+            jobs, "ModelPool", lambda name, n: pool
+        ), contextlib.redirect_stdout(io.StringIO()):
+            stats = jobs.run_batch_phases(
+                videos,
+                len(videos),
+                str(mp3_dir),
+                str(trans_dir),
+                io.StringIO(),
+                jobs.BatchOptions(
+                    pool_size=model_instances, prefer_captions=False, predecode_workers=predecode
+                ),
+            )
+        cpu = _cpu_seconds() - cpu0
+    wall = stats.wall_clock
+    return {
+        "wall": wall,
+        "whisper": stats["whisper"],
+        "model_busy": pool.busy / (wall * model_instances) if wall > 0 else 0.0,
+        "cpu": cpu / (wall * (os.cpu_count() or 1)) if wall > 0 else 0.0,
+        "per_hour": stats["whisper"] / wall * 3600 if wall > 0 else 0.0,
+    }
+
+
+def bench_predecode(args: argparse.Namespace) -> int:
+    with tempfile.TemporaryDirectory() as tmp:
+        source = str(Path(tmp) / "clip.wav")
+        _write_wav(source, args.seconds)
+        rows = {
+            label: run_predecode_once(
+                source,
+                files=args.files,
+                seconds=args.seconds,
+                rtf=args.rtf,
+                model_instances=args.model_instances,
+                predecode=n,
+            )
+            for label, n in (("inline", 0), (f"predecode={args.predecode}", args.predecode))
+        }
+    print(
+        f"predecode bench: files={args.files} x {args.seconds:g}s audio, "
+        f"fake GPU rtf={args.rtf:g}, models={args.model_instances}, cores={os.cpu_count()}"
+    )
+    print(
+        f"{'decode':<13} {'wall(s)':>8} {'model busy':>11} {'cpu':>6} "
+        f"{'ok':>4} {'transcripts/h':>14}"
+    )
+    for label, r in rows.items():
+        print(
+            f"{label:<13} {r['wall']:>8.2f} {r['model_busy']:>10.0%} {r['cpu']:>6.0%} "
+            f"{r['whisper']:>4} {r['per_hour']:>14.0f}"
+        )
+    inline, pre = (r["wall"] for r in rows.values())
+    if pre > 0:
+        print(f"speedup (predecode vs inline): {inline / pre:.2f}x")
+    return 0 if all(r["whisper"] == args.files for r in rows.values()) else 1
+
+
+class _GpuModel:
+    """
+    Stand-in Whisper model for the ``batch`` bench. Every instance shares one
+    fake GPU: a forward pass over ``k`` 30 s chunks holds it for
+    ``step + per_chunk * k`` seconds. ``gpu:<step>:<per_chunk>`` model name.
+    """
+
+    gpu = threading.Lock()
+
+    def __init__(self, model_name: str, *args, **kwargs):
+        _, step, per_chunk = str(model_name).split(":")
+        self.step = float(step)
+        self.per_chunk = float(per_chunk)
+
+    def forward(self, chunks: int) -> None:
+        with self.gpu:
+            time.sleep(self.step + self.per_chunk * chunks)
+
+    @staticmethod
+    def chunks(audio) -> int:
+        return max(1, -(-len(audio) // (30 * 16000)))
+
+    def transcribe(self, audio, **kwargs):
+        from suxxtext.whisper_runtime import Segment
+
+        for _ in range(self.chunks(audio)):
+            self.forward(1)
+        return [Segment(0.0, len(audio) / 16000, " words")], None
+
+
+class _GpuPipeline:
+    """``BatchedInferencePipeline`` for :class:`_GpuModel`: ``batch_size`` chunks per pass."""
+
+    def __init__(self, model: _GpuModel):
+        self.model = model
+
+    def transcribe(self, audio, batch_size: int = 8, **kwargs):
+        from suxxtext.whisper_runtime import Segment
+
+        n = self.model.chunks(audio)
+        for i in range(0, n, batch_size):
+            self.model.forward(min(batch_size, n - i))
+        return [Segment(0.0, len(audio) / 16000, " words")], None
+
+
+def run_whisper_batch_once(
+    *,
+    model_name: str,
+    audio,
+    files: int,
+    model_instances: int,
+    batch: int,
+) -> Dict[str, float]:
+    """Transcribe ``files`` copies of ``audio`` through one thread-pool setup."""
+    from suxxtext import whisper_runtime as wr
+
+    synthetic = not isinstance(audio, str)
+    patches = contextlib.ExitStack()
+    with patches, tempfile.TemporaryDirectory() as tmp:
+        if synthetic:
+            patches.enter_context(mock.patch.object(wr, "WhisperModel", _GpuModel))
+            patches.enter_context(
+                mock.patch("faster_whisper.BatchedInferencePipeline", _GpuPipeline)
+            )
+        with contextlib.redirect_stdout(io.StringIO()):
+            pool = wr.ModelPool(model_name, model_instances, batch_size=batch)
+
+        def one(i: int) -> bool:
+            with pool.get_model() as model:
+                ok, _ = wr.transcribe_audio(audio, model, str(Path(tmp) / f"{i}.txt"))
+            return ok
+
+        t0 = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=model_instances) as ex:
+            ok = sum(ex.map(one, range(files)))
+        wall = time.perf_counter() - t0
+        pool.close()
+    per_hour = ok / wall * 3600 if wall > 0 else 0.0
+    return {"wall": wall, "ok": ok, "per_hour": per_hour, "per_model": per_hour / model_instances}
+
+
+def bench_batch(args: argparse.Namespace) -> int:
+    import numpy as np
+
+    if args.audio:
+        model_name, audio = args.model, args.audio
+    else:
+        model_name = f"gpu:{args.step:g}:{args.per_chunk:g}"
+        audio = np.zeros(int(args.seconds * 16000), dtype=np.float32)
+    setups = [
+        ("1 model", 1, 0),
+        (f"{args.model_instances} models", args.model_instances, 0),
+        (f"1 model, batch {args.batch}", 1, args.batch),
+    ]
+    rows = {
+        label: run_whisper_batch_once(
+            model_name=model_name,
+            audio=audio,
+            files=args.files,
+            model_instances=models,
+            batch=batch,
+        )
+        for label, models, batch in setups
+    }
+    source = args.audio or f"{args.seconds:g}s synthetic audio, shared fake GPU"
+    print(f"whisper batch bench: {model_name} files={args.files} ({source})")
+    print(
+        f"{'setup':<18} {'wall(s)':>8} {'ok':>4} {'transcripts/h':>14} {'per model':>10}"
+    )
+    for label, r in rows.items():
+        print(
+            f"{label:<18} {r['wall']:>8.2f} {r['ok']:>4} {r['per_hour']:>14.0f} "
+            f"{r['per_model']:>10.0f}"
+        )
+    single, batched = rows[setups[0][0]]["wall"], rows[setups[-1][0]]["wall"]
+    if batched > 0:
+        print(f"speedup (batch {args.batch} vs 1 model): {single / batched:.2f}x")
+    return 0 if all(r["ok"] == args.files for r in rows.values()) else 1
+
+
+def build_parser() -> argparse.ArgumentParser:
+    p = argparse.ArgumentParser(
+        prog="python -m suxxtext.bench",
+        description="Offline throughput benchmarks (fake network + fake Whisper).",
+    )
+    sub = p.add_subparsers(dest="bench")
+
+    pp = sub.add_parser("pipeline", help="Streaming vs two-phase caption→Whisper batch")
+    pp.add_argument("--videos", type=int, default=60)
+    pp.add_argument("--miss-rate", type=float, default=0.3, help="Fraction needing Whisper")
+    pp.add_argument("--caption-seconds", type=float, default=0.02)
+    pp.add_argument("--download-seconds", type=float, default=0.05)
+    pp.add_argument("--whisper-seconds", type=float, default=0.1)
+    pp.add_argument("--load-seconds", type=float, default=0.1, help="Fake model pool load")
+    pp.add_argument("--workers", type=int, default=4)
+    pp.add_argument("--model_instances", type=int, default=2)
+    pp.add_argument("--seed", type=int, default=0)
+    pp.set_defaults(func=bench_pipeline)
+
+    pi = sub.add_parser("index", help="Transcript skip check: substring scan vs id index")
+    pi.add_argument("--files", type=int, default=50_000, help="Synthetic transcripts on disk")
+    pi.add_argument("--lookups", type=int, default=2_000, help="Videos checked (half archived)")
+    pi.add_argument("--seed", type=int, default=0)
+    pi.set_defaults(func=bench_index)
+
+    po = sub.add_parser("order", help="Whisper order policies: makespan and work per window")
+    po.add_argument("--videos", type=int, default=40)
+    po.add_argument(
+        "--seconds-per-audio-hour", type=float, default=0.5, help="Fake ASR cost"
+    )
+    po.add_argument("--workers", type=int, default=4)
+    po.add_argument("--model_instances", type=int, default=2)
+    po.add_argument("--seed", type=int, default=0)
+    po.set_defaults(func=bench_order)
+
+    pc = sub.add_parser("cpu", help="CPU Whisper: thread vs process model pool")
+    pc.add_argument("--jobs", type=int, default=16, help="Transcriptions per backend")
+    pc.add_argument("--model_instances", type=int, default=max(1, (os.cpu_count() or 1)))
+    pc.add_argument("--cpu-threads", type=int, default=0, help="Per model (0 = cores / models)")
+    pc.add_argument("--work", type=int, default=2_000_000, help="Synthetic model CPU work")
+    pc.add_argument("--audio", default=None, help="Real faster-whisper run on this file")
+    pc.add_argument("--model", default="tiny", help="Whisper model with --audio")
+    pc.set_defaults(func=bench_cpu)
+
+    py = sub.add_parser("ytdl", help="yt-dlp engines: subprocess per download vs in-process pool")
+    py.add_argument("--downloads", type=int, default=12, help="Downloads per engine")
+    py.add_argument("--workers", type=int, default=2)
+    py.add_argument("--size-kb", type=int, default=512, help="Size of each served file")
+    py.set_defaults(func=bench_ytdl)
+
+    pd = sub.add_parser("predecode", help="Whisper audio decode: inline vs pre-decode processes")
+    pd.add_argument("--files", type=int, default=12)
+    pd.add_argument("--seconds", type=float, default=60.0, help="Audio length of each file")
+    pd.add_argument("--rtf", type=float, default=0.01, help="Fake GPU seconds per audio second")
+    pd.add_argument("--model_instances", type=int, default=2)
+    pd.add_argument("--predecode", type=int, default=2, help="Decode processes")
+    pd.set_defaults(func=bench_predecode)
+
+    pb = sub.add_parser("batch", help="Whisper: model copies vs batched inference")
+    pb.add_argument("--files", type=int, default=8)
+    pb.add_argument("--seconds", type=float, default=300.0, help="Synthetic audio per file")
+    pb.add_argument("--batch", type=int, default=8, help="Chunks per batched pass")
+    pb.add_argument("--model_instances", type=int, default=2)
+    pb.add_argument("--step", type=float, default=0.05, help="Fake GPU seconds per pass")
+    pb.add_argument("--per-chunk", type=float, default=0.005, help="Fake GPU seconds per chunk")
+    pb.add_argument("--audio", default=None, help="Real faster-whisper run on this file")
+    pb.add_argument("--model", default="tiny", help="Whisper model with --audio")
+    pb.set_defaults(func=bench_batch)
+    return p
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if not getattr(args, "func", None):
+        parser.print_help()
+        return 2
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
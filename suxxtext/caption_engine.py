@@ -0,0 +1,178 @@
+"""Concurrent caption fetches for the batch caption sweep.
+
+The caption sweep (``ChannelBatch.steps``) handles videos one at a time, and
+every caption request used to wait for the previous one. Most of that time
+is network latency. :class:`CaptionEngine` runs an asyncio loop in a
+background thread that keeps up to ``concurrency`` requests in flight. The
+sweep asks for the videos coming up next (:meth:`CaptionEngine.submit`)
+and then collects each result in listing order (:meth:`CaptionEngine.result`).
+The skip checks, leases, journal rows and the IP-block streak of
+``CaptionGate`` therefore stay sequential and unchanged.
+
+youtube-transcript-api is blocking, so each request runs on a worker thread
+of the engine. The shared caption token bucket (``--caption-delay``) still
+spaces request starts, so concurrency hides latency but never raises the
+request rate above the configured budget.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import threading
+from typing import Callable, Dict, Iterable, List, Optional
+
+DEFAULT_CAPTION_CONCURRENCY = 4
+
+FetchFn = Callable[[str, Optional[List[str]]], dict]
+
+
+class CaptionEngine:
+    """
+    Bounded-concurrency caption fetcher shared by every channel of a run.
+
+    ``fetch(video_id, languages)`` has :func:`suxxtext.captions.fetch_captions`
+    semantics: it returns a result dict and never raises (exceptions become
+    ``{"error": ...}``).
+    """
+
+    def __init__(self, fetch: FetchFn, concurrency: int = DEFAULT_CAPTION_CONCURRENCY):
+        self.fetch = fetch
+        self.concurrency = max(1, int(concurrency))
+        # how far ahead of the sweep to start requests
+        self.lookahead = 2 * self.concurrency
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self._lock = threading.Lock()
+        self._futures: Dict[str, concurrent.futures.Future] = {}
+        # loop thread only
+        self._tasks: Dict[concurrent.futures.Future, asyncio.Task] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._executor: Optional[concurrent.futures.ThreadPoolExecutor] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+
+    # -- lifecycle --------------------------------------------------------
+
+    def start(self) -> "CaptionEngine":
+        if self._thread is not None:
+            return self
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=self.concurrency, thread_name_prefix="captions"
+        )
+        loop = asyncio.new_event_loop()
+        ready = threading.Event()
+
+        def _run() -> None:
+            asyncio.set_event_loop(loop)
+            self._slots = asyncio.Semaphore(self.concurrency)
+            ready.set()
+            loop.run_forever()
+
+        self._loop = loop
+        self._thread = threading.Thread(target=_run, name="caption-engine", daemon=True)
+        self._thread.start()
+        ready.wait()
+        return self
+
+    def close(self) -> None:
+        """Cancel requests not yet started and stop the loop."""
+        if self._thread is None:
+            return
+        self.cancel()
+        loop = self._loop
+        asyncio.run_coroutine_threadsafe(self._drain(), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+        self._thread.join()
+        loop.close()
+        self._executor.shutdown(wait=True)
+        self._thread = None
+        self._loop = None
+
+    def __enter__(self) -> "CaptionEngine":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    # -- requests ---------------------------------------------------------
+
+    async def _fetch_one(self, video_id: str, languages: Optional[List[str]]) -> dict:
+        async with self._slots:
+            with self._lock:
+                self.in_flight += 1
+                self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+            try:
+                return await asyncio.get_running_loop().run_in_executor(
+                    self._executor, self.fetch, video_id, languages
+                )
+            except Exception as e:
+                return {"error": str(e)}
+            finally:
+                with self._lock:
+                    self.in_flight -= 1
+
+    def _spawn(
+        self, video_id: str, languages: Optional[List[str]], future: concurrent.futures.Future
+    ) -> None:
+        if not future.set_running_or_notify_cancel():
+            return
+        task = asyncio.ensure_future(self._fetch_one(video_id, languages))
+        self._tasks[future] = task
+
+        def _done(t: asyncio.Task) -> None:
+            self._tasks.pop(future, None)
+            if t.cancelled():
+                future.set_exception(concurrent.futures.CancelledError())
+            else:
+                future.set_result(t.result())
+
+        task.add_done_callback(_done)
+
+    def _cancel_tasks(self, futures: List[concurrent.futures.Future]) -> None:
+        for future in futures:
+            task = self._tasks.get(future)
+            if task is not None:
+                task.cancel()
+
+    async def _drain(self) -> None:
+        await asyncio.gather(*self._tasks.values(), return_exceptions=True)
+
+    def submit(self, video_id: str, languages: Optional[List[str]] = None) -> None:
+        """Start fetching captions for ``video_id`` (no-op if already started)."""
+        self.start()
+        with self._lock:
+            if video_id in self._futures:
+                return
+            future: concurrent.futures.Future = concurrent.futures.Future()
+            self._futures[video_id] = future
+        self._loop.call_soon_threadsafe(self._spawn, video_id, languages, future)
+
+    def submit_many(self, video_ids: Iterable[str]) -> None:
+        for video_id in video_ids:
+            self.submit(video_id)
+
+    def result(self, video_id: str, languages: Optional[List[str]] = None) -> dict:
+        """Captions for ``video_id``; waits for (or starts) its request."""
+        self.submit(video_id, languages)
+        with self._lock:
+            future = self._futures.pop(video_id)
+        try:
+            return future.result()
+        except concurrent.futures.CancelledError:
+            return {"error": "caption request cancelled"}
+
+    def pending(self) -> int:
+        with self._lock:
+            return len(self._futures)
+
+    def cancel(self) -> None:
+        """Drop every request not yet collected (e.g. after an IP block)."""
+        with self._lock:
+            futures = list(self._futures.values())
+            self._futures.clear()
+        for future in futures:
+            future.cancel()  # not started yet
+        if self._loop is not None and futures:
+            # waiting for a slot (or in a request whose result is now unwanted)
+            self._loop.call_soon_threadsafe(self._cancel_tasks, futures)
@@ -4,9 +4,36 @@ from __future__ import annotations
 
 from typing import List, Optional
 
+from suxxtext.ratelimit import CAPTIONS, rate_limiter
 from suxxtext.whisper_runtime import format_timestamp
 
 
+def caption_result(video_id: str, segments: List[dict], language: str = "unknown") -> dict:
+    """
+    The success dict of :func:`fetch_captions` built from ``segments``
+    (``{"text", "start", "duration"}``, seconds), whatever fetched them.
+    """
+    full_text = " ".join(s["text"].strip() for s in segments if s["text"].strip())
+    timestamped_text = "\n".join(
+        f"{format_timestamp(s['start'])} {s['text'].strip()}"
+        for s in segments
+        if s["text"].strip()
+    )
+    total_dur = 0.0
+    if segments:
+        last = segments[-1]
+        total_dur = float(last["start"]) + float(last.get("duration") or 0)
+    return {
+        "success": True,
+        "video_id": video_id,
+        "segment_count": len(segments),
+        "duration": format_timestamp(total_dur),
+        "full_text": full_text,
+        "timestamped_text": timestamped_text,
+        "language": language,
+    }
+
+
 def fetch_captions(video_id: str, languages: Optional[List[str]] = None) -> dict:
     """
     Fetch captions for a video id.
@@ -19,6 +46,7 @@ def fetch_captions(video_id: str, languages: Optional[List[str]] = None) -> dict
             "error": "youtube-transcript-api not installed. Run: pip install youtube-transcript-api"
         }
 
+    rate_limiter().acquire(CAPTIONS)
     try:
         api = YouTubeTranscriptApi()
         if languages:
@@ -30,16 +58,6 @@ def fetch_captions(video_id: str, languages: Optional[List[str]] = None) -> dict
             {"text": seg.text, "start": seg.start, "duration": seg.duration}
             for seg in fetched
         ]
-        full_text = " ".join(s["text"].strip() for s in segments if s["text"].strip())
-        timestamped_text = "\n".join(
-            f"{format_timestamp(s['start'])} {s['text'].strip()}"
-            for s in segments
-            if s["text"].strip()
-        )
-        total_dur = 0.0
-        if segments:
-            last = segments[-1]
-            total_dur = float(last["start"]) + float(last.get("duration") or 0)
 
         language = "unknown"
         try:
@@ -51,15 +69,7 @@ def fetch_captions(video_id: str, languages: Optional[List[str]] = None) -> dict
         except Exception:
             pass
 
-        return {
-            "success": True,
-            "video_id": video_id,
-            "segment_count": len(segments),
-            "duration": format_timestamp(total_dur),
-            "full_text": full_text,
-            "timestamped_text": timestamped_text,
-            "language": language,
-        }
+        return caption_result(video_id, segments, language)
     except Exception as e:
         err = str(e)
         low = err.lower()
@@ -7,19 +7,41 @@ import os
 import subprocess
 import sys
 import time
-from typing import Optional
+from dataclasses import replace
+from typing import List, Optional
 
 from colorama import Fore, Style, init as colorama_init
 
+from suxxtext.audio_cache import CACHE_KEEP, CACHE_POLICIES, DEFAULT_CACHE_GB
+from suxxtext.caption_engine import DEFAULT_CAPTION_CONCURRENCY
 from suxxtext.jobs import (
+    ADAPTIVE_MAX_WORKERS,
+    DEFAULT_AUDIO_PREFETCH,
+    DEFAULT_DOWNLOAD_RETRIES,
     DEFAULT_MODEL_INSTANCES,
     DEFAULT_WORKERS,
     SAFE_PACE_SECONDS,
+    SCHEDULE_ROUND_ROBIN,
+    SCHEDULES,
+    BatchOptions,
     download_channel_history_json,
+    plan_channel_videos,
     process_channel_videos,
     process_single_video,
 )
+from suxxtext.lease import DEFAULT_LEASE_TTL
 from suxxtext.monitor import list_channels_with_logs, run_monitor
+from suxxtext.schedule import ORDER_LISTING, ORDERS, parse_duration, parse_until
+from suxxtext.whisper_runtime import BACKEND_THREAD, BACKENDS
+from suxxtext.youtube import (
+    AUDIO_BEST,
+    AUDIO_PROFILES,
+    DEFAULT_ASR_MIN_KBPS,
+    YTDL_ENGINES,
+    set_audio_profile,
+    set_ytdl_engine,
+    ytdl_engine,
+)
 
 colorama_init(autoreset=True)
 
@@ -89,6 +111,9 @@ Examples:
   # custom pace (seconds between Whisper starts):
   python -m suxxtext --mode batch --channel "@Drberg" --limit 100 --pace 120
 
+  # Dry run: archived / likely-Whisper counts, audio + GPU hours, ETA
+  python -m suxxtext --mode batch --channel "@Drberg" --limit all --plan
+
   # Live dashboard (near real-time):
   python -m suxxtext --mode monitor
   python -m suxxtext --mode monitor --channel Drberg --interval 1.5
@@ -108,7 +133,49 @@ Examples:
     parser.add_argument("-u", "--url", help="YouTube video or channel URL")
     parser.add_argument(
         "--channel",
-        help="Channel @handle or URL (batch/json alias for --url)",
+        action="append",
+        help=(
+            "Channel @handle or URL (batch/json alias for --url). "
+            "Batch: repeat to process several channels in one run"
+        ),
+    )
+    parser.add_argument(
+        "--channels-file",
+        metavar="FILE",
+        help="Batch: file with one channel @handle or URL per line (# comments ok)",
+    )
+    parser.add_argument(
+        "--schedule",
+        choices=SCHEDULES,
+        default=SCHEDULE_ROUND_ROBIN,
+        help=(
+            "Multi-channel batch: interleave caption sweeps round-robin, or "
+            "weighted by each channel's backlog. Default: round-robin"
+        ),
+    )
+    parser.add_argument(
+        "--order",
+        choices=ORDERS,
+        default=ORDER_LISTING,
+        help=(
+            "Batch: which queued Whisper video goes next — listing (newest "
+            "first), shortest, longest (shortest makespan) or views "
+            "(views per audio minute). Default: listing"
+        ),
+    )
+    budget = parser.add_mutually_exclusive_group()
+    budget.add_argument(
+        "--max-runtime",
+        metavar="DURATION",
+        help=(
+            "Batch: time budget (e.g. 90m, 6h, 1h30m). Only Whisper work predicted "
+            "to finish in time is started; the rest is left for the next run"
+        ),
+    )
+    budget.add_argument(
+        "--until",
+        metavar="HH:MM",
+        help="Batch: like --max-runtime, ending at the next local HH:MM (e.g. 07:00)",
     )
     parser.add_argument(
         "--model",
@@ -128,7 +195,7 @@ Examples:
         "--workers",
         type=int,
         default=DEFAULT_WORKERS,
-        help=f"Concurrent Whisper workers for batch (1-32). Default: {DEFAULT_WORKERS}",
+        help=f"Concurrent audio download workers for batch (1-32). Default: {DEFAULT_WORKERS}",
     )
     parser.add_argument(
         "--model_instances",
@@ -139,6 +206,94 @@ Examples:
             f"Default: {DEFAULT_MODEL_INSTANCES} (gentle GPU throttle)"
         ),
     )
+    parser.add_argument(
+        "--whisper-backend",
+        choices=BACKENDS,
+        default=BACKEND_THREAD,
+        help=(
+            "Batch: thread = models shared by threads in this process (GPU); "
+            "process = one worker process per model (CPU-only hosts). Default: thread"
+        ),
+    )
+    parser.add_argument(
+        "--cpu-threads",
+        type=int,
+        default=0,
+        metavar="N",
+        help="CPU inference threads per Whisper model (0 = cores / model instances)",
+    )
+    parser.add_argument(
+        "--whisper-batch",
+        type=int,
+        default=0,
+        metavar="N",
+        help=(
+            "Batch: batched Whisper inference — split each file at VAD speech "
+            "boundaries and decode N chunks per model pass (faster-whisper "
+            "BatchedInferencePipeline; more GPU memory per instance, so fewer "
+            "--model_instances are needed). 0 = off"
+        ),
+    )
+    parser.add_argument(
+        "--adaptive",
+        action="store_true",
+        help=(
+            "Batch: AIMD download concurrency — start at --workers, grow while "
+            "downloads succeed, halve on 403/429/bot-check/caption IP block"
+        ),
+    )
+    parser.add_argument(
+        "--max-workers",
+        type=int,
+        default=ADAPTIVE_MAX_WORKERS,
+        metavar="N",
+        help=f"Ceiling for --adaptive download concurrency. Default: {ADAPTIVE_MAX_WORKERS}",
+    )
+    parser.add_argument(
+        "--prefetch",
+        type=int,
+        default=DEFAULT_AUDIO_PREFETCH,
+        metavar="N",
+        help=(
+            "Max downloaded audio files waiting for a free Whisper model "
+            f"(caps mp3/ disk use). Default: {DEFAULT_AUDIO_PREFETCH}"
+        ),
+    )
+    parser.add_argument(
+        "--audio-cache",
+        choices=CACHE_POLICIES,
+        default=CACHE_KEEP,
+        help=(
+            "Batch: what to do with mp3/ audio after Whisper: keep it, delete it once "
+            "the transcript is written, or lru (keep at most --audio-cache-gb). Default: keep"
+        ),
+    )
+    parser.add_argument(
+        "--audio-cache-gb",
+        type=float,
+        default=DEFAULT_CACHE_GB,
+        metavar="GB",
+        help=(
+            "With --audio-cache lru: mp3/ size cap per channel; least recently "
+            f"used audio is evicted first. Default: {DEFAULT_CACHE_GB:g}"
+        ),
+    )
+    parser.add_argument(
+        "--retries",
+        type=int,
+        default=DEFAULT_DOWNLOAD_RETRIES,
+        metavar="N",
+        help=(
+            "Batch: retry a transiently failed download (403/429/bot-check/network) "
+            f"up to N times in the same run, with backoff. Default: {DEFAULT_DOWNLOAD_RETRIES}"
+        ),
+    )
+    parser.add_argument(
+        "--retry-cookies",
+        default=None,
+        metavar="BROWSER",
+        help="Batch: download retries use yt-dlp --cookies-from-browser BROWSER",
+    )
     parser.add_argument(
         "--whisper-only",
         action="store_true",
@@ -153,7 +308,61 @@ Examples:
         "--caption-delay",
         type=float,
         default=0.5,
-        help="Seconds between caption requests in batch (default 0.5)",
+        help="Minimum seconds between caption requests (shared rate limit, default 0.5)",
+    )
+    parser.add_argument(
+        "--caption-concurrency",
+        type=int,
+        default=DEFAULT_CAPTION_CONCURRENCY,
+        metavar="N",
+        help=(
+            "Batch: caption requests in flight at once (1 = serial); --caption-delay "
+            f"still caps the request rate. Default: {DEFAULT_CAPTION_CONCURRENCY}"
+        ),
+    )
+    parser.add_argument(
+        "--subtitle-fallback",
+        action="store_true",
+        help=(
+            "Batch: if the caption API gets IP-blocked, fetch the remaining captions "
+            "as subtitles with one yt-dlp run per 50 videos before using Whisper"
+        ),
+    )
+    parser.add_argument(
+        "--audio-format",
+        choices=AUDIO_PROFILES,
+        default=AUDIO_BEST,
+        help=(
+            "Whisper audio to download: best (bestaudio m4a, ~130 kbps; default) or "
+            "asr (smallest audio stream at or above --audio-min-kbps; Whisper only "
+            "needs 16 kHz mono, so this cuts download bytes severalfold)"
+        ),
+    )
+    parser.add_argument(
+        "--audio-min-kbps",
+        type=float,
+        default=DEFAULT_ASR_MIN_KBPS,
+        help=f"Bitrate floor for --audio-format asr (default {DEFAULT_ASR_MIN_KBPS:g})",
+    )
+    parser.add_argument(
+        "--predecode",
+        type=int,
+        default=0,
+        metavar="N",
+        help=(
+            "Batch: decode downloaded audio to 16 kHz arrays in N worker processes "
+            "while it waits for a model, so models only run inference (0 = off; "
+            "about 230 MB of disk per audio hour waiting in mp3/.predecode/)"
+        ),
+    )
+    parser.add_argument(
+        "--stream-audio",
+        action="store_true",
+        help=(
+            "Batch: pipe Whisper audio from yt-dlp through ffmpeg into the model as "
+            "it downloads instead of downloading the whole file first (needs "
+            "ffmpeg; with --audio-cache delete the audio never touches disk)"
+        ),
     )
     parser.add_argument(
         "--safe",
@@ -174,6 +383,57 @@ Examples:
             f"0=off. --safe sets this to {int(SAFE_PACE_SECONDS)}."
         ),
     )
+    parser.add_argument(
+        "--two-phase",
+        action="store_true",
+        help=(
+            "Batch: finish the whole caption sweep before starting Whisper "
+            "(legacy order; default streams caption misses to Whisper)"
+        ),
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help=(
+            "Batch: continue the last run from logs/batch-journal.jsonl "
+            "(no channel re-listing, no repeat caption attempts)"
+        ),
+    )
+    parser.add_argument(
+        "--full-rescan",
+        action="store_true",
+        help=(
+            "Batch: list every upload instead of only those newer than the "
+            "last run (logs/discovery-cursor.json)"
+        ),
+    )
+    parser.add_argument(
+        "--shared-archive",
+        action="store_true",
+        help=(
+            "Batch: other hosts run on the same channels/ folder (e.g. NFS); "
+            "lease each video in logs/claims/ so no two hosts do the same work"
+        ),
+    )
+    parser.add_argument(
+        "--lease-ttl",
+        type=float,
+        default=DEFAULT_LEASE_TTL,
+        metavar="SECONDS",
+        help=(
+            "With --shared-archive: reclaim a lease not refreshed for this long "
+            f"(crashed host). Default: {int(DEFAULT_LEASE_TTL)}"
+        ),
+    )
+    parser.add_argument(
+        "--plan",
+        action="store_true",
+        help=(
+            "Batch: list the channel and print what the run would do (archived, "
+            "likely Whisper, audio / GPU hours, ETA per model count) without "
+            "fetching captions or audio"
+        ),
+    )
     parser.add_argument(
         "--cookies-from-browser",
         default=None,
@@ -183,6 +443,18 @@ Examples:
             "Sets SUXXTEXT_COOKIES_FROM_BROWSER for this process."
         ),
     )
+    parser.add_argument(
+        "--ytdl-engine",
+        choices=YTDL_ENGINES,
+        default=None,
+        help=(
+            "How yt-dlp runs for downloads and flat listings: subprocess (one "
+            "process per call, uses the project venv's yt-dlp; default) or "
+            "inprocess (long-lived YoutubeDL instances per worker, no start-up "
+            "cost, download progress in events.jsonl). "
+            f"Default: SUXXTEXT_YTDL_ENGINE or {ytdl_engine()}"
+        ),
+    )
     parser.add_argument(
         "--interval",
         type=float,
@@ -198,7 +470,62 @@ Examples:
 
 
 def _resolve_url(args) -> Optional[str]:
-    return args.url or args.channel
+    return args.url or (args.channel[0] if args.channel else None)
+
+
+def _read_channels_file(path: str) -> List[str]:
+    with open(path, "r", encoding="utf-8") as f:
+        lines = (line.split("#", 1)[0].strip() for line in f)
+        return [line for line in lines if line]
+
+
+def _resolve_channels(args) -> List[str]:
+    """All batch channels: --url, every --channel, then --channels-file."""
+    channels = [args.url] if args.url else []
+    channels.extend(args.channel or [])
+    if args.channels_file:
+        channels.extend(_read_channels_file(args.channels_file))
+    return channels
+
+
+def _resolve_deadline(args) -> Optional[float]:
+    """Epoch deadline from --max-runtime / --until (``None`` when unset)."""
+    if args.max_runtime:
+        return time.time() + parse_duration(args.max_runtime)
+    if args.until:
+        return parse_until(args.until)
+    return None
+
+
+def _batch_options(args, prefer_captions: bool, whisper_fallback: bool) -> BatchOptions:
+    """Batch-mode flags as :class:`~suxxtext.jobs.BatchOptions` (no deadline yet)."""
+    return BatchOptions(
+        model_name=args.model or "base",
+        prefer_captions=prefer_captions,
+        whisper_fallback=whisper_fallback,
+        caption_delay=args.caption_delay,
+        pace_seconds=float(args.pace or 0.0),
+        safe=bool(args.safe),
+        pipelined=not args.two_phase,
+        prefetch=args.prefetch,
+        adaptive=bool(args.adaptive),
+        adaptive_max_workers=args.max_workers,
+        schedule=args.schedule,
+        order=args.order,
+        retries=max(0, args.retries),
+        retry_cookies=args.retry_cookies,
+        shared_archive=bool(args.shared_archive),
+        lease_ttl=max(30.0, args.lease_ttl),
+        whisper_backend=args.whisper_backend,
+        cpu_threads=max(0, args.cpu_threads),
+        audio_cache=args.audio_cache,
+        audio_cache_gb=max(0.0, args.audio_cache_gb),
+        caption_concurrency=max(1, args.caption_concurrency),
+        subtitle_fallback=bool(args.subtitle_fallback),
+        stream_audio=bool(args.stream_audio),
+        predecode_workers=max(0, args.predecode),
+        whisper_batch=max(0, args.whisper_batch),
+    )
 
 
 def main(argv=None):
@@ -216,6 +543,9 @@ def main(argv=None):
 
     if args.cookies_from_browser:
         os.environ["SUXXTEXT_COOKIES_FROM_BROWSER"] = args.cookies_from_browser.strip()
+    if args.ytdl_engine:
+        set_ytdl_engine(args.ytdl_engine)
+    set_audio_profile(args.audio_format, args.audio_min_kbps)
 
     if args.mode:
         target = _resolve_url(args)
@@ -233,23 +563,42 @@ def main(argv=None):
                 whisper_fallback=whisper_fallback,
             )
         elif args.mode == "batch":
-            if not target:
+            try:
+                channels = _resolve_channels(args)
+            except OSError as e:
+                print(f"{Fore.RED + Style.BRIGHT}Error reading --channels-file: {e}{Style.RESET_ALL}")
+                return 1
+            if not channels:
                 print(
-                    f"{Fore.RED + Style.BRIGHT}Error: --url or --channel is required "
-                    f"for batch mode{Style.RESET_ALL}"
+                    f"{Fore.RED + Style.BRIGHT}Error: --url, --channel or --channels-file "
+                    f"is required for batch mode{Style.RESET_ALL}"
+                )
+                return 1
+            options = _batch_options(args, prefer_captions, whisper_fallback)
+            if args.plan:
+                plan_channel_videos(
+                    url=channels[0] if len(channels) == 1 else channels,
+                    limit=args.limit,
+                    workers=args.workers,
+                    model_instances=args.model_instances,
+                    options=options,
+                    resume=bool(args.resume),
+                    full_rescan=bool(args.full_rescan),
                 )
+                return 0
+            try:
+                deadline = _resolve_deadline(args)
+            except ValueError as e:
+                print(f"{Fore.RED + Style.BRIGHT}Error: {e}{Style.RESET_ALL}")
                 return 1
             process_channel_videos(
-                url=target,
+                url=channels[0] if len(channels) == 1 else channels,
                 limit=args.limit,
                 workers=args.workers,
                 model_instances=args.model_instances,
-                model=args.model,
-                prefer_captions=prefer_captions,
-                whisper_fallback=whisper_fallback,
-                caption_delay=args.caption_delay,
-                pace_seconds=float(args.pace or 0.0),
-                safe=bool(args.safe),
+                options=replace(options, deadline=deadline),
+                resume=bool(args.resume),
+                full_rescan=bool(args.full_rescan),
             )
         elif args.mode == "json":
             if not target:
@@ -262,7 +611,7 @@ def main(argv=None):
         elif args.mode == "stats":
             run_stats()
         elif args.mode == "monitor":
-            ch = args.channel
+            ch = args.channel[-1] if args.channel else None
             # --channel might be @Handle; strip for archive folder
             if ch and ch.startswith("@"):
                 ch = ch[1:]
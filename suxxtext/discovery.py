@@ -0,0 +1,92 @@
+"""Incremental channel discovery with a persisted per-channel cursor.
+
+``channels/<Name>/logs/discovery-cursor.json`` keeps the compact listing
+from the last run, newest first. The next run pages the uploads tab only
+until it meets one of the newest ids already in that listing, then appends
+the cached remainder, so a daily run on a channel with thousands of uploads
+fetches a page or two instead of the whole history. ``full_rescan=True``
+ignores the cursor and lists everything (refreshing view counts, dropping
+deleted videos).
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from datetime import datetime, timezone
+from typing import List, Optional, Tuple
+
+from colorama import Fore, Style
+
+from suxxtext.journal import compact_entry
+from suxxtext.paths import CHANNELS_ROOT
+from suxxtext.youtube import get_channel_videos
+
+CURSOR_NAME = "discovery-cursor.json"
+# Newest ids that end paging — several, so a deleted / privated newest
+# upload does not turn the next run into a full listing.
+CURSOR_STOP_IDS = 20
+
+
+def cursor_path(channel_folder: str, channels_root: str = CHANNELS_ROOT) -> str:
+    return os.path.join(channels_root, channel_folder, "logs", CURSOR_NAME)
+
+
+def load_cursor(path: str) -> Optional[dict]:
+    """The saved cursor, or ``None`` if missing / unreadable."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            cursor = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(cursor, dict) or not cursor.get("entries"):
+        return None
+    return cursor
+
+
+def save_cursor(path: str, channel_url: str, videos: List[dict]) -> None:
+    """Atomically replace the cursor with ``videos`` (newest first)."""
+    entries = [compact_entry(v) for v in videos if v.get("id")]
+    cursor = {
+        "channel_url": channel_url,
+        "updated": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "newest_id": entries[0]["id"] if entries else None,
+        "count": len(entries),
+        "entries": entries,
+    }
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(cursor, f, ensure_ascii=False)
+    os.replace(tmp, path)
+
+
+def list_channel_videos(
+    channel_url: str,
+    channel_folder: str,
+    full_rescan: bool = False,
+    channels_root: str = CHANNELS_ROOT,
+) -> Tuple[List[dict], Optional[dict]]:
+    """
+    Channel listing, newest first, using the cursor but never advancing it:
+    a batch run calls :func:`save_cursor` once it knows its archive folder,
+    dry runs such as ``--plan`` never do.
+
+    Returns ``(videos, channel_info)``; ``channel_info`` is ``None`` after
+    an incremental listing (it only covers the new uploads).
+    """
+    cursor = None if full_rescan else load_cursor(cursor_path(channel_folder, channels_root))
+    if cursor is None:
+        return get_channel_videos(channel_url)
+
+    cached = cursor["entries"]
+    stop_ids = [e["id"] for e in cached[:CURSOR_STOP_IDS]]
+    new, _ = get_channel_videos(channel_url, stop_at_ids=stop_ids)
+    new_ids = {v["id"] for v in new}
+    videos = list(new) + [e for e in cached if e["id"] not in new_ids]
+    print(
+        f"{Fore.BLUE}Incremental discovery: {len(new)} new upload(s) since "
+        f"{cursor.get('updated', 'last run')}, {len(cached)} cached "
+        f"(--full-rescan to relist everything).{Style.RESET_ALL}"
+    )
+    return videos, None
@@ -0,0 +1,269 @@
+"""Structured per-stage event stream (append-only JSONL).
+
+``channels/<Name>/logs/events.jsonl`` gets one line per stage start / finish
+so the monitor, reports and post-run analysis read exact numbers instead of
+scraping the text log::
+
+    {"ts": 1700000000.12, "run": "20240101-120000-4242", "event": "run_start", "kind": "batch", ...}
+    {"ts": ..., "run": ..., "event": "check", "id": "abcdefghijk", "n": 3, "of": 512}
+    {"ts": ..., "run": ..., "event": "queued", "id": "abcdefghijk"}
+    {"ts": ..., "run": ..., "event": "start", "id": "abcdefghijk", "stage": "download"}
+    {"ts": ..., "run": ..., "event": "progress", "id": "abcdefghijk", "bytes": 1048576,
+     "total": 3145728, "speed": 524288, "eta": 4}
+    {"ts": ..., "run": ..., "event": "done", "id": "abcdefghijk", "stage": "download",
+     "outcome": "ok", "seconds": 4.21, "bytes": 3145728}
+    {"ts": ..., "run": ..., "event": "run_end", "counts": {...}, "seconds": 812.4}
+
+``ts`` is epoch seconds; ``kind`` on ``run_start`` is ``batch`` or ``pcs``.
+``done`` rows always carry ``outcome`` (``ok`` | ``miss`` | ``skip`` |
+``error``) and ``seconds``; ``bytes`` when a file was written. ``progress``
+rows (and ``speed`` on download ``done`` rows) come only from the in-process
+yt-dlp engine. Unlike the batch journal this stream is for measurement
+only — nothing is resumed from it.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import json
+import os
+import threading
+import time
+from collections import Counter, defaultdict, deque
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from suxxtext.paths import CHANNELS_ROOT
+
+EVENTS_NAME = "events.jsonl"
+
+# Stages
+CAPTIONS = "captions"
+SKIP = "skip"
+DOWNLOAD = "download"
+TRANSCRIBE = "transcribe"
+SUMMARIZE = "summarize"
+
+# Outcomes
+OK = "ok"
+MISS = "miss"
+SKIPPED = "skip"
+ERROR = "error"
+
+
+def events_path(channel_folder: str, channels_root: str = CHANNELS_ROOT) -> str:
+    return os.path.join(channels_root, channel_folder, "logs", EVENTS_NAME)
+
+
+def new_run_id() -> str:
+    """Sortable id shared by every channel of one process run."""
+    return f"{datetime.now():%Y%m%d-%H%M%S}-{os.getpid()}"
+
+
+def file_size(path: str) -> Optional[int]:
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return None
+
+
+class EventSink:
+    """Thread-safe JSONL appender for one channel's event stream."""
+
+    def __init__(self, path: str, run_id: Optional[str] = None):
+        self.path = path
+        self.run_id = run_id or new_run_id()
+        self._lock = threading.Lock()
+        self._fh = None
+
+    @classmethod
+    def for_channel(
+        cls,
+        channel_folder: str,
+        run_id: Optional[str] = None,
+        channels_root: str = CHANNELS_ROOT,
+    ) -> "EventSink":
+        return cls(events_path(channel_folder, channels_root), run_id)
+
+    def emit(self, event: str, **fields: Any) -> None:
+        row = {"ts": round(time.time(), 3), "run": self.run_id, "event": event}
+        row.update({k: v for k, v in fields.items() if v is not None})
+        line = json.dumps(row, ensure_ascii=False)
+        with self._lock:
+            if self._fh is None:
+                os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+                self._fh = open(self.path, "a", encoding="utf-8")
+            self._fh.write(line + "\n")
+            self._fh.flush()
+
+    @contextlib.contextmanager
+    def stage(self, stage: str, video_id: str, **fields: Any) -> Iterator[dict]:
+        """
+        Emit ``start``, run the block, then ``done`` with its duration.
+
+        The block fills the yielded dict (``outcome``, ``bytes``, ``error``…);
+        an exception is recorded as ``outcome=error`` and re-raised.
+        """
+        self.emit("start", id=video_id, stage=stage, **fields)
+        result: dict = {}
+        t0 = time.perf_counter()
+        try:
+            yield result
+        except BaseException as exc:
+            result.setdefault("outcome", ERROR)
+            result.setdefault("error", f"{type(exc).__name__}: {exc}")
+            raise
+        finally:
+            result.setdefault("outcome", OK)
+            self.emit(
+                "done",
+                id=video_id,
+                stage=stage,
+                seconds=round(time.perf_counter() - t0, 3),
+                **fields,
+                **result,
+            )
+
+    def close(self) -> None:
+        with self._lock:
+            if self._fh is not None:
+                self._fh.close()
+                self._fh = None
+
+    def __enter__(self) -> "EventSink":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def read_events(path: str, offset: int = 0) -> Tuple[List[dict], int]:
+    """
+    Complete rows appended after byte ``offset``, and the offset to resume
+    from. A torn last line is left for the next read.
+    """
+    rows: List[dict] = []
+    try:
+        with open(path, "rb") as f:
+            if offset > os.fstat(f.fileno()).st_size:
+                offset = 0  # file was truncated / replaced
+            f.seek(offset)
+            data = f.read()
+    except OSError:
+        return rows, offset
+    end = data.rfind(b"\n") + 1
+    for line in data[:end].splitlines():
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError:
+            continue
+        if isinstance(row, dict):
+            rows.append(row)
+    return rows, offset + end
+
+
+class EventTally:
+    """
+    Running aggregate of the latest ``kind`` run in an event stream.
+
+    :meth:`refresh` reads only bytes appended since the previous call, so a
+    dashboard can poll a long stream cheaply.
+    """
+
+    RECENT = 6
+
+    def __init__(self, path: str, kind: str = "batch"):
+        self.path = path
+        self.kind = kind
+        self.offset = 0
+        self._other_runs: set = set()
+        self._reset(None)
+
+    def _reset(self, row: Optional[dict]) -> None:
+        self.run: Optional[str] = row.get("run") if row else None
+        self.run_start: Optional[dict] = row
+        self.run_end: Optional[dict] = None
+        self.outcomes: Dict[str, Counter] = defaultdict(Counter)
+        self.seconds: Dict[str, float] = defaultdict(float)
+        self.bytes: Dict[str, int] = defaultdict(int)
+        self.queued = 0
+        self.last_check: Optional[Tuple[int, int]] = None
+        self.in_flight: Dict[str, Dict[str, float]] = defaultdict(dict)
+        self.recent_ok: deque = deque(maxlen=self.RECENT)
+        self.bot_sign = 0
+        self.http_403 = 0
+
+    def refresh(self) -> "EventTally":
+        rows, self.offset = read_events(self.path, self.offset)
+        for row in rows:
+            self.add(row)
+        return self
+
+    def add(self, row: dict) -> None:
+        event = row.get("event")
+        if event == "run_start":
+            if row.get("kind", "batch") == self.kind:
+                self._reset(row)
+            else:
+                self._other_runs.add(row.get("run"))
+            return
+        if row.get("run") in self._other_runs:
+            return
+        if event == "run_end":
+            self.run_end = row
+            return
+        vid = row.get("id")
+        stage = row.get("stage")
+        if event == "check":
+            self.last_check = (int(row.get("n") or 0), int(row.get("of") or 0))
+        elif event == "queued":
+            self.queued += 1
+        elif event == "start" and vid and stage:
+            self.in_flight[stage][vid] = row.get("ts") or 0.0
+        elif event == "done" and stage:
+            if vid:
+                self.in_flight[stage].pop(vid, None)
+            outcome = row.get("outcome") or OK
+            self.outcomes[stage][outcome] += 1
+            self.seconds[stage] += float(row.get("seconds") or 0.0)
+            self.bytes[stage] += int(row.get("bytes") or 0)
+            if outcome == OK and stage in (CAPTIONS, TRANSCRIBE) and vid:
+                if vid in self.recent_ok:
+                    self.recent_ok.remove(vid)
+                self.recent_ok.append(vid)
+            if outcome == ERROR and row.get("error"):
+                err = str(row["error"])
+                self.bot_sign += "Sign in to confirm" in err
+                self.http_403 += "http error 403" in err.lower()
+
+    def count(self, stage: str, outcome: str = OK) -> int:
+        return self.outcomes[stage][outcome]
+
+    def mean_seconds(self, stage: str) -> Optional[float]:
+        n = sum(self.outcomes[stage].values())
+        return self.seconds[stage] / n if n else None
+
+    def parsed(self) -> dict:
+        """The subset of the monitor's log-parse fields this stream can answer."""
+        return {
+            "last_check": self.last_check,
+            "whisper_ok": self.count(TRANSCRIBE),
+            "caption_ok": self.count(CAPTIONS),
+            "download_err": self.count(DOWNLOAD, ERROR),
+            "already": self.count(SKIP, SKIPPED),
+            "submitted": self.queued or None,
+            "batch_done": self.run_end is not None,
+            "downloading": list(self.in_flight[DOWNLOAD])[-4:],
+            "transcribing": list(self.in_flight[TRANSCRIBE])[-4:],
+            "recent_ok": list(self.recent_ok),
+            "bot_sign": self.bot_sign,
+            "http_403": self.http_403,
+            "stage_seconds": {
+                s: self.mean_seconds(s)
+                for s in (CAPTIONS, DOWNLOAD, TRANSCRIBE, SUMMARIZE)
+                if self.mean_seconds(s) is not None
+            },
+            "download_bytes": self.bytes[DOWNLOAD],
+        }
@@ -7,28 +7,83 @@ throttle (4 workers / 2 Whisper models) from the Drberg 512 run.
 
 from __future__ import annotations
 
-import concurrent.futures
-import json
+import contextlib
 import os
+import random
+import threading
 import time
+from dataclasses import dataclass, replace
 from datetime import datetime
-from typing import Any, List, Optional, Tuple
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
 
 from colorama import Fore, Style
 
+from suxxtext import events as ev
+from suxxtext.audio_cache import (
+    CACHE_DELETE,
+    CACHE_KEEP,
+    CACHE_LRU,
+    DEFAULT_CACHE_GB,
+    AudioCache,
+    reuse_audio,
+)
+from suxxtext.caption_engine import DEFAULT_CAPTION_CONCURRENCY, CaptionEngine
 from suxxtext.captions import fetch_captions
+from suxxtext.discovery import cursor_path, list_channel_videos, save_cursor
+from suxxtext.events import EventSink, file_size, new_run_id
+from suxxtext.journal import (
+    CAPTION_MISS,
+    DOWNLOADED,
+    FAILED,
+    SKIPPED,
+    TRANSCRIBED,
+    RunJournal,
+    resume_action,
+)
 from suxxtext.paths import (
+    TranscriptIndex,
+    atomic_write_text,
+    channel_dirs,
     ensure_channel_dirs,
+    remember_channel_folder,
+    remembered_channel_folder,
     resolve_channel_folder,
     sanitize_filename,
     transcript_exists_for_id,
 )
-from suxxtext.whisper_runtime import ModelPool, transcribe_audio
+from suxxtext.lease import DEFAULT_LEASE_TTL, LeaseBoard
+from suxxtext.metadata import MetadataStore
+from suxxtext.pipeline import BatchStats, WhisperStage, interleave
+from suxxtext.plan import ChannelPlan, RunPlan, stage_seconds
+from suxxtext.ratelimit import CAPTIONS, DOWNLOAD, per_second, rate_limiter
+from suxxtext.schedule import (
+    ORDER_LISTING,
+    RuntimeModel,
+    TimeBudget,
+    order_key,
+    video_duration,
+)
+from suxxtext.predecode import PreDecoder
+from suxxtext.shutdown import GracefulShutdown
+from suxxtext.streaming import ffmpeg_available, open_audio_stream, transcribe_stream
+from suxxtext.subtitles import BulkSubtitles, fetch_subtitles_bulk
+from suxxtext.whisper_runtime import (
+    BACKEND_PROCESS,
+    BACKEND_THREAD,
+    ModelPool,
+    ProcessModelPool,
+    get_whisper_runtime,
+    transcribe_audio,
+)
 from suxxtext.youtube import (
+    AUDIO_ASR,
+    audio_profile,
+    best_audio_bytes,
     download_audio,
     download_lowres_video,
     extract_video_info,
     get_channel_videos,
+    terminate_children,
 )
 
 # Proven gentle defaults (YouTube 403/429 recovery — see docs/ops-channel-batch.md)
@@ -39,6 +94,27 @@ MIN_CAPTION_CHARS = 40
 SAFE_PACE_SECONDS = 180.0
 SAFE_WORKERS = 1
 SAFE_MODEL_INSTANCES = 1
+# Downloaded audio files allowed to wait for a free Whisper model (disk cap)
+DEFAULT_AUDIO_PREFETCH = 4
+# Seconds between download ``progress`` events (in-process yt-dlp engine)
+PROGRESS_EVERY = 5.0
+# Consecutive caption IP/request blocks before captions are skipped for the run
+IP_BLOCK_STREAK_LIMIT = 3
+# Adaptive (AIMD) download concurrency: ceiling, halve on throttle, and ignore
+# further throttle hits for a while so one burst of in-flight 403s counts once
+ADAPTIVE_MAX_WORKERS = 8
+ADAPTIVE_DECREASE_FACTOR = 0.5
+ADAPTIVE_COOLDOWN_SECONDS = 30.0
+# In-run download retries: transient failures go back on the queue after
+# exponential backoff (base · 2^(n-1), capped) with ±50% jitter
+DEFAULT_DOWNLOAD_RETRIES = 2
+RETRY_BASE_SECONDS = 30.0
+RETRY_MAX_SECONDS = 600.0
+RETRY_JITTER = 0.5
+# Multi-channel Phase 1 interleaving
+SCHEDULE_ROUND_ROBIN = "round-robin"
+SCHEDULE_BACKLOG = "backlog"
+SCHEDULES = (SCHEDULE_ROUND_ROBIN, SCHEDULE_BACKLOG)
 
 
 def normalize_channel_url(url: str) -> str:
@@ -55,6 +131,224 @@ def normalize_channel_url(url: str) -> str:
     return u
 
 
+def _looks_like_ip_block(detail: str) -> bool:
+    d = (detail or "").lower()
+    return any(
+        s in d
+        for s in (
+            "blocking requests from your ip",
+            "ipblocked",
+            "requestblocked",
+            "too many requests",
+            "cloud provider",
+        )
+    )
+
+
+def _looks_like_throttle(detail: str) -> bool:
+    """YouTube push-back on downloads (403 / 429 / bot-check) or the caption API."""
+    d = (detail or "").lower()
+    return _looks_like_ip_block(detail) or any(
+        s in d
+        for s in (
+            "http error 403",
+            "http error 429",
+            "sign in to confirm",
+        )
+    )
+
+
+def _looks_transient(detail: str) -> bool:
+    """Download failures worth retrying later in the same run."""
+    d = (detail or "").lower()
+    return _looks_like_throttle(detail) or any(
+        s in d
+        for s in (
+            "timed out",
+            "connection reset",
+            "temporary failure",
+            "remote end closed",
+            "incompleteread",
+            "http error 5",
+        )
+    )
+
+
+class RetryPolicy:
+    """
+    When a failed download goes back on the queue.
+
+    Only transient failures (throttle, bot-check, network) are retried, at
+    most ``max_retries`` times per video. Retry ``n`` waits
+    ``base_seconds · 2^(n-1)`` (capped at ``max_seconds``) times a random
+    factor in ``1 ± jitter``, so a burst of 403s does not come back as one
+    burst. With ``cookies_from_browser``, retries from ``cookies_after`` on
+    pass yt-dlp ``--cookies-from-browser``.
+    """
+
+    def __init__(
+        self,
+        max_retries: int = DEFAULT_DOWNLOAD_RETRIES,
+        base_seconds: float = RETRY_BASE_SECONDS,
+        max_seconds: float = RETRY_MAX_SECONDS,
+        jitter: float = RETRY_JITTER,
+        cookies_from_browser: Optional[str] = None,
+        cookies_after: int = 1,
+        rng: Optional[random.Random] = None,
+    ):
+        self.max_retries = max(0, int(max_retries))
+        self.base_seconds = base_seconds
+        self.max_seconds = max_seconds
+        self.jitter = min(max(jitter, 0.0), 1.0)
+        self.cookies_from_browser = cookies_from_browser
+        self.cookies_after = max(1, int(cookies_after))
+        self.rng = rng or random.Random()
+
+    def __call__(self, video: dict, detail: str) -> Optional[float]:
+        """Seconds until the next attempt, or ``None`` to give up."""
+        if not _looks_transient(detail):
+            return None
+        n = int(video.get("_retry") or 0) + 1
+        if n > self.max_retries:
+            return None
+        video["_retry"] = n
+        if self.cookies_from_browser and n >= self.cookies_after:
+            video["_cookies"] = self.cookies_from_browser
+        delay = min(self.max_seconds, self.base_seconds * 2 ** (n - 1))
+        return delay * self.rng.uniform(1 - self.jitter, 1 + self.jitter)
+
+
+class AdaptiveConcurrency:
+    """
+    AIMD cap on concurrent downloads.
+
+    Workers wrap each download in :meth:`slot`. Every ``limit`` consecutive
+    successes raise the cap by one (up to ``maximum``); a throttle signal
+    (HTTP 403 / 429, bot-check, caption IP block) multiplies it by
+    ``decrease_factor`` (down to ``minimum``). Throttle hits inside
+    ``cooldown_seconds`` of the last cut are ignored — they are usually the
+    same burst still in flight.
+    """
+
+    def __init__(
+        self,
+        initial: int = DEFAULT_WORKERS,
+        maximum: int = ADAPTIVE_MAX_WORKERS,
+        minimum: int = 1,
+        decrease_factor: float = ADAPTIVE_DECREASE_FACTOR,
+        cooldown_seconds: float = ADAPTIVE_COOLDOWN_SECONDS,
+        logf: Any = None,
+    ):
+        self.minimum = max(1, int(minimum))
+        self.maximum = max(self.minimum, int(maximum))
+        self.limit = min(self.maximum, max(self.minimum, int(initial)))
+        self.decrease_factor = decrease_factor
+        self.cooldown_seconds = cooldown_seconds
+        self.logf = logf
+        self.history: List[Tuple[float, int]] = [(time.monotonic(), self.limit)]
+        self._active = 0
+        self._successes = 0
+        self._last_decrease: Optional[float] = None
+        self._cond = threading.Condition()
+
+    @contextlib.contextmanager
+    def slot(self):
+        with self._cond:
+            while self._active >= self.limit:
+                self._cond.wait()
+            self._active += 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._active -= 1
+                self._cond.notify_all()
+
+    def _set_limit(self, new: int, why: str) -> None:
+        old, self.limit = self.limit, new
+        self.history.append((time.monotonic(), new))
+        self._cond.notify_all()
+        msg = f"AIMD: download concurrency {old} → {new} ({why})"
+        print(f"{Fore.MAGENTA}{msg}{Style.RESET_ALL}")
+        if self.logf is not None:
+            self.logf.write(msg + "\n")
+
+    def on_success(self) -> None:
+        with self._cond:
+            self._successes += 1
+            if self._successes >= self.limit and self.limit < self.maximum:
+                self._successes = 0
+                self._set_limit(self.limit + 1, "sustained success")
+
+    def on_throttle(self, reason: str = "") -> bool:
+        """Multiplicative decrease; returns True if the cap actually changed."""
+        with self._cond:
+            self._successes = 0
+            now = time.monotonic()
+            if (
+                self._last_decrease is not None
+                and now - self._last_decrease < self.cooldown_seconds
+            ):
+                return False
+            self._last_decrease = now
+            new = max(self.minimum, int(self.limit * self.decrease_factor))
+            if new == self.limit:
+                return False
+            self._set_limit(new, (reason or "throttled")[:80])
+            return True
+
+    def observe(self, ok: bool, detail: str = "") -> None:
+        """Feed one download outcome; non-throttle errors are neutral."""
+        if ok:
+            self.on_success()
+        elif _looks_like_throttle(detail):
+            # yt-dlp errors end with " | <last stderr line>" — the useful part
+            self.on_throttle((detail or "").rsplit(" | ", 1)[-1])
+
+
+@dataclass
+class BatchOptions:
+    """
+    How a batch run works through its videos: what the CLI sets, passed on
+    unchanged from :func:`process_channel_videos` to the Whisper stage.
+
+    Runtime objects (journal, event sink, leases, AIMD controller, retry
+    policy, shutdown) are not options; they are passed alongside.
+    """
+
+    model_name: str = "base"
+    pool_size: int = DEFAULT_MODEL_INSTANCES  # Whisper model instances (ASR threads)
+    max_workers: int = DEFAULT_WORKERS  # download threads
+    prefer_captions: bool = True
+    whisper_fallback: bool = True
+    # minimum seconds between caption requests / between downloads (0 = unlimited);
+    # a download pace also means serial Whisper
+    caption_delay: float = 0.5
+    pace_seconds: float = 0.0
+    caption_concurrency: int = DEFAULT_CAPTION_CONCURRENCY  # caption requests in flight
+    subtitle_fallback: bool = False  # bulk yt-dlp subtitles once the caption API blocks
+    pipelined: bool = True  # False: every caption first, then Whisper
+    prefetch: int = DEFAULT_AUDIO_PREFETCH  # downloaded files waiting for a model
+    schedule: str = SCHEDULE_ROUND_ROBIN  # how several channels' sweeps interleave
+    order: str = ORDER_LISTING  # which queued Whisper video goes next
+    deadline: Optional[float] = None  # epoch seconds; later work is deferred
+    whisper_backend: str = BACKEND_THREAD
+    cpu_threads: int = 0  # per process-backend model (0 = cores / models)
+    whisper_batch: int = 0  # > 1: VAD chunks per batched faster-whisper pass
+    stream_audio: bool = False  # pipe yt-dlp through ffmpeg into the model
+    predecode_workers: int = 0  # processes decoding audio before a model takes it
+    # read by process_channel_videos only, which builds the runtime objects
+    safe: bool = False
+    adaptive: bool = False
+    adaptive_max_workers: Optional[int] = None
+    retries: int = DEFAULT_DOWNLOAD_RETRIES
+    retry_cookies: Optional[str] = None
+    shared_archive: bool = False
+    lease_ttl: float = DEFAULT_LEASE_TTL
+    audio_cache: str = CACHE_KEEP
+    audio_cache_gb: float = DEFAULT_CACHE_GB
+
+
 def _paths_for_video(
     video_info: dict, mp3_dir: str, trans_dir: str
 ) -> Tuple[str, str, str, str, str]:
@@ -74,21 +368,22 @@ def try_captions_to_file(
     video_id: str,
     txt_path: str,
     languages: Optional[List[str]] = None,
+    result: Optional[dict] = None,
 ) -> Tuple[bool, str]:
     """
     Fetch captions and write plain text archive file.
     Returns (ok, detail) where detail is language note or error.
+    ``result`` is a :func:`fetch_captions` result fetched already (e.g. by
+    the caption engine).
     """
-    result = fetch_captions(video_id, languages)
+    if result is None:
+        result = fetch_captions(video_id, languages)
     if not result.get("success"):
         return False, result.get("error") or "captions unavailable"
     text = (result.get("full_text") or "").strip()
     if len(text) < MIN_CAPTION_CHARS:
         return False, f"captions too short ({len(text)} chars)"
-    with open(txt_path, "w", encoding="utf-8") as f:
-        f.write(text)
-        if not text.endswith("\n"):
-            f.write("\n")
+    atomic_write_text(txt_path, text if text.endswith("\n") else text + "\n")
     lang = result.get("language") or "unknown"
     return True, f"captions lang={lang} chars={len(text)}"
 
@@ -110,9 +405,7 @@ def process_video_task(
     Status: ``captions`` | ``whisper`` | ``error`` | ``skipped``.
     """
     _ = lock
-    video_id, video_url, title, mp3_path, txt_path = _paths_for_video(
-        video_info, mp3_dir, trans_dir
-    )
+    video_id, _, title, _, txt_path = _paths_for_video(video_info, mp3_dir, trans_dir)
 
     if prefer_captions:
         print(f"{Fore.WHITE}[{video_id}] Trying captions...{Style.RESET_ALL}")
@@ -138,8 +431,41 @@ def process_video_task(
         logf.write(msg + "\n")
         return "error", msg
 
+    ok, msg = download_audio_task(video_info, mp3_dir, trans_dir, logf)
+    if not ok:
+        return "error", msg
+    return transcribe_audio_task(video_info, mp3_dir, trans_dir, logf, model_pool)
+
+
+def download_audio_task(
+    video_info: dict,
+    mp3_dir: str,
+    trans_dir: str,
+    logf: Any,
+    cookies_from_browser: Optional[str] = None,
+    progress: Optional[Callable[[dict], None]] = None,
+) -> Tuple[bool, str]:
+    """
+    Download stage: fetch audio to ``mp3/``. Returns ``(ok, message)``.
+
+    Audio already on disk for this video id is reused instead. ``progress``
+    receives yt-dlp progress dicts (``inprocess`` engine only).
+    """
+    video_id, video_url, title, mp3_path, _ = _paths_for_video(
+        video_info, mp3_dir, trans_dir
+    )
+    if reuse_audio(mp3_dir, video_id, mp3_path):
+        print(
+            f"{Fore.WHITE}[{video_id}] Reusing audio on disk: "
+            f"{os.path.basename(mp3_path)}{Style.RESET_ALL}"
+        )
+        return True, f"Reused audio for {title} ({video_id})"
     print(f"{Fore.WHITE}[{video_id}] Downloading audio...{Style.RESET_ALL}")
-    ok, err = download_audio(video_url, mp3_path)
+    kwargs = {"progress": progress} if progress is not None else {}
+    if cookies_from_browser:
+        ok, err = download_audio(video_url, mp3_path, cookies_from_browser, **kwargs)
+    else:
+        ok, err = download_audio(video_url, mp3_path, **kwargs)
     if not ok:
         msg = f"Download error for {title} ({video_id}): {err}"
         print(f"{Fore.RED + Style.BRIGHT}[{video_id}] {msg}{Style.RESET_ALL}")
@@ -149,12 +475,31 @@ def process_video_task(
                 os.remove(mp3_path)
             except OSError as remove_err:
                 logf.write(f"  - Could not remove incomplete mp3 {mp3_path}: {remove_err}\n")
-        return "error", msg
+        return False, msg
+    return True, f"Downloaded audio for {title} ({video_id})"
+
+
+def transcribe_audio_task(
+    video_info: dict,
+    mp3_dir: str,
+    trans_dir: str,
+    logf: Any,
+    model_pool: ModelPool,
+    audio_file: Optional[str] = None,
+) -> Tuple[str, str]:
+    """
+    ASR stage: Whisper an already-downloaded file. Status ``whisper`` | ``error``.
 
+    ``audio_file`` (e.g. a pre-decoded ``.npy``) is transcribed instead of
+    the downloaded file when given.
+    """
+    video_id, _, title, mp3_path, txt_path = _paths_for_video(
+        video_info, mp3_dir, trans_dir
+    )
     print(f"{Fore.WHITE}[{video_id}] Transcribing audio (Whisper)...{Style.RESET_ALL}")
     try:
         with model_pool.get_model() as model:
-            ok, err = transcribe_audio(mp3_path, model, txt_path, lock=None)
+            ok, err = transcribe_audio(audio_file or mp3_path, model, txt_path, lock=None)
     except Exception as pool_err:
         ok = False
         err = f"Model execution failed: {pool_err}"
@@ -294,54 +639,71 @@ def download_channel_history_json(url: Optional[str] = None):
 
     print(f"{Fore.BLUE}Retrieving all video metadata for the channel...{Style.RESET_ALL}")
     try:
-        _, channel_info = get_channel_videos(channel_url)
+        videos, channel_info = get_channel_videos(channel_url)
     except Exception as e:
         print(f"{Fore.RED + Style.BRIGHT}Error retrieving channel info: {e}{Style.RESET_ALL}")
         return
 
     channel_folder = resolve_channel_folder(info=channel_info, channel_url=channel_url)
-    base_channel_dir, _, _ = ensure_channel_dirs(channel_folder)
-    metadata_path = os.path.join(base_channel_dir, f"{channel_folder}-full-history.json")
+    ensure_channel_dirs(channel_folder)
+    store = _save_channel_metadata(channel_folder, videos, channel_info)
+    if store is not None:
+        try:
+            metadata_path = store.export_legacy()
+            print(f"{Fore.GREEN}Full channel metadata saved to {metadata_path}{Style.RESET_ALL}")
+        except Exception as e:
+            print(f"{Fore.YELLOW}Warning: Could not save metadata file: {e}{Style.RESET_ALL}")
+    print(f"{Fore.GREEN}Done.{Style.RESET_ALL}")
 
+
+def _save_channel_metadata(
+    channel_folder: str, videos: List[dict], channel_info: Optional[dict]
+) -> Optional[MetadataStore]:
+    """Upsert a listing into the channel's metadata store (only changed rows)."""
+    store = MetadataStore(channel_folder)
     try:
-        with open(metadata_path, "w", encoding="utf-8") as meta_f:
-            json.dump(channel_info, meta_f, indent=4, ensure_ascii=False)
-        print(f"{Fore.GREEN}Full channel metadata saved to {metadata_path}{Style.RESET_ALL}")
+        added, updated = store.upsert(videos, channel_info)
     except Exception as e:
-        print(f"{Fore.YELLOW}Warning: Could not save metadata file: {e}{Style.RESET_ALL}")
-    print(f"{Fore.GREEN}Done.{Style.RESET_ALL}")
+        print(f"{Fore.YELLOW}Warning: Could not update metadata store: {e}{Style.RESET_ALL}")
+        return None
+    print(
+        f"{Fore.GREEN}Channel metadata: {added} new, {updated} updated, "
+        f"{len(store)} total in {store.videos_path}{Style.RESET_ALL}"
+    )
+    return store
 
 
 def process_channel_videos(
-    url: Optional[str] = None,
+    url: Union[str, List[str], None] = None,
     limit=None,
     workers: Optional[int] = None,
     model_instances: Optional[int] = None,
-    model: Optional[str] = None,
-    prefer_captions: bool = True,
-    whisper_fallback: bool = True,
-    caption_delay: float = 0.5,
-    pace_seconds: float = 0.0,
-    safe: bool = False,
+    options: Optional[BatchOptions] = None,
+    resume: bool = False,
+    full_rescan: bool = False,
 ):
     """
     Batch process latest N channel videos.
 
     Pipeline (default):
       1. Skip if transcript already exists for video_id
-      2. Try YouTube captions (serial + small delay — kinder to rate limits)
+      2. Try YouTube captions (rate-limited; each miss is queued for Whisper)
       3. Whisper download+ASR for remaining (concurrent, gentle defaults)
 
-    Safe / paced mode (``safe=True`` or ``pace_seconds>0``):
-      Serial Whisper, sleep so starts are at least ``pace_seconds`` apart
-      (default safe pace = 180s ≈ 480 videos/day). Lower bot-check risk;
-      pair with ``SUXXTEXT_COOKIES_FROM_BROWSER=chrome`` when possible.
+    ``url`` may be a list of channels sharing one model pool, download stage
+    and rate-limit budget; ``limit`` applies per channel. ``options`` tunes
+    the run (see :class:`BatchOptions`); safe / paced mode forces serial
+    Whisper. Every stage is journaled, so Ctrl-C drains to a checkpoint and
+    ``resume=True`` replays the last run instead of listing the channel.
 
     None interactive args → prompts. Defaults: 4 workers / 2 Whisper instances.
     """
-    model_name = model or "base"
+    opts = options or BatchOptions()
+    model_name = opts.model_name
+    pace_seconds = opts.pace_seconds
+    stream_audio = opts.stream_audio
 
-    if safe:
+    if opts.safe:
         # Safe mode is opinionated: serial + 3 min pace (unless --pace overrides)
         if pace_seconds <= 0:
             pace_seconds = SAFE_PACE_SECONDS
@@ -358,51 +720,27 @@ def process_channel_videos(
             f"{Fore.YELLOW}NOTE: The channel URL should be in this format: "
             f"https://www.youtube.com/@channelname/videos{Style.RESET_ALL}"
         )
-        channel_url = input(f"{Fore.CYAN}Enter YouTube channel URL: {Style.RESET_ALL}").strip()
+        channel_urls = [
+            input(f"{Fore.CYAN}Enter YouTube channel URL: {Style.RESET_ALL}").strip()
+        ]
+    elif isinstance(url, str):
+        channel_urls = [normalize_channel_url(url)]
     else:
-        channel_url = normalize_channel_url(url)
-
-    print(
-        f"{Fore.BLUE}Retrieving all video metadata for the channel "
-        f"(this might take a while for large channels)...{Style.RESET_ALL}"
-    )
-    try:
-        videos, channel_info = get_channel_videos(channel_url)
-    except Exception as e:
-        print(f"{Fore.RED + Style.BRIGHT}Error retrieving channel info: {e}{Style.RESET_ALL}")
+        channel_urls = list(dict.fromkeys(normalize_channel_url(u) for u in url if u))
+
+    channels: List[dict] = []
+    for channel_url in channel_urls:
+        if len(channel_urls) > 1:
+            print(f"\n{Fore.CYAN + Style.BRIGHT}=== {channel_url} ==={Style.RESET_ALL}")
+        ch = _open_channel(channel_url, limit, resume, full_rescan)
+        if ch is not None:
+            channels.append(ch)
+    if not channels:
         return
 
-    total_videos_found = len(videos)
-    print(f"{Fore.WHITE}Found {total_videos_found} videos in the channel.{Style.RESET_ALL}")
-
-    if limit is None:
-        num_videos_str = input(
-            f"{Fore.CYAN}How many of the latest videos do you want to ensure are processed "
-            f"(enter 'all' or a number)? [default {min(10, total_videos_found)}]: {Style.RESET_ALL}"
-        ).strip()
-        if num_videos_str.lower() == "all":
-            num_videos_target = total_videos_found
-            print(f"{Fore.BLUE}Processing all {total_videos_found} videos.{Style.RESET_ALL}")
-        else:
-            try:
-                num_videos_target = int(num_videos_str) if num_videos_str else min(10, total_videos_found)
-            except ValueError:
-                num_videos_target = min(10, total_videos_found)
-            if num_videos_target > total_videos_found:
-                num_videos_target = total_videos_found
-            print(f"{Fore.BLUE}Processing {num_videos_target} videos.{Style.RESET_ALL}")
-    else:
-        if str(limit).lower() == "all":
-            num_videos_target = total_videos_found
-        else:
-            num_videos_target = int(limit)
-            if num_videos_target > total_videos_found:
-                num_videos_target = total_videos_found
-        print(f"{Fore.BLUE}Processing {num_videos_target} videos.{Style.RESET_ALL}")
-
     if workers is None:
         concurrency_str = input(
-            f"{Fore.CYAN}Concurrent Whisper workers "
+            f"{Fore.CYAN}Concurrent download workers "
             f"[default {DEFAULT_WORKERS}, max 32]: {Style.RESET_ALL}"
         ).strip()
         try:
@@ -411,7 +749,7 @@ def process_channel_videos(
                 max_workers = DEFAULT_WORKERS
             elif max_workers > 32:
                 max_workers = 32
-            print(f"{Fore.BLUE}Using {max_workers} concurrent workers.{Style.RESET_ALL}")
+            print(f"{Fore.BLUE}Using {max_workers} concurrent download workers.{Style.RESET_ALL}")
         except ValueError:
             max_workers = DEFAULT_WORKERS
             print(
@@ -419,7 +757,7 @@ def process_channel_videos(
             )
     else:
         max_workers = min(max(1, int(workers)), 32)
-        print(f"{Fore.BLUE}Using {max_workers} concurrent workers.{Style.RESET_ALL}")
+        print(f"{Fore.BLUE}Using {max_workers} concurrent download workers.{Style.RESET_ALL}")
 
     if model_instances is None:
         model_count_str = input(
@@ -436,282 +774,1371 @@ def process_channel_videos(
         pool_size = max(1, int(model_instances))
 
     print(f"{Fore.BLUE}Using up to {pool_size} Whisper model instance(s).{Style.RESET_ALL}")
+    audio_prefetch = max(1, int(opts.prefetch)) if opts.prefetch else DEFAULT_AUDIO_PREFETCH
     mode_note = []
-    if prefer_captions:
+    if opts.prefer_captions:
         mode_note.append("captions-first")
     else:
         mode_note.append("whisper-only")
-    if prefer_captions and whisper_fallback:
+    if opts.prefer_captions and opts.whisper_fallback:
         mode_note.append("Whisper fallback on miss")
-    elif prefer_captions and not whisper_fallback:
+    elif opts.prefer_captions and not opts.whisper_fallback:
         mode_note.append("no Whisper fallback")
+    if opts.whisper_fallback:
+        mode_note.append("streaming Whisper queue" if opts.pipelined else "two-phase")
+    adaptive = opts.adaptive and pace_seconds <= 0
+    adaptive_ceiling = max(
+        max_workers, int(opts.adaptive_max_workers or ADAPTIVE_MAX_WORKERS)
+    )
+    if adaptive and opts.whisper_fallback:
+        mode_note.append(f"adaptive downloads {max_workers}→≤{adaptive_ceiling}")
     if pace_seconds > 0:
         per_day = int(86400 / pace_seconds) if pace_seconds else 0
         mode_note.append(
             f"SAFE/paced ≥{pace_seconds:.0f}s between Whisper videos (~{per_day}/day max)"
         )
+    if opts.whisper_fallback and opts.order != ORDER_LISTING:
+        mode_note.append(f"{opts.order}-first Whisper order")
+    if opts.deadline is not None:
+        mode_note.append(f"deadline {datetime.fromtimestamp(opts.deadline):%H:%M}")
+    if opts.whisper_fallback and opts.retries > 0:
+        mode_note.append(
+            f"≤{opts.retries} download retries"
+            + (f" (cookies {opts.retry_cookies})" if opts.retry_cookies else "")
+        )
+    if opts.whisper_fallback and opts.whisper_backend == BACKEND_PROCESS:
+        mode_note.append(
+            f"process-pool Whisper ({opts.cpu_threads or 'auto'} CPU thread(s) per model)"
+        )
+    if opts.prefer_captions and opts.caption_concurrency > 1:
+        mode_note.append(f"{opts.caption_concurrency} caption requests in flight")
+    if opts.prefer_captions and opts.subtitle_fallback:
+        mode_note.append("yt-dlp subtitles if the caption API is blocked")
+    if opts.whisper_fallback and stream_audio and not ffmpeg_available():
+        print(
+            f"{Fore.YELLOW}--stream-audio needs ffmpeg on PATH; downloading audio "
+            f"files instead.{Style.RESET_ALL}"
+        )
+        stream_audio = False
+    if opts.whisper_fallback and stream_audio:
+        mode_note.append("audio streamed into Whisper")
+    if opts.whisper_fallback and opts.predecode_workers > 0:
+        mode_note.append(f"{opts.predecode_workers} audio pre-decode process(es)")
+    if opts.whisper_fallback and opts.whisper_batch > 1:
+        mode_note.append(f"batched Whisper ({opts.whisper_batch} chunks per pass)")
+    profile, min_kbps = audio_profile()
+    if opts.whisper_fallback and profile == AUDIO_ASR:
+        mode_note.append(f"ASR audio profile (smallest stream ≥{min_kbps:g} kbps)")
+    if opts.whisper_fallback and opts.audio_cache == CACHE_LRU:
+        mode_note.append(f"audio cache ≤{opts.audio_cache_gb:g} GB/channel (LRU)")
+    elif opts.whisper_fallback and opts.audio_cache != CACHE_KEEP:
+        mode_note.append(f"audio {opts.audio_cache} after transcript")
+    if opts.shared_archive:
+        mode_note.append(f"shared archive (leases, ttl {opts.lease_ttl:.0f}s)")
+    if len(channels) > 1:
+        mode_note.append(f"{len(channels)} channels, {opts.schedule} interleave, shared model pool")
     print(f"{Fore.BLUE}Pipeline: {', '.join(mode_note)}{Style.RESET_ALL}")
     cookies_env = (os.environ.get("SUXXTEXT_COOKIES_FROM_BROWSER") or "").strip()
     if cookies_env:
         print(
             f"{Fore.BLUE}yt-dlp cookies-from-browser: {cookies_env}{Style.RESET_ALL}"
         )
-    elif pace_seconds > 0 or safe:
+    elif pace_seconds > 0 or opts.safe:
         print(
             f"{Fore.YELLOW}Tip: export SUXXTEXT_COOKIES_FROM_BROWSER=chrome "
             f"to reduce bot-checks in safe mode.{Style.RESET_ALL}"
         )
 
-    channel_folder = resolve_channel_folder(info=channel_info, channel_url=channel_url)
-    base_channel_dir, mp3_dir, trans_dir = ensure_channel_dirs(channel_folder)
-    print(f"{Fore.BLUE}Channel archive folder: {base_channel_dir}{Style.RESET_ALL}")
+    run_id = new_run_id()
+    with contextlib.ExitStack() as stack:
+        for ch in channels:
+            journal = RunJournal.for_channel(ch["folder"])
+            journal.start_run(resume=ch["resume_state"] is not None, target=ch["target"])
+            if ch["resume_state"] is None:
+                journal.record_discovered(ch["videos"])
+            ch["journal"] = stack.enter_context(journal)
+            ch["events"] = stack.enter_context(EventSink.for_channel(ch["folder"], run_id))
+            ch["claims"] = (
+                stack.enter_context(LeaseBoard.for_channel(ch["folder"], ttl=opts.lease_ttl))
+                if opts.shared_archive
+                else None
+            )
+            ch["events"].emit(
+                "run_start",
+                audio_cache=opts.audio_cache,
+                kind="batch",
+                channel=ch["channel_url"],
+                model=model_name,
+                order=opts.order,
+                deadline=opts.deadline,
+                retries=opts.retries,
+                shared_archive=opts.shared_archive or None,
+                whisper_backend=opts.whisper_backend,
+                stream_audio=stream_audio or None,
+                whisper_batch=opts.whisper_batch if opts.whisper_batch > 1 else None,
+                target=ch["target"],
+                total=ch["total"],
+                resume=ch["resume_state"] is not None,
+                prefer_captions=opts.prefer_captions,
+                whisper_fallback=opts.whisper_fallback,
+                workers=max_workers,
+                models=pool_size,
+                pace_seconds=pace_seconds,
+                pipelined=opts.pipelined,
+                adaptive=adaptive,
+                channels=len(channels),
+            )
+            print(
+                f"\n{Fore.BLUE}Starting processing. Aiming to ensure the latest {ch['target']} "
+                f"videos of {ch['folder']} are processed.{Style.RESET_ALL}"
+            )
+            logf = stack.enter_context(open(ch["log_path"], "a", encoding="utf-8"))
+            logf.write(f"\n--- Processing run started at {datetime.now()} ---\n")
+            logf.write(
+                f"Targeting latest {ch['target']} videos out of {ch['total']} total.\n"
+            )
+            logf.write(
+                f"prefer_captions={opts.prefer_captions} whisper_fallback={opts.whisper_fallback} "
+                f"workers={max_workers} models={pool_size} caption_delay={opts.caption_delay} "
+                f"pace_seconds={pace_seconds} safe={opts.safe} pipelined={opts.pipelined} "
+                f"prefetch={audio_prefetch} adaptive={adaptive} channels={len(channels)}\n"
+            )
+            ch["logf"] = logf
+            ch["audio_cache"] = AudioCache(
+                ch["mp3_dir"], opts.audio_cache, int(opts.audio_cache_gb * 1e9), logf
+            )
+            ch["audio_cache"].enforce()
+
+        shutdown = stack.enter_context(GracefulShutdown())
+        shutdown.on_abort(terminate_children)
+        controller = None
+        if adaptive:
+            controller = AdaptiveConcurrency(
+                initial=max_workers, maximum=adaptive_ceiling, logf=channels[0]["logf"]
+            )
+        gate = CaptionGate(controller)
+        batches = [
+            ChannelBatch(
+                ch["videos"],
+                ch["target"],
+                ch["mp3_dir"],
+                ch["trans_dir"],
+                ch["logf"],
+                name=ch["folder"] if len(channels) > 1 else "",
+                prefer_captions=opts.prefer_captions,
+                whisper_fallback=opts.whisper_fallback,
+                journal=ch["journal"],
+                resume_state=ch["resume_state"],
+                controller=controller,
+                gate=gate,
+                mode="pipelined" if opts.pipelined else "two-phase",
+                events=ch["events"],
+                claims=ch["claims"],
+                audio_cache=ch["audio_cache"],
+                stream_audio=stream_audio,
+            )
+            for ch in channels
+        ]
+        run_channel_batches(
+            batches,
+            replace(
+                opts,
+                pool_size=pool_size,
+                max_workers=max_workers,
+                pace_seconds=pace_seconds,
+                prefetch=audio_prefetch,
+                stream_audio=stream_audio,
+            ),
+            controller=controller,
+            retry_policy=(
+                RetryPolicy(opts.retries, cookies_from_browser=opts.retry_cookies)
+                if opts.retries > 0
+                else None
+            ),
+            shutdown=shutdown,
+        )
+        for ch, batch in zip(channels, batches):
+            cache = ch["audio_cache"]
+            if cache.evicted:
+                batch.stats.add("audio_removed", cache.evicted)
+                ch["logf"].write(
+                    f"Audio cache ({cache.policy}): removed {cache.evicted} file(s), "
+                    f"{cache.freed_bytes / 1e9:.2f} GB freed\n"
+                )
+            ch["logf"].write(f"Throughput: {batch.stats.throughput_line()}\n")
+            if batch.stats["audio_bytes"]:
+                ch["logf"].write(
+                    f"Audio downloaded: {batch.stats['audio_bytes']} bytes "
+                    f"(~{batch.stats['audio_bytes_saved']} saved vs bestaudio)\n"
+                )
+            ch["events"].emit(
+                "run_end",
+                counts=dict(batch.stats.counts),
+                seconds=round(batch.stats.wall_clock, 3),
+                time_to_first=batch.stats.time_to_first,
+                interrupted=shutdown.draining or None,
+            )
 
-    metadata_path = os.path.join(base_channel_dir, f"{channel_folder}-full-history.json")
-    try:
-        with open(metadata_path, "w", encoding="utf-8") as meta_f:
-            json.dump(channel_info, meta_f, indent=4, ensure_ascii=False)
-        print(f"{Fore.GREEN}Full channel metadata saved to {metadata_path}{Style.RESET_ALL}")
-    except Exception as e:
-        print(f"{Fore.YELLOW}Warning: Could not save metadata file: {e}{Style.RESET_ALL}")
+    for ch, batch in zip(channels, batches):
+        if len(channels) > 1:
+            print(f"\n{Fore.CYAN + Style.BRIGHT}=== {ch['folder']} ==={Style.RESET_ALL}")
+        _print_batch_summary(batch.stats, ch["target"], ch["log_path"])
+    if len(channels) > 1:
+        new = sum(b.stats["captions"] + b.stats["whisper"] for b in batches)
+        errors = sum(b.stats["error"] for b in batches)
+        print(
+            f"\n{Fore.GREEN + Style.BRIGHT}All {len(channels)} channels: {new} new, "
+            f"{errors} error(s).{Style.RESET_ALL}"
+        )
 
-    log_path = os.path.join(base_channel_dir, "error_log.txt")
 
-    if not videos:
-        print(f"{Fore.YELLOW}No videos found for this channel URL.{Style.RESET_ALL}")
-        return
+def plan_channel_videos(
+    url: Union[str, List[str]],
+    limit=None,
+    workers: int = DEFAULT_WORKERS,
+    model_instances: int = DEFAULT_MODEL_INSTANCES,
+    options: Optional[BatchOptions] = None,
+    resume: bool = False,
+    full_rescan: bool = False,
+) -> Optional[RunPlan]:
+    """
+    Dry run of :func:`process_channel_videos`: list the channel(s), then
+    report archived / likely-Whisper counts, audio hours, GPU hours and an
+    ETA (see ``suxxtext.plan``) without fetching captions or audio.
 
-    skipped_count = 0
-    caption_count = 0
-    whisper_count = 0
-    error_count = 0
-    checked_count = 0
-    need_whisper: List[dict] = []
-    # After N consecutive IP / request blocks from youtube-transcript-api, skip
-    # further caption attempts for this run (Whisper path still works).
-    caption_ip_block_streak = 0
-    captions_disabled_this_run = False
-    IP_BLOCK_STREAK_LIMIT = 3
-
-    def _looks_like_ip_block(detail: str) -> bool:
-        d = (detail or "").lower()
-        return any(
-            s in d
-            for s in (
-                "blocking requests from your ip",
-                "ipblocked",
-                "requestblocked",
-                "too many requests",
-                "cloud provider",
+    Nothing on disk changes: the discovery cursor and metadata store are
+    read, not written, and ``limit=None`` plans every video without asking.
+    """
+    opts = options or BatchOptions()
+    pace_seconds = opts.pace_seconds
+    if opts.safe and pace_seconds <= 0:
+        pace_seconds = SAFE_PACE_SECONDS
+    if opts.safe or pace_seconds > 0:
+        workers, model_instances = SAFE_WORKERS, SAFE_MODEL_INSTANCES
+    urls = [url] if isinstance(url, str) else list(url)
+    channel_urls = list(dict.fromkeys(normalize_channel_url(u) for u in urls if u))
+
+    plans: List[ChannelPlan] = []
+    event_paths: List[str] = []
+    for channel_url in channel_urls:
+        ch = _open_channel(channel_url, limit, resume, full_rescan, read_only=True)
+        if ch is None:
+            continue
+        hits, misses = RunJournal.for_channel(ch["folder"]).caption_history()
+        plans.append(
+            ChannelPlan(
+                ch["folder"],
+                ch["videos"],
+                ch["target"],
+                TranscriptIndex.load(ch["trans_dir"]),
+                hits,
+                misses,
+                prefer_captions=opts.prefer_captions,
+                whisper_fallback=opts.whisper_fallback,
             )
         )
+        event_paths.append(ev.events_path(ch["folder"]))
+    if not plans:
+        return None
+
+    plan = RunPlan(
+        plans,
+        RuntimeModel.from_events(event_paths, opts.whisper_batch),
+        stage_seconds(event_paths),
+        model_name=opts.model_name,
+        workers=min(max(1, int(workers)), 32),
+        pool_size=model_instances,
+        caption_delay=opts.caption_delay,
+        pace_seconds=pace_seconds,
+        pipelined=opts.pipelined,
+        order=opts.order,
+    )
+    print()
+    for line in plan.lines():
+        color = Fore.CYAN + Style.BRIGHT if not line.startswith(" ") else Fore.WHITE
+        print(f"{color}{line}{Style.RESET_ALL}")
+    print(f"{Fore.GREEN}Plan only: nothing was downloaded or transcribed.{Style.RESET_ALL}")
+    return plan
+
+
+def _open_channel(
+    channel_url: str,
+    limit,
+    resume: bool,
+    full_rescan: bool = False,
+    read_only: bool = False,
+) -> Optional[dict]:
+    """
+    List (or resume) one channel and resolve its target and archive folders.
 
-    print(
-        f"\n{Fore.BLUE}Starting processing. Aiming to ensure the latest {num_videos_target} "
-        f"videos are processed.{Style.RESET_ALL}"
+    Listing is incremental from the channel's discovery cursor unless
+    ``full_rescan``. ``read_only`` (dry runs) neither advances the cursor,
+    writes the metadata store nor creates folders, and a missing ``limit``
+    means all videos instead of a prompt.
+
+    Returns ``None`` when the channel cannot be listed or has no videos.
+    """
+    videos: List[dict] = []
+    channel_info: Optional[dict] = None
+    resume_state: Optional[Dict[str, dict]] = None
+    listed = False
+    # where earlier runs archived this URL; the URL alone may not name it
+    known_folder = remembered_channel_folder(channel_url) or resolve_channel_folder(
+        channel_url=channel_url
     )
+    if resume:
+        journal = RunJournal.for_channel(known_folder)
+        videos = journal.discovered()
+        if videos:
+            resume_state = journal.states()
+            print(
+                f"{Fore.BLUE}Resuming from {journal.path}: {len(videos)} discovered, "
+                f"{len(resume_state)} with recorded progress.{Style.RESET_ALL}"
+            )
+        else:
+            print(
+                f"{Fore.YELLOW}No journal to resume at {journal.path}; "
+                f"listing the channel.{Style.RESET_ALL}"
+            )
 
-    try:
-        existing_transcriptions = os.listdir(trans_dir)
-    except OSError as e:
+    if not videos:
         print(
-            f"{Fore.YELLOW}  - Warning: Could not list transcription directory {trans_dir}: {e}{Style.RESET_ALL}"
+            f"{Fore.BLUE}Retrieving video metadata for the channel "
+            f"{'(full rescan)' if full_rescan else '(new uploads only if a discovery cursor exists)'}"
+            f"...{Style.RESET_ALL}"
+        )
+        try:
+            videos, channel_info = list_channel_videos(
+                channel_url,
+                known_folder,
+                full_rescan=full_rescan,
+            )
+            listed = True
+        except Exception as e:
+            print(f"{Fore.RED + Style.BRIGHT}Error retrieving channel info: {e}{Style.RESET_ALL}")
+            return None
+
+    total_videos_found = len(videos)
+    print(f"{Fore.WHITE}Found {total_videos_found} videos in the channel.{Style.RESET_ALL}")
+
+    if limit is None and read_only:
+        limit = "all"
+    if limit is None:
+        num_videos_str = input(
+            f"{Fore.CYAN}How many of the latest videos do you want to ensure are processed "
+            f"(enter 'all' or a number)? [default {min(10, total_videos_found)}]: {Style.RESET_ALL}"
+        ).strip()
+        if num_videos_str.lower() == "all":
+            num_videos_target = total_videos_found
+            print(f"{Fore.BLUE}Processing all {total_videos_found} videos.{Style.RESET_ALL}")
+        else:
+            try:
+                num_videos_target = int(num_videos_str) if num_videos_str else min(10, total_videos_found)
+            except ValueError:
+                num_videos_target = min(10, total_videos_found)
+            if num_videos_target > total_videos_found:
+                num_videos_target = total_videos_found
+            print(f"{Fore.BLUE}Processing {num_videos_target} videos.{Style.RESET_ALL}")
+    else:
+        if str(limit).lower() == "all":
+            num_videos_target = total_videos_found
+        else:
+            num_videos_target = int(limit)
+            if num_videos_target > total_videos_found:
+                num_videos_target = total_videos_found
+        print(f"{Fore.BLUE}Processing {num_videos_target} videos.{Style.RESET_ALL}")
+
+    if channel_info is None:
+        channel_folder = known_folder
+    else:
+        channel_folder = resolve_channel_folder(info=channel_info, channel_url=channel_url)
+    dirs = channel_dirs if read_only else ensure_channel_dirs
+    base_channel_dir, mp3_dir, trans_dir = dirs(channel_folder)
+    print(f"{Fore.BLUE}Channel archive folder: {base_channel_dir}{Style.RESET_ALL}")
+
+    if not read_only:
+        # the cursor goes where the run archives (the info may name a folder
+        # the URL alone does not), and later runs look that folder up
+        if listed:
+            save_cursor(cursor_path(channel_folder), channel_url, videos)
+        remember_channel_folder(channel_url, channel_folder)
+    if resume_state is None and not read_only:
+        _save_channel_metadata(channel_folder, videos, channel_info)
+
+    if not videos:
+        print(f"{Fore.YELLOW}No videos found for this channel URL.{Style.RESET_ALL}")
+        return None
+
+    return {
+        "channel_url": channel_url,
+        "folder": channel_folder,
+        "mp3_dir": mp3_dir,
+        "trans_dir": trans_dir,
+        "log_path": os.path.join(base_channel_dir, "error_log.txt"),
+        "videos": videos,
+        "total": total_videos_found,
+        "target": num_videos_target,
+        "resume_state": resume_state,
+    }
+
+
+class CaptionGate:
+    """
+    Caption-API health shared by every channel in a run.
+
+    After ``IP_BLOCK_STREAK_LIMIT`` consecutive IP / request blocks from
+    youtube-transcript-api, caption attempts stop for the rest of the run —
+    the block is per IP, not per channel. The Whisper path still works.
+    """
+
+    def __init__(self, controller: Optional[AdaptiveConcurrency] = None):
+        self.controller = controller
+        self.streak = 0
+        self.disabled = False
+        self.fallback = "Whisper fallback"
+
+    def observe(self, ok: bool, detail: str, logf: Any) -> None:
+        if ok or not _looks_like_ip_block(detail):
+            self.streak = 0
+            return
+        if self.controller is not None:
+            self.controller.on_throttle(detail)
+        self.streak += 1
+        if self.streak >= IP_BLOCK_STREAK_LIMIT:
+            self.disabled = True
+            msg = (
+                f"Caption API IP-blocked {self.streak}x in a row — "
+                f"skipping further caption API attempts this run; {self.fallback}."
+            )
+            print(f"{Fore.MAGENTA}{msg}{Style.RESET_ALL}")
+            logf.write(msg + "\n")
+
+
+class ChannelBatch:
+    """
+    One channel's share of a batch run.
+
+    :meth:`steps` runs Phase 1 (skip check + captions) one video per step, so
+    a scheduler can interleave several channels; caption misses go to the
+    ``queue_whisper`` callback. :meth:`download` / :meth:`transcribe` are the
+    Whisper handlers, writing into this channel's folders, log and journal.
+    Each stage is also timed into the channel's ``events`` stream.
+
+    With ``claims`` (a :class:`~suxxtext.lease.LeaseBoard` on a shared
+    archive) a video is leased before its caption attempt and again before
+    its download, so processes on other hosts skip it; see :meth:`claim`.
+
+    ``audio_cache`` (an :class:`~suxxtext.audio_cache.AudioCache`) holds each
+    downloaded file until its transcription is over, then applies its
+    policy (delete / LRU cap / keep).
+
+    When a :class:`~suxxtext.caption_engine.CaptionEngine` is set as
+    ``captions``, caption requests for the next videos start ahead of the
+    sweep; results are still handled one video at a time, in order. Once
+    the caption API is blocked, a :class:`~suxxtext.subtitles.BulkSubtitles`
+    set as ``subtitles`` takes over: one yt-dlp run per chunk of videos.
+
+    A :class:`~suxxtext.predecode.PreDecoder` set as ``predecoder`` decodes
+    each file as soon as it is on disk, so the model only runs inference.
+
+    With ``stream_audio`` Whisper videos skip the download stage: the ASR
+    worker pipes yt-dlp through ffmpeg into the model (``suxxtext.streaming``)
+    and keeps the audio in ``mp3/`` only if the cache policy keeps audio.
+    """
+
+    def __init__(
+        self,
+        videos: List[dict],
+        num_videos_target: int,
+        mp3_dir: str,
+        trans_dir: str,
+        logf: Any,
+        *,
+        name: str = "",
+        prefer_captions: bool = True,
+        whisper_fallback: bool = True,
+        journal: Optional[RunJournal] = None,
+        resume_state: Optional[Dict[str, dict]] = None,
+        controller: Optional[AdaptiveConcurrency] = None,
+        gate: Optional[CaptionGate] = None,
+        mode: str = "pipelined",
+        events: Optional[EventSink] = None,
+        claims: Optional[LeaseBoard] = None,
+        audio_cache: Optional[AudioCache] = None,
+        stream_audio: bool = False,
+    ):
+        self.videos = videos
+        self.num_videos_target = num_videos_target
+        self.mp3_dir = mp3_dir
+        self.trans_dir = trans_dir
+        self.logf = logf
+        self.name = name
+        self.prefer_captions = prefer_captions
+        self.whisper_fallback = whisper_fallback
+        self.journal = journal
+        self.resume_state = resume_state
+        self.controller = controller
+        self.gate = gate or CaptionGate(controller)
+        self.events = events
+        self.claims = claims
+        self.audio_cache = audio_cache
+        self.stream_audio = stream_audio
+        self.captions: Optional[CaptionEngine] = None
+        self.predecoder: Optional[PreDecoder] = None
+        self.subtitles: Optional[BulkSubtitles] = None
+        self._ahead: Dict[str, int] = {}  # id → index of requests started ahead
+        self._ahead_to = 0
+        self.stats = BatchStats(mode)
+        if not os.path.isdir(trans_dir):
+            print(
+                f"{Fore.YELLOW}  - Warning: Could not list transcription directory {trans_dir}{Style.RESET_ALL}"
+            )
+        self.index = TranscriptIndex.load(trans_dir)
+
+    @property
+    def backlog(self) -> int:
+        """Videos this channel may still check (scheduler weight)."""
+        return max(0, min(self.num_videos_target, len(self.videos)) - self.stats["checked"])
+
+    def _note(self, video_id: str, stage_name: str, **fields: Any) -> None:
+        if self.journal is not None:
+            self.journal.record(video_id, stage_name, **fields)
+
+    def _emit(self, event: str, **fields: Any) -> None:
+        if self.events is not None:
+            self.events.emit(event, **fields)
+
+    def _stage(self, stage_name: str, video_id: str, **fields: Any):
+        if self.events is None:
+            return contextlib.nullcontext({})
+        return self.events.stage(stage_name, video_id, **fields)
+
+    def _progress(self, video_id: str, event: dict) -> Optional[Callable[[dict], None]]:
+        """
+        Download progress reporter: a ``progress`` event at most every
+        ``PROGRESS_EVERY`` seconds, and the last speed on the stage event.
+        """
+        if self.events is None:
+            return None
+        last = [0.0]
+
+        def report(d: dict) -> None:
+            if d.get("speed"):
+                event["speed"] = round(d["speed"])
+            now = time.monotonic()
+            if d.get("status") != "downloading" or now - last[0] < PROGRESS_EVERY:
+                return
+            last[0] = now
+            self._emit(
+                "progress",
+                id=video_id,
+                bytes=d.get("downloaded_bytes"),
+                total=d.get("total_bytes"),
+                speed=event.get("speed"),
+                eta=d.get("eta"),
+            )
+
+        return report
+
+    def _count_audio(self, video: dict, nbytes: Optional[int], event: dict) -> None:
+        """Bytes downloaded, and the estimated saving of the ``asr`` audio profile."""
+        if not nbytes:
+            return
+        self.stats.add("audio_bytes", nbytes)
+        try:
+            duration = float(video.get("duration") or 0)
+        except (TypeError, ValueError):
+            duration = 0.0
+        if audio_profile()[0] != AUDIO_ASR or duration <= 0:
+            return
+        saved = max(0, best_audio_bytes(duration) - nbytes)
+        self.stats.add("audio_bytes_saved", saved)
+        event["saved_bytes"] = saved
+
+    def claim(self, video: dict) -> bool:
+        """
+        Lease ``video`` for this process (always ``True`` without ``claims``).
+
+        ``False`` when another host holds the lease, or already wrote the
+        transcript since this run listed the archive.
+        """
+        if self.claims is None:
+            return True
+        video_id = video["id"]
+        if not self.claims.acquire(video_id):
+            owner = (self.claims.holder(video_id) or {}).get("owner", "another host")
+            msg = f"Claimed by {owner}: {video_id}"
+        else:
+            existing = transcript_exists_for_id(self.trans_dir, video_id)
+            if not existing:
+                return True
+            self.claims.release(video_id)
+            self.index.add(video_id, existing)
+            owner = "another host"
+            msg = f"Finished elsewhere: {video_id} ({existing})"
+        print(f"{Fore.YELLOW}  - {msg}. Skipping.{Style.RESET_ALL}")
+        self.logf.write(msg + "\n")
+        self._emit("claimed", id=video_id, by=owner)
+        return False
+
+    def release(self, video: dict) -> None:
+        if self.claims is not None:
+            self.claims.release(video["id"])
+
+    def fail(self, video: dict, at: str, reason: str) -> None:
+        """Journal a failure the stage hit outside ``download``/``transcribe``."""
+        self._note(video["id"], FAILED, at=at, reason=reason)
+
+    def checkpoint(self, dropped: List[dict]) -> None:
+        """Interrupted run: record what is left for ``--resume``."""
+        pending = [v["id"] for v in dropped]
+        unchecked = self.backlog
+        msg = (
+            f"Interrupted: {len(pending)} queued Whisper video(s) not started, "
+            f"{unchecked} not checked; continue with --resume"
+        )
+        prefix = f"{self.name}: " if self.name else ""
+        print(f"{Fore.YELLOW + Style.BRIGHT}{prefix}{msg}{Style.RESET_ALL}")
+        self.logf.write(msg + "\n")
+        if self.journal is not None:
+            self.journal.mark_interrupted(pending, unchecked)
+        self._emit("interrupted", pending=len(pending), unchecked=unchecked)
+
+    def defer(self, video: dict, predicted: float) -> None:
+        """Whisper refused by the time budget; left for the next run."""
+        msg = (
+            f"Deferred {video['id']}: ~{predicted / 60:.1f}m of Whisper would finish "
+            f"after the deadline"
         )
-        existing_transcriptions = []
+        print(f"{Fore.YELLOW}[{video['id']}] {msg}{Style.RESET_ALL}")
+        self.logf.write(msg + "\n")
+        self._emit("deferred", id=video["id"], predicted=round(predicted, 1))
+        self.release(video)
+
+    def retry_later(self, video: dict, delay: float, max_retries: int) -> None:
+        """A failed download went back on the queue (see :class:`RetryPolicy`)."""
+        cookies = f", cookies {video['_cookies']}" if video.get("_cookies") else ""
+        msg = (
+            f"Retry {video.get('_retry')}/{max_retries} for {video['id']} "
+            f"in {delay:.0f}s{cookies}"
+        )
+        print(f"{Fore.YELLOW}[{video['id']}] {msg}{Style.RESET_ALL}")
+        self.logf.write(msg + "\n")
+        self._emit(
+            "retry",
+            id=video["id"],
+            attempt=video.get("_retry"),
+            delay=round(delay, 1),
+            cookies=video.get("_cookies"),
+        )
+
+    def _fetch_ahead(self, idx: int) -> None:
+        """Start caption requests for the next videos the sweep will try."""
+        engine = self.captions
+        self._ahead = {vid: i for vid, i in self._ahead.items() if i > idx}
+        room = min(engine.lookahead, self.num_videos_target - self.stats["checked"])
+        j = max(self._ahead_to, idx + 1)
+        while len(self._ahead) < room and j < len(self.videos):
+            video_id = self.videos[j]["id"]
+            j += 1
+            if self.index.find(video_id):
+                continue
+            if self.resume_state and resume_action(self.resume_state.get(video_id)) != "full":
+                continue
+            self._ahead[video_id] = j - 1
+            engine.submit(video_id)
+        self._ahead_to = j
+
+    def _upcoming(self, idx: int, n: int) -> List[str]:
+        """Ids of up to ``n`` videos after ``idx`` the sweep will try captions for."""
+        room = min(n, self.num_videos_target - self.stats["checked"])
+        out: List[str] = []
+        for video in self.videos[idx + 1 :]:
+            if len(out) >= room:
+                break
+            video_id = video["id"]
+            if self.index.find(video_id):
+                continue
+            if self.resume_state and resume_action(self.resume_state.get(video_id)) != "full":
+                continue
+            out.append(video_id)
+        return out
+
+    def _captions_to_file(self, idx: int, txt_path: str) -> Tuple[bool, str]:
+        video_id = self.videos[idx]["id"]
+        if self.gate.disabled and self.subtitles is not None:
+            subs = self.subtitles
+            if not subs.has(video_id):
+                chunk = [video_id] + self._upcoming(idx, subs.chunk - 1)
+                print(
+                    f"{Fore.BLUE}  - Caption API blocked: fetching subtitles for "
+                    f"{len(chunk)} video(s) with one yt-dlp run...{Style.RESET_ALL}"
+                )
+                subs.fetch(chunk)
+            ok, detail = try_captions_to_file(video_id, txt_path, result=subs.result(video_id))
+            if ok:
+                self.stats.add("subtitles")
+                detail += " via yt-dlp"
+            return ok, detail
+        if self.captions is None:
+            return try_captions_to_file(video_id, txt_path)
+        self.captions.submit(video_id)  # ahead of the lookahead, not queued behind it
+        self._fetch_ahead(idx)
+        return try_captions_to_file(video_id, txt_path, result=self.captions.result(video_id))
+
+    def audio_on_disk(self, video: dict) -> bool:
+        """Audio for ``video`` is already in ``mp3/`` (held for ASR if so)."""
+        mp3_path = _paths_for_video(video, self.mp3_dir, self.trans_dir)[3]
+        if not reuse_audio(self.mp3_dir, video["id"], mp3_path):
+            return False
+        self.stats.add("audio_reused")
+        if self.audio_cache is not None:
+            self.audio_cache.hold(mp3_path)
+        if self.predecoder is not None:
+            self.predecoder.submit(mp3_path)
+        return True
+
+    def download(self, video: dict) -> Tuple[bool, str]:
+        controller = self.controller
+        mp3_path = _paths_for_video(video, self.mp3_dir, self.trans_dir)[3]
+        cookies = video.get("_cookies")
+        reused = reuse_audio(self.mp3_dir, video["id"], mp3_path)
+        if self.audio_cache is not None:
+            # held from the start: LRU must not evict it between rename and ASR
+            self.audio_cache.reserve(mp3_path)
+        ok = False
+        try:
+            with self._stage(
+                ev.DOWNLOAD, video["id"], attempt=video.get("_retry"), reused=reused or None
+            ) as event:
+                progress = self._progress(video["id"], event)
+                if controller is None or reused:
+                    ok, msg = download_audio_task(
+                        video, self.mp3_dir, self.trans_dir, self.logf, cookies, progress
+                    )
+                else:
+                    with controller.slot():
+                        ok, msg = download_audio_task(
+                            video, self.mp3_dir, self.trans_dir, self.logf, cookies, progress
+                        )
+                    controller.observe(ok, msg)
+                if ok:
+                    event["bytes"] = file_size(mp3_path)
+                    if not reused:
+                        self._count_audio(video, event["bytes"], event)
+                else:
+                    event.update(outcome=ev.ERROR, error=msg)
+        finally:
+            if self.audio_cache is not None:
+                self.audio_cache.downloaded(mp3_path, ok)
+        if ok:
+            if reused:
+                self.stats.add("audio_reused")
+            if self.predecoder is not None:
+                self.predecoder.submit(mp3_path)
+            self._note(video["id"], DOWNLOADED)
+        else:
+            self._note(video["id"], FAILED, at="download", reason=msg)
+        return ok, msg
 
-    with open(log_path, "a", encoding="utf-8") as logf:
-        logf.write(f"\n--- Processing run started at {datetime.now()} ---\n")
-        logf.write(
-            f"Targeting latest {num_videos_target} videos out of {total_videos_found} total.\n"
+    def _stream_transcribe(self, video: dict, pool: Any, event: dict) -> Tuple[str, str]:
+        """Download and Whisper in one pass (``stream_audio``); no retries."""
+        video_id, video_url, title, mp3_path, txt_path = _paths_for_video(
+            video, self.mp3_dir, self.trans_dir
         )
-        logf.write(
-            f"prefer_captions={prefer_captions} whisper_fallback={whisper_fallback} "
-            f"workers={max_workers} models={pool_size} caption_delay={caption_delay} "
-            f"pace_seconds={pace_seconds} safe={safe}\n"
+        keep = self.audio_cache is None or self.audio_cache.policy != CACHE_DELETE
+        print(
+            f"{Fore.WHITE}[{video_id}] Transcribing audio (Whisper, streaming)..."
+            f"{Style.RESET_ALL}"
         )
+        if keep and self.audio_cache is not None:
+            self.audio_cache.reserve(mp3_path)
+        ok = False
+        try:
+            with open_audio_stream(
+                video_url, video.get("_cookies"), keep_file=mp3_path if keep else None
+            ) as stream:
+                timing: dict = {}
+                ok, err = transcribe_stream(stream, pool, txt_path, timing=timing)
+        finally:
+            if keep and self.audio_cache is not None:
+                self.audio_cache.downloaded(mp3_path, ok)
+        # the stage also spans the download: runtime history uses asr_seconds
+        event.update(
+            streamed=True,
+            download_bytes=stream.bytes_in,
+            asr_seconds=round(timing.get("asr_seconds", 0.0), 3),
+        )
+        if ok:
+            self._count_audio(video, stream.bytes_in, event)
+        if self.controller is not None and (ok or stream.error):
+            self.controller.observe(ok, stream.error or "")
+        if ok:
+            self.stats.add("streamed")
+            print(f"{Fore.GREEN}[{video_id}] Whisper saved to {txt_path}{Style.RESET_ALL}")
+            return "whisper", f"Whisper processed {title} ({video_id})"
+        kind = "Download" if stream.error else "Transcription"
+        msg = f"{kind} error for {title} ({video_id}): {err}"
+        print(f"{Fore.RED + Style.BRIGHT}[{video_id}] {msg}{Style.RESET_ALL}")
+        self.logf.write(msg + "\n")
+        return "error", msg
 
-        # --- Phase 1: skip existing + captions (serial, rate-friendly) ---
-        for idx, video in enumerate(videos):
-            if checked_count >= num_videos_target:
+    def transcribe(self, video: dict, pool: Any) -> Tuple[str, str]:
+        _, _, _, mp3_path, txt_path = _paths_for_video(video, self.mp3_dir, self.trans_dir)
+        try:
+            streamed = self.stream_audio and not os.path.exists(mp3_path)
+            audio = None
+            if self.predecoder is not None and not streamed:
+                # wait for the decode before the stage timer: RTF is inference only
+                audio = self.predecoder.take(mp3_path)
+            try:
+                with self._stage(
+                    ev.TRANSCRIBE, video["id"], audio_seconds=video_duration(video)
+                ) as event:
+                    if streamed:
+                        status, msg = self._stream_transcribe(video, pool, event)
+                    else:
+                        status, msg = transcribe_audio_task(
+                            video, self.mp3_dir, self.trans_dir, self.logf, pool, audio
+                        )
+                    if audio is not None and audio != mp3_path:
+                        event["predecoded"] = True
+                    if status == "whisper":
+                        event["bytes"] = file_size(txt_path)
+                    else:
+                        event.update(outcome=ev.ERROR, error=msg)
+            finally:
+                if audio is not None:
+                    self.predecoder.discard(mp3_path)
+            if status == "whisper":
+                self.index.add(video["id"], txt_path)
+                self._note(video["id"], TRANSCRIBED, via="whisper")
+            else:
+                self._note(video["id"], FAILED, at="transcribe", reason=msg)
+            if self.audio_cache is not None:
+                self.audio_cache.finished(mp3_path, status == "whisper")
+        finally:
+            self.release(video)
+        return status, msg
+
+    def steps(self, queue_whisper: Callable[[dict, bool], None]) -> Iterator[None]:
+        """Phase 1 for this channel; yields once per video checked."""
+        stats = self.stats
+        prefix = f"{self.name}: " if self.name else ""
+
+        def _queue(video: dict, ready: bool) -> None:
+            # streamed videos download inside the ASR stage
+            queue_whisper(video, ready or self.stream_audio)
+            self._emit("queued", id=video["id"], ready=ready or None)
+
+        def _skipped(video_id: str, via: str) -> None:
+            self._emit("done", id=video_id, stage=ev.SKIP, outcome=ev.SKIPPED, via=via)
+
+        for idx, video in enumerate(self.videos):
+            if stats["checked"] >= self.num_videos_target:
                 print(
-                    f"{Fore.YELLOW}Reached target of {num_videos_target} videos checked. "
-                    f"Stopping discovery.{Style.RESET_ALL}"
+                    f"{Fore.YELLOW}{prefix}Reached target of {self.num_videos_target} "
+                    f"videos checked. Stopping discovery.{Style.RESET_ALL}"
                 )
-                break
+                return
 
             video_id = video["id"]
             title = video.get("title", f"video_{video_id}")
             print(
-                f"\n{Fore.WHITE}[{idx + 1}/{total_videos_found}] Checking video: "
+                f"\n{Fore.WHITE}{prefix}[{idx + 1}/{len(self.videos)}] Checking video: "
                 f"{title} ({video_id}){Style.RESET_ALL}"
             )
-
-            found_existing = False
-            for existing_file in existing_transcriptions:
-                if video_id in existing_file and existing_file.endswith(".txt"):
+            self._emit("check", id=video_id, n=idx + 1, of=len(self.videos))
+
+            if self.resume_state:
+                action = resume_action(self.resume_state.get(video_id))
+                if action == "asr" and not self.audio_on_disk(video):
+                    action = "whisper"
+                if action == "done":
+                    print(f"{Fore.YELLOW}  - Journal: already done. Skipping.{Style.RESET_ALL}")
+                    _skipped(video_id, "journal")
+                    stats.add("skipped")
+                    stats.add("checked")
+                    yield
+                    continue
+                if action in ("whisper", "asr"):
+                    stats.add("checked")
+                    if not self.whisper_fallback:
+                        stats.add("error")
+                        yield
+                        continue
                     print(
-                        f"{Fore.YELLOW}  - Transcription file containing ID {video_id} already exists: "
-                        f"{existing_file}. Skipping.{Style.RESET_ALL}"
+                        f"{Fore.BLUE}  - Journal: resuming at "
+                        f"{'ASR (audio on disk)' if action == 'asr' else 'Whisper download'}"
+                        f"{Style.RESET_ALL}"
                     )
-                    found_existing = True
-                    skipped_count += 1
-                    break
+                    _queue(video, action == "asr")
+                    yield
+                    continue
 
-            checked_count += 1
-            if found_existing:
+            existing_file = self.index.find(video_id)
+            stats.add("checked")
+            if existing_file:
+                print(
+                    f"{Fore.YELLOW}  - Transcription file containing ID {video_id} already exists: "
+                    f"{existing_file}. Skipping.{Style.RESET_ALL}"
+                )
+                stats.add("skipped")
+                self._note(video_id, SKIPPED)
+                _skipped(video_id, "transcript")
+                yield
                 continue
 
-            if prefer_captions and not captions_disabled_this_run:
-                _, _, _, _, txt_path = _paths_for_video(video, mp3_dir, trans_dir)
+            if self.prefer_captions and (not self.gate.disabled or self.subtitles is not None):
+                if not self.claim(video):
+                    stats.add("claimed")
+                    yield
+                    continue
+                _, _, _, _, txt_path = _paths_for_video(video, self.mp3_dir, self.trans_dir)
                 print(f"{Fore.BLUE}  - Trying captions...{Style.RESET_ALL}")
-                ok, detail = try_captions_to_file(video_id, txt_path)
+                try:
+                    with self._stage(ev.CAPTIONS, video_id) as event:
+                        ok, detail = self._captions_to_file(idx, txt_path)
+                        if ok:
+                            event["bytes"] = file_size(txt_path)
+                        else:
+                            event.update(outcome=ev.MISS, error=detail)
+                finally:
+                    # a miss is leased again before its download
+                    self.release(video)
+                self.gate.observe(ok, detail, self.logf)
+                if self.gate.disabled and self.captions is not None:
+                    self.captions.cancel()
                 if ok:
                     print(f"{Fore.GREEN}  - Captions OK ({detail}){Style.RESET_ALL}")
-                    caption_count += 1
-                    caption_ip_block_streak = 0
-                    existing_transcriptions.append(os.path.basename(txt_path))
-                    if caption_delay > 0:
-                        time.sleep(caption_delay)
+                    stats.add("captions")
+                    self._note(video_id, TRANSCRIBED, via="captions")
+                    self.index.add(video_id, txt_path)
+                    yield
                     continue
                 print(f"{Fore.YELLOW}  - Captions miss: {detail}{Style.RESET_ALL}")
-                logf.write(f"Captions miss {video_id}: {detail}\n")
-                if _looks_like_ip_block(detail):
-                    caption_ip_block_streak += 1
-                    if caption_ip_block_streak >= IP_BLOCK_STREAK_LIMIT:
-                        captions_disabled_this_run = True
-                        msg = (
-                            f"Caption API IP-blocked {caption_ip_block_streak}x in a row — "
-                            f"skipping further caption attempts this run; Whisper fallback."
-                        )
-                        print(f"{Fore.MAGENTA}{msg}{Style.RESET_ALL}")
-                        logf.write(msg + "\n")
-                else:
-                    caption_ip_block_streak = 0
-                if caption_delay > 0 and not captions_disabled_this_run:
-                    time.sleep(caption_delay)
-                if not whisper_fallback:
-                    error_count += 1
-                    logf.write(f"No captions and Whisper disabled: {video_id}\n")
+                self.logf.write(f"Captions miss {video_id}: {detail}\n")
+                self._note(video_id, CAPTION_MISS, reason=detail)
+                if not self.whisper_fallback:
+                    stats.add("error")
+                    self.logf.write(f"No captions and Whisper disabled: {video_id}\n")
+                    self._note(video_id, FAILED, at="captions", reason=detail)
+                    yield
                     continue
-                need_whisper.append(video)
+                _queue(video, self.audio_on_disk(video))
             else:
-                if prefer_captions and captions_disabled_this_run:
+                if self.prefer_captions and self.gate.disabled:
                     print(
                         f"{Fore.YELLOW}  - Captions skipped (API blocked this run) "
                         f"→ Whisper queue{Style.RESET_ALL}"
                     )
-                need_whisper.append(video)
+                if not self.whisper_fallback:
+                    stats.add("error")
+                    yield
+                    continue
+                _queue(video, self.audio_on_disk(video))
+            yield
+
+
+def run_channel_batches(
+    batches: List[ChannelBatch],
+    options: Optional[BatchOptions] = None,
+    *,
+    controller: Optional[AdaptiveConcurrency] = None,
+    retry_policy: Optional[RetryPolicy] = None,
+    shutdown: Optional[GracefulShutdown] = None,
+) -> None:
+    """
+    Drive one or more :class:`ChannelBatch` over a single Whisper stage.
+
+    Every channel shares one lazily loaded model pool, one set of download
+    threads and the process-wide rate limits; Phase 1 steps are interleaved
+    per ``options.schedule`` so no channel waits for another to finish.
+    ``controller`` caps concurrent downloads (AIMD), ``retry_policy`` puts
+    transient download failures back on the queue, and once ``shutdown`` is
+    draining no new work starts and each batch journals a checkpoint.
+    """
+    opts = options or BatchOptions()
+    limiter = rate_limiter()
+    limiter.configure(CAPTIONS, per_second(opts.caption_delay))
+    limiter.configure(DOWNLOAD, per_second(opts.pace_seconds))
+    whisper_fallback = any(b.whisper_fallback for b in batches)
+    need_whisper: List[Tuple[dict, bool]] = []
+    queued: List[dict] = []
+    priority = order_key(opts.order)
+    # Past runs only: read before this run adds transcribe events
+    runtime = RuntimeModel.from_events(
+        (b.events.path for b in batches if b.events), opts.whisper_batch
+    )
+    budget: Optional[TimeBudget] = None
+    if opts.deadline is not None:
+        budget = TimeBudget(
+            opts.deadline,
+            runtime,
+            opts.model_name,
+            workers=1 if opts.pace_seconds > 0 else opts.pool_size,
+        )
+        history = runtime.samples(opts.model_name)
+        line = (
+            f"Deadline {datetime.fromtimestamp(opts.deadline):%Y-%m-%d %H:%M} "
+            f"({budget.remaining() / 60:.0f}m left); Whisper '{opts.model_name}' "
+            f"{runtime.rtf(opts.model_name):.3f}s per audio second "
+            f"({f'{history / 3600:.1f}h audio history' if history else 'default estimate'})"
+        )
+        print(f"{Fore.BLUE}{line}{Style.RESET_ALL}")
+        for b in batches:
+            b.logf.write(line + "\n")
 
-        # --- Phase 2: Whisper for remaining ---
-        futures = []
-        if need_whisper and whisper_fallback:
+    def _load_pool() -> ModelPool:
+        print(
+            f"\n{Fore.MAGENTA}Loading {opts.pool_size} instance(s) of Whisper "
+            f"'{opts.model_name}'..."
+            f"{Style.RESET_ALL}"
+        )
+        if opts.whisper_backend == BACKEND_PROCESS:
+            if get_whisper_runtime()[0] == "cpu":
+                return ProcessModelPool(
+                    opts.model_name,
+                    opts.pool_size,
+                    cpu_threads=opts.cpu_threads,
+                    batch_size=opts.whisper_batch,
+                )
             print(
-                f"\n{Fore.MAGENTA}Loading {pool_size} instance(s) of Whisper '{model_name}' "
-                f"for {len(need_whisper)} video(s)...{Style.RESET_ALL}"
+                f"{Fore.YELLOW}GPU available: the process backend is for CPU hosts; "
+                f"using the thread pool.{Style.RESET_ALL}"
             )
-            try:
-                model_pool = ModelPool(model_name, pool_size)
-            except Exception as e:
-                print(f"{Fore.RED}Error initializing model pool: {e}{Style.RESET_ALL}")
-                logf.write(f"Model pool init failed: {e}\n")
-                error_count += len(need_whisper)
-                need_whisper = []
-                model_pool = None
-
-            if model_pool is not None:
-                n_w = len(need_whisper)
-                if pace_seconds > 0:
-                    print(
-                        f"{Fore.BLUE}--- Paced Whisper: {n_w} video(s), "
-                        f"≥{pace_seconds:.0f}s between starts (serial)... ---{Style.RESET_ALL}"
-                    )
-                    for i, video in enumerate(need_whisper, 1):
-                        t0 = time.monotonic()
-                        vid = video.get("id", "?")
-                        print(
-                            f"{Fore.CYAN}[pace {i}/{n_w}] {vid} "
-                            f"(min interval {pace_seconds:.0f}s){Style.RESET_ALL}"
-                        )
-                        try:
-                            status, _message = process_whisper_only_task(
-                                video, mp3_dir, trans_dir, logf, model_pool, None
-                            )
-                            if status == "whisper":
-                                whisper_count += 1
-                            elif status == "captions":
-                                caption_count += 1
-                            elif status == "error":
-                                error_count += 1
-                        except Exception as exc:
-                            error_count += 1
-                            print(
-                                f"{Fore.RED + Style.BRIGHT}A task generated an exception: "
-                                f"{exc}{Style.RESET_ALL}"
-                            )
-                            logf.write(f"A task generated an exception: {exc}\n")
-                        elapsed = time.monotonic() - t0
-                        remaining = pace_seconds - elapsed
-                        if remaining > 0 and i < n_w:
-                            print(
-                                f"{Fore.BLUE}  pacing sleep {remaining:.0f}s "
-                                f"(work took {elapsed:.0f}s)...{Style.RESET_ALL}"
-                            )
-                            time.sleep(remaining)
+        kwargs = {}
+        if opts.cpu_threads:
+            kwargs["cpu_threads"] = opts.cpu_threads
+        if opts.whisper_batch > 1:
+            kwargs["batch_size"] = opts.whisper_batch
+        return ModelPool(opts.model_name, opts.pool_size, **kwargs)
+
+    # Queued videos carry their channel so the shared stage can route them
+    def _batch(video: dict) -> ChannelBatch:
+        return video["_batch"]
+
+    def _admit(video: dict) -> bool:
+        if budget.admit(video):
+            return True
+        _batch(video).defer(video, runtime.seconds(video, opts.model_name))
+        return False
+
+    def _download(video: dict) -> Tuple[bool, str]:
+        ok = False
+        try:
+            ok, msg = _batch(video).download(video)
+            return ok, msg
+        finally:
+            if budget is not None and not ok:
+                budget.release(video)
+
+    def _retry(video: dict, message: str) -> Optional[float]:
+        delay = retry_policy(video, message)
+        if delay is not None:
+            _batch(video).retry_later(video, delay, retry_policy.max_retries)
+        return delay
+
+    def _transcribe(video: dict, pool: Any) -> Tuple[str, str]:
+        try:
+            return _batch(video).transcribe(video, pool)
+        finally:
+            if budget is not None:
+                budget.release(video)
+
+    stage = None
+    download_workers = controller.maximum if controller else opts.max_workers
+    if whisper_fallback:
+        stage = WhisperStage(
+            _download,
+            _transcribe,
+            _load_pool,
+            batches[0].stats,
+            batches[0].logf,
+            download_workers=download_workers,
+            asr_workers=(
+                max(opts.pool_size, download_workers)
+                if any(b.stream_audio for b in batches)
+                else opts.pool_size
+            ),
+            prefetch=opts.prefetch,
+            pace_seconds=opts.pace_seconds,
+            route=lambda video: (_batch(video).stats, _batch(video).logf),
+            priority=priority,
+            admit=_admit if budget is not None else None,
+            retry=_retry if retry_policy is not None else None,
+            claim=(
+                (lambda video: _batch(video).claim(video))
+                if any(b.claims is not None for b in batches)
+                else None
+            ),
+            release=lambda video: _batch(video).release(video),
+            fail=lambda video, at, message: _batch(video).fail(video, at, message),
+        )
+        if opts.pipelined:
+            stage.start()
+        if shutdown is not None:
+            shutdown.on_drain(stage.stop)
+
+    def _queue_for(batch: ChannelBatch) -> Callable[[dict, bool], None]:
+        def _queue_whisper(video: dict, ready: bool) -> None:
+            item = dict(video, _batch=batch)
+            queued.append(item)
+            if stage is not None and opts.pipelined:
+                if ready:
+                    stage.put_ready(item)
                 else:
-                    print(
-                        f"{Fore.BLUE}--- Submitting {n_w} Whisper tasks "
-                        f"(up to {max_workers} workers)... ---{Style.RESET_ALL}"
-                    )
-                    with concurrent.futures.ThreadPoolExecutor(
-                        max_workers=max_workers
-                    ) as executor:
-                        for video in need_whisper:
-                            futures.append(
-                                executor.submit(
-                                    process_whisper_only_task,
-                                    video,
-                                    mp3_dir,
-                                    trans_dir,
-                                    logf,
-                                    model_pool,
-                                    None,
-                                )
-                            )
-                        for future in concurrent.futures.as_completed(futures):
-                            try:
-                                status, _message = future.result()
-                                if status == "whisper":
-                                    whisper_count += 1
-                                elif status == "captions":
-                                    caption_count += 1
-                                elif status == "error":
-                                    error_count += 1
-                            except Exception as exc:
-                                error_count += 1
-                                print(
-                                    f"{Fore.RED + Style.BRIGHT}A task generated an exception: "
-                                    f"{exc}{Style.RESET_ALL}"
-                                )
-                                logf.write(f"A task generated an exception: {exc}\n")
-        elif need_whisper and not whisper_fallback:
-            error_count += len(need_whisper)
+                    stage.put(item)
+            else:
+                need_whisper.append((item, ready))
+
+        return _queue_whisper
+
+    predecoder: Optional[PreDecoder] = None
+    if stage is not None and opts.predecode_workers > 0:
+        predecoder = PreDecoder(opts.predecode_workers)
+        for b in batches:
+            b.predecoder = predecoder
+
+    # --- Phase 1: skip existing + captions (in order, rate-limited) ---
+    engine: Optional[CaptionEngine] = None
+    if opts.caption_concurrency > 1 and any(b.prefer_captions for b in batches):
+        engine = CaptionEngine(
+            lambda video_id, languages: fetch_captions(video_id, languages),
+            opts.caption_concurrency,
+        ).start()
+        for b in batches:
+            b.captions = engine
+    if opts.subtitle_fallback:
+        subtitles = BulkSubtitles(
+            lambda ids: fetch_subtitles_bulk(ids, sleep_seconds=opts.caption_delay)
+        )
+        for b in batches:
+            b.subtitles = subtitles
+            b.gate.fallback = "bulk yt-dlp subtitles, then Whisper"
+    weights = [b.backlog for b in batches] if opts.schedule == SCHEDULE_BACKLOG else None
+    try:
+        for _ in interleave([b.steps(_queue_for(b)) for b in batches], weights):
+            if budget is not None and budget.expired:
+                print(
+                    f"{Fore.YELLOW}Deadline reached: stopping the caption sweep; "
+                    f"draining queued work.{Style.RESET_ALL}"
+                )
+                for b in batches:
+                    b.logf.write("Deadline reached: caption sweep stopped\n")
+                break
+            if shutdown is not None and shutdown.draining:
+                for b in batches:
+                    b.logf.write("Interrupted: caption sweep stopped\n")
+                break
+    finally:
+        if engine is not None:
+            engine.close()
+            for b in batches:
+                b.captions = None
+
+    # --- Phase 2: Whisper for remaining (drain the streaming queue) ---
+    if stage is not None:
+        n_w = stage.submitted if opts.pipelined else len(need_whisper)
+        if n_w:
+            if opts.pace_seconds > 0:
+                print(
+                    f"{Fore.BLUE}--- Paced Whisper: {n_w} video(s), "
+                    f"≥{opts.pace_seconds:.0f}s between starts (serial)... ---{Style.RESET_ALL}"
+                )
+            else:
+                print(
+                    f"{Fore.BLUE}--- Submitting {n_w} Whisper tasks "
+                    f"(up to {stage.workers} workers, {opts.pool_size} model(s), "
+                    f"prefetch {stage.ready.queue.maxsize})... ---{Style.RESET_ALL}"
+                )
+        try:
+            if not opts.pipelined:
+                if priority is not None:
+                    need_whisper.sort(key=lambda t: priority(t[0]))
+                stage.start()
+                for video, ready in need_whisper:
+                    if ready:
+                        stage.put_ready(video)
+                    else:
+                        stage.put(video)
+            stage.close()
+        finally:
+            if predecoder is not None:
+                predecoder.close()
+                for b in batches:
+                    b.predecoder = None
+        if predecoder is not None and (predecoder.decoded or predecoder.failed):
+            _report_predecode(batches, predecoder)
+        if stage.asr_window is not None:
+            _report_makespan(batches, queued, stage, runtime, opts.model_name, opts.order)
+
+    if shutdown is not None and shutdown.draining:
+        dropped = stage.dropped if stage is not None else []
+        for b in batches:
+            b.checkpoint([v for v in dropped if v.get("_batch") is b])
+
+    for b in batches:
+        b.stats.finish()
+
+
+def _report_predecode(batches: List[ChannelBatch], predecoder: PreDecoder) -> None:
+    line = (
+        f"Pre-decoded {predecoder.decoded} file(s) "
+        f"({predecoder.audio_seconds / 3600:.1f}h audio, {predecoder.workers} process(es)); "
+        f"ASR waited {predecoder.wait_seconds:.1f}s for decodes"
+        + (f", {predecoder.failed} decoded by the model instead" if predecoder.failed else "")
+    )
+    print(f"{Fore.BLUE}{line}{Style.RESET_ALL}")
+    for b in batches:
+        b.logf.write(line + "\n")
+
+
+def _report_makespan(
+    batches: List[ChannelBatch],
+    queued: List[dict],
+    stage: WhisperStage,
+    runtime: RuntimeModel,
+    model_name: str,
+    order: str,
+) -> None:
+    """Predicted (runtime model) vs measured ASR makespan, to console, logs and events."""
+    predicted = runtime.makespan(queued, model_name, stage.ready.workers, order)
+    actual = stage.asr_window or 0.0
+    audio = sum(video_duration(v) for v in queued)
+    line = (
+        f"Makespan ({order}, {len(queued)} video(s), {audio / 3600:.1f}h audio): "
+        f"predicted {predicted / 60:.1f}m at {runtime.rtf(model_name):.3f}s/s, "
+        f"actual {actual / 60:.1f}m"
+    )
+    print(f"{Fore.BLUE}{line}{Style.RESET_ALL}")
+    for b in batches:
+        b.logf.write(line + "\n")
+        b._emit(
+            "makespan",
+            order=order,
+            model=model_name,
+            videos=len(queued),
+            audio_seconds=round(audio, 1),
+            predicted=round(predicted, 3),
+            actual=round(actual, 3),
+        )
+
+
+def run_batch_phases(
+    videos: List[dict],
+    num_videos_target: int,
+    mp3_dir: str,
+    trans_dir: str,
+    logf: Any,
+    options: Optional[BatchOptions] = None,
+    *,
+    journal: Optional[RunJournal] = None,
+    resume_state: Optional[Dict[str, dict]] = None,
+    controller: Optional[AdaptiveConcurrency] = None,
+    events: Optional[EventSink] = None,
+    retry_policy: Optional[RetryPolicy] = None,
+    claims: Optional[LeaseBoard] = None,
+    shutdown: Optional[GracefulShutdown] = None,
+    audio_cache: Optional[AudioCache] = None,
+) -> BatchStats:
+    """
+    Skip check + captions over ``videos``, Whisper for the misses.
+
+    One channel through :func:`run_channel_batches`. Stage transitions go to
+    ``journal`` and timed stage events to ``events`` when given;
+    ``resume_state`` (last journal row per video id) skips finished work,
+    ``claims`` leases videos on a shared archive and ``audio_cache`` applies
+    a ``mp3/`` retention policy.
+    """
+    opts = options or BatchOptions()
+    batch = ChannelBatch(
+        videos,
+        num_videos_target,
+        mp3_dir,
+        trans_dir,
+        logf,
+        prefer_captions=opts.prefer_captions,
+        whisper_fallback=opts.whisper_fallback,
+        journal=journal,
+        resume_state=resume_state,
+        controller=controller,
+        mode="pipelined" if opts.pipelined else "two-phase",
+        events=events,
+        claims=claims,
+        audio_cache=audio_cache,
+        stream_audio=opts.stream_audio,
+    )
+    run_channel_batches(
+        [batch], opts, controller=controller, retry_policy=retry_policy, shutdown=shutdown
+    )
+    return batch.stats
 
+
+def _print_batch_summary(stats: BatchStats, num_videos_target: int, log_path: str) -> None:
     print(f"\n{Fore.GREEN + Style.BRIGHT}Batch processing summary:{Style.RESET_ALL}")
     print(
         f"{Fore.WHITE} - Videos checked (up to target): "
-        f"{min(checked_count, num_videos_target)}/{num_videos_target}{Style.RESET_ALL}"
+        f"{min(stats['checked'], num_videos_target)}/{num_videos_target}{Style.RESET_ALL}"
     )
     print(
-        f"{Fore.WHITE} - New via captions: {caption_count}{Style.RESET_ALL}"
+        f"{Fore.WHITE} - New via captions: {stats['captions']}{Style.RESET_ALL}"
     )
     print(
-        f"{Fore.WHITE} - New via Whisper: {whisper_count}{Style.RESET_ALL}"
+        f"{Fore.WHITE} - New via Whisper: {stats['whisper']}{Style.RESET_ALL}"
     )
     print(
         f"{Fore.GREEN} - New videos successfully processed: "
-        f"{caption_count + whisper_count}{Style.RESET_ALL}"
+        f"{stats['captions'] + stats['whisper']}{Style.RESET_ALL}"
     )
     print(
-        f"{Fore.YELLOW} - Videos skipped (already existed within target): {skipped_count}{Style.RESET_ALL}"
+        f"{Fore.YELLOW} - Videos skipped (already existed within target): "
+        f"{stats['skipped']}{Style.RESET_ALL}"
     )
-    print(f"{Fore.RED + Style.BRIGHT} - Errors during processing: {error_count}{Style.RESET_ALL}")
+    print(f"{Fore.RED + Style.BRIGHT} - Errors during processing: {stats['error']}{Style.RESET_ALL}")
+    if stats["retried"]:
+        print(f"{Fore.WHITE} - Download retries within the run: {stats['retried']}{Style.RESET_ALL}")
+    if stats["deferred"]:
+        print(
+            f"{Fore.YELLOW} - Deferred past the deadline (left for the next run): "
+            f"{stats['deferred']}{Style.RESET_ALL}"
+        )
+    if stats["interrupted"]:
+        print(
+            f"{Fore.YELLOW} - Interrupted before download (left for --resume): "
+            f"{stats['interrupted']}{Style.RESET_ALL}"
+        )
+    if stats["subtitles"]:
+        print(
+            f"{Fore.WHITE} - Captions via bulk yt-dlp subtitles (API blocked): "
+            f"{stats['subtitles']}{Style.RESET_ALL}"
+        )
+    if stats["streamed"]:
+        print(
+            f"{Fore.WHITE} - Whisper videos streamed into the model (no download stage): "
+            f"{stats['streamed']}{Style.RESET_ALL}"
+        )
+    if stats["audio_bytes"]:
+        saved = stats["audio_bytes_saved"]
+        print(
+            f"{Fore.WHITE} - Audio downloaded: {stats['audio_bytes'] / 1e6:.1f} MB"
+            + (f" (~{saved / 1e6:.1f} MB less than bestaudio)" if saved else "")
+            + Style.RESET_ALL
+        )
+    if stats["audio_reused"]:
+        print(
+            f"{Fore.WHITE} - Audio reused from mp3/ (not downloaded again): "
+            f"{stats['audio_reused']}{Style.RESET_ALL}"
+        )
+    if stats["audio_removed"]:
+        print(
+            f"{Fore.WHITE} - Audio files removed by the cache policy: "
+            f"{stats['audio_removed']}{Style.RESET_ALL}"
+        )
+    if stats["claimed"]:
+        print(
+            f"{Fore.YELLOW} - Claimed / finished by another host: "
+            f"{stats['claimed']}{Style.RESET_ALL}"
+        )
+    print(f"{Fore.WHITE} - Throughput: {stats.throughput_line()}{Style.RESET_ALL}")
     print(f"{Fore.WHITE} - Detailed errors (if any) are logged in {log_path}{Style.RESET_ALL}")
@@ -0,0 +1,217 @@
+"""Per-channel write-ahead batch journal (append-only JSONL).
+
+``channels/<Name>/logs/batch-journal.jsonl`` gets one line per stage
+transition, flushed as it happens::
+
+    {"ts": "...", "event": "run_start", "resume": false}
+    {"ts": "...", "event": "discovery", "count": 2, "ids": ["abcdefghijk", "..."]}
+    {"ts": "...", "id": "abcdefghijk", "stage": "discovered", "entry": {...}}
+    {"ts": "...", "id": "abcdefghijk", "stage": "caption_miss", "reason": "..."}
+    {"ts": "...", "id": "abcdefghijk", "stage": "downloaded"}
+    {"ts": "...", "id": "abcdefghijk", "stage": "transcribed", "via": "whisper"}
+    {"ts": "...", "id": "abcdefghijk", "stage": "failed", "at": "download", "reason": "..."}
+    {"ts": "...", "event": "interrupted", "pending": ["..."], "unchecked": 12}
+
+``--resume`` replays the latest discovery list (no yt-dlp channel listing)
+and each video's last stage, so finished work and known caption misses are
+not repeated. A discovery writes its ids in listing order, but ``discovered``
+rows only for videos that are new or whose listing fields changed, so
+re-listing a large channel adds one line, not one per video.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from suxxtext.paths import CHANNELS_ROOT
+
+JOURNAL_NAME = "batch-journal.jsonl"
+
+# Stages
+DISCOVERED = "discovered"
+SKIPPED = "skipped"
+CAPTION_MISS = "caption_miss"
+DOWNLOADED = "downloaded"
+TRANSCRIBED = "transcribed"
+FAILED = "failed"
+
+DONE_STAGES = (SKIPPED, TRANSCRIBED)
+
+# Flat-listing fields worth keeping to rebuild the work list without yt-dlp
+_ENTRY_KEYS = ("id", "title", "view_count", "duration", "upload_date", "url", "ie_key")
+
+
+def compact_entry(video: dict) -> dict:
+    """The listing fields of ``video`` needed to rebuild a work list offline."""
+    return {k: video.get(k) for k in _ENTRY_KEYS if video.get(k) is not None}
+
+
+def journal_path(channel_folder: str, channels_root: str = CHANNELS_ROOT) -> str:
+    return os.path.join(channels_root, channel_folder, "logs", JOURNAL_NAME)
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+
+class RunJournal:
+    """Thread-safe appender + reader for one channel's batch journal."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._fh = None
+
+    @classmethod
+    def for_channel(
+        cls, channel_folder: str, channels_root: str = CHANNELS_ROOT
+    ) -> "RunJournal":
+        return cls(journal_path(channel_folder, channels_root))
+
+    # -- writing ----------------------------------------------------------
+
+    def _write(self, row: Dict[str, Any]) -> None:
+        line = json.dumps(row, ensure_ascii=False)
+        with self._lock:
+            if self._fh is None:
+                os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+                self._fh = open(self.path, "a", encoding="utf-8")
+            self._fh.write(line + "\n")
+            self._fh.flush()
+
+    def start_run(self, resume: bool = False, **fields: Any) -> None:
+        self._write({"ts": _now(), "event": "run_start", "resume": resume, **fields})
+
+    def record(self, video_id: str, stage: str, **fields: Any) -> None:
+        row = {"ts": _now(), "id": video_id, "stage": stage}
+        row.update({k: v for k, v in fields.items() if v is not None})
+        self._write(row)
+
+    def record_discovered(self, videos: List[dict]) -> None:
+        """The listing order, plus a ``discovered`` line per new or changed video."""
+        _, known = self._discovery()
+        self._write(
+            {
+                "ts": _now(),
+                "event": "discovery",
+                "count": len(videos),
+                "ids": [v["id"] for v in videos],
+            }
+        )
+        for v in videos:
+            entry = compact_entry(v)
+            if known.get(v["id"]) != entry:
+                self.record(v["id"], DISCOVERED, entry=entry)
+
+    def mark_interrupted(self, pending: List[str], unchecked: int = 0) -> None:
+        """Checkpoint of a drained run: queued ids not started, videos never checked."""
+        self._write(
+            {"ts": _now(), "event": "interrupted", "pending": pending, "unchecked": unchecked}
+        )
+
+    def close(self) -> None:
+        with self._lock:
+            if self._fh is not None:
+                self._fh.close()
+                self._fh = None
+
+    def __enter__(self) -> "RunJournal":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    # -- reading ----------------------------------------------------------
+
+    def _rows(self):
+        if not os.path.isfile(self.path):
+            return
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    # torn last line after a crash — ignore
+                    continue
+
+    def _discovery(self) -> Tuple[List[dict], Dict[str, dict]]:
+        """``(latest listing, last entry per id over every discovery)``."""
+        entries: Dict[str, dict] = {}
+        order: Optional[List[str]] = None
+        since: List[dict] = []  # journals written before ``ids``: rows after the event
+        for row in self._rows():
+            if row.get("event") == "discovery":
+                order = row.get("ids")
+                since = []
+            elif row.get("stage") == DISCOVERED and row.get("entry"):
+                entries[row["id"]] = row["entry"]
+                since.append(row["entry"])
+        if order is None:
+            return since, entries
+        return [entries[vid] for vid in order if vid in entries], entries
+
+    def discovered(self) -> List[dict]:
+        """Entries from the most recent discovery, in listing order."""
+        return self._discovery()[0]
+
+    def states(self) -> Dict[str, dict]:
+        """Last non-discovery stage row per video id."""
+        out: Dict[str, dict] = {}
+        for row in self._rows():
+            stage = row.get("stage")
+            vid = row.get("id")
+            if vid and stage and stage != DISCOVERED:
+                out[vid] = row
+        return out
+
+    def caption_history(self) -> Tuple[Set[str], Set[str]]:
+        """
+        ``(hits, misses)`` over every run: ids transcribed from captions, and
+        ids with a recorded caption miss (or a failed Whisper attempt).
+        """
+        hits: Set[str] = set()
+        misses: Set[str] = set()
+        for row in self._rows():
+            vid = row.get("id")
+            stage = row.get("stage")
+            if not vid:
+                continue
+            if stage == TRANSCRIBED and row.get("via") == "captions":
+                hits.add(vid)
+            elif stage == CAPTION_MISS or (
+                stage == FAILED and row.get("at") in ("download", "transcribe")
+            ):
+                misses.add(vid)
+        return hits, misses - hits
+
+
+def resume_action(state: Optional[dict]) -> str:
+    """
+    Map a video's last journal row to the work left for it.
+
+    ``done`` | ``whisper`` (skip captions) | ``asr`` (audio already on disk,
+    if the file still exists) | ``full`` (captions then Whisper).
+    """
+    if not state:
+        return "full"
+    stage = state.get("stage")
+    if stage in DONE_STAGES:
+        return "done"
+    if stage == CAPTION_MISS:
+        return "whisper"
+    if stage == DOWNLOADED:
+        return "asr"
+    if stage == FAILED:
+        at = state.get("at")
+        if at == "transcribe":
+            return "asr"
+        if at == "download":
+            return "whisper"
+    return "full"
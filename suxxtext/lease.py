@@ -0,0 +1,236 @@
+"""Lease files so several hosts can share one channel archive.
+
+With ``--shared-archive``, a batch process claims a video before it works on
+it by creating ``channels/<Name>/logs/claims/<id>.lease`` with
+``O_CREAT | O_EXCL``. Only one process can create the file, on a local disk
+or over NFS. The file records who holds the lease::
+
+    {"owner": "gpu-box-2:4242", "host": "gpu-box-2", "pid": 4242, "ts": 1700000000.0}
+
+A background thread touches every held lease each ``heartbeat`` seconds.
+A lease whose mtime is older than ``ttl`` belongs to a host that died or
+hung, and the next claimant reclaims it. A lease left by a dead process on
+the same host is reclaimed at once. Reclaiming renames the stale file aside
+before creating a new one, so only one process wins even when two try at
+once.
+
+Host clocks should agree to within a small part of ``ttl`` (NTP is enough).
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+import socket
+import threading
+import time
+from typing import Callable, List, Optional, Set
+
+from suxxtext.paths import CHANNELS_ROOT
+
+CLAIMS_DIR = "claims"
+LEASE_SUFFIX = ".lease"
+DEFAULT_LEASE_TTL = 600.0
+
+
+def claims_dir(channel_folder: str, channels_root: str = CHANNELS_ROOT) -> str:
+    return os.path.join(channels_root, channel_folder, "logs", CLAIMS_DIR)
+
+
+def owner_id() -> str:
+    """``host:pid`` — unique per process across the hosts sharing an archive."""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def _pid_alive(pid: int) -> bool:
+    if os.name == "nt":
+        return True  # no cheap probe; rely on the ttl
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        return True
+    return True
+
+
+def _read(path: str) -> Optional[dict]:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            info = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return info if isinstance(info, dict) else None
+
+
+class LeaseBoard:
+    """
+    Claims on video ids in one shared ``claims/`` directory.
+
+    :meth:`acquire` is re-entrant for the owner. :meth:`close` stops the
+    heartbeat and releases every lease still held, so after a clean exit
+    failed videos are free for other hosts again.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        owner: Optional[str] = None,
+        ttl: float = DEFAULT_LEASE_TTL,
+        heartbeat: Optional[float] = None,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.directory = directory
+        self.owner = owner or owner_id()
+        self.host = self.owner.rsplit(":", 1)[0]
+        self.ttl = float(ttl)
+        self.heartbeat_seconds = float(heartbeat) if heartbeat else self.ttl / 5
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._held: Set[str] = set()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._tag = re.sub(r"[^A-Za-z0-9_.-]", "_", self.owner)
+        os.makedirs(directory, exist_ok=True)
+
+    @classmethod
+    def for_channel(
+        cls, channel_folder: str, channels_root: str = CHANNELS_ROOT, **kwargs
+    ) -> "LeaseBoard":
+        return cls(claims_dir(channel_folder, channels_root), **kwargs)
+
+    def _path(self, video_id: str) -> str:
+        return os.path.join(self.directory, video_id + LEASE_SUFFIX)
+
+    # -- claiming ---------------------------------------------------------
+
+    def held(self) -> List[str]:
+        with self._lock:
+            return sorted(self._held)
+
+    def holder(self, video_id: str) -> Optional[dict]:
+        """The lease record for ``video_id``, or ``None`` if unclaimed."""
+        return _read(self._path(video_id))
+
+    def acquire(self, video_id: str) -> bool:
+        """Claim ``video_id``; ``False`` while another live process holds it."""
+        with self._lock:
+            if video_id in self._held:
+                return True
+        path = self._path(video_id)
+        for _ in range(3):
+            try:
+                fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o644)
+            except FileExistsError:
+                if not self._reclaim(path):
+                    return False
+                continue
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(
+                    {"owner": self.owner, "host": self.host, "pid": os.getpid(), "ts": self.clock()},
+                    f,
+                )
+            with self._lock:
+                self._held.add(video_id)
+            return True
+        return False
+
+    def _stale(self, path: str, info: Optional[dict]) -> bool:
+        try:
+            age = self.clock() - os.path.getmtime(path)
+        except OSError:
+            return True  # gone already
+        if age > self.ttl:
+            return True
+        if info is None:
+            # being written right now, or torn; only the ttl frees it
+            return False
+        if info.get("owner") == self.owner:
+            return True  # ours from before (e.g. a lost heartbeat); take it back
+        pid = info.get("pid")
+        return info.get("host") == self.host and isinstance(pid, int) and not _pid_alive(pid)
+
+    def _reclaim(self, path: str) -> bool:
+        """Move a stale lease aside; ``True`` when the path is free to create."""
+        info = _read(path)
+        if not self._stale(path, info):
+            return False
+        aside = f"{path}.{self._tag}.stale"
+        try:
+            os.rename(path, aside)
+        except FileNotFoundError:
+            return True  # someone else removed it first; race for the create
+        except OSError:
+            return False
+        moved = _read(aside)
+        if info is not None and (moved or {}).get("owner") != info.get("owner"):
+            # another claimant reclaimed and re-created it in between: put back
+            try:
+                os.link(aside, path)
+            except OSError:
+                pass
+            self._unlink(aside)
+            return False
+        self._unlink(aside)
+        return True
+
+    def release(self, video_id: str) -> None:
+        with self._lock:
+            if video_id not in self._held:
+                return
+            self._held.discard(video_id)
+        path = self._path(video_id)
+        if (_read(path) or {}).get("owner") == self.owner:
+            self._unlink(path)
+
+    @staticmethod
+    def _unlink(path: str) -> None:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    # -- heartbeat --------------------------------------------------------
+
+    def beat(self) -> List[str]:
+        """Refresh every held lease; returns ids lost to another claimant."""
+        lost = []
+        for video_id in self.held():
+            path = self._path(video_id)
+            if (_read(path) or {}).get("owner") != self.owner:
+                lost.append(video_id)
+                continue
+            try:
+                os.utime(path, None)
+            except OSError:
+                lost.append(video_id)
+        if lost:
+            with self._lock:
+                self._held.difference_update(lost)
+        return lost
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.heartbeat_seconds):
+            self.beat()
+
+    def start(self) -> "LeaseBoard":
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="lease-heartbeat", daemon=True)
+            self._thread.start()
+        return self
+
+    def close(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        for video_id in self.held():
+            self.release(video_id)
+
+    def __enter__(self) -> "LeaseBoard":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
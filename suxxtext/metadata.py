@@ -0,0 +1,228 @@
+"""Per-channel video metadata store (append-only JSONL, upsert by video id).
+
+``channels/<Name>/<Name>-videos.jsonl`` holds one row per change::
+
+    {"id": "abcdefghijk", "seen": [3, 0], "entry": {...yt-dlp flat entry...}}
+
+Reading replays the file (last row per id wins). :meth:`MetadataStore.upsert`
+merges new listing fields into the stored entry and appends a row only for
+new or changed videos, so a run touches a handful of lines instead of
+rewriting a tens-of-MB ``*-full-history.json``. Channel-level fields live in
+``<Name>-channel.json`` (rewritten only when they change). ``seen`` is
+(listing number, position) of first sighting, which keeps entries newest
+first across incremental listings.
+
+The legacy ``<Name>-full-history.json`` is produced on demand::
+
+    python -m suxxtext.metadata export Drberg
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from suxxtext.paths import CHANNELS_ROOT
+
+VIDEOS_SUFFIX = "-videos.jsonl"
+CHANNEL_SUFFIX = "-channel.json"
+LEGACY_SUFFIX = "-full-history.json"
+# Rewrite the JSONL once superseded rows outnumber live ones by this much
+COMPACT_SLACK = 1000
+
+
+def _canonical(obj: Any) -> str:
+    return json.dumps(obj, sort_keys=True, ensure_ascii=False)
+
+
+def _atomic_write_json(path: str, obj: Any, indent: Optional[int] = None) -> None:
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(obj, f, indent=indent, ensure_ascii=False)
+    os.replace(tmp, path)
+
+
+class MetadataStore:
+    """Upsert-only video metadata for one channel archive folder."""
+
+    def __init__(self, channel_folder: str, channels_root: str = CHANNELS_ROOT):
+        self.channel_folder = channel_folder
+        self.base = os.path.join(channels_root, channel_folder)
+        self.videos_path = os.path.join(self.base, channel_folder + VIDEOS_SUFFIX)
+        self.channel_path = os.path.join(self.base, channel_folder + CHANNEL_SUFFIX)
+        self.legacy_path = os.path.join(self.base, channel_folder + LEGACY_SUFFIX)
+        self._rows: Optional[Dict[str, dict]] = None
+        self._lines = 0
+
+    # -- reading ----------------------------------------------------------
+
+    def _load(self) -> Dict[str, dict]:
+        if self._rows is not None:
+            return self._rows
+        rows: Dict[str, dict] = {}
+        lines = 0
+        if os.path.isfile(self.videos_path):
+            with open(self.videos_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        row = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue  # torn last line after a crash
+                    if isinstance(row, dict) and row.get("id"):
+                        rows[row["id"]] = row
+                        lines += 1
+        self._rows, self._lines = rows, lines
+        if not rows and os.path.isfile(self.legacy_path):
+            self._import_legacy()
+        return self._rows
+
+    def _import_legacy(self) -> None:
+        """One-time seed from an existing ``*-full-history.json``."""
+        try:
+            entries, channel = load_history(self.legacy_path)
+        except (OSError, ValueError):
+            return
+        self.upsert(entries, channel)
+
+    def entries(self) -> List[dict]:
+        """Stored entries, newest first."""
+        rows = sorted(
+            self._load().values(), key=lambda r: (-r["seen"][0], r["seen"][1])
+        )
+        return [r["entry"] for r in rows]
+
+    def get(self, video_id: str) -> Optional[dict]:
+        row = self._load().get(video_id)
+        return row["entry"] if row else None
+
+    def channel(self) -> dict:
+        try:
+            with open(self.channel_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def __len__(self) -> int:
+        return len(self._load())
+
+    # -- writing ----------------------------------------------------------
+
+    def upsert(
+        self, entries: Iterable[dict], channel_info: Optional[dict] = None
+    ) -> Tuple[int, int]:
+        """Merge a listing (newest first); returns ``(added, updated)``."""
+        rows = self._load()
+        listing = 1 + max((r["seen"][0] for r in rows.values()), default=0)
+        added = updated = 0
+        out: List[str] = []
+        for pos, entry in enumerate(entries):
+            vid = entry.get("id") if entry else None
+            if not vid:
+                continue
+            old = rows.get(vid)
+            if old is None:
+                row = {"id": vid, "seen": [listing, pos], "entry": dict(entry)}
+                added += 1
+            else:
+                merged = {**old["entry"], **entry}
+                if _canonical(merged) == _canonical(old["entry"]):
+                    continue
+                row = {"id": vid, "seen": old["seen"], "entry": merged}
+                updated += 1
+            rows[vid] = row
+            out.append(json.dumps(row, ensure_ascii=False))
+        if out:
+            os.makedirs(self.base, exist_ok=True)
+            with open(self.videos_path, "a", encoding="utf-8") as f:
+                f.write("\n".join(out) + "\n")
+            self._lines += len(out)
+        if channel_info:
+            self._save_channel(channel_info)
+        if self._lines - len(rows) > max(len(rows), COMPACT_SLACK):
+            self.compact()
+        return added, updated
+
+    def _save_channel(self, channel_info: dict) -> None:
+        fields = {k: v for k, v in channel_info.items() if k != "entries"}
+        if _canonical(fields) == _canonical(self.channel()):
+            return
+        os.makedirs(self.base, exist_ok=True)
+        _atomic_write_json(self.channel_path, fields)
+
+    def compact(self) -> None:
+        """Rewrite the JSONL with one row per video."""
+        rows = self._load()
+        tmp = self.videos_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            for row in rows.values():
+                f.write(json.dumps(row, ensure_ascii=False) + "\n")
+        os.replace(tmp, self.videos_path)
+        self._lines = len(rows)
+
+    def export_legacy(self, path: Optional[str] = None) -> str:
+        """Write the old ``*-full-history.json`` shape; returns its path."""
+        path = path or self.legacy_path
+        data = dict(self.channel())
+        data["entries"] = self.entries()
+        _atomic_write_json(path, data, indent=4)
+        return path
+
+
+def load_history(path: str) -> Tuple[List[dict], dict]:
+    """
+    ``(entries, channel fields)`` from a ``*-videos.jsonl`` store or a legacy
+    ``*-full-history.json`` (dict with ``entries``, or a bare list).
+    """
+    if path.endswith(VIDEOS_SUFFIX):
+        base = os.path.dirname(os.path.abspath(path))
+        folder = os.path.basename(path)[: -len(VIDEOS_SUFFIX)]
+        store = MetadataStore(folder, os.path.dirname(base))
+        return store.entries(), store.channel()
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    if isinstance(data, list):
+        return data, {}
+    entries = data.get("entries") or []
+    return entries, {k: v for k, v in data.items() if k != "entries"}
+
+
+def build_parser() -> argparse.ArgumentParser:
+    p = argparse.ArgumentParser(
+        prog="python -m suxxtext.metadata",
+        description="Channel metadata store (channels/<Name>/<Name>-videos.jsonl).",
+    )
+    sub = p.add_subparsers(dest="cmd")
+    pe = sub.add_parser("export", help="Write the legacy <Name>-full-history.json")
+    pe.add_argument("channel", help="Archive folder name under channels/")
+    pe.add_argument("--out", default=None, help="Output path (default: next to the store)")
+    pc = sub.add_parser("compact", help="Rewrite the JSONL with one row per video")
+    pc.add_argument("channel", help="Archive folder name under channels/")
+    return p
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if not args.cmd:
+        parser.print_help()
+        return 2
+    store = MetadataStore(args.channel.lstrip("@"))
+    if not len(store):
+        print(f"No metadata for {args.channel} under {store.base}")
+        return 1
+    if args.cmd == "export":
+        path = store.export_legacy(args.out)
+        print(f"Exported {len(store)} videos to {path}")
+    elif args.cmd == "compact":
+        store.compact()
+        print(f"Compacted {store.videos_path} to {len(store)} rows")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,6 +1,8 @@
 """Near-real-time CLI dashboard for channel batch / PCS jobs.
 
-Reads ``channels/<Name>/logs/latest-batch.*`` and archive counts.
+Reads ``channels/<Name>/logs/latest-batch.*`` and archive counts. When the
+run writes ``logs/events.jsonl`` its exact counters, in-flight ids and stage
+timings replace the numbers scraped from the text log.
 No extra deps — colorama + ANSI clear + box drawing.
 """
 
@@ -12,16 +14,20 @@ import shutil
 import time
 from datetime import datetime
 from pathlib import Path
-from typing import List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple
 
 from colorama import Fore, Style
 
+from suxxtext.events import EVENTS_NAME, EventTally
 from suxxtext.paths import CHANNELS_ROOT, ensure_channel_dirs
 
 _ID_RE = re.compile(r"\[([A-Za-z0-9_-]{11})\]")
 _CHECK_RE = re.compile(r"\[(\d+)/(\d+)\] Checking video:")
 _PACE_RE = re.compile(r"\[pace (\d+)/(\d+)\]")
 
+# Incremental event readers, one per stream, kept across refreshes
+_TALLIES: Dict[str, EventTally] = {}
+
 # layout
 W = 72  # inner content width (between box borders)
 
@@ -256,6 +262,18 @@ def _parse_log(text: str) -> dict:
     }
 
 
+def _event_tally(path: Path) -> Optional[EventTally]:
+    """Latest batch run in ``events.jsonl`` (reads only new bytes per call)."""
+    if not path.is_file():
+        return None
+    key = str(path)
+    tally = _TALLIES.get(key)
+    if tally is None:
+        tally = _TALLIES[key] = EventTally(key)
+    tally.refresh()
+    return tally if tally.run else None
+
+
 def _mtime_age(path: Path) -> str:
     try:
         age = time.time() - path.stat().st_mtime
@@ -397,6 +415,9 @@ def collect_snapshot(channel: str, channels_root: str = CHANNELS_ROOT) -> dict:
 
     log_text = _tail_text(blog) if blog and blog.is_file() else ""
     parsed = _parse_log(log_text) if log_text else {}
+    tally = _event_tally(logs / EVENTS_NAME)
+    if tally is not None:
+        parsed = {**parsed, **tally.parsed(), "source": "events"}
 
     n_txt = _count_glob(trans, "*.txt")
     n_mp3 = _count_glob(mp3, "*")
@@ -561,9 +582,13 @@ def render_snapshot(snap: dict) -> str:
         _box_row(
             f"  skip~{_num(skip)}   dl-err {_num(dl, dl > 0)}   "
             f"bot {_num(bot, bot > 0)}   403 {_num(h403, h403 > 0)}"
-            f"   (log window)"
+            f"   ({'this run' if p.get('source') == 'events' else 'log window'})"
         )
     )
+    stage_s = p.get("stage_seconds") or {}
+    if stage_s:
+        avg = "  ·  ".join(f"{k} {v:.1f}s" for k, v in stage_s.items())
+        out.append(_box_row(f"  avg  {avg}"))
 
     gu = snap.get("gpu_util")
     gm = snap.get("gpu_mem")
@@ -2,11 +2,16 @@
 
 from __future__ import annotations
 
+import json
 import os
 import re
-from typing import List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple
 
 CHANNELS_ROOT = "channels"
+# Suffix of an archive file still being written (never matches ``*.txt``)
+PARTIAL_SUFFIX = ".part"
+# channel URL -> archive folder of past runs (see remember_channel_folder)
+FOLDERS_NAME = "channel-folders.json"
 
 
 def sanitize_filename(name: str, max_length: int = 50) -> str:
@@ -164,17 +169,85 @@ def resolve_channel_folder(
     return candidates[0]
 
 
-def ensure_channel_dirs(
+def _folders_path(channels_root: str) -> str:
+    return os.path.join(channels_root, FOLDERS_NAME)
+
+
+def _load_folders(channels_root: str) -> Dict[str, str]:
+    try:
+        with open(_folders_path(channels_root), "r", encoding="utf-8") as f:
+            folders = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return folders if isinstance(folders, dict) else {}
+
+
+def remembered_channel_folder(
+    channel_url: str, channels_root: str = CHANNELS_ROOT
+) -> Optional[str]:
+    """Folder a past run archived ``channel_url`` in, if it still exists."""
+    folder = _load_folders(channels_root).get(channel_url)
+    if folder and os.path.isdir(os.path.join(channels_root, folder)):
+        return folder
+    return None
+
+
+def remember_channel_folder(
+    channel_url: str, channel_folder: str, channels_root: str = CHANNELS_ROOT
+) -> None:
+    """
+    Record where ``channel_url`` is archived. Without channel info (``/channel/``
+    URLs, resume, incremental listings) :func:`resolve_channel_folder` can only
+    guess from the URL, so later runs look the folder up here first.
+    """
+    folders = _load_folders(channels_root)
+    if folders.get(channel_url) == channel_folder:
+        return
+    folders[channel_url] = channel_folder
+    os.makedirs(channels_root, exist_ok=True)
+    tmp = _folders_path(channels_root) + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(folders, f, ensure_ascii=False, indent=1, sort_keys=True)
+    os.replace(tmp, _folders_path(channels_root))
+
+
+def channel_dirs(
     channel_folder: str, channels_root: str = CHANNELS_ROOT
 ) -> Tuple[str, str, str]:
+    """``(base, mp3, transcriptions)`` paths of a channel archive (not created)."""
     base = os.path.join(channels_root, channel_folder)
-    mp3_dir = os.path.join(base, "mp3")
-    trans_dir = os.path.join(base, "transcriptions")
+    return base, os.path.join(base, "mp3"), os.path.join(base, "transcriptions")
+
+
+def ensure_channel_dirs(
+    channel_folder: str, channels_root: str = CHANNELS_ROOT
+) -> Tuple[str, str, str]:
+    base, mp3_dir, trans_dir = channel_dirs(channel_folder, channels_root)
     os.makedirs(mp3_dir, exist_ok=True)
     os.makedirs(trans_dir, exist_ok=True)
     return base, mp3_dir, trans_dir
 
 
+def atomic_write_text(path: str, text: str) -> None:
+    """
+    Write ``text`` to ``path`` via ``path.part`` + rename, so an interrupted
+    run leaves either the complete file or none (never a truncated ``.txt``).
+    """
+    tmp = path + PARTIAL_SUFFIX
+    try:
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+
+
 def transcript_exists_for_id(trans_dir: str, video_id: str) -> Optional[str]:
     """Return matching transcript filename if video_id already archived, else None."""
     if not video_id or not os.path.isdir(trans_dir):
@@ -188,20 +261,74 @@ def transcript_exists_for_id(trans_dir: str, video_id: str) -> Optional[str]:
     return None
 
 
-def list_existing_transcript_ids(trans_dir: str) -> set:
-    ids = set()
-    if not os.path.isdir(trans_dir):
-        return ids
-    try:
-        for name in os.listdir(trans_dir):
-            if not name.endswith(".txt"):
-                continue
-            m = re.search(r"([A-Za-z0-9_-]{11})\.txt$", name)
-            if m:
-                ids.add(m.group(1))
-            # also any embedded 11-char token
-            for part in re.findall(r"[A-Za-z0-9_-]{11}", name):
-                ids.add(part)
-    except OSError:
-        pass
+_TRAILING_ID_RE = re.compile(r"([A-Za-z0-9_-]{11})\.txt$")
+_ID_TOKEN_RE = re.compile(r"[A-Za-z0-9_-]{11}")
+# every 11-char window bounded by ``_`` (or another separator) or the name's
+# start / end; overlapping, since ids may themselves contain ``_``
+_BOUNDED_ID_RE = re.compile(r"(?<![A-Za-z0-9-])(?=([A-Za-z0-9_-]{11})(?![A-Za-z0-9-]))")
+
+
+def _transcript_ids_in_name(name: str) -> List[str]:
+    """Video ids a transcript filename may belong to, trailing ``_<id>.txt`` first."""
+    ids = []
+    m = _TRAILING_ID_RE.search(name)
+    if m:
+        ids.append(m.group(1))
+    # legacy names: ids anywhere, e.g. ``X_<id>_Title.txt``
+    stem = name[:-4] if name.endswith(".txt") else name
+    ids.extend(_BOUNDED_ID_RE.findall(stem))
+    ids.extend(_ID_TOKEN_RE.findall(name))
     return ids
+
+
+def list_existing_transcript_ids(trans_dir: str) -> set:
+    return set(TranscriptIndex.load(trans_dir).ids())
+
+
+class TranscriptIndex:
+    """
+    video id → transcript filename for one ``transcriptions/`` folder.
+
+    Built with a single directory scan; :meth:`add` keeps it current as the
+    batch writes files, so skip checks are a dict lookup instead of a
+    substring match against every filename.
+    """
+
+    def __init__(self, trans_dir: str):
+        self.trans_dir = trans_dir
+        self._by_id: Dict[str, str] = {}
+
+    @classmethod
+    def load(cls, trans_dir: str) -> "TranscriptIndex":
+        index = cls(trans_dir)
+        try:
+            with os.scandir(trans_dir) as it:
+                for entry in it:
+                    if entry.name.endswith(".txt"):
+                        index._add_name(entry.name)
+        except OSError:
+            pass
+        return index
+
+    def _add_name(self, name: str) -> None:
+        for vid in _transcript_ids_in_name(name):
+            self._by_id.setdefault(vid, name)
+
+    def add(self, video_id: str, path: str) -> None:
+        """Record a transcript just written for ``video_id``."""
+        self._by_id[video_id] = os.path.basename(path)
+
+    def find(self, video_id: str) -> Optional[str]:
+        """Transcript filename for ``video_id``, or ``None``."""
+        if not video_id:
+            return None
+        return self._by_id.get(video_id)
+
+    def ids(self) -> List[str]:
+        return list(self._by_id)
+
+    def __contains__(self, video_id: str) -> bool:
+        return video_id in self._by_id
+
+    def __len__(self) -> int:
+        return len(self._by_id)
@@ -17,6 +17,8 @@ from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Sequence, Tuple
 
+from suxxtext import events as ev
+from suxxtext.events import EventSink, file_size
 from suxxtext.ollama_client import (
     OllamaError,
     default_model,
@@ -25,7 +27,7 @@ from suxxtext.ollama_client import (
     ollama_host,
     ping,
 )
-from suxxtext.paths import CHANNELS_ROOT
+from suxxtext.paths import CHANNELS_ROOT, atomic_write_text
 
 # YouTube video ids are 11 chars; transcript names usually end with _ID.txt
 VIDEO_ID_RE = re.compile(r"([A-Za-z0-9_-]{11})\.txt$")
@@ -404,9 +406,8 @@ def summarize_transcript_file(
         items=items,
         raw_response=raw,
     )
-    out_path.write_text(
-        json.dumps(record.to_dict(), indent=2, ensure_ascii=False) + "\n",
-        encoding="utf-8",
+    atomic_write_text(
+        str(out_path), json.dumps(record.to_dict(), indent=2, ensure_ascii=False) + "\n"
     )
     return record
 
@@ -486,7 +487,11 @@ def batch_summarize_channel(
     force: bool = False,
     limit: Optional[int] = None,
 ) -> List[PCSRecord]:
-    """Process all transcripts under channels/<folder>/transcriptions/."""
+    """
+    Process all transcripts under channels/<folder>/transcriptions/.
+
+    Per-file timings go to ``logs/events.jsonl`` (stage ``summarize``).
+    """
     base = Path(channels_root) / channel_folder
     trans_dir = base / "transcriptions"
     out_dir = base / "summaries"
@@ -494,30 +499,45 @@ def batch_summarize_channel(
     if limit is not None:
         files = files[:limit]
     results: List[PCSRecord] = []
-    for i, f in enumerate(files, 1):
-        print(f"[{i}/{len(files)}] {f.name}", flush=True)
+    errors = 0
+    finished = False
+    with EventSink.for_channel(channel_folder, channels_root=channels_root) as sink:
+        sink.emit("run_start", kind="pcs", model=model or default_model(), total=len(files))
         try:
-            rec = summarize_transcript_file(
-                f,
-                channel=channel_folder,
-                model=model,
-                host=host,
-                out_dir=out_dir,
-                force=force,
-            )
-            primary = rec.primary()
-            rel = "; ".join(primary.related[:4]) if primary.related else "(none)"
-            print(
-                f"  → problem:  {primary.problem[:90]}\n"
-                f"    cause:    {primary.cause[:90]}\n"
-                f"    solution: {primary.solution[:90]}\n"
-                f"    related:  {rel[:90]}",
-                flush=True,
+            for i, f in enumerate(files, 1):
+                print(f"[{i}/{len(files)}] {f.name}", flush=True)
+                video_id = video_id_from_transcript_path(f) or f.stem[:11]
+                try:
+                    with sink.stage(ev.SUMMARIZE, video_id) as event:
+                        rec = summarize_transcript_file(
+                            f,
+                            channel=channel_folder,
+                            model=model,
+                            host=host,
+                            out_dir=out_dir,
+                            force=force,
+                        )
+                        event["bytes"] = file_size(str(out_dir / f"{rec.video_id}.json"))
+                    primary = rec.primary()
+                    rel = "; ".join(primary.related[:4]) if primary.related else "(none)"
+                    print(
+                        f"  → problem:  {primary.problem[:90]}\n"
+                        f"    cause:    {primary.cause[:90]}\n"
+                        f"    solution: {primary.solution[:90]}\n"
+                        f"    related:  {rel[:90]}",
+                        flush=True,
+                    )
+                    results.append(rec)
+                except (OllamaError, ValueError, OSError) as e:
+                    errors += 1
+                    print(f"  ERROR: {e}", file=sys.stderr, flush=True)
+            rebuild_index(out_dir)
+            finished = True
+        finally:
+            # also after Ctrl-C or an unexpected error, so the run is not left open
+            sink.emit(
+                "run_end", ok=len(results), errors=errors, interrupted=None if finished else True
             )
-            results.append(rec)
-        except (OllamaError, ValueError, OSError) as e:
-            print(f"  ERROR: {e}", file=sys.stderr, flush=True)
-    rebuild_index(out_dir)
     print(f"Index: {out_dir / 'index.jsonl'} ({len(results)} ok)", flush=True)
     return results
 
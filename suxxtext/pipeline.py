@@ -0,0 +1,496 @@
+"""Streaming batch pipeline: captions → download stage → ready-audio queue → ASR.
+
+Phase 1 (skip check + captions) feeds caption misses straight into a
+:class:`WhisperStage` while discovery is still running, so the GPU is busy
+long before the caption sweep ends. Inside it, downloads and transcription
+are separate :class:`Stage` s joined by a bounded queue of ready audio files.
+The legacy two-phase order is the same stage fed only after Phase 1 finishes.
+"""
+
+from __future__ import annotations
+
+import itertools
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from colorama import Fore, Style
+
+# Stage queue depth per worker — enough to keep workers fed without
+# building a huge in-memory backlog on 10k-video channels.
+QUEUE_DEPTH_PER_WORKER = 4
+
+_STOP = object()
+
+
+class BatchStats:
+    """Thread-safe batch counters + timings for the run summary."""
+
+    def __init__(self, mode: str = "pipelined"):
+        self.mode = mode
+        self.started = time.monotonic()
+        self.first_transcript: Optional[float] = None
+        self.first_whisper: Optional[float] = None
+        self.finished: Optional[float] = None
+        self.counts: Dict[str, int] = {
+            "skipped": 0,
+            "captions": 0,
+            "whisper": 0,
+            "error": 0,
+            "checked": 0,
+        }
+        self._lock = threading.Lock()
+
+    def add(self, status: str, n: int = 1) -> None:
+        with self._lock:
+            self.counts[status] = self.counts.get(status, 0) + n
+            if status not in ("captions", "whisper") or n <= 0:
+                return
+            now = time.monotonic()
+            if self.first_transcript is None:
+                self.first_transcript = now
+            if status == "whisper" and self.first_whisper is None:
+                self.first_whisper = now
+
+    def __getitem__(self, status: str) -> int:
+        with self._lock:
+            return self.counts.get(status, 0)
+
+    def finish(self) -> None:
+        if self.finished is None:
+            self.finished = time.monotonic()
+
+    @property
+    def time_to_first(self) -> Optional[float]:
+        if self.first_transcript is None:
+            return None
+        return self.first_transcript - self.started
+
+    @property
+    def time_to_first_whisper(self) -> Optional[float]:
+        if self.first_whisper is None:
+            return None
+        return self.first_whisper - self.started
+
+    @property
+    def wall_clock(self) -> float:
+        end = self.finished if self.finished is not None else time.monotonic()
+        return end - self.started
+
+    def throughput_line(self) -> str:
+        def _s(v: Optional[float]) -> str:
+            return f"{v:.1f}s" if v is not None else "—"
+
+        new = self["captions"] + self["whisper"]
+        per_hour = new * 3600.0 / self.wall_clock if self.wall_clock > 0 else 0.0
+        return (
+            f"mode={self.mode} first_transcript={_s(self.time_to_first)} "
+            f"first_whisper={_s(self.time_to_first_whisper)} "
+            f"wall={self.wall_clock:.1f}s new={new} ({per_hour:.0f}/h)"
+        )
+
+
+def interleave(
+    streams: Sequence[Iterable[Any]], weights: Optional[Sequence[float]] = None
+) -> Iterator[Any]:
+    """
+    Merge ``streams`` by smooth weighted round-robin until all are exhausted.
+
+    Equal (or no) weights give plain round-robin; weight 3 vs 1 yields
+    ``a a b a a a b a …`` evenly spread rather than in bursts.
+    """
+    its = [iter(s) for s in streams]
+    w = [max(float(x), 0.0) or 1.0 for x in weights] if weights else [1.0] * len(its)
+    credit = [0.0] * len(its)
+    live = list(range(len(its)))
+    while live:
+        total = sum(w[i] for i in live)
+        for i in live:
+            credit[i] += w[i]
+        pick = max(live, key=lambda i: credit[i])
+        credit[pick] -= total
+        try:
+            item = next(its[pick])
+        except StopIteration:
+            live.remove(pick)
+            continue
+        yield item
+
+
+class Stage:
+    """
+    Bounded input queue drained by ``workers`` threads calling ``handler(item)``.
+
+    With ``priority`` the queue hands out the waiting item with the lowest
+    ``priority(item)`` first (ties in arrival order); ``maxsize=0`` makes it
+    unbounded so the whole backlog can be reordered.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        handler: Callable[[Any], None],
+        workers: int = 1,
+        maxsize: Optional[int] = None,
+        priority: Optional[Callable[[Any], Any]] = None,
+    ):
+        self.name = name
+        self.handler = handler
+        self.workers = max(1, int(workers))
+        if maxsize is None:
+            maxsize = self.workers * QUEUE_DEPTH_PER_WORKER
+        self.priority = priority
+        if priority is None:
+            self.queue: queue.Queue = queue.Queue(maxsize=max(1, int(maxsize)))
+        else:
+            self.queue = queue.PriorityQueue(maxsize=max(0, int(maxsize)))
+        self._seq = itertools.count()
+        self._threads: List[threading.Thread] = []
+
+    def start(self) -> "Stage":
+        for i in range(self.workers):
+            t = threading.Thread(
+                target=self._worker, name=f"{self.name}-{i + 1}", daemon=True
+            )
+            t.start()
+            self._threads.append(t)
+        return self
+
+    def put(self, item: Any) -> None:
+        """Enqueue one item (blocks while the queue is full)."""
+        if self.priority is None:
+            self.queue.put(item)
+        else:
+            self.queue.put(((0, self.priority(item)), next(self._seq), item))
+
+    def close(self) -> None:
+        """Signal no more work; returns once every worker has drained and exited."""
+        for _ in self._threads:
+            if self.priority is None:
+                self.queue.put(_STOP)
+            else:
+                # sorts after every real item, so the backlog drains first
+                self.queue.put(((1,), next(self._seq), _STOP))
+        for t in self._threads:
+            t.join()
+
+    def join(self) -> None:
+        """Block until every item put so far has been handled."""
+        self.queue.join()
+
+    def _worker(self) -> None:
+        while True:
+            item = self.queue.get()
+            if self.priority is not None:
+                item = item[2]
+            try:
+                if item is _STOP:
+                    return
+                self.handler(item)
+            finally:
+                self.queue.task_done()
+
+
+class WhisperStage:
+    """
+    Download stage → bounded ready-audio queue → transcription stage.
+
+    ``download(video)`` returns ``(ok, message)`` once the audio file is on
+    disk; ``transcribe(video, model_pool)`` returns ``(status, message)``.
+    Downloads (network-bound) and ASR (compute-bound) get separate worker
+    counts, so models never wait on the network. At most ``prefetch``
+    downloaded files wait for a model, which caps audio disk use.
+
+    The model pool is built lazily when the first video is queued (in the
+    background, overlapping that download), so caption-only runs never load
+    Whisper. With ``pace_seconds > 0`` both stages are serial; the spacing
+    itself comes from the shared download rate limit (``suxxtext.ratelimit``).
+
+    ``route(video) -> (stats, logf)`` lets one stage (one model pool) serve
+    several channels, each counted and logged in its own archive.
+
+    ``priority(video)`` orders both queues (lowest first) instead of FIFO;
+    the download queue is then unbounded so every queued video competes.
+    :attr:`asr_window` is the wall time from the first ASR start to the last
+    ASR finish (the measured makespan).
+
+    ``admit(video) -> bool`` is asked before a video's download starts (or
+    before audio already on disk is queued); refused videos are counted as
+    ``deferred`` and never reach a model. ``claim(video) -> bool`` is asked
+    first; a refused video (handled by another host) is counted as
+    ``claimed``. ``release(video)`` hands the claim back when a video leaves
+    the stage without reaching ASR (deferred, failed download, exception),
+    so another host can take it during this run. ``fail(video, at, message)``
+    is told about failures the callbacks could not record themselves (an
+    exception, or a model pool that failed to load); ``at`` is ``"download"``
+    or ``"transcribe"``.
+
+    ``retry(video, message) -> delay`` is asked after a failed download; a
+    delay in seconds puts the video back on the download queue after that
+    long (counted as ``retried``), ``None`` counts the error. :meth:`close`
+    waits for pending retries.
+
+    :meth:`stop` (first Ctrl-C) drops every download not yet started,
+    including retries still waiting on their timer, as ``interrupted`` (kept
+    in :attr:`dropped`); running downloads and audio already on disk still go
+    through ASR.
+    """
+
+    def __init__(
+        self,
+        download: Callable[[dict], Tuple[bool, str]],
+        transcribe: Callable[[dict, Any], Tuple[str, str]],
+        pool_factory: Callable[[], Any],
+        stats: BatchStats,
+        logf: Any,
+        download_workers: int = 1,
+        asr_workers: int = 1,
+        prefetch: Optional[int] = None,
+        pace_seconds: float = 0.0,
+        route: Optional[Callable[[dict], Tuple[BatchStats, Any]]] = None,
+        priority: Optional[Callable[[dict], Any]] = None,
+        admit: Optional[Callable[[dict], bool]] = None,
+        retry: Optional[Callable[[dict, str], Optional[float]]] = None,
+        claim: Optional[Callable[[dict], bool]] = None,
+        release: Optional[Callable[[dict], None]] = None,
+        fail: Optional[Callable[[dict, str, str], None]] = None,
+    ):
+        self.download = download
+        self.transcribe = transcribe
+        self.pool_factory = pool_factory
+        self.stats = stats
+        self.logf = logf
+        self.route = route or (lambda video: (self.stats, self.logf))
+        self.admit = admit
+        self.retry = retry
+        self.claim = claim
+        self.release = release or (lambda video: None)
+        self.fail = fail or (lambda video, at, message: None)
+        self._stopped = threading.Event()
+        self.dropped: List[dict] = []
+        self._retry_cond = threading.Condition()
+        self._retrying = 0
+        self._retry_timers: Dict[threading.Timer, dict] = {}
+        self.pace_seconds = float(pace_seconds or 0.0)
+        if self.pace_seconds > 0:
+            download_workers = asr_workers = 1
+        self.downloads = Stage(
+            "download",
+            self._download_one,
+            download_workers,
+            maxsize=0 if priority else None,
+            priority=priority,
+        )
+        self.ready = Stage(
+            "asr",
+            self._transcribe_one,
+            asr_workers,
+            maxsize=prefetch if prefetch else asr_workers,
+            priority=priority,
+        )
+        self.submitted = 0
+        self._pool: Any = None
+        self._pool_failed: Optional[str] = None
+        self._pool_lock = threading.Lock()
+        self._pace_lock = threading.Lock()
+        self._started_n = 0
+        self._asr_lock = threading.Lock()
+        self._asr_first: Optional[float] = None
+        self._asr_last: Optional[float] = None
+
+    @property
+    def workers(self) -> int:
+        return self.downloads.workers
+
+    @property
+    def asr_window(self) -> Optional[float]:
+        if self._asr_first is None or self._asr_last is None:
+            return None
+        return self._asr_last - self._asr_first
+
+    # -- model pool -------------------------------------------------------
+
+    def _get_pool(self) -> Any:
+        with self._pool_lock:
+            if self._pool is None and self._pool_failed is None:
+                try:
+                    self._pool = self.pool_factory()
+                except Exception as e:
+                    self._pool_failed = str(e)
+                    print(f"{Fore.RED}Error initializing model pool: {e}{Style.RESET_ALL}")
+                    self.logf.write(f"Model pool init failed: {e}\n")
+            return self._pool
+
+    # -- lifecycle --------------------------------------------------------
+
+    def start(self) -> "WhisperStage":
+        self.ready.start()
+        self.downloads.start()
+        return self
+
+    def _note_submitted(self) -> None:
+        self.submitted += 1
+        if self.submitted == 1:
+            threading.Thread(target=self._get_pool, name="pool-load", daemon=True).start()
+
+    def put(self, video: dict) -> None:
+        """Enqueue one video for download (blocks while the queue is full)."""
+        self._note_submitted()
+        self.downloads.put(video)
+
+    def put_ready(self, video: dict) -> None:
+        """Enqueue a video whose audio is already on disk straight for ASR."""
+        self._note_submitted()
+        if self._admitted(video):
+            self.ready.put(video)
+
+    def stop(self) -> None:
+        """Start no further downloads; what is in flight finishes."""
+        self._stopped.set()
+        with self._retry_cond:
+            pending = list(self._retry_timers.items())
+            self._retry_timers.clear()
+            for timer, video in pending:
+                timer.cancel()
+                stats, _ = self.route(video)
+                stats.add("interrupted")
+                self.dropped.append(video)
+            self._retrying -= len(pending)
+            self._retry_cond.notify_all()
+
+    @property
+    def stopped(self) -> bool:
+        return self._stopped.is_set()
+
+    def close(self) -> None:
+        """Drain downloads (and their retries), then transcriptions."""
+        while True:
+            self.downloads.join()
+            with self._retry_cond:
+                if not self._retrying:
+                    break
+                # stop() may run from a signal handler on this very thread
+                self._retry_cond.wait(1.0)
+        self.downloads.close()
+        self.ready.close()
+        close_pool = getattr(self._pool, "close", None)
+        if close_pool is not None:
+            close_pool()
+
+    def __enter__(self) -> "WhisperStage":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    # -- workers ----------------------------------------------------------
+
+    def _pace(self, video: dict) -> None:
+        with self._pace_lock:
+            self._started_n += 1
+            n = self._started_n
+            vid = video.get("id", "?")
+            print(
+                f"{Fore.CYAN}[pace {n}/{self.submitted}] {vid} "
+                f"(min interval {self.pace_seconds:.0f}s){Style.RESET_ALL}"
+            )
+
+    def _report_exception(self, video: dict, exc: Exception) -> None:
+        stats, logf = self.route(video)
+        stats.add("error")
+        print(
+            f"{Fore.RED + Style.BRIGHT}A task generated an exception: "
+            f"{exc}{Style.RESET_ALL}"
+        )
+        logf.write(f"A task generated an exception: {exc}\n")
+
+    def _admitted(self, video: dict) -> bool:
+        stats, _ = self.route(video)
+        if self.claim is not None and not self.claim(video):
+            stats.add("claimed")
+            return False
+        if self.admit is None or self.admit(video):
+            return True
+        stats.add("deferred")
+        self.release(video)
+        return False
+
+    def _download_one(self, video: dict) -> None:
+        stats, _ = self.route(video)
+        if self.stopped:
+            stats.add("interrupted")
+            self.dropped.append(video)
+            return
+        if self._pool_failed is not None:
+            stats.add("error")
+            self.fail(video, "download", f"Model pool init failed: {self._pool_failed}")
+            return
+        if not self._admitted(video):
+            return
+        if self.pace_seconds > 0:
+            self._pace(video)
+        try:
+            ok, message = self.download(video)
+        except Exception as exc:
+            self._report_exception(video, exc)
+            self.fail(video, "download", str(exc))
+            self.release(video)
+            return
+        if not ok:
+            delay = self.retry(video, message) if self.retry is not None else None
+            if delay is None:
+                stats.add("error")
+                self.release(video)
+            else:
+                stats.add("retried")
+                self._schedule_retry(video, delay)
+            return
+        stats.add("downloaded")
+        self.ready.put(video)
+
+    def _schedule_retry(self, video: dict, delay: float) -> None:
+        def _requeue() -> None:
+            with self._retry_cond:
+                if self._retry_timers.pop(timer, None) is None:
+                    return  # cancelled by stop(), which already dropped it
+            self.downloads.put(video)
+            with self._retry_cond:
+                self._retrying -= 1
+                self._retry_cond.notify_all()
+
+        timer = threading.Timer(max(0.0, delay), _requeue)
+        timer.daemon = True
+        with self._retry_cond:
+            if self.stopped:
+                stats, _ = self.route(video)
+                stats.add("interrupted")
+                self.dropped.append(video)
+                return
+            self._retrying += 1
+            self._retry_timers[timer] = video
+        timer.start()
+
+    def _transcribe_one(self, video: dict) -> None:
+        stats, _ = self.route(video)
+        pool = self._get_pool()
+        if pool is None:
+            stats.add("error")
+            self.fail(video, "transcribe", f"Model pool init failed: {self._pool_failed}")
+            self.release(video)
+            return
+        with self._asr_lock:
+            if self._asr_first is None:
+                self._asr_first = time.monotonic()
+        try:
+            status, _message = self.transcribe(video, pool)
+        except Exception as exc:
+            self._report_exception(video, exc)
+            self.fail(video, "transcribe", str(exc))
+            self.release(video)
+            return
+        finally:
+            with self._asr_lock:
+                self._asr_last = time.monotonic()
+        if status in ("whisper", "captions", "error"):
+            stats.add(status)
@@ -0,0 +1,248 @@
+"""Batch planner: what a run would do, and roughly how long, before it runs.
+
+``--plan`` lists the channel (flat listing, incremental from the discovery
+cursor) and, without fetching captions or downloading audio, sorts the
+target videos into:
+
+- ``archived``   — a transcript already exists (:class:`TranscriptIndex`)
+- ``known miss`` — the journal recorded a caption miss or a failed Whisper
+  attempt, so the video goes to Whisper
+- ``untried``    — captions are tried first; the share expected to miss is
+  this channel's caption miss rate from the journal
+
+Audio hours come from listing durations; GPU hours and the ETA from the
+per-model real-time factor measured in ``logs/events.jsonl``
+(:class:`suxxtext.schedule.RuntimeModel`) and the mean caption / download
+times of past runs.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, Iterable, List, Optional, Sequence, Set
+
+from suxxtext.events import CAPTIONS, DOWNLOAD, OK, read_events
+from suxxtext.paths import TranscriptIndex
+from suxxtext.schedule import (
+    ORDER_LISTING,
+    RuntimeModel,
+    order_key,
+    predict_makespan,
+    video_duration,
+)
+
+# Stage seconds assumed until a channel has history in its event stream
+DEFAULT_STAGE_SECONDS: Dict[str, float] = {CAPTIONS: 1.5, DOWNLOAD: 20.0}
+# Model instance counts the ETA table compares
+PLAN_MODEL_INSTANCES = (1, 2, 3, 4)
+
+
+def stage_seconds(paths: Iterable[str]) -> Dict[str, float]:
+    """
+    Mean wall seconds per caption attempt (hit or miss) and per successful
+    download across past event streams, defaults where there is no history.
+    """
+    totals = {CAPTIONS: [0.0, 0], DOWNLOAD: [0.0, 0]}
+    for path in paths:
+        rows, _ = read_events(path)
+        for row in rows:
+            stage = row.get("stage")
+            if row.get("event") != "done" or stage not in totals:
+                continue
+            if stage == DOWNLOAD and row.get("outcome") != OK:
+                continue
+            totals[stage][0] += float(row.get("seconds") or 0.0)
+            totals[stage][1] += 1
+    return {
+        stage: (wall / n if n else DEFAULT_STAGE_SECONDS[stage])
+        for stage, (wall, n) in totals.items()
+    }
+
+
+def format_span(seconds: float) -> str:
+    """``"45m"`` below two hours, else ``"3.2h"``."""
+    if seconds < 7200:
+        return f"{seconds / 60:.0f}m"
+    return f"{seconds / 3600:.1f}h"
+
+
+class ChannelPlan:
+    """How one channel's target videos would be handled by the next run."""
+
+    def __init__(
+        self,
+        name: str,
+        videos: Sequence[dict],
+        target: int,
+        index: TranscriptIndex,
+        caption_hits: Set[str],
+        caption_misses: Set[str],
+        *,
+        prefer_captions: bool = True,
+        whisper_fallback: bool = True,
+    ):
+        self.name = name
+        self.total = len(videos)
+        self.target = min(target, len(videos))
+        self.prefer_captions = prefer_captions
+        self.whisper_fallback = whisper_fallback
+        self.history = len(caption_hits) + len(caption_misses)
+        self.miss_rate: Optional[float] = (
+            len(caption_misses) / self.history if self.history else None
+        )
+        self.archived: List[dict] = []
+        self.known_miss: List[dict] = []
+        self.untried: List[dict] = []
+        for video in videos[: self.target]:
+            if video["id"] in index:
+                self.archived.append(video)
+            elif not prefer_captions or video["id"] in caption_misses:
+                self.known_miss.append(video)
+            else:
+                self.untried.append(video)
+
+    @property
+    def untried_miss_rate(self) -> float:
+        """Share of untried videos expected to need Whisper (1.0 without history)."""
+        return 1.0 if self.miss_rate is None else self.miss_rate
+
+    def whisper_jobs(self) -> List[tuple]:
+        """``(video, weight)``: known misses count fully, untried ones by the miss rate."""
+        if not self.whisper_fallback:
+            return []
+        rate = self.untried_miss_rate
+        return [(v, 1.0) for v in self.known_miss] + [(v, rate) for v in self.untried]
+
+    @property
+    def likely_whisper(self) -> float:
+        return sum(w for _, w in self.whisper_jobs())
+
+    @property
+    def audio_seconds(self) -> float:
+        """Expected seconds of audio Whisper will transcribe."""
+        return sum(video_duration(v) * w for v, w in self.whisper_jobs())
+
+    @property
+    def caption_checks(self) -> int:
+        return len(self.untried) if self.prefer_captions else 0
+
+
+class RunPlan:
+    """Totals, GPU hours and ETA for one or more :class:`ChannelPlan`."""
+
+    def __init__(
+        self,
+        channels: Sequence[ChannelPlan],
+        runtime: RuntimeModel,
+        stage_means: Dict[str, float],
+        *,
+        model_name: str = "base",
+        workers: int = 4,
+        pool_size: int = 2,
+        caption_delay: float = 0.5,
+        pace_seconds: float = 0.0,
+        pipelined: bool = True,
+        order: str = ORDER_LISTING,
+    ):
+        self.channels = list(channels)
+        self.runtime = runtime
+        self.stage_means = stage_means
+        self.model_name = model_name
+        self.workers = max(1, int(workers))
+        self.pool_size = max(1, int(pool_size))
+        self.caption_delay = caption_delay
+        self.pace_seconds = pace_seconds
+        self.pipelined = pipelined
+        self.order = order
+
+    def _jobs(self) -> List[tuple]:
+        jobs = [job for ch in self.channels for job in ch.whisper_jobs()]
+        key = order_key(self.order)
+        return sorted(jobs, key=lambda job: key(job[0])) if key else jobs
+
+    @property
+    def audio_seconds(self) -> float:
+        return sum(ch.audio_seconds for ch in self.channels)
+
+    @property
+    def gpu_seconds(self) -> float:
+        """Whisper seconds on one model instance for the expected audio."""
+        return self.audio_seconds * self.runtime.rtf(self.model_name)
+
+    def caption_seconds(self) -> float:
+        per_check = max(self.caption_delay, self.stage_means[CAPTIONS])
+        return sum(ch.caption_checks for ch in self.channels) * per_check
+
+    def download_seconds(self) -> float:
+        n = sum(ch.likely_whisper for ch in self.channels)
+        if self.pace_seconds > 0:
+            return n * max(self.pace_seconds, self.stage_means[DOWNLOAD])
+        return n * self.stage_means[DOWNLOAD] / self.workers
+
+    def asr_seconds(self, pool_size: Optional[int] = None) -> float:
+        """
+        Predicted ASR makespan; untried videos weigh in at the miss rate, so
+        this is the expected rather than the worst case.
+        """
+        models = 1 if self.pace_seconds > 0 else (pool_size or self.pool_size)
+        rtf = self.runtime.rtf(self.model_name)
+        return predict_makespan([video_duration(v) * rtf * w for v, w in self._jobs()], models)
+
+    def eta(self, pool_size: Optional[int] = None) -> float:
+        """Wall time: stages overlap when pipelined, captions first when two-phase."""
+        whisper = max(self.download_seconds(), self.asr_seconds(pool_size))
+        if self.pipelined:
+            return max(self.caption_seconds(), whisper)
+        return self.caption_seconds() + whisper
+
+    def lines(self) -> List[str]:
+        out: List[str] = []
+        for ch in self.channels:
+            out.append(f"Plan for {ch.name}: latest {ch.target} of {ch.total} listed")
+            out.append(f"  archived (transcript exists):  {len(ch.archived)}")
+            if ch.prefer_captions:
+                out.append(f"  known caption miss (journal):  {len(ch.known_miss)}")
+                if ch.miss_rate is None:
+                    rate = "no caption history: assuming all may need Whisper"
+                else:
+                    rate = f"~{ch.miss_rate:.0%} miss rate over {ch.history} past attempt(s)"
+                out.append(f"  captions to try:               {len(ch.untried)} ({rate})")
+            else:
+                out.append(f"  Whisper-only:                  {len(ch.known_miss)}")
+            if ch.whisper_fallback:
+                out.append(
+                    f"  likely Whisper:                ~{ch.likely_whisper:.0f} "
+                    f"({ch.audio_seconds / 3600:.1f}h audio)"
+                )
+            else:
+                out.append("  likely Whisper:                0 (no Whisper fallback)")
+        history = self.runtime.samples(self.model_name)
+        rtf = self.runtime.rtf(self.model_name)
+        if len(self.channels) > 1:
+            n = sum(ch.likely_whisper for ch in self.channels)
+            out.append(
+                f"All {len(self.channels)} channels: ~{n:.0f} Whisper video(s), "
+                f"{self.audio_seconds / 3600:.1f}h audio"
+            )
+        out.append(
+            f"Whisper '{self.model_name}': {rtf:.3f}s per audio second "
+            f"({f'{history / 3600:.1f}h audio history' if history else 'default estimate'}) "
+            f"→ {self.gpu_seconds / 3600:.2f} GPU-hour(s)"
+        )
+        models = 1 if self.pace_seconds > 0 else self.pool_size
+        out.append(
+            f"ETA ~{format_span(self.eta())}: captions {format_span(self.caption_seconds())}, "
+            f"downloads {format_span(self.download_seconds())} "
+            f"({'paced' if self.pace_seconds > 0 else f'{self.workers} worker(s)'}), "
+            f"ASR {format_span(self.asr_seconds())} ({models} model(s), {self.order} order)"
+        )
+        if self.pace_seconds <= 0 and self.gpu_seconds > 0:
+            table = ", ".join(
+                f"{n} → {format_span(self.eta(n))}" for n in PLAN_MODEL_INSTANCES
+            )
+            out.append(f"ETA by --model_instances: {table}")
+            if self.download_seconds() >= self.asr_seconds():
+                out.append(
+                    "Downloads are the bottleneck: more model instances will not help; "
+                    "raise --workers (or --adaptive) within the throttle guidance."
+                )
+        return out
@@ -0,0 +1,136 @@
+"""Decode queued Whisper audio to 16 kHz float32 before a model takes it.
+
+``WhisperModel.transcribe(path)`` decodes and resamples the file (PyAV)
+before inference starts, while the ASR thread holds a model from the pool.
+That decode is CPU work, and on a GPU host the model sits idle meanwhile.
+:class:`PreDecoder` runs the decode in worker processes as soon as the
+audio is on disk (after its download, or when it is reused). It writes
+``mp3/.predecode/<audio name>.npy``. The ASR stage waits for that file
+before borrowing a model, and hands the model a memory-mapped array, so
+model time is inference only. Each ``.npy`` is removed after its
+transcription. Float32 at 16 kHz is about 230 MB per audio hour, and the
+bounded ready queue (``--audio-prefetch``) caps how many exist at once.
+
+A failed decode is not an error: the model then decodes the original file
+as before.
+"""
+
+from __future__ import annotations
+
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Callable, Dict, Optional
+
+import numpy as np
+
+from suxxtext.streaming import SAMPLE_RATE
+
+PREDECODE_DIR = ".predecode"
+
+
+def decode_to_npy(audio_file: str, npy_path: str) -> float:
+    """Decode ``audio_file`` to a 16 kHz mono float32 ``.npy``; audio seconds."""
+    from faster_whisper.audio import decode_audio
+
+    audio = decode_audio(audio_file, sampling_rate=SAMPLE_RATE)
+    tmp = npy_path + ".tmp"
+    with open(tmp, "wb") as f:
+        np.save(f, np.asarray(audio, dtype=np.float32))
+    os.replace(tmp, npy_path)
+    return len(audio) / SAMPLE_RATE
+
+
+def npy_path_for(audio_file: str) -> str:
+    folder, name = os.path.split(os.path.abspath(audio_file))
+    return os.path.join(folder, PREDECODE_DIR, name + ".npy")
+
+
+class PreDecoder:
+    """
+    ``workers`` decode processes shared by every channel of a run.
+
+    :meth:`submit` starts decoding a file, :meth:`take` waits for it and
+    returns the path the model should read (the ``.npy``, or the original
+    file if decoding failed), and :meth:`discard` removes the ``.npy``.
+    ``decode(audio_file, npy_path)`` must be importable (spawn).
+    """
+
+    def __init__(
+        self, workers: int, decode: Callable[[str, str], float] = decode_to_npy
+    ):
+        self.workers = max(1, int(workers))
+        self.decode = decode
+        self.decoded = 0
+        self.failed = 0
+        self.audio_seconds = 0.0
+        # ASR time spent waiting for a decode that was not done yet
+        self.wait_seconds = 0.0
+        self._lock = threading.Lock()
+        self._jobs: Dict[str, Future] = {}
+        self._executor: Optional[ProcessPoolExecutor] = ProcessPoolExecutor(
+            max_workers=self.workers, mp_context=multiprocessing.get_context("spawn")
+        )
+
+    def submit(self, audio_file: str) -> None:
+        key = os.path.abspath(audio_file)
+        with self._lock:
+            if key in self._jobs or self._executor is None:
+                return
+            npy = npy_path_for(key)
+            os.makedirs(os.path.dirname(npy), exist_ok=True)
+            self._jobs[key] = self._executor.submit(self.decode, key, npy)
+
+    def take(self, audio_file: str) -> str:
+        """Path to transcribe for ``audio_file`` (waits for its decode)."""
+        key = os.path.abspath(audio_file)
+        with self._lock:
+            job = self._jobs.get(key)
+        if job is None:
+            return audio_file
+        started = time.monotonic()
+        try:
+            seconds = job.result()
+        except Exception:
+            with self._lock:
+                self.failed += 1
+            return audio_file
+        finally:
+            waited = time.monotonic() - started
+            with self._lock:
+                self.wait_seconds += waited
+        with self._lock:
+            self.decoded += 1
+            self.audio_seconds += seconds
+        return npy_path_for(key)
+
+    def discard(self, audio_file: str) -> None:
+        key = os.path.abspath(audio_file)
+        with self._lock:
+            job = self._jobs.pop(key, None)
+        if job is None:
+            return
+        job.cancel()
+        for path in (npy_path_for(key), npy_path_for(key) + ".tmp"):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def close(self) -> None:
+        """Stop the workers and remove every ``.npy`` not yet discarded."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+            pending = list(self._jobs)
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+        for key in pending:
+            self.discard(key)
+
+    def __enter__(self) -> "PreDecoder":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
@@ -0,0 +1,115 @@
+"""Process-wide token-bucket rate limits per YouTube endpoint.
+
+One shared :class:`RateLimiter` holds a bucket per endpoint — caption API,
+yt-dlp metadata (listing / video info) and media download. The low-level
+helpers in ``suxxtext.captions`` and ``suxxtext.youtube`` take a token
+before every request, so budgets hold across worker threads and across
+every job path instead of each loop sleeping a worst-case fixed delay.
+
+A bucket with ``rate=None`` is unlimited.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import Dict, Optional
+
+CAPTIONS = "captions"
+METADATA = "metadata"
+DOWNLOAD = "download"
+
+# Defaults: 0.5 s caption spacing (old --caption-delay), gentle metadata,
+# downloads bounded by worker concurrency only.
+DEFAULT_RATES: Dict[str, Optional[float]] = {
+    CAPTIONS: 2.0,
+    METADATA: 1.0,
+    DOWNLOAD: None,
+}
+DEFAULT_BURST = 1
+
+
+def per_second(interval_seconds: Optional[float]) -> Optional[float]:
+    """Min interval between requests → bucket rate (``None`` if no limit)."""
+    if not interval_seconds or interval_seconds <= 0:
+        return None
+    return 1.0 / float(interval_seconds)
+
+
+class TokenBucket:
+    """Thread-safe token bucket: ``rate`` tokens/s, up to ``burst`` saved."""
+
+    def __init__(self, rate: Optional[float] = None, burst: int = DEFAULT_BURST):
+        self._lock = threading.Lock()
+        self.configure(rate, burst)
+
+    def configure(self, rate: Optional[float], burst: int = DEFAULT_BURST) -> None:
+        with self._lock:
+            self.rate = rate if rate and rate > 0 else None
+            self.burst = max(1, int(burst))
+            self._tokens = float(self.burst)
+            self._stamp = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        if self.rate is None:
+            return
+        self._tokens = min(float(self.burst), self._tokens + (now - self._stamp) * self.rate)
+        self._stamp = now
+
+    def try_acquire(self, n: float = 1.0) -> bool:
+        with self._lock:
+            if self.rate is None:
+                return True
+            self._refill(time.monotonic())
+            if self._tokens >= n:
+                self._tokens -= n
+                return True
+            return False
+
+    def acquire(self, n: float = 1.0) -> float:
+        """Block until ``n`` tokens are available; returns seconds waited."""
+        waited = 0.0
+        while True:
+            with self._lock:
+                if self.rate is None:
+                    return waited
+                now = time.monotonic()
+                self._refill(now)
+                if self._tokens >= n:
+                    self._tokens -= n
+                    return waited
+                delay = (n - self._tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+
+class RateLimiter:
+    """Named token buckets sharing one process-wide budget."""
+
+    def __init__(self, rates: Optional[Dict[str, Optional[float]]] = None):
+        self._lock = threading.Lock()
+        self._buckets: Dict[str, TokenBucket] = {}
+        for endpoint, rate in (rates if rates is not None else DEFAULT_RATES).items():
+            self._buckets[endpoint] = TokenBucket(rate)
+
+    def bucket(self, endpoint: str) -> TokenBucket:
+        with self._lock:
+            if endpoint not in self._buckets:
+                self._buckets[endpoint] = TokenBucket(DEFAULT_RATES.get(endpoint))
+            return self._buckets[endpoint]
+
+    def configure(
+        self, endpoint: str, rate: Optional[float], burst: int = DEFAULT_BURST
+    ) -> None:
+        self.bucket(endpoint).configure(rate, burst)
+
+    def acquire(self, endpoint: str, n: float = 1.0) -> float:
+        return self.bucket(endpoint).acquire(n)
+
+
+_SHARED = RateLimiter()
+
+
+def rate_limiter() -> RateLimiter:
+    """The shared limiter every job path draws from."""
+    return _SHARED
@@ -0,0 +1,258 @@
+"""Whisper work ordering and a runtime model for batch planning.
+
+Caption misses reach Whisper in listing order (newest first) by default, so
+one 3-hour podcast can hold a model while dozens of short videos wait. An
+order policy ranks queued videos by the ``duration`` / ``view_count`` the
+flat listing already carries:
+
+- ``listing``  — arrival order (default, unchanged behaviour)
+- ``shortest`` — shortest audio first: most transcripts finished early
+- ``longest``  — longest first (LPT): shortest makespan over several models
+- ``views``    — most views per minute of audio first
+
+:class:`RuntimeModel` turns past ``transcribe`` events
+(``logs/events.jsonl``) into seconds of Whisper per second of audio, per
+model, so a run can predict its makespan before it starts, and
+:class:`TimeBudget` uses it to admit only Whisper work that finishes before
+a deadline (``--max-runtime`` / ``--until``).
+"""
+
+from __future__ import annotations
+
+import heapq
+import re
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Iterable, List, Optional, Sequence
+
+from suxxtext.events import TRANSCRIBE, read_events
+
+ORDER_LISTING = "listing"
+ORDER_SHORTEST = "shortest"
+ORDER_LONGEST = "longest"
+ORDER_VIEWS = "views"
+ORDERS = (ORDER_LISTING, ORDER_SHORTEST, ORDER_LONGEST, ORDER_VIEWS)
+
+# Assumed length of a video whose listing has no duration
+DEFAULT_DURATION = 600.0
+# Whisper wall seconds per audio second (faster-whisper, one instance) used
+# until a model has history in the event stream
+DEFAULT_RTF: Dict[str, float] = {
+    "tiny": 0.03,
+    "base": 0.05,
+    "small": 0.1,
+    "medium": 0.2,
+    "large": 0.35,
+}
+FALLBACK_RTF = 0.1
+# Slack kept before a deadline for the download of an admitted video and
+# for the drain of in-flight work
+DEADLINE_MARGIN_SECONDS = 120.0
+
+_DURATION_RE = re.compile(r"^(?:(\d+(?:\.\d+)?)h)?(?:(\d+(?:\.\d+)?)m)?(?:(\d+(?:\.\d+)?)s?)?$")
+
+
+def video_duration(video: dict) -> float:
+    """Audio seconds from a flat entry (``DEFAULT_DURATION`` when unknown)."""
+    try:
+        d = float(video.get("duration") or 0)
+    except (TypeError, ValueError):
+        d = 0.0
+    return d if d > 0 else DEFAULT_DURATION
+
+
+def _views_per_minute(video: dict) -> float:
+    try:
+        views = float(video.get("view_count") or 0)
+    except (TypeError, ValueError):
+        views = 0.0
+    return views / max(video_duration(video) / 60.0, 1.0)
+
+
+def order_key(policy: str) -> Optional[Callable[[dict], float]]:
+    """Priority for ``policy`` (lowest runs first); ``None`` keeps arrival order."""
+    if policy == ORDER_SHORTEST:
+        return video_duration
+    if policy == ORDER_LONGEST:
+        return lambda video: -video_duration(video)
+    if policy == ORDER_VIEWS:
+        return lambda video: -_views_per_minute(video)
+    if policy == ORDER_LISTING:
+        return None
+    raise ValueError(f"unknown order policy {policy!r} (choose from {', '.join(ORDERS)})")
+
+
+def order_videos(videos: Iterable[dict], policy: str) -> List[dict]:
+    """``videos`` in the order ``policy`` would run them (stable)."""
+    key = order_key(policy)
+    videos = list(videos)
+    return sorted(videos, key=key) if key else videos
+
+
+def predict_makespan(job_seconds: Sequence[float], workers: int) -> float:
+    """
+    Wall time for ``job_seconds`` started in order on ``workers`` identical
+    machines, each job going to the first one free (list scheduling).
+    """
+    free = [0.0] * max(1, int(workers))
+    end = 0.0
+    for seconds in job_seconds:
+        start = heapq.heappop(free)
+        finish = start + max(0.0, float(seconds))
+        end = max(end, finish)
+        heapq.heappush(free, finish)
+    return end
+
+
+class RuntimeModel:
+    """Whisper seconds per audio second, per model, from past runs."""
+
+    def __init__(self, history: Optional[Dict[str, Sequence[float]]] = None):
+        # model -> (wall seconds, audio seconds) summed over finished jobs
+        self._totals: Dict[str, List[float]] = defaultdict(lambda: [0.0, 0.0])
+        for model, (wall, audio) in (history or {}).items():
+            self._totals[model] = [float(wall), float(audio)]
+
+    @classmethod
+    def from_events(cls, paths: Iterable[str], whisper_batch: int = 0) -> "RuntimeModel":
+        """
+        Aggregate successful ``transcribe`` rows across event streams.
+
+        Only runs with the same ``whisper_batch`` setting count (batched
+        inference has its own RTF). Streamed rows (download and ASR in one
+        stage) count their ``asr_seconds`` only, and are skipped when that
+        is missing.
+        """
+        batch = whisper_batch if whisper_batch > 1 else 0
+        rt = cls()
+        for path in paths:
+            rows, _ = read_events(path)
+            models: Dict[str, str] = {}
+            for row in rows:
+                if (
+                    row.get("event") == "run_start"
+                    and row.get("model")
+                    and (row.get("whisper_batch") or 0) == batch
+                ):
+                    models[row.get("run")] = row["model"]
+                elif (
+                    row.get("event") == "done"
+                    and row.get("stage") == TRANSCRIBE
+                    and row.get("outcome") == "ok"
+                    and row.get("audio_seconds")
+                    and row.get("run") in models
+                ):
+                    if row.get("streamed"):
+                        if row.get("asr_seconds") is None:
+                            continue
+                        wall = row["asr_seconds"]
+                    else:
+                        wall = row.get("seconds") or 0.0
+                    rt.add(models[row["run"]], wall, row["audio_seconds"])
+        return rt
+
+    def add(self, model: str, wall_seconds: float, audio_seconds: float) -> None:
+        t = self._totals[model]
+        t[0] += float(wall_seconds)
+        t[1] += float(audio_seconds)
+
+    def samples(self, model: str) -> float:
+        """Audio seconds of history behind ``rtf(model)`` (0 = default)."""
+        return self._totals[model][1] if model in self._totals else 0.0
+
+    def rtf(self, model: str) -> float:
+        wall, audio = self._totals[model] if model in self._totals else (0.0, 0.0)
+        if audio > 0 and wall > 0:
+            return wall / audio
+        return DEFAULT_RTF.get(model, FALLBACK_RTF)
+
+    def seconds(self, video: dict, model: str) -> float:
+        """Predicted Whisper wall seconds for one video."""
+        return video_duration(video) * self.rtf(model)
+
+    def makespan(
+        self, videos: Sequence[dict], model: str, workers: int, policy: str = ORDER_LISTING
+    ) -> float:
+        """Predicted ASR makespan for ``videos`` under ``policy``."""
+        ordered = order_videos(videos, policy)
+        return predict_makespan([self.seconds(v, model) for v in ordered], workers)
+
+
+def parse_duration(text: str) -> float:
+    """``"90m"``, ``"2h"``, ``"1h30m"``, ``"45s"`` or bare seconds → seconds."""
+    m = _DURATION_RE.match((text or "").strip().lower())
+    if not m or not any(m.groups()):
+        raise ValueError(f"invalid duration {text!r} (use e.g. 90m, 2h, 1h30m)")
+    h, mins, secs = (float(g) if g else 0.0 for g in m.groups())
+    return h * 3600 + mins * 60 + secs
+
+
+def parse_until(text: str, now: Optional[datetime] = None) -> float:
+    """Next local ``HH:MM`` (today, else tomorrow) → epoch seconds."""
+    try:
+        t = datetime.strptime((text or "").strip(), "%H:%M")
+    except ValueError:
+        raise ValueError(f"invalid time {text!r} (use HH:MM, e.g. 07:00)") from None
+    now = now or datetime.now()
+    at = now.replace(hour=t.hour, minute=t.minute, second=0, microsecond=0)
+    if at <= now:
+        at += timedelta(days=1)
+    return at.timestamp()
+
+
+class TimeBudget:
+    """
+    Admission control for Whisper work under a wall-clock deadline.
+
+    Each admitted video adds its predicted ASR seconds to a backlog shared by
+    ``workers`` models. :meth:`admit` refuses a video whose predicted finish
+    (backlog plus this video spread over the models, plus ``margin``) lands
+    after ``deadline``; shorter videos later in the queue may still fit.
+    :meth:`release` removes a video's share once it is done.
+    """
+
+    def __init__(
+        self,
+        deadline: float,
+        runtime: RuntimeModel,
+        model: str,
+        workers: int = 1,
+        margin: float = DEADLINE_MARGIN_SECONDS,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.deadline = float(deadline)
+        self.runtime = runtime
+        self.model = model
+        self.workers = max(1, int(workers))
+        self.margin = float(margin)
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._pending: Dict[str, float] = {}
+
+    def remaining(self) -> float:
+        return self.deadline - self.clock()
+
+    @property
+    def expired(self) -> bool:
+        """No time left to start anything new."""
+        return self.remaining() <= self.margin
+
+    def backlog(self) -> float:
+        with self._lock:
+            return sum(self._pending.values())
+
+    def admit(self, video: dict) -> bool:
+        cost = self.runtime.seconds(video, self.model)
+        with self._lock:
+            backlog = sum(self._pending.values())
+            finish = max(cost, (backlog + cost) / self.workers) + self.margin
+            if finish > self.remaining():
+                return False
+            self._pending[video["id"]] = cost
+            return True
+
+    def release(self, video: dict) -> None:
+        with self._lock:
+            self._pending.pop(video["id"], None)
@@ -0,0 +1,87 @@
+"""Two-stage Ctrl-C for batch runs: drain first, abort on the second signal.
+
+The first SIGINT / SIGTERM sets :attr:`GracefulShutdown.draining` and calls
+the registered drain callbacks. The caption sweep stops, queued downloads
+are dropped, and downloads and transcriptions already running finish and
+are journaled. A second signal calls the abort callbacks (kill yt-dlp
+children) and exits at once with status 130. Transcripts are written
+atomically (``suxxtext.paths.atomic_write_text``), so even a hard abort
+never leaves a truncated ``.txt`` that a later run would take as done.
+"""
+
+from __future__ import annotations
+
+import os
+import signal
+import threading
+from typing import Callable, Dict, List, Optional
+
+from colorama import Fore, Style
+
+_SIGNALS = tuple(
+    sig for sig in (getattr(signal, "SIGINT", None), getattr(signal, "SIGTERM", None)) if sig
+)
+
+
+class GracefulShutdown:
+    """Installs SIGINT / SIGTERM handlers for the duration of a ``with`` block."""
+
+    def __init__(self, exit: Callable[[int], None] = os._exit):
+        self._exit = exit
+        self._drained = threading.Event()
+        self._on_drain: List[Callable[[], None]] = []
+        self._on_abort: List[Callable[[], None]] = []
+        self._previous: Dict[int, object] = {}
+
+    @property
+    def draining(self) -> bool:
+        return self._drained.is_set()
+
+    def on_drain(self, callback: Callable[[], None]) -> None:
+        self._on_drain.append(callback)
+        if self.draining:
+            callback()
+
+    def on_abort(self, callback: Callable[[], None]) -> None:
+        self._on_abort.append(callback)
+
+    def request(self, signum: Optional[int] = None) -> None:
+        """What a signal does (also callable directly, e.g. from tests)."""
+        if not self.draining:
+            self._drained.set()
+            print(
+                f"\n{Fore.YELLOW + Style.BRIGHT}Stopping: no new work is started; "
+                f"in-flight downloads / transcriptions finish. "
+                f"Press Ctrl-C again to abort now.{Style.RESET_ALL}"
+            )
+            for callback in list(self._on_drain):
+                callback()
+            return
+        print(f"\n{Fore.RED + Style.BRIGHT}Aborting.{Style.RESET_ALL}")
+        for callback in list(self._on_abort):
+            try:
+                callback()
+            except Exception:
+                pass
+        self._exit(130)
+
+    def _handle(self, signum, frame) -> None:
+        self.request(signum)
+
+    def install(self) -> "GracefulShutdown":
+        # signal handlers can only be set from the main thread
+        if threading.current_thread() is threading.main_thread():
+            for sig in _SIGNALS:
+                self._previous[sig] = signal.signal(sig, self._handle)
+        return self
+
+    def restore(self) -> None:
+        for sig, handler in self._previous.items():
+            signal.signal(sig, handler)
+        self._previous.clear()
+
+    def __enter__(self) -> "GracefulShutdown":
+        return self.install()
+
+    def __exit__(self, *exc) -> None:
+        self.restore()
@@ -0,0 +1,354 @@
+"""Stream Whisper audio from yt-dlp through ffmpeg straight into the model.
+
+The file path downloads ``<title>_<views>_<id>.m4a`` to ``mp3/`` in full and
+only then hands it to Whisper, which decodes it again from disk. With
+``--stream-audio`` the ASR worker runs instead::
+
+    yt-dlp -f bestaudio -o - URL  →  ffmpeg (16 kHz mono s16le)  →  Whisper
+
+and transcribes the PCM in windows of ``STREAM_WINDOW_SECONDS`` as they
+arrive, so the download and inference of one video overlap. Each window is
+cut at the quietest 100 ms of its last ``CUT_SEARCH_SECONDS``, and the tail
+of the text so far is the next window's ``initial_prompt``, so cuts rarely
+split a word or lose context. A model is borrowed from the pool for one
+window at a time, never while waiting on the network.
+
+The downloaded bytes also go to ``mp3/`` (``.part``, renamed when complete)
+unless ``keep_file`` is ``None`` (audio cache ``delete``); then the audio
+never touches the disk.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import os
+import queue
+import shutil
+import subprocess
+import threading
+import time
+from collections import deque
+from typing import Any, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from suxxtext.paths import atomic_write_text
+from suxxtext.ratelimit import DOWNLOAD, rate_limiter
+from suxxtext.youtube import audio_stream_argv, tracked_child
+
+SAMPLE_RATE = 16000
+STREAM_WINDOW_SECONDS = 120.0
+CUT_SEARCH_SECONDS = 5.0
+# Characters of earlier text passed as the next window's prompt
+PROMPT_CHARS = 200
+# Decoded audio allowed to wait for a model before the download is paused
+MAX_BUFFER_SECONDS = 1800.0
+
+_READ_BYTES = 64 * 1024
+_FRAME = SAMPLE_RATE // 10
+
+
+def ffmpeg_available() -> bool:
+    return shutil.which("ffmpeg") is not None
+
+
+def decoder_argv() -> List[str]:
+    """ffmpeg: any container on stdin → 16 kHz mono signed 16-bit PCM on stdout."""
+    return [
+        "ffmpeg",
+        "-hide_banner",
+        "-loglevel",
+        "error",
+        "-i",
+        "pipe:0",
+        "-f",
+        "s16le",
+        "-ac",
+        "1",
+        "-ar",
+        str(SAMPLE_RATE),
+        "pipe:1",
+    ]
+
+
+class AudioStream:
+    """
+    ``source`` (yt-dlp writing media to stdout) piped through ``decoder``.
+
+    Use as a context manager and iterate for float32 PCM chunks. Once the
+    iteration ends, :attr:`error` holds the failure (with the stderr tail of
+    the process that failed), or ``None`` when the whole track was decoded
+    and ``keep_file`` (if any) is complete on disk.
+    """
+
+    def __init__(
+        self,
+        source: List[str],
+        decoder: Optional[List[str]] = None,
+        keep_file: Optional[str] = None,
+        max_buffer_seconds: float = MAX_BUFFER_SECONDS,
+    ):
+        self.source = source
+        self.decoder = decoder or decoder_argv()
+        self.keep_file = keep_file
+        self.error: Optional[str] = None
+        self.bytes_in = 0
+        self.samples = 0
+        chunks = max(1, int(max_buffer_seconds * SAMPLE_RATE * 2 / _READ_BYTES))
+        self._chunks: queue.Queue = queue.Queue(maxsize=chunks)
+        self._procs: List[subprocess.Popen] = []
+        self._threads: List[threading.Thread] = []
+        self._stderr: List[deque] = []
+        self._pump_error: Optional[str] = None
+        self._stopping = threading.Event()
+        self._children = contextlib.ExitStack()
+        self._finished = False
+
+    @property
+    def seconds(self) -> float:
+        return self.samples / SAMPLE_RATE
+
+    # -- lifecycle --------------------------------------------------------
+
+    def _spawn(self, argv: List[str], **kwargs: Any) -> subprocess.Popen:
+        proc = subprocess.Popen(
+            argv, stderr=subprocess.PIPE, start_new_session=os.name != "nt", **kwargs
+        )
+        self._children.enter_context(tracked_child(proc))
+        self._procs.append(proc)
+        tail: deque = deque(maxlen=3)
+        self._stderr.append(tail)
+        self._thread(self._drain_stderr, proc, tail)
+        return proc
+
+    def _thread(self, target: Any, *args: Any) -> None:
+        t = threading.Thread(target=target, args=args, daemon=True)
+        t.start()
+        self._threads.append(t)
+
+    def __enter__(self) -> "AudioStream":
+        try:
+            self._decoder = self._spawn(
+                self.decoder, stdin=subprocess.PIPE, stdout=subprocess.PIPE
+            )
+            self._source = self._spawn(self.source, stdout=subprocess.PIPE)
+        except OSError as e:
+            self.error = f"Could not start {e.filename or 'decoder'}: {e}"
+            self._kill()
+            self._chunks.put(None)
+            self._finished = True
+            return self
+        self._thread(self._pump)
+        self._thread(self._read)
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self._stopping.set()
+        if not self._finished:
+            self._kill()
+            self._finish()
+        self._children.close()
+
+    def _kill(self) -> None:
+        for proc in self._procs:
+            if proc.poll() is None:
+                try:
+                    proc.kill()
+                except OSError:
+                    pass
+
+    # -- worker threads ---------------------------------------------------
+
+    @staticmethod
+    def _drain_stderr(proc: subprocess.Popen, tail: deque) -> None:
+        for raw in proc.stderr:
+            line = raw.decode("utf-8", "replace").strip()
+            if line:
+                tail.append(line)
+
+    def _pump(self) -> None:
+        """yt-dlp stdout → decoder stdin (and ``keep_file.part``)."""
+        part = None
+        try:
+            if self.keep_file:
+                part = open(self.keep_file + ".part", "wb")
+            while True:
+                data = self._source.stdout.read1(_READ_BYTES)
+                if not data:
+                    break
+                self.bytes_in += len(data)
+                if part is not None:
+                    part.write(data)
+                self._decoder.stdin.write(data)
+        except (OSError, ValueError) as e:
+            self._pump_error = str(e)
+            if self._source.poll() is None:
+                self._source.kill()
+        finally:
+            if part is not None:
+                part.close()
+            try:
+                self._decoder.stdin.close()
+            except OSError:
+                pass
+
+    def _put(self, item: Optional[bytes]) -> None:
+        while not self._stopping.is_set():
+            try:
+                self._chunks.put(item, timeout=0.2)
+                return
+            except queue.Full:
+                continue
+
+    def _read(self) -> None:
+        """Decoder stdout → whole 16-bit samples on the chunk queue."""
+        rest = b""
+        try:
+            while True:
+                data = self._decoder.stdout.read1(_READ_BYTES)
+                if not data:
+                    break
+                data = rest + data
+                cut = len(data) - len(data) % 2
+                rest = data[cut:]
+                if cut:
+                    self._put(data[:cut])
+        finally:
+            self._put(None)
+
+    # -- consumer ---------------------------------------------------------
+
+    def __iter__(self) -> Iterator[np.ndarray]:
+        while True:
+            item = self._chunks.get()
+            if item is None:
+                break
+            pcm = np.frombuffer(item, dtype="<i2").astype(np.float32) / 32768.0
+            self.samples += len(pcm)
+            yield pcm
+        if not self._finished:
+            self._finish()
+
+    def _finish(self) -> None:
+        for proc in self._procs:
+            proc.wait()
+        for t in self._threads:
+            t.join()
+        self._finished = True
+        if self.error is None:
+            self.error = self._failure()
+        part = self.keep_file + ".part" if self.keep_file else None
+        if part is None or not os.path.exists(part):
+            return
+        if self.error is None:
+            os.replace(part, self.keep_file)
+        else:
+            try:
+                os.remove(part)
+            except OSError:
+                pass
+
+    def _failure(self) -> Optional[str]:
+        (decoder, source), (decoder_tail, source_tail) = self._procs, self._stderr
+        # whoever stopped first: the pump kills yt-dlp when the decoder dies
+        order = [(decoder, decoder_tail, "decoder"), (source, source_tail, "yt-dlp")]
+        if not self._pump_error:
+            order.reverse()
+        for proc, tail, name in order:
+            if proc.returncode:
+                detail = f" | {' | '.join(tail)}" if tail else ""
+                return f"{name} exited with status {proc.returncode}{detail}"
+        if self._pump_error:
+            return f"Audio pipe failed: {self._pump_error}"
+        if not self.samples:
+            return "No audio decoded"
+        return None
+
+
+def open_audio_stream(
+    youtube_url: str,
+    cookies_from_browser: Optional[str] = None,
+    keep_file: Optional[str] = None,
+) -> AudioStream:
+    """:class:`AudioStream` of a video's audio track (one download slot)."""
+    rate_limiter().acquire(DOWNLOAD)
+    return AudioStream(audio_stream_argv(youtube_url, cookies_from_browser), keep_file=keep_file)
+
+
+def _cut_point(audio: np.ndarray, window: int, search: int) -> int:
+    """Index in ``[window - search, window]`` at the quietest (latest) 100 ms frame."""
+    lo = max(0, window - search)
+    region = audio[lo:window]
+    n = len(region) // _FRAME
+    if n == 0:
+        return window
+    energy = np.square(region[: n * _FRAME].reshape(n, _FRAME)).mean(axis=1)
+    quietest = n - 1 - int(energy[::-1].argmin())
+    return lo + quietest * _FRAME + _FRAME // 2
+
+
+def pcm_windows(
+    chunks: Iterable[np.ndarray],
+    window_seconds: float = STREAM_WINDOW_SECONDS,
+    search_seconds: float = CUT_SEARCH_SECONDS,
+) -> Iterator[np.ndarray]:
+    """Regroup PCM chunks into windows of about ``window_seconds``."""
+    window = max(_FRAME, int(window_seconds * SAMPLE_RATE))
+    search = min(window // 2, int(search_seconds * SAMPLE_RATE))
+    buf: List[np.ndarray] = []
+    have = 0
+    for chunk in chunks:
+        buf.append(chunk)
+        have += len(chunk)
+        while have >= window:
+            audio = np.concatenate(buf)
+            cut = _cut_point(audio, window, search)
+            yield audio[:cut]
+            buf = [audio[cut:]]
+            have = len(buf[0])
+    if have >= _FRAME:
+        yield np.concatenate(buf)
+
+
+def transcribe_stream(
+    stream: Iterable[np.ndarray],
+    model_pool: Any,
+    output_file: str,
+    window_seconds: float = STREAM_WINDOW_SECONDS,
+    timing: Optional[dict] = None,
+) -> Tuple[bool, Optional[str]]:
+    """
+    Whisper ``stream`` window by window into ``output_file``.
+
+    ``(ok, error)`` like :func:`suxxtext.whisper_runtime.transcribe_audio`.
+    Nothing is written unless the stream ends without ``error``, so a cut-off
+    download never leaves a partial transcript. ``timing["asr_seconds"]``
+    gets the time spent in the model, without waits on the network.
+    """
+    texts: List[str] = []
+    try:
+        for audio in pcm_windows(stream, window_seconds):
+            kwargs: dict = {"beam_size": 5}
+            prompt = " ".join(texts)[-PROMPT_CHARS:].strip()
+            if prompt:
+                kwargs["initial_prompt"] = prompt
+            with model_pool.get_model() as model:
+                t0 = time.perf_counter()
+                segments, _ = model.transcribe(audio, **kwargs)
+                text = " ".join(segment.text for segment in segments).strip()
+                if timing is not None:
+                    timing["asr_seconds"] = timing.get("asr_seconds", 0.0) + (
+                        time.perf_counter() - t0
+                    )
+            if text:
+                texts.append(text)
+    except Exception as e:
+        return False, str(e)
+    error = getattr(stream, "error", None)
+    if error:
+        return False, error
+    try:
+        atomic_write_text(output_file, " ".join(texts))
+    except OSError as e:
+        return False, str(e)
+    return True, None
@@ -0,0 +1,187 @@
+"""Bulk subtitles through one yt-dlp process (caption API fallback).
+
+youtube-transcript-api is one HTTP client per video, and the batch stops
+using it after a streak of IP blocks. yt-dlp reaches the same subtitle
+tracks through the player API. It is slow to start (interpreter plus
+extractors), so :func:`fetch_subtitles_bulk` feeds a whole list of ids to
+a single ``yt-dlp --batch-file --skip-download --write-auto-subs`` run. It
+then parses the JSON3 (or WebVTT) files into the result dict of
+:func:`suxxtext.captions.fetch_captions`, so callers cannot tell which path
+produced the captions.
+"""
+
+from __future__ import annotations
+
+import html
+import json
+import os
+import re
+import tempfile
+from collections import deque
+from typing import Callable, Dict, Iterable, List, Optional
+
+from suxxtext.captions import caption_result
+from suxxtext.youtube import download_subtitles
+
+DEFAULT_SUBTITLE_LANGS = ["en"]
+# Videos per yt-dlp process
+DEFAULT_SUBTITLE_CHUNK = 50
+
+_VTT_TIME = re.compile(
+    r"^((?:\d+:)?\d{2}:\d{2}[.,]\d{3})\s+-->\s+((?:\d+:)?\d{2}:\d{2}[.,]\d{3})"
+)
+_VTT_TAG = re.compile(r"<[^>]*>")
+
+
+def parse_json3(data) -> List[dict]:
+    """Segments from a YouTube ``json3`` subtitle file (text or parsed dict)."""
+    if isinstance(data, (str, bytes)):
+        data = json.loads(data)
+    segments = []
+    for event in data.get("events") or ():
+        segs = event.get("segs")
+        if not segs:
+            continue
+        text = "".join(seg.get("utf8", "") for seg in segs).replace("\n", " ").strip()
+        if not text:
+            continue
+        segments.append(
+            {
+                "text": text,
+                "start": (event.get("tStartMs") or 0) / 1000.0,
+                "duration": (event.get("dDurationMs") or 0) / 1000.0,
+            }
+        )
+    return segments
+
+
+def _vtt_seconds(stamp: str) -> float:
+    parts = stamp.replace(",", ".").split(":")
+    seconds = 0.0
+    for part in parts:
+        seconds = seconds * 60 + float(part)
+    return seconds
+
+
+def parse_vtt(text: str) -> List[dict]:
+    """
+    Segments from a WebVTT file.
+
+    YouTube's auto-generated VTT repeats the previous line at the top of
+    each cue (rolling captions) and adds 10 ms cues that only repeat. Lines
+    seen in the last few cues are therefore dropped, so each spoken line is
+    kept once.
+    """
+    segments: List[dict] = []
+    recent: deque = deque(maxlen=3)
+    start = end = None
+    for raw in text.splitlines():
+        line = raw.strip()
+        match = _VTT_TIME.match(line)
+        if match:
+            start, end = _vtt_seconds(match.group(1)), _vtt_seconds(match.group(2))
+            continue
+        if start is None or not line:
+            continue
+        clean = html.unescape(_VTT_TAG.sub("", line)).strip()
+        if not clean or clean in recent:
+            continue
+        recent.append(clean)
+        segments.append({"text": clean, "start": start, "duration": max(0.0, end - start)})
+    return segments
+
+
+def _pick_file(names: List[str], languages: List[str]) -> Optional[str]:
+    """Best subtitle file for one id: language order, then json3 over vtt."""
+
+    def rank(name: str):
+        _, lang, ext = name.split(".", 2) if name.count(".") >= 2 else (name, "", "")
+        for i, want in enumerate(languages):
+            if lang == want:
+                return (i, 0, ext != "json3", lang)
+            if lang.startswith(want):
+                return (i, 1, ext != "json3", lang)
+        return (len(languages), 0, ext != "json3", lang)
+
+    return min(names, key=rank) if names else None
+
+
+def read_subtitles(path: str, video_id: str) -> dict:
+    """Parse one downloaded subtitle file into a ``fetch_captions`` result."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            raw = f.read()
+        segments = parse_json3(raw) if path.endswith(".json3") else parse_vtt(raw)
+    except (OSError, ValueError) as e:
+        return {"error": f"Unreadable subtitles from yt-dlp: {e}"}
+    if not segments:
+        return {"error": "Empty subtitles from yt-dlp."}
+    language = os.path.basename(path).split(".")[1] if path.count(".") >= 2 else "unknown"
+    return caption_result(video_id, segments, language)
+
+
+def fetch_subtitles_bulk(
+    video_ids: Iterable[str],
+    languages: Optional[List[str]] = None,
+    cookies_from_browser: Optional[str] = None,
+    sleep_seconds: float = 0.0,
+) -> Dict[str, dict]:
+    """
+    ``{video_id: fetch_captions-style result}`` for every id, from one
+    yt-dlp run. Ids without subtitles get ``{"error": ...}`` (with the tail
+    of yt-dlp's stderr when the run failed, so IP blocks are recognisable).
+    """
+    ids = list(dict.fromkeys(v for v in video_ids if v))
+    if not ids:
+        return {}
+    languages = languages or DEFAULT_SUBTITLE_LANGS
+    with tempfile.TemporaryDirectory(prefix="suxxtext-subs-") as tmp:
+        ok, err = download_subtitles(ids, tmp, languages, cookies_from_browser, sleep_seconds)
+        by_id: Dict[str, List[str]] = {}
+        for name in os.listdir(tmp):
+            if name.endswith((".json3", ".vtt")):
+                by_id.setdefault(name.split(".", 1)[0], []).append(name)
+        results = {}
+        for vid in ids:
+            best = _pick_file(by_id.get(vid, []), languages)
+            if best is not None:
+                results[vid] = read_subtitles(os.path.join(tmp, best), vid)
+            elif ok or not err:
+                results[vid] = {"error": "No subtitles via yt-dlp."}
+            else:
+                results[vid] = {"error": f"No subtitles via yt-dlp: {err.rsplit(' | ', 1)[-1]}"}
+    return results
+
+
+class BulkSubtitles:
+    """
+    Subtitle results fetched a chunk of ids at a time.
+
+    The batch asks :meth:`fetch` for the current video plus the next
+    ``chunk - 1`` it will try, then reads them one by one with
+    :meth:`result`.
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[List[str]], Dict[str, dict]] = fetch_subtitles_bulk,
+        chunk: int = DEFAULT_SUBTITLE_CHUNK,
+    ):
+        self._fetch = fetch
+        self.chunk = max(1, int(chunk))
+        self.runs = 0
+        self._results: Dict[str, dict] = {}
+
+    def has(self, video_id: str) -> bool:
+        return video_id in self._results
+
+    def fetch(self, video_ids: List[str]) -> None:
+        self.runs += 1
+        results = self._fetch(list(video_ids))
+        for vid in video_ids:
+            self._results[vid] = results.get(vid) or {"error": "No subtitles via yt-dlp."}
+
+    def result(self, video_id: str) -> dict:
+        if video_id not in self._results:
+            self.fetch([video_id])
+        return self._results.pop(video_id)
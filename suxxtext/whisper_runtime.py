@@ -1,14 +1,55 @@
-"""faster-whisper model loading and transcription."""
+"""faster-whisper model loading and transcription.
+
+Two model pool backends share the ``get_model()`` interface used by the
+batch ASR stage:
+
+- ``thread`` (:class:`ModelPool`) — every instance lives in this process and
+  the ASR threads borrow them. Right for GPUs, where CTranslate2 releases the
+  GIL for the heavy work.
+- ``process`` (:class:`ProcessModelPool`) — CPU hosts. Each instance lives in
+  its own worker process with ``cpu_threads`` inference threads, pinned to
+  its own cores where the OS allows. Audio decode and the Python-side
+  segment handling then run in parallel instead of queueing on one GIL.
+
+Audio given to :func:`transcribe_audio` may be a media file or a ``.npy``
+of 16 kHz float32 samples written ahead of time (``suxxtext.predecode``);
+the latter is memory-mapped, so the model skips decoding.
+
+With ``batch_size`` > 1 either pool wraps each instance in a
+:class:`BatchedModel`. faster-whisper's ``BatchedInferencePipeline`` then
+splits each file at VAD speech boundaries into chunks of up to 30 s and
+runs ``batch_size`` chunks per encoder/decoder pass. One instance then does
+the work that would otherwise need several full model copies.
+"""
 
 from __future__ import annotations
 
 import contextlib
+import multiprocessing
+import os
 import queue
-from typing import Any, Optional, Tuple, Union
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from types import SimpleNamespace
+from typing import Any, Callable, List, Optional, Tuple, Union
 
+import numpy as np
 from colorama import Fore, Style
 from faster_whisper import WhisperModel
 
+from suxxtext.paths import atomic_write_text
+
+BACKEND_THREAD = "thread"
+BACKEND_PROCESS = "process"
+BACKENDS = (BACKEND_THREAD, BACKEND_PROCESS)
+
+
+def load_audio(audio: Any) -> Any:
+    """Pre-decoded ``.npy`` paths → memory-mapped samples; anything else as is."""
+    if isinstance(audio, str) and audio.endswith(".npy"):
+        return np.load(audio, mmap_mode="r")
+    return audio
+
 
 def get_whisper_runtime() -> Tuple[str, str]:
     """Prefer CUDA + float16; fall back to CPU int8."""
@@ -31,21 +72,58 @@ def load_whisper_model(model_name: str, quiet: bool = False) -> WhisperModel:
     return WhisperModel(model_name, device=device, compute_type=compute_type)
 
 
+class BatchedModel:
+    """
+    ``model`` behind ``BatchedInferencePipeline``: same ``transcribe`` call,
+    but the VAD chunks of one file are decoded ``batch_size`` at a time.
+    """
+
+    def __init__(self, model: Any, batch_size: int):
+        try:
+            from faster_whisper import BatchedInferencePipeline
+        except ImportError:
+            raise RuntimeError(
+                "--whisper-batch needs faster-whisper >= 1.1. "
+                "Run: pip install -U faster-whisper"
+            ) from None
+        self.model = model
+        self.batch_size = batch_size
+        self.pipeline = BatchedInferencePipeline(model)
+
+    def transcribe(self, audio: Any, **kwargs: Any) -> Tuple[Any, Any]:
+        kwargs.setdefault("batch_size", self.batch_size)
+        return self.pipeline.transcribe(audio, **kwargs)
+
+
+def batched(model: Any, batch_size: int) -> Any:
+    """``model`` wrapped in :class:`BatchedModel` when ``batch_size`` > 1."""
+    return BatchedModel(model, batch_size) if batch_size > 1 else model
+
+
 class ModelPool:
-    def __init__(self, model_name: str, pool_size: int):
+    def __init__(
+        self, model_name: str, pool_size: int, cpu_threads: int = 0, batch_size: int = 0
+    ):
         self.pool: queue.Queue = queue.Queue()
         self.pool_size = pool_size
+        self.batch_size = batch_size
         self.device, self.compute_type = get_whisper_runtime()
+        # 0 = CTranslate2 default; only applies to CPU instances
+        threads = {"cpu_threads": int(cpu_threads)} if cpu_threads else {}
         print(
             f"{Fore.MAGENTA}Initializing Model Pool: {pool_size} x '{model_name}' "
-            f"on {self.device} ({self.compute_type})...{Style.RESET_ALL}"
+            f"on {self.device} ({self.compute_type})"
+            f"{f', batch {batch_size}' if batch_size > 1 else ''}...{Style.RESET_ALL}"
         )
         for i in range(pool_size):
             try:
                 model = WhisperModel(
-                    model_name, device=self.device, compute_type=self.compute_type
+                    model_name,
+                    device=self.device,
+                    compute_type=self.compute_type,
+                    **(threads if self.device == "cpu" else {}),
                 )
-                self.pool.put(model)
+                self.pool.put(batched(model, batch_size))
                 print(
                     f"{Fore.MAGENTA}  - Loaded model instance {i + 1}/{pool_size}{Style.RESET_ALL}"
                 )
@@ -61,8 +139,9 @@ class ModelPool:
                             model_name,
                             device=self.device,
                             compute_type=self.compute_type,
+                            **threads,
                         )
-                        self.pool.put(model)
+                        self.pool.put(batched(model, batch_size))
                         print(
                             f"{Fore.MAGENTA}  - Loaded model instance {i + 1}/{pool_size} on CPU{Style.RESET_ALL}"
                         )
@@ -83,6 +162,144 @@ class ModelPool:
         finally:
             self.pool.put(model)
 
+    def close(self) -> None:
+        pass
+
+
+# -- process backend ---------------------------------------------------------
+
+Segment = namedtuple("Segment", "start end text")
+
+# The model owned by this worker process (set by the pool initializer)
+_WORKER_MODEL: Any = None
+
+
+def load_cpu_model(model_name: str, cpu_threads: int) -> Any:
+    """Default :class:`ProcessModelPool` loader: int8 CPU model."""
+    return WhisperModel(model_name, device="cpu", compute_type="int8", cpu_threads=cpu_threads)
+
+
+def _init_worker(
+    loader: Callable[[str, int], Any],
+    model_name: str,
+    cpu_threads: int,
+    cores: Optional[List[int]],
+    batch_size: int = 0,
+) -> None:
+    global _WORKER_MODEL
+    if cores and hasattr(os, "sched_setaffinity"):
+        try:
+            os.sched_setaffinity(0, cores)
+        except OSError:
+            pass
+    _WORKER_MODEL = batched(loader(model_name, cpu_threads), batch_size)
+
+
+def _worker_ready() -> bool:
+    return _WORKER_MODEL is not None
+
+
+def _worker_transcribe(audio_file: str, kwargs: dict) -> Tuple[List[Segment], Any]:
+    segments, info = _WORKER_MODEL.transcribe(load_audio(audio_file), **kwargs)
+    # consume the generator here: decoding and inference happen in this process
+    out = [Segment(s.start, s.end, s.text) for s in segments]
+    return out, SimpleNamespace(
+        language=getattr(info, "language", None), duration=getattr(info, "duration", None)
+    )
+
+
+class _RemoteModel:
+    """Stands in for a model that lives in one worker process."""
+
+    def __init__(self, executor: ProcessPoolExecutor):
+        self._executor = executor
+
+    def transcribe(self, audio_file: Any, **kwargs: Any) -> Tuple[List[Segment], Any]:
+        if isinstance(audio_file, np.memmap) and audio_file.filename:
+            audio_file = str(audio_file.filename)  # the worker maps the file itself
+        return self._executor.submit(_worker_transcribe, audio_file, kwargs).result()
+
+
+def _usable_cores() -> List[int]:
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+class ProcessModelPool:
+    """
+    ``pool_size`` CPU models, one per worker process.
+
+    Each worker gets ``cpu_threads`` inference threads (default: usable cores
+    split evenly) and, with ``pin=True`` and enough cores, its own core set
+    via ``sched_setaffinity`` (Linux). ``loader(model_name, cpu_threads)``
+    builds the model inside the worker; it must be importable (spawn).
+    ``batch_size`` > 1 wraps it in :class:`BatchedModel` there.
+    """
+
+    def __init__(
+        self,
+        model_name: str,
+        pool_size: int,
+        cpu_threads: int = 0,
+        pin: bool = True,
+        loader: Callable[[str, int], Any] = load_cpu_model,
+        batch_size: int = 0,
+    ):
+        self.pool: queue.Queue = queue.Queue()
+        self.pool_size = max(1, int(pool_size))
+        self.batch_size = batch_size
+        self.device, self.compute_type = "cpu", "int8"
+        cores = _usable_cores()
+        self.cpu_threads = int(cpu_threads) or max(1, len(cores) // self.pool_size)
+        pin = pin and len(cores) >= self.pool_size * self.cpu_threads
+        print(
+            f"{Fore.MAGENTA}Initializing Model Pool: {self.pool_size} x '{model_name}' "
+            f"in worker processes (cpu int8, {self.cpu_threads} thread(s) each"
+            f"{', pinned' if pin else ''}"
+            f"{f', batch {batch_size}' if batch_size > 1 else ''})...{Style.RESET_ALL}"
+        )
+        ctx = multiprocessing.get_context("spawn")
+        self._executors: List[ProcessPoolExecutor] = []
+        for i in range(self.pool_size):
+            span = cores[i * self.cpu_threads : (i + 1) * self.cpu_threads] if pin else None
+            self._executors.append(
+                ProcessPoolExecutor(
+                    max_workers=1,
+                    mp_context=ctx,
+                    initializer=_init_worker,
+                    initargs=(loader, model_name, self.cpu_threads, span, batch_size),
+                )
+            )
+        # load every instance in parallel; surface load errors here
+        ready = [ex.submit(_worker_ready) for ex in self._executors]
+        try:
+            for i, fut in enumerate(ready):
+                fut.result()
+                print(
+                    f"{Fore.MAGENTA}  - Loaded model instance {i + 1}/{self.pool_size} "
+                    f"(process){Style.RESET_ALL}"
+                )
+        except Exception as e:
+            print(f"{Fore.RED}Error loading model worker process: {e}{Style.RESET_ALL}")
+            self.close()
+            raise
+        for ex in self._executors:
+            self.pool.put(_RemoteModel(ex))
+
+    @contextlib.contextmanager
+    def get_model(self):
+        model = self.pool.get()
+        try:
+            yield model
+        finally:
+            self.pool.put(model)
+
+    def close(self) -> None:
+        for ex in self._executors:
+            ex.shutdown(wait=True, cancel_futures=True)
+        self._executors = []
+
 
 def transcribe_audio(
     audio_file: str,
@@ -96,10 +313,9 @@ def transcribe_audio(
             model = load_whisper_model(model_name_or_obj)
         else:
             model = model_name_or_obj
-        segments, _ = model.transcribe(audio_file, beam_size=5)
+        segments, _ = model.transcribe(load_audio(audio_file), beam_size=5)
         full_text = " ".join(segment.text for segment in segments)
-        with open(output_file, "w", encoding="utf-8") as f:
-            f.write(full_text)
+        atomic_write_text(output_file, full_text)
         return True, None
     except Exception as e:
         return False, str(e)
@@ -1,17 +1,98 @@
-"""yt-dlp helpers: resolve binary, download media, list channel videos."""
+"""yt-dlp helpers: resolve binary, download media, list channel videos.
+
+Whisper audio is fetched with one of two profiles (:func:`set_audio_profile`):
+``best`` (``bestaudio[ext=m4a]``, about 130 kbps AAC) or ``asr``, the
+smallest audio-only stream at or above a bitrate floor (48 kbps by default;
+Whisper resamples everything to 16 kHz mono anyway). If no stream reaches
+the floor, ``asr`` takes the one closest to it.
+
+Downloads and flat discovery run yt-dlp either as a subprocess per call
+(``subprocess``, the default) or through long-lived in-process
+``YoutubeDL`` instances (``inprocess``, see ``suxxtext.ytdl_pool``), chosen
+with :func:`set_ytdl_engine` or ``SUXXTEXT_YTDL_ENGINE``.
+"""
 
 from __future__ import annotations
 
+import contextlib
 import os
 import re
 import shutil
 import subprocess
+import sys
+import threading
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from suxxtext.ratelimit import DOWNLOAD, METADATA, rate_limiter
+from suxxtext.ytdl_pool import ytdl_pool
 
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
 SUXXTEXT_VENV_PYTHON = PROJECT_ROOT / "suxxtext-venv" / "bin" / "python3"
 
+ENGINE_SUBPROCESS = "subprocess"
+ENGINE_INPROCESS = "inprocess"
+YTDL_ENGINES = (ENGINE_SUBPROCESS, ENGINE_INPROCESS)
+_ENGINE = os.environ.get("SUXXTEXT_YTDL_ENGINE", ENGINE_SUBPROCESS)
+if _ENGINE not in YTDL_ENGINES:
+    _ENGINE = ENGINE_SUBPROCESS
+
+AUDIO_FORMAT = "bestaudio[ext=m4a]/bestaudio"
+AUDIO_BEST = "best"
+AUDIO_ASR = "asr"
+AUDIO_PROFILES = (AUDIO_BEST, AUDIO_ASR)
+DEFAULT_ASR_MIN_KBPS = 48.0
+# YouTube's bestaudio[ext=m4a] (itag 140): the baseline for bytes saved
+BEST_AUDIO_KBPS = 129.5
+_AUDIO_PROFILE: Tuple[str, float] = (AUDIO_BEST, DEFAULT_ASR_MIN_KBPS)
+LOWRES_FORMAT = (
+    "bestvideo[height<=480][ext=mp4]+bestaudio[ext=m4a]/best[height<=480][ext=mp4]/best[ext=mp4]"
+)
+
+
+def set_ytdl_engine(engine: str) -> None:
+    """``subprocess`` (one yt-dlp process per call) or ``inprocess`` (pooled)."""
+    global _ENGINE
+    if engine not in YTDL_ENGINES:
+        raise ValueError(f"unknown yt-dlp engine: {engine}")
+    _ENGINE = engine
+
+
+def ytdl_engine() -> str:
+    return _ENGINE
+
+
+def set_audio_profile(profile: str, min_kbps: float = DEFAULT_ASR_MIN_KBPS) -> None:
+    """``best`` or ``asr`` (smallest audio stream of at least ``min_kbps``)."""
+    global _AUDIO_PROFILE
+    if profile not in AUDIO_PROFILES:
+        raise ValueError(f"unknown audio profile: {profile}")
+    _AUDIO_PROFILE = (profile, max(1.0, float(min_kbps)))
+
+
+def audio_profile() -> Tuple[str, float]:
+    return _AUDIO_PROFILE
+
+
+def audio_format() -> Tuple[str, Optional[List[str]]]:
+    """yt-dlp ``(format, format_sort)`` for Whisper audio under the current profile."""
+    profile, floor = _AUDIO_PROFILE
+    if profile != AUDIO_ASR:
+        return AUDIO_FORMAT, None
+    # original language first, then the bitrate closest to the floor; the
+    # filter keeps streams below the floor out unless nothing reaches it
+    return f"ba[abr>={floor:g}]/ba", ["lang", f"abr~{floor:g}"]
+
+
+def best_audio_bytes(duration_seconds: float) -> int:
+    """Estimated size of the ``best`` profile download for this much audio."""
+    return int(duration_seconds * BEST_AUDIO_KBPS * 1000 / 8)
+
+
+def _audio_format_args() -> List[str]:
+    fmt, sort = audio_format()
+    return ["-f", fmt, *(["-S", ",".join(sort)] if sort else [])]
+
 
 def _cookies_from_browser_args(
     cookies_from_browser: Optional[str] = None,
@@ -53,28 +134,113 @@ def extract_video_id(url_or_id: str) -> str:
     return url_or_id
 
 
+# Running yt-dlp children, so a hard abort can stop them
+_CHILDREN: Set[subprocess.Popen] = set()
+_CHILDREN_LOCK = threading.Lock()
+
+
+def terminate_children() -> None:
+    """Kill every running yt-dlp child (second Ctrl-C)."""
+    with _CHILDREN_LOCK:
+        children = list(_CHILDREN)
+    for proc in children:
+        try:
+            proc.kill()
+        except OSError:
+            pass
+
+
+@contextlib.contextmanager
+def tracked_child(proc: subprocess.Popen) -> Iterator[subprocess.Popen]:
+    """Register ``proc`` for :func:`terminate_children` while the block runs."""
+    with _CHILDREN_LOCK:
+        _CHILDREN.add(proc)
+    try:
+        yield proc
+    finally:
+        with _CHILDREN_LOCK:
+            _CHILDREN.discard(proc)
+
+
+def _run_yt_dlp(argv: List[str]) -> Tuple[bool, Optional[str]]:
+    """
+    Run yt-dlp with stdout passed through; stderr is echoed after exit and
+    its last lines are appended to the error so callers can spot 403 /
+    bot-check / 429 failures.
+
+    The child runs in its own session (POSIX), so a terminal Ctrl-C reaches
+    only this process, which then lets in-flight downloads finish (see
+    ``suxxtext.shutdown``).
+    """
+    try:
+        proc = subprocess.Popen(
+            argv, stderr=subprocess.PIPE, text=True, start_new_session=os.name != "nt"
+        )
+    except OSError as e:
+        return False, str(e)
+    with tracked_child(proc):
+        _, stderr = proc.communicate()
+    if stderr:
+        sys.stderr.write(stderr)
+        sys.stderr.flush()
+    if proc.returncode == 0:
+        return True, None
+    err = str(subprocess.CalledProcessError(proc.returncode, argv))
+    tail = [ln.strip() for ln in (stderr or "").splitlines() if ln.strip()][-3:]
+    if tail:
+        err = f"{err} | {' | '.join(tail)}"
+    return False, err
+
+
 def download_audio(
     youtube_url: str,
     output_file: str,
     cookies_from_browser: Optional[str] = None,
+    progress: Optional[Callable[[dict], None]] = None,
 ) -> Tuple[bool, Optional[str]]:
-    try:
-        subprocess.run(
-            [
-                *resolve_yt_dlp(),
-                *_cookies_from_browser_args(cookies_from_browser),
-                "-f",
-                "bestaudio[ext=m4a]/bestaudio",
-                "-o",
-                output_file,
-                "--no-playlist",
-                youtube_url,
-            ],
-            check=True,
+    """
+    Best audio track to ``output_file``. ``progress`` gets yt-dlp progress
+    dicts (``inprocess`` engine only).
+    """
+    rate_limiter().acquire(DOWNLOAD)
+    if _ENGINE == ENGINE_INPROCESS:
+        fmt, sort = audio_format()
+        return ytdl_pool().download(
+            youtube_url,
+            output_file,
+            fmt,
+            cookies_from_browser=cookies_from_browser,
+            format_sort=sort,
+            progress=progress,
         )
-        return True, None
-    except subprocess.CalledProcessError as e:
-        return False, str(e)
+    return _run_yt_dlp(
+        [
+            *resolve_yt_dlp(),
+            *_cookies_from_browser_args(cookies_from_browser),
+            *_audio_format_args(),
+            "-o",
+            output_file,
+            "--no-playlist",
+            youtube_url,
+        ]
+    )
+
+
+def audio_stream_argv(
+    youtube_url: str, cookies_from_browser: Optional[str] = None
+) -> List[str]:
+    """yt-dlp argv that writes the audio track to stdout (``--stream-audio``)."""
+    return [
+        *resolve_yt_dlp(),
+        *_cookies_from_browser_args(cookies_from_browser),
+        *_audio_format_args(),
+        "-o",
+        "-",
+        "--no-playlist",
+        "--quiet",
+        "--no-progress",
+        youtube_url,
+    ]
 
 
 def download_lowres_video(
@@ -82,51 +248,135 @@ def download_lowres_video(
     output_file: str,
     cookies_from_browser: Optional[str] = None,
 ) -> Tuple[bool, Optional[str]]:
-    try:
-        subprocess.run(
-            [
-                *resolve_yt_dlp(),
-                *_cookies_from_browser_args(cookies_from_browser),
-                "-f",
-                "bestvideo[height<=480][ext=mp4]+bestaudio[ext=m4a]/best[height<=480][ext=mp4]/best[ext=mp4]",
-                "--merge-output-format",
-                "mp4",
-                "-o",
-                output_file,
-                "--no-playlist",
-                youtube_url,
-            ],
-            check=True,
+    rate_limiter().acquire(DOWNLOAD)
+    if _ENGINE == ENGINE_INPROCESS:
+        return ytdl_pool().download(
+            youtube_url,
+            output_file,
+            LOWRES_FORMAT,
+            cookies_from_browser=cookies_from_browser,
+            merge_output_format="mp4",
         )
-        return True, None
-    except subprocess.CalledProcessError as e:
-        return False, str(e)
+    return _run_yt_dlp(
+        [
+            *resolve_yt_dlp(),
+            *_cookies_from_browser_args(cookies_from_browser),
+            "-f",
+            LOWRES_FORMAT,
+            "--merge-output-format",
+            "mp4",
+            "-o",
+            output_file,
+            "--no-playlist",
+            youtube_url,
+        ]
+    )
+
+
+def download_subtitles(
+    video_ids: List[str],
+    out_dir: str,
+    languages: List[str],
+    cookies_from_browser: Optional[str] = None,
+    sleep_seconds: float = 0.0,
+) -> Tuple[bool, Optional[str]]:
+    """
+    Subtitles (manual or auto) for every id in one yt-dlp process, as
+    ``out_dir/<id>.<lang>.json3`` (``.vtt`` when json3 is not offered).
+
+    ``sleep_seconds`` spaces the subtitle requests inside the process.
+    yt-dlp exits non-zero if any video failed; the files that were written
+    are still valid.
+    """
+    batch_file = os.path.join(out_dir, "batch.txt")
+    with open(batch_file, "w", encoding="utf-8") as f:
+        f.writelines(f"https://www.youtube.com/watch?v={vid}\n" for vid in video_ids)
+    sleep_args = ["--sleep-subtitles", f"{sleep_seconds:g}"] if sleep_seconds > 0 else []
+    rate_limiter().acquire(METADATA)
+    return _run_yt_dlp(
+        [
+            *resolve_yt_dlp(),
+            *_cookies_from_browser_args(cookies_from_browser),
+            "--batch-file",
+            batch_file,
+            "--skip-download",
+            "--write-subs",
+            "--write-auto-subs",
+            "--sub-langs",
+            ",".join(f"{lang}.*" for lang in languages),
+            "--sub-format",
+            "json3/vtt/best",
+            *sleep_args,
+            "--ignore-errors",
+            "--no-warnings",
+            "--quiet",
+            "-P",
+            out_dir,
+            "-o",
+            "%(id)s.%(ext)s",
+        ]
+    )
 
 
 def extract_video_info(youtube_url: str) -> Dict[str, Any]:
     import yt_dlp
 
     ytdlp_opts = {"skip_download": True, "quiet": True, "no_playlist": True}
+    rate_limiter().acquire(METADATA)
     with yt_dlp.YoutubeDL(ytdlp_opts) as ydl:
         return ydl.extract_info(youtube_url, download=False)
 
 
-def get_channel_videos(channel_url: str, max_videos: int = 10) -> Tuple[List[dict], dict]:
-    """Return (video entries newest-first, full channel info). max_videos unused (full list)."""
+def get_channel_videos(
+    channel_url: str,
+    max_videos: Optional[int] = None,
+    stop_at_ids: Optional[Iterable[str]] = None,
+) -> Tuple[List[dict], dict]:
+    """
+    Return (video entries newest-first, channel info).
+
+    With ``max_videos`` or ``stop_at_ids`` the uploads tab is paged lazily
+    and listing stops after ``max_videos`` entries or at the first id already
+    in ``stop_at_ids`` (known from an earlier run) — a few pages instead of
+    the whole channel. With neither, the full channel is listed.
+    """
     import yt_dlp
 
-    _ = max_videos
     ytdlp_opts = {
         "extract_flat": True,
         "skip_download": True,
         "quiet": True,
         "force_generic_extractor": False,
     }
+    known = set(stop_at_ids or ())
+    incremental = bool(known) or bool(max_videos)
+    if incremental:
+        ytdlp_opts["lazy_playlist"] = True
+    rate_limiter().acquire(METADATA)
     with yt_dlp.YoutubeDL(ytdlp_opts) as ydl:
-        info = ydl.extract_info(channel_url, download=False)
-        videos = info.get("entries") or []
-        videos = [v for v in videos if v and str(v.get("ie_key", "")).startswith("Youtube")]
-        videos = sorted(videos, key=lambda v: v.get("upload_date") or "", reverse=True)
+        if not incremental:
+            info = ydl.extract_info(channel_url, download=False)
+            videos = info.get("entries") or []
+            videos = [v for v in videos if v and str(v.get("ie_key", "")).startswith("Youtube")]
+            videos = sorted(videos, key=lambda v: v.get("upload_date") or "", reverse=True)
+            return videos, info
+
+        # Unprocessed result: "entries" is a generator that fetches pages on demand
+        info = ydl.extract_info(channel_url, download=False, process=False)
+        for _ in range(3):  # follow channel-root → uploads-tab redirects
+            if info.get("_type") not in ("url", "url_transparent") or not info.get("url"):
+                break
+            info = ydl.extract_info(info["url"], download=False, process=False)
+        videos = []
+        for v in info.get("entries") or []:
+            if not v or not str(v.get("ie_key", "")).startswith("Youtube"):
+                continue
+            if v.get("id") in known:
+                break
+            videos.append(v)
+            if max_videos and len(videos) >= max_videos:
+                break
+        info["entries"] = videos
         return videos, info
 
 
@@ -140,9 +390,32 @@ def normalize_channel_url(channel: str) -> str:
     return f"https://www.youtube.com/@{channel}/videos"
 
 
+def _flat_entry(v: dict) -> dict:
+    def _field(key: str) -> str:
+        value = v.get(key)
+        return "?" if value is None else str(value)
+
+    return {
+        "title": str(v.get("title") or "").strip(),
+        "id": str(v.get("id") or "").strip(),
+        "duration": _field("duration"),
+        "view_count": _field("view_count"),
+        "url": v.get("webpage_url") or v.get("url") or "",
+    }
+
+
 def discover_channel_videos_flat(channel_url: str, limit: int = 10) -> List[dict]:
     """Lightweight latest-N discovery via yt-dlp --print (for TL;DW)."""
     url = normalize_channel_url(channel_url)
+    if _ENGINE == ENGINE_INPROCESS:
+        rate_limiter().acquire(METADATA)
+        try:
+            info = ytdl_pool().extract(
+                url, extract_flat="in_playlist", playlistend=limit, noplaylist=False
+            )
+        except Exception:
+            return []
+        return [_flat_entry(v) for v in (info.get("entries") or [])[:limit] if v]
     cmd = [
         *resolve_yt_dlp(),
         "--flat-playlist",
@@ -153,6 +426,7 @@ def discover_channel_videos_flat(channel_url: str, limit: int = 10) -> List[dict
         str(limit),
         url,
     ]
+    rate_limiter().acquire(METADATA)
     try:
         result = subprocess.run(cmd, capture_output=True, text=True, timeout=90)
         if result.returncode != 0:
@@ -0,0 +1,208 @@
+"""In-process yt-dlp: one long-lived ``YoutubeDL`` per worker thread.
+
+The subprocess path (``suxxtext.youtube._run_yt_dlp``) starts a fresh
+``python -m yt_dlp`` for every download. Each start pays interpreter
+start-up, extractor initialisation and the YouTube player-JS fetch and
+parse. :class:`YtdlPool` keeps one ``yt_dlp.YoutubeDL`` per worker thread
+(and per cookie source) alive for the whole run, so extractor and player
+caches are reused. Progress comes back through yt-dlp's progress hooks as
+dicts instead of text on stdout::
+
+    {"status": "downloading", "downloaded_bytes": 1048576, "total_bytes": 3145728,
+     "speed": 524288.0, "eta": 4, "elapsed": 2.0}
+
+Calls return ``(ok, error)`` like the subprocess helpers, with yt-dlp's last
+error lines in ``error`` so 403 / 429 / bot-check detection keeps working.
+Select it with ``--ytdl-engine inprocess`` or
+``SUXXTEXT_YTDL_ENGINE=inprocess`` (see ``suxxtext.youtube``).
+"""
+
+from __future__ import annotations
+
+import contextlib
+import os
+import re
+import sys
+import threading
+from collections import deque
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+ProgressFn = Callable[[dict], None]
+
+_ANSI = re.compile(r"\x1b\[[0-9;]*m")
+_PROGRESS_KEYS = ("downloaded_bytes", "total_bytes", "speed", "eta", "elapsed")
+
+
+def _browser(cookies_from_browser: Optional[str]) -> str:
+    return (
+        cookies_from_browser or os.environ.get("SUXXTEXT_COOKIES_FROM_BROWSER") or ""
+    ).strip()
+
+
+class _Logger:
+    """yt-dlp logger: drop chatter, echo errors to stderr, keep the last few."""
+
+    def __init__(self):
+        self.errors: deque = deque(maxlen=3)
+
+    def debug(self, msg: str) -> None:
+        pass
+
+    def info(self, msg: str) -> None:
+        pass
+
+    def warning(self, msg: str) -> None:
+        pass
+
+    def error(self, msg: str) -> None:
+        msg = _ANSI.sub("", msg).strip()
+        self.errors.append(msg)
+        sys.stderr.write(msg + "\n")
+
+
+class _Worker:
+    """One thread's ``YoutubeDL`` with its logger and current progress callback."""
+
+    def __init__(self, ydl: Any, logger: _Logger):
+        self.ydl = ydl
+        self.logger = logger
+        self.progress: Optional[ProgressFn] = None
+        ydl.add_progress_hook(self._hook)
+
+    def _hook(self, d: dict) -> None:
+        if self.progress is None:
+            return
+        total = d.get("total_bytes") or d.get("total_bytes_estimate")
+        report = {"status": d.get("status")}
+        report.update({k: d.get(k) for k in _PROGRESS_KEYS})
+        report["total_bytes"] = total
+        try:
+            self.progress(report)
+        except Exception:
+            pass  # a broken reporter must not fail the download
+
+
+class YtdlPool:
+    """
+    Long-lived ``yt_dlp.YoutubeDL`` instances, one per thread and cookie source.
+
+    Per-call options (output path, format) are set on the thread's instance
+    for the duration of the call only.
+    """
+
+    def __init__(self, base_opts: Optional[Dict[str, Any]] = None):
+        self.base_opts = dict(base_opts or {})
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._all: List[_Worker] = []
+        self.created = 0
+
+    def _worker(self, cookies_from_browser: Optional[str]) -> _Worker:
+        import yt_dlp
+
+        browser = _browser(cookies_from_browser)
+        workers = getattr(self._local, "workers", None)
+        if workers is None:
+            workers = self._local.workers = {}
+        worker = workers.get(browser)
+        if worker is None:
+            logger = _Logger()
+            opts = {
+                "quiet": True,
+                "no_warnings": True,
+                "noprogress": True,
+                "noplaylist": True,
+                "logger": logger,
+                **self.base_opts,
+            }
+            if browser:
+                opts["cookiesfrombrowser"] = (browser, None, None, None)
+            worker = workers[browser] = _Worker(yt_dlp.YoutubeDL(opts), logger)
+            with self._lock:
+                self._all.append(worker)
+                self.created += 1
+        return worker
+
+    @contextlib.contextmanager
+    def _using(
+        self, cookies_from_browser: Optional[str], progress: Optional[ProgressFn], **params: Any
+    ) -> Iterator[_Worker]:
+        worker = self._worker(cookies_from_browser)
+        ydl_params = worker.ydl.params
+        saved = {k: ydl_params.get(k) for k in params}
+        ydl_params.update(params)
+        worker.progress = progress
+        worker.logger.errors.clear()
+        try:
+            yield worker
+        finally:
+            worker.progress = None
+            for k, v in saved.items():
+                if v is None:
+                    ydl_params.pop(k, None)
+                else:
+                    ydl_params[k] = v
+
+    @staticmethod
+    def _error(worker: _Worker, exc: Exception) -> str:
+        lines = list(worker.logger.errors) or [_ANSI.sub("", str(exc)).strip()]
+        return " | ".join(lines)
+
+    def download(
+        self,
+        url: str,
+        output_file: str,
+        fmt: str,
+        *,
+        cookies_from_browser: Optional[str] = None,
+        merge_output_format: Optional[str] = None,
+        format_sort: Optional[List[str]] = None,
+        progress: Optional[ProgressFn] = None,
+    ) -> Tuple[bool, Optional[str]]:
+        """Download ``url`` to ``output_file``; ``(ok, error)``."""
+        from yt_dlp.utils import DownloadError
+
+        params: Dict[str, Any] = {"format": fmt, "outtmpl": {"default": output_file}}
+        if format_sort:
+            params["format_sort"] = format_sort
+        if merge_output_format:
+            params["merge_output_format"] = merge_output_format
+        with self._using(cookies_from_browser, progress, **params) as worker:
+            try:
+                worker.ydl.download([url])
+            except DownloadError as e:
+                return False, self._error(worker, e)
+            except Exception as e:
+                return False, f"{type(e).__name__}: {e}"
+            if worker.logger.errors:
+                return False, self._error(worker, RuntimeError("download failed"))
+        return True, None
+
+    def extract(
+        self, url: str, *, cookies_from_browser: Optional[str] = None, **params: Any
+    ) -> Dict[str, Any]:
+        """``extract_info(url, download=False)`` with ``params`` for this call."""
+        with self._using(cookies_from_browser, None, **params) as worker:
+            return worker.ydl.extract_info(url, download=False)
+
+    def close(self) -> None:
+        with self._lock:
+            workers, self._all = self._all, []
+        for worker in workers:
+            try:
+                worker.ydl.close()
+            except Exception:
+                pass
+
+
+_SHARED: Optional[YtdlPool] = None
+_SHARED_LOCK = threading.Lock()
+
+
+def ytdl_pool() -> YtdlPool:
+    """The process-wide pool the ``inprocess`` engine downloads through."""
+    global _SHARED
+    with _SHARED_LOCK:
+        if _SHARED is None:
+            _SHARED = YtdlPool()
+        return _SHARED
@@ -1,10 +1,30 @@
-"""Ensure project root is on sys.path for `import suxxtext`."""
+"""Ensure project root is on sys.path for `import suxxtext`, plus shared fixtures."""
 
 from __future__ import annotations
 
 import sys
 from pathlib import Path
 
+import pytest
+
 ROOT = Path(__file__).resolve().parents[1]
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
+
+from fakes import FakeBatch, FakePool, RecordingPool  # noqa: E402
+
+
+@pytest.fixture
+def fake_batch(tmp_path, monkeypatch):
+    """A :class:`FakeBatch` patched into ``suxxtext.jobs`` for the whole test."""
+    batch = FakeBatch(tmp_path)
+    for name in ("fetch_captions", "download_audio", "transcribe_audio"):
+        monkeypatch.setattr(f"suxxtext.jobs.{name}", getattr(batch, name))
+    monkeypatch.setattr("suxxtext.jobs.ModelPool", lambda name, n, **kw: FakePool(name, n))
+    return batch
+
+
+@pytest.fixture
+def whisper_pool():
+    """One :class:`~fakes.RecordingPool`; patch ``ModelPool`` with ``lambda *a, **kw: pool``."""
+    return RecordingPool()
@@ -0,0 +1,115 @@
+"""Test doubles shared by the batch tests (see the fixtures in ``conftest.py``)."""
+
+from __future__ import annotations
+
+import contextlib
+import io
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from suxxtext.jobs import run_batch_phases
+from suxxtext.paths import atomic_write_text
+from suxxtext.whisper_runtime import Segment
+
+
+class FakePool:
+    """``ModelPool`` stand-in: ``pool_size`` slots, each lending a dummy model."""
+
+    def __init__(self, model_name: str, pool_size: int):
+        self.pool_size = pool_size
+        self._sem = threading.Semaphore(max(1, pool_size))
+
+    @contextlib.contextmanager
+    def get_model(self):
+        with self._sem:
+            yield "fake-model"
+
+
+class FakeBatch:
+    """
+    Captions, yt-dlp and Whisper stand-ins for ``run_batch_phases`` (no network).
+
+    Records the ids each stage saw. The attributes below are the per-test
+    knobs; ``on_download(video_id, cookies)`` runs before each download and
+    may return an error message (e.g. to fail only without cookies) or do
+    something on the side, such as requesting a shutdown.
+    """
+
+    def __init__(self, root: Path):
+        for name in ("mp3", "trans"):
+            (root / name).mkdir(exist_ok=True)
+        self.mp3_dir = str(root / "mp3")
+        self.trans_dir = str(root / "trans")
+        self.captions: Dict[str, str] = {}  # id -> caption text (all others miss)
+        self.download_errors: Dict[str, str] = {}
+        self.transcribe_errors: Dict[str, str] = {}
+        self.on_download: Optional[Callable[[str, Optional[str]], Optional[str]]] = None
+        self.download_delay = 0.0
+        self.audio = b""
+        self.transcript = "whisper\n"
+        self.fetched: List[str] = []
+        self.downloaded: List[str] = []
+        self.transcribed: List[str] = []
+
+    def fetch_captions(self, video_id, languages=None):
+        self.fetched.append(video_id)
+        if video_id in self.captions:
+            return {"success": True, "full_text": self.captions[video_id], "language": "en"}
+        return {"error": "none"}
+
+    def download_audio(self, url, output_file, cookies_from_browser=None, **kw):
+        video_id = url.rsplit("=", 1)[-1]
+        self.downloaded.append(video_id)
+        err = self.on_download(video_id, cookies_from_browser) if self.on_download else None
+        err = err or self.download_errors.get(video_id)
+        if err:
+            return False, err
+        time.sleep(self.download_delay)
+        with open(output_file, "wb") as f:
+            f.write(self.audio)
+        return True, None
+
+    def transcribe_audio(self, audio_file, model, output_file, lock=None):
+        video_id = Path(output_file).stem[-11:]
+        self.transcribed.append(video_id)
+        if video_id in self.transcribe_errors:
+            return False, self.transcribe_errors[video_id]
+        atomic_write_text(output_file, self.transcript)
+        return True, None
+
+    def run(self, videos, options=None, logf=None, **kwargs):
+        """``run_batch_phases`` over all of ``videos`` in this fake's folders."""
+        return run_batch_phases(
+            list(videos),
+            len(videos),
+            self.mp3_dir,
+            self.trans_dir,
+            logf or io.StringIO(),
+            options,
+            **kwargs,
+        )
+
+
+class RecordingModel:
+    """A Whisper model that records ``(audio, kwargs)`` and says one word per call."""
+
+    def __init__(self):
+        self.calls = []
+
+    def transcribe(self, audio, **kwargs):
+        self.calls.append((audio, kwargs))
+        return iter([Segment(0.0, 1.0, f" window{len(self.calls)}")]), None
+
+
+class RecordingPool:
+    def __init__(self, *a, **kw):
+        self.model = RecordingModel()
+
+    @contextlib.contextmanager
+    def get_model(self):
+        yield self.model
+
+    def close(self):
+        pass
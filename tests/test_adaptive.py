@@ -0,0 +1,150 @@
+"""AIMD download concurrency + in-run retry tests (fake yt-dlp, no network)."""
+
+from __future__ import annotations
+
+import sys
+import textwrap
+
+from suxxtext.bench import synthetic_videos
+from suxxtext.jobs import AdaptiveConcurrency, BatchOptions, RetryPolicy, _looks_like_throttle
+from suxxtext.youtube import download_audio
+
+FAKE_YT_DLP = textwrap.dedent(
+    """
+    import os, sys
+    argv = sys.argv[1:]
+    out = argv[argv.index("-o") + 1]
+    url = argv[-1]
+    fail_ids = [x for x in os.environ.get("FAKE_YTDLP_FAIL_IDS", "").split(",") if x]
+    if any(vid in url for vid in fail_ids):
+        sys.stderr.write("ERROR: [youtube] x: Sign in to confirm you're not a bot\\n")
+        sys.stderr.write("ERROR: unable to download video data: HTTP Error 403: Forbidden\\n")
+        sys.exit(1)
+    with open(out, "wb") as f:
+        f.write(b"audio")
+    """
+)
+
+
+def _fake_yt_dlp(tmp_path, monkeypatch, fail_ids=()):
+    script = tmp_path / "fake_yt_dlp.py"
+    script.write_text(FAKE_YT_DLP, encoding="utf-8")
+    monkeypatch.setattr(
+        "suxxtext.youtube.resolve_yt_dlp", lambda: [sys.executable, str(script)]
+    )
+    monkeypatch.setenv("FAKE_YTDLP_FAIL_IDS", ",".join(fail_ids))
+
+
+def test_throttle_signals():
+    assert _looks_like_throttle("HTTP Error 403: Forbidden")
+    assert _looks_like_throttle("Sign in to confirm you're not a bot")
+    assert _looks_like_throttle("HTTP Error 429: Too Many Requests")
+    assert _looks_like_throttle("YouTube is blocking requests from your IP")
+    assert not _looks_like_throttle("Video unavailable")
+
+
+def test_aimd_increase_and_decrease():
+    c = AdaptiveConcurrency(initial=2, maximum=4, cooldown_seconds=0.0)
+    c.on_success()
+    c.on_success()
+    assert c.limit == 3
+    for _ in range(3):
+        c.on_success()
+    assert c.limit == 4
+    for _ in range(10):
+        c.on_success()
+    assert c.limit == 4  # ceiling
+    assert c.on_throttle("HTTP Error 403")
+    assert c.limit == 2
+    c.on_throttle("HTTP Error 403")
+    assert c.limit == 1
+    assert not c.on_throttle("HTTP Error 403")  # floor
+    c.observe(False, "Video unavailable")
+    assert c.limit == 1
+
+
+def test_aimd_cooldown_counts_burst_once():
+    c = AdaptiveConcurrency(initial=8, maximum=8, cooldown_seconds=60.0)
+    assert c.on_throttle("403")
+    assert not c.on_throttle("403")
+    assert c.limit == 4
+
+
+def test_download_audio_surfaces_stderr(tmp_path, monkeypatch):
+    _fake_yt_dlp(tmp_path, monkeypatch, fail_ids=["badBADbad01"])
+    ok, err = download_audio("https://www.youtube.com/watch?v=badBADbad01", str(tmp_path / "a.m4a"))
+    assert not ok
+    assert "HTTP Error 403" in err
+    ok, err = download_audio("https://www.youtube.com/watch?v=goodGOOD001", str(tmp_path / "b.m4a"))
+    assert ok and err is None
+    assert (tmp_path / "b.m4a").read_bytes() == b"audio"
+
+
+def test_batch_backs_off_on_injected_403s(tmp_path, monkeypatch, fake_batch):
+    videos = synthetic_videos(24)
+    fail_ids = [v["id"] for v in videos[8:11]]
+    _fake_yt_dlp(tmp_path, monkeypatch, fail_ids=fail_ids)
+    monkeypatch.setattr("suxxtext.jobs.download_audio", download_audio)  # the real one
+    controller = AdaptiveConcurrency(initial=2, maximum=6, cooldown_seconds=60.0)
+
+    stats = fake_batch.run(
+        videos, BatchOptions(prefer_captions=False, pool_size=2), controller=controller
+    )
+    limits = [n for _, n in controller.history]
+    cuts = [i for i in range(1, len(limits)) if limits[i] < limits[i - 1]]
+    assert len(cuts) == 1  # one cut for the whole burst (cooldown)
+    assert limits[cuts[0] - 1] > 2  # had grown while downloads succeeded
+    assert limits[cuts[0]] == limits[cuts[0] - 1] // 2
+    assert limits[-1] > limits[cuts[0]]  # recovered after the burst
+    assert stats["error"] == 3
+    assert stats["whisper"] == 21
+
+
+def test_retry_policy_backoff_and_cap():
+    policy = RetryPolicy(
+        max_retries=3,
+        base_seconds=10,
+        max_seconds=25,
+        jitter=0.0,
+        cookies_from_browser="chrome",
+        cookies_after=2,
+    )
+    video = {"id": "x"}
+    assert policy(dict(video), "ERROR: Video unavailable") is None
+    assert policy(video, "HTTP Error 403: Forbidden") == 10
+    assert "_cookies" not in video
+    assert policy(video, "Sign in to confirm you're not a bot") == 20
+    assert video["_cookies"] == "chrome"
+    assert policy(video, "Read timed out") == 25  # capped
+    assert policy(video, "HTTP Error 403: Forbidden") is None  # out of retries
+    jittered = RetryPolicy(base_seconds=10, jitter=0.5)
+    assert all(5 <= jittered({"id": "y"}, "HTTP Error 429") <= 15 for _ in range(20))
+
+
+def test_batch_retries_transient_failures_in_run(fake_batch):
+    videos = synthetic_videos(8)
+    flaky = {v["id"] for v in videos[:3]}
+    gone = videos[3]["id"]
+    cookies = []
+
+    def sign_in_wall(video_id, cookies_from_browser):
+        cookies.append((video_id, cookies_from_browser))
+        if video_id == gone:
+            return "ERROR: Video unavailable"
+        if video_id in flaky and cookies_from_browser is None:
+            return "ERROR: Sign in to confirm you're not a bot"
+        return None
+
+    fake_batch.on_download = sign_in_wall
+    stats = fake_batch.run(
+        videos,
+        BatchOptions(prefer_captions=False),
+        retry_policy=RetryPolicy(
+            base_seconds=0.01, max_seconds=0.05, cookies_from_browser="chrome"
+        ),
+    )
+    assert stats["whisper"] == 7
+    assert stats["retried"] == 3
+    assert stats["error"] == 1  # permanent failure, not retried
+    assert sorted(v for v, c in cookies if c == "chrome") == sorted(flaky)
+    assert fake_batch.downloaded.count(gone) == 1
@@ -0,0 +1,86 @@
+"""Audio reuse and the mp3/ cache policies (no network)."""
+
+from __future__ import annotations
+
+import io
+import os
+from unittest.mock import patch
+
+from suxxtext.audio_cache import CACHE_DELETE, CACHE_LRU, AudioCache, find_audio
+from suxxtext.bench import synthetic_videos
+from suxxtext.jobs import BatchOptions, _paths_for_video, download_audio_task
+
+
+def _write(path, size, mtime):
+    with open(path, "wb") as f:
+        f.write(b"\0" * size)
+    os.utime(path, (mtime, mtime))
+
+
+def test_existing_audio_is_reused_under_a_new_name(tmp_path):
+    video = synthetic_videos(1)[0]
+    mp3_path = _paths_for_video(video, str(tmp_path), str(tmp_path))[3]
+    old = tmp_path / f"Old_title_5views_{video['id']}.m4a"
+    _write(old, 10, 1000)
+    (tmp_path / f"Other_{video['id']}.m4a.part").write_bytes(b"\0")  # unfinished: ignored
+
+    def forbidden(*a, **kw):
+        raise AssertionError("audio on disk must not be downloaded again")
+
+    with patch("suxxtext.jobs.download_audio", forbidden):
+        ok, msg = download_audio_task(video, str(tmp_path), str(tmp_path), io.StringIO())
+    assert ok and msg.startswith("Reused audio")
+    assert os.path.getsize(mp3_path) == 10 and not old.exists()
+    assert find_audio(str(tmp_path), "zzzzzzzzzzz") is None
+
+
+def test_lru_evicts_oldest_unheld_files(tmp_path):
+    for i, name in enumerate(("a_x.m4a", "b_x.m4a", "c_x.m4a")):
+        _write(tmp_path / name, 100, 1000 + i)
+    cache = AudioCache(str(tmp_path), CACHE_LRU, max_bytes=250)
+    cache.hold(str(tmp_path / "a_x.m4a"))  # oldest, but waiting for ASR
+    assert sorted(os.listdir(tmp_path)) == ["a_x.m4a", "c_x.m4a"]
+    cache.finished(str(tmp_path / "a_x.m4a"), ok=True)  # used just now: now the newest
+    _write(tmp_path / "d_x.m4a", 100, 2000)
+    cache.enforce()
+    assert sorted(os.listdir(tmp_path)) == ["a_x.m4a", "d_x.m4a"]
+    assert cache.evicted == 2 and cache.freed_bytes == 200
+
+
+def test_lru_keeps_a_download_that_is_not_held_yet(tmp_path):
+    _write(tmp_path / "a_x.m4a", 100, 1500)
+    cache = AudioCache(str(tmp_path), CACHE_LRU, max_bytes=150)
+    fresh = str(tmp_path / "new_x.m4a")
+    cache.reserve(fresh)
+    # renamed into place with the server's (old) mtime, then another video is held
+    _write(fresh, 100, 1000)
+    cache.hold(str(tmp_path / "a_x.m4a"))
+    assert sorted(os.listdir(tmp_path)) == ["a_x.m4a", "new_x.m4a"]
+    cache.downloaded(fresh, ok=True)
+    cache.finished(str(tmp_path / "a_x.m4a"), ok=True)  # the fresh file is still held
+    assert os.listdir(tmp_path) == ["new_x.m4a"]
+    gone = str(tmp_path / "gone_x.m4a")
+    cache.reserve(gone)
+    cache.downloaded(gone, ok=False)  # a failed download drops its hold
+    assert os.path.abspath(gone) not in cache._held
+
+
+def test_delete_policy_keeps_audio_of_failed_transcriptions(tmp_path, fake_batch):
+    videos = synthetic_videos(4)
+    fake_batch.transcribe_errors = {videos[2]["id"]: "decode error"}
+    fake_batch.audio = b"\0" * 10
+
+    cache = AudioCache(fake_batch.mp3_dir, CACHE_DELETE)
+    options = BatchOptions(prefer_captions=False, pool_size=1, max_workers=2)
+    stats = fake_batch.run(videos, options)
+    assert stats["whisper"] == 3 and not stats["audio_reused"]
+    # same videos again, now with the delete policy: no downloads needed
+    for name in os.listdir(tmp_path / "trans"):
+        os.remove(tmp_path / "trans" / name)
+    with patch("suxxtext.jobs.download_audio", None):
+        stats = fake_batch.run(videos, options, audio_cache=cache)
+    assert stats["audio_reused"] == 4 and stats["whisper"] == 3 and stats["error"] == 1
+    assert os.listdir(tmp_path / "mp3") == [
+        os.path.basename(_paths_for_video(videos[2], "", "")[3])
+    ]
+    assert cache.evicted == 3
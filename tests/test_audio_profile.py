@@ -0,0 +1,83 @@
+"""ASR audio profile: format choice and bytes saved (no network)."""
+
+from __future__ import annotations
+
+from unittest.mock import patch
+
+import yt_dlp
+
+from suxxtext import youtube
+from suxxtext.bench import synthetic_videos
+from suxxtext.jobs import BatchOptions
+
+
+def _fmt(format_id, ext, abr, lang="en"):
+    return {
+        "format_id": format_id,
+        "ext": ext,
+        "acodec": "opus" if ext == "webm" else "mp4a.40.2",
+        "vcodec": "none",
+        "abr": abr,
+        "tbr": abr,
+        "url": f"http://127.0.0.1/{format_id}",
+        "language": lang,
+        "language_preference": 10 if lang == "en" else -1,
+    }
+
+
+# YouTube-like audio formats, plus a dubbed track that must never win
+FORMATS = [
+    _fmt("139", "m4a", 48.8),
+    _fmt("249", "webm", 51.0),
+    _fmt("250", "webm", 68.0),
+    _fmt("140", "m4a", 129.5),
+    _fmt("251", "webm", 135.0),
+    _fmt("249-dub", "webm", 50.0, "es"),
+    _fmt("139-dub", "m4a", 30.0, "es"),
+]
+
+
+def _chosen(profile, floor=youtube.DEFAULT_ASR_MIN_KBPS):
+    with patch.object(youtube, "_AUDIO_PROFILE", (profile, floor)):
+        fmt, sort = youtube.audio_format()
+    opts = {"format": fmt, "quiet": True, "simulate": True}
+    if sort:
+        opts["format_sort"] = sort
+    info = {
+        "id": "abcdefghijk",
+        "title": "t",
+        "formats": [dict(f) for f in FORMATS],
+        "extractor": "youtube",
+        "extractor_key": "Youtube",
+        "webpage_url": "http://127.0.0.1/watch",
+    }
+    with yt_dlp.YoutubeDL(opts) as ydl:
+        return ydl.process_ie_result(info, download=False)["format_id"]
+
+
+def test_asr_profile_picks_smallest_stream_above_floor():
+    assert _chosen(youtube.AUDIO_BEST) == "140"
+    assert _chosen(youtube.AUDIO_ASR) == "139"
+    assert _chosen(youtube.AUDIO_ASR, 60) == "250"
+    # nothing reaches the floor: the closest stream, not the smallest
+    assert _chosen(youtube.AUDIO_ASR, 320) == "251"
+
+
+def test_batch_records_bytes_saved(tmp_path, fake_batch):
+    videos = synthetic_videos(4)
+    size = 100_000
+    fake_batch.audio = b"\0" * size
+
+    def run(profile):
+        for p in (tmp_path / "mp3").iterdir():
+            p.unlink()
+        for p in (tmp_path / "trans").iterdir():
+            p.unlink()
+        with patch.object(youtube, "_AUDIO_PROFILE", (profile, 48.0)):
+            return fake_batch.run(videos, BatchOptions(prefer_captions=False))
+
+    stats = run(youtube.AUDIO_ASR)
+    assert stats["audio_bytes"] == 4 * size
+    expected = sum(youtube.best_audio_bytes(v["duration"]) - size for v in videos)
+    assert stats["audio_bytes_saved"] == expected
+    assert run(youtube.AUDIO_BEST)["audio_bytes_saved"] == 0
@@ -0,0 +1,89 @@
+"""Concurrent caption sweep (no network)."""
+
+from __future__ import annotations
+
+import io
+import os
+import threading
+import time
+from unittest.mock import patch
+
+from suxxtext.bench import synthetic_videos
+from suxxtext.caption_engine import CaptionEngine
+from suxxtext.jobs import IP_BLOCK_STREAK_LIMIT, BatchOptions, run_batch_phases
+
+
+class _SlowFetch:
+    """Fake ``fetch_captions`` that records how many requests overlap."""
+
+    def __init__(self, seconds=0.05, reply=None):
+        self.seconds = seconds
+        self.reply = reply or {"success": True, "full_text": "caption words " * 10}
+        self.calls = []
+        self.active = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, video_id, languages=None):
+        with self._lock:
+            self.calls.append(video_id)
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(self.seconds)
+        with self._lock:
+            self.active -= 1
+        return dict(self.reply)
+
+
+def test_engine_bounds_requests_in_flight():
+    fetch = _SlowFetch()
+    with CaptionEngine(fetch, concurrency=3) as engine:
+        ids = [f"id{i}" for i in range(9)]
+        engine.submit_many(ids)
+        results = [engine.result(i) for i in ids]
+    assert all(r["success"] for r in results)
+    assert fetch.peak == 3 and engine.peak_in_flight == 3
+    assert sorted(fetch.calls) == sorted(ids)
+
+
+def _sweep(tmp_path, fetch, videos, concurrency):
+    (tmp_path / "mp3").mkdir(exist_ok=True)
+    (tmp_path / "trans").mkdir(exist_ok=True)
+    with patch("suxxtext.jobs.fetch_captions", fetch):
+        return run_batch_phases(
+            videos,
+            len(videos),
+            str(tmp_path / "mp3"),
+            str(tmp_path / "trans"),
+            io.StringIO(),
+            BatchOptions(
+                whisper_fallback=False, caption_delay=0.0, caption_concurrency=concurrency
+            ),
+        )
+
+
+def test_sweep_overlaps_caption_requests(tmp_path):
+    videos = synthetic_videos(16)
+    # an archived video in the middle is skipped, not fetched
+    (tmp_path / "trans").mkdir()
+    (tmp_path / "trans" / f"Done_{videos[5]['id']}.txt").write_text("x", encoding="utf-8")
+    fetch = _SlowFetch()
+    started = time.monotonic()
+    stats = _sweep(tmp_path, fetch, videos, concurrency=4)
+    wall = time.monotonic() - started
+    assert stats["captions"] == 15 and stats["skipped"] == 1
+    assert videos[5]["id"] not in fetch.calls and len(fetch.calls) == 15
+    assert fetch.peak > 1
+    assert wall < 15 * fetch.seconds
+    assert len(os.listdir(tmp_path / "trans")) == 16
+
+
+def test_ip_block_streak_cancels_requests_ahead(tmp_path):
+    videos = synthetic_videos(40)
+    fetch = _SlowFetch(
+        seconds=0.02, reply={"error": "YouTube is blocking requests from your IP"}
+    )
+    stats = _sweep(tmp_path, fetch, videos, concurrency=2)
+    assert stats["error"] == len(videos)
+    # the streak trips after a few misses; only the look-ahead was in flight
+    assert len(fetch.calls) <= IP_BLOCK_STREAK_LIMIT + 2 * 2 + 1
@@ -0,0 +1,99 @@
+"""Incremental discovery cursor tests (fake yt-dlp listing, no network)."""
+
+from __future__ import annotations
+
+from unittest.mock import patch
+
+import pytest
+
+from suxxtext.bench import synthetic_videos
+from suxxtext.discovery import cursor_path, list_channel_videos, load_cursor, save_cursor
+from suxxtext.ratelimit import DEFAULT_RATES, METADATA, rate_limiter
+from suxxtext.youtube import get_channel_videos
+
+URL = "https://www.youtube.com/@Chan/videos"
+
+
+@pytest.fixture(autouse=True)
+def _no_metadata_rate_limit():
+    rate_limiter().configure(METADATA, None)
+    yield
+    rate_limiter().configure(METADATA, DEFAULT_RATES[METADATA])
+
+
+class _FakeYDL:
+    """Serves ``uploads`` newest-first; counts entries actually paged."""
+
+    uploads: list = []
+    pulled = 0
+    full_listings = 0
+
+    def __init__(self, opts):
+        self.opts = opts
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def extract_info(self, url, download=False, process=True):
+        def entries():
+            for v in _FakeYDL.uploads:
+                _FakeYDL.pulled += 1
+                yield dict(v, _type="url")
+
+        if process:
+            _FakeYDL.full_listings += 1
+            _FakeYDL.pulled += len(_FakeYDL.uploads)
+            return {"channel": "Chan", "entries": [dict(v) for v in _FakeYDL.uploads]}
+        return {"_type": "playlist", "channel": "Chan", "entries": entries()}
+
+
+def _reset(uploads):
+    _FakeYDL.uploads = uploads
+    _FakeYDL.pulled = 0
+    _FakeYDL.full_listings = 0
+
+
+def test_max_videos_and_stop_ids_page_lazily():
+    uploads = synthetic_videos(50)
+    _reset(uploads)
+    with patch("yt_dlp.YoutubeDL", _FakeYDL):
+        videos, _ = get_channel_videos(URL, max_videos=5)
+        assert [v["id"] for v in videos] == [v["id"] for v in uploads[:5]]
+        assert _FakeYDL.pulled == 5
+        _reset(uploads)
+        videos, info = get_channel_videos(URL, stop_at_ids=[uploads[3]["id"], "gone"])
+        assert len(videos) == 3 and info["entries"] == videos
+        assert _FakeYDL.pulled == 4
+
+
+def _discover(tmp_path, full_rescan=False):
+    """List like a batch run does, then advance the cursor."""
+    root = str(tmp_path)
+    videos, info = list_channel_videos(URL, "Chan", full_rescan=full_rescan, channels_root=root)
+    save_cursor(cursor_path("Chan", root), URL, videos)
+    return videos, info
+
+
+def test_cursor_lists_only_new_uploads(tmp_path):
+    old = synthetic_videos(200)
+    _reset(old)
+    with patch("yt_dlp.YoutubeDL", _FakeYDL):
+        videos, info = _discover(tmp_path)
+        assert len(videos) == 200 and info is not None
+        assert _FakeYDL.full_listings == 1
+
+        new = synthetic_videos(3, seed=7)
+        _reset(new + old)
+        videos, info = _discover(tmp_path)
+        assert info is None
+        assert _FakeYDL.full_listings == 0 and _FakeYDL.pulled == 4
+        assert [v["id"] for v in videos] == [v["id"] for v in new + old]
+        cursor = load_cursor(cursor_path("Chan", str(tmp_path)))
+        assert cursor["newest_id"] == new[0]["id"] and cursor["count"] == 203
+
+        _reset(new + old)
+        videos, info = _discover(tmp_path, full_rescan=True)
+        assert _FakeYDL.full_listings == 1 and len(videos) == 203
@@ -0,0 +1,123 @@
+"""Structured event stream tests (no network)."""
+
+from __future__ import annotations
+
+import json
+import threading
+
+import pytest
+
+from suxxtext.bench import synthetic_videos
+from suxxtext.events import EventSink, EventTally, read_events
+from suxxtext.jobs import BatchOptions
+from suxxtext.monitor import collect_snapshot
+
+
+def test_sink_is_thread_safe(tmp_path):
+    path = tmp_path / "logs" / "events.jsonl"
+    sink = EventSink(str(path), run_id="r1")
+
+    def worker(n):
+        for i in range(200):
+            sink.emit("check", id=f"v{n}-{i}", n=i, of=200, note="x" * 200)
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    sink.close()
+    lines = path.read_text(encoding="utf-8").splitlines()
+    assert len(lines) == 1600
+    assert all(json.loads(ln)["run"] == "r1" for ln in lines)
+
+
+def test_stage_times_and_records_errors(tmp_path):
+    path = tmp_path / "events.jsonl"
+    with EventSink(str(path)) as sink:
+        with sink.stage("download", "abcdefghijk") as event:
+            event["bytes"] = 42
+        with pytest.raises(RuntimeError):
+            with sink.stage("transcribe", "abcdefghijk"):
+                raise RuntimeError("boom")
+    rows, _ = read_events(str(path))
+    assert [(r["event"], r["stage"]) for r in rows] == [
+        ("start", "download"),
+        ("done", "download"),
+        ("start", "transcribe"),
+        ("done", "transcribe"),
+    ]
+    assert rows[1]["outcome"] == "ok" and rows[1]["bytes"] == 42
+    assert rows[1]["seconds"] >= 0
+    assert rows[3]["outcome"] == "error" and "boom" in rows[3]["error"]
+
+
+def test_read_events_resumes_from_offset(tmp_path):
+    path = tmp_path / "events.jsonl"
+    path.write_text('{"event": "a"}\n{"event": "b"', encoding="utf-8")
+    rows, offset = read_events(str(path))
+    assert [r["event"] for r in rows] == ["a"]
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('}\n{"event": "c"}\n')
+    rows, offset = read_events(str(path), offset)
+    assert [r["event"] for r in rows] == ["b", "c"]
+    assert read_events(str(path), offset) == ([], offset)
+
+
+def test_batch_run_emits_stage_events(tmp_path, fake_batch):
+    videos = synthetic_videos(6)
+    fake_batch.captions = {v["id"]: "caption text " * 10 for v in videos[:2]}
+    fake_batch.download_errors = {videos[5]["id"]: "HTTP Error 403: Forbidden"}
+    fake_batch.audio = b"a" * 100
+
+    path = tmp_path / "events.jsonl"
+    sink = EventSink(str(path))
+    sink.emit("run_start", kind="batch")
+    fake_batch.run(videos, BatchOptions(caption_delay=0.0), events=sink)
+    sink.emit("run_end")
+    sink.close()
+
+    tally = EventTally(str(path)).refresh()
+    assert tally.count("captions") == 2
+    assert tally.count("captions", "miss") == 4
+    assert tally.queued == 4
+    assert tally.count("download") == 3
+    assert tally.count("download", "error") == 1
+    assert tally.bytes["download"] == 300
+    assert tally.count("transcribe") == 3
+    assert tally.last_check == (6, 6)
+    p = tally.parsed()
+    assert p["whisper_ok"] == 3 and p["http_403"] == 1
+    assert p["batch_done"] and not p["downloading"] and not p["transcribing"]
+
+
+def test_monitor_prefers_events(tmp_path, monkeypatch):
+    logs = tmp_path / "channels" / "TestCh" / "logs"
+    logs.mkdir(parents=True)
+    path = logs / "events.jsonl"
+    sink = EventSink(str(path), run_id="batch-1")
+    sink.emit("run_start", kind="batch")
+    sink.emit("queued", id="aaaaaaaaaaa")
+    sink.emit("queued", id="bbbbbbbbbbb")
+    with sink.stage("transcribe", "aaaaaaaaaaa"):
+        pass
+    sink.emit("start", id="bbbbbbbbbbb", stage="download")
+    sink.close()
+    # a later PCS run in the same stream does not reset the batch view
+    with EventSink(str(path), run_id="pcs-1") as pcs:
+        pcs.emit("run_start", kind="pcs")
+        with pcs.stage("summarize", "aaaaaaaaaaa"):
+            pass
+
+    monkeypatch.chdir(tmp_path)
+    p = collect_snapshot("TestCh", channels_root="channels")["parsed"]
+    assert p["source"] == "events"
+    assert p["submitted"] == 2 and p["whisper_ok"] == 1
+    assert p["downloading"] == ["bbbbbbbbbbb"]
+    assert p["recent_ok"] == ["aaaaaaaaaaa"]
+
+    with EventSink(str(path), run_id="batch-1") as sink:
+        sink.emit("done", id="bbbbbbbbbbb", stage="download", outcome="ok", seconds=1.0)
+    p = collect_snapshot("TestCh", channels_root="channels")["parsed"]
+    assert p["downloading"] == []
+    assert "download" in p["stage_seconds"]
@@ -0,0 +1,158 @@
+"""Batch journal + --resume tests (no network)."""
+
+from __future__ import annotations
+
+import json
+from unittest.mock import patch
+
+from suxxtext.bench import synthetic_videos
+from suxxtext.jobs import BatchOptions, _paths_for_video, process_channel_videos
+from suxxtext.journal import (
+    CAPTION_MISS,
+    DISCOVERED,
+    DOWNLOADED,
+    FAILED,
+    TRANSCRIBED,
+    RunJournal,
+    compact_entry,
+    resume_action,
+)
+
+
+def test_journal_roundtrip_and_torn_line(tmp_path):
+    path = tmp_path / "logs" / "batch-journal.jsonl"
+    videos = synthetic_videos(3)
+    with RunJournal(str(path)) as j:
+        j.start_run()
+        j.record_discovered(videos)
+        j.record(videos[0]["id"], CAPTION_MISS, reason="none")
+        j.record(videos[0]["id"], DOWNLOADED)
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('{"id": "torn')  # crash mid-write
+    j = RunJournal(str(path))
+    assert [v["id"] for v in j.discovered()] == [v["id"] for v in videos]
+    states = j.states()
+    assert states[videos[0]["id"]]["stage"] == DOWNLOADED
+    assert videos[1]["id"] not in states
+
+
+def test_latest_discovery_wins(tmp_path):
+    j = RunJournal(str(tmp_path / "j.jsonl"))
+    j.record_discovered(synthetic_videos(5))
+    newer = synthetic_videos(2, seed=9)
+    j.record_discovered(newer)
+    j.close()
+    assert [v["id"] for v in j.discovered()] == [v["id"] for v in newer]
+
+
+def test_rediscovery_writes_only_changed_entries(tmp_path):
+    path = tmp_path / "j.jsonl"
+    videos = synthetic_videos(50)
+    with RunJournal(str(path)) as j:
+        j.record_discovered(videos)
+        size = len(path.read_text(encoding="utf-8").splitlines())
+        reordered = [dict(videos[1], view_count=7)] + [videos[0]] + videos[2:]
+        j.record_discovered(reordered)
+    lines = path.read_text(encoding="utf-8").splitlines()
+    assert len(lines) == size + 2  # the new listing order + one changed entry
+    listed = j.discovered()
+    assert [v["id"] for v in listed] == [v["id"] for v in reordered]
+    assert listed[0]["view_count"] == 7
+
+
+def test_discovery_rows_without_ids_still_replay(tmp_path):
+    path = tmp_path / "j.jsonl"
+    videos = synthetic_videos(3)
+    rows = [{"event": "discovery", "count": 3}] + [
+        {"id": v["id"], "stage": DISCOVERED, "entry": compact_entry(v)} for v in videos
+    ]
+    path.write_text("".join(json.dumps(r) + "\n" for r in rows), encoding="utf-8")
+    assert [v["id"] for v in RunJournal(str(path)).discovered()] == [v["id"] for v in videos]
+
+
+def test_resume_action():
+    assert resume_action(None) == "full"
+    assert resume_action({"stage": TRANSCRIBED}) == "done"
+    assert resume_action({"stage": CAPTION_MISS}) == "whisper"
+    assert resume_action({"stage": DOWNLOADED}) == "asr"
+    assert resume_action({"stage": FAILED, "at": "download"}) == "whisper"
+    assert resume_action({"stage": FAILED, "at": "transcribe"}) == "asr"
+    assert resume_action({"stage": FAILED, "at": "captions"}) == "full"
+
+
+def test_resume_skips_finished_network_work(tmp_path, fake_batch):
+    done, missed, downloaded, fresh = synthetic_videos(4)
+    _, _, _, mp3_path, _ = _paths_for_video(downloaded, fake_batch.mp3_dir, fake_batch.trans_dir)
+    open(mp3_path, "wb").close()
+    state = {
+        done["id"]: {"stage": TRANSCRIBED},
+        missed["id"]: {"stage": CAPTION_MISS},
+        downloaded["id"]: {"stage": DOWNLOADED},
+    }
+
+    journal = RunJournal(str(tmp_path / "j.jsonl"))
+    stats = fake_batch.run(
+        [done, missed, downloaded, fresh],
+        BatchOptions(caption_delay=0.0),
+        journal=journal,
+        resume_state=state,
+    )
+    journal.close()
+    assert fake_batch.fetched == [fresh["id"]]
+    assert sorted(fake_batch.downloaded) == sorted(v["id"] for v in (missed, fresh))
+    assert len(fake_batch.transcribed) == 3
+    assert stats["skipped"] == 1 and stats["whisper"] == 3
+    after = journal.states()
+    assert all(after[v["id"]]["stage"] == TRANSCRIBED for v in (missed, downloaded, fresh))
+
+
+def test_process_channel_resume_skips_listing(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    videos = synthetic_videos(3)
+    j = RunJournal.for_channel("TestCh")
+    j.record_discovered(videos)
+    for v in videos:
+        j.record(v["id"], TRANSCRIBED, via="captions")
+    j.close()
+    with patch("suxxtext.discovery.get_channel_videos") as listing, patch(
+        "suxxtext.jobs.fetch_captions"
+    ) as fetch:
+        process_channel_videos(
+            url="@TestCh", limit="all", workers=1, model_instances=1, resume=True
+        )
+        listing.assert_not_called()
+        fetch.assert_not_called()
+
+
+def test_resume_finds_the_folder_of_a_channel_id_url(tmp_path, monkeypatch, fake_batch):
+    monkeypatch.chdir(tmp_path)
+    url = "https://www.youtube.com/channel/UCabcdefghijklmnopqrstuv/videos"
+    videos = synthetic_videos(3)
+    info = {"channel": "Named Channel", "channel_id": "UCabcdefghijklmnopqrstuv"}
+    fake_batch.captions = {v["id"]: "hello " * 50 for v in videos}
+    # an archive already named after the channel: found only through the info
+    (tmp_path / "channels" / "Named_Channel").mkdir(parents=True)
+    with patch("suxxtext.discovery.get_channel_videos", lambda u, **kw: (list(videos), info)):
+        process_channel_videos(
+            url=url,
+            limit="all",
+            workers=1,
+            model_instances=1,
+            options=BatchOptions(whisper_fallback=False),
+        )
+    assert RunJournal.for_channel("Named_Channel").discovered()
+
+    with patch("suxxtext.discovery.get_channel_videos") as listing, patch(
+        "suxxtext.jobs.fetch_captions"
+    ) as fetch:
+        process_channel_videos(
+            url=url,
+            limit="all",
+            workers=1,
+            model_instances=1,
+            options=BatchOptions(whisper_fallback=False),
+            resume=True,
+        )
+        # the URL alone resolves to channels/UC.../; the run's folder is remembered
+        listing.assert_not_called()
+        fetch.assert_not_called()
@@ -0,0 +1,155 @@
+"""Shared-archive lease tests: several processes / hosts on one directory."""
+
+from __future__ import annotations
+
+import json
+import multiprocessing
+import os
+import subprocess
+import sys
+import threading
+import time
+
+from suxxtext.bench import synthetic_videos
+from suxxtext.jobs import BatchOptions
+from suxxtext.journal import FAILED, RunJournal, resume_action
+from suxxtext.lease import LeaseBoard
+
+IDS = [f"vid{i:08d}" for i in range(60)]
+
+
+def _claim_all(directory, out):
+    board = LeaseBoard(directory)
+    out.put([vid for vid in IDS if board.acquire(vid)])
+
+
+def test_processes_split_ids_without_overlap(tmp_path):
+    ctx = multiprocessing.get_context("fork" if sys.platform != "win32" else "spawn")
+    out = ctx.Queue()
+    procs = [ctx.Process(target=_claim_all, args=(str(tmp_path), out)) for _ in range(3)]
+    for p in procs:
+        p.start()
+    got = [out.get(timeout=30) for _ in procs]
+    for p in procs:
+        p.join(timeout=30)
+    claimed = [vid for ids in got for vid in ids]
+    assert sorted(claimed) == IDS  # every id exactly once
+
+
+def test_stale_leases_are_reclaimed(tmp_path):
+    clock = [1000.0]
+    a = LeaseBoard(str(tmp_path), owner="hostA:1", ttl=60, clock=lambda: clock[0])
+    b = LeaseBoard(str(tmp_path), owner="hostB:2", ttl=60, clock=lambda: clock[0])
+    assert a.acquire("x") and a.acquire("x")  # re-entrant
+    assert not b.acquire("x")
+    assert b.holder("x")["owner"] == "hostA:1"
+
+    # host A stops heartbeating: the lease expires and B takes over
+    os.utime(a._path("x"), (900.0, 900.0))
+    assert b.acquire("x")
+    assert a.beat() == ["x"] and a.held() == []
+    a.release("x")  # no longer ours: must not delete B's lease
+    assert b.holder("x")["owner"] == "hostB:2"
+    b.release("x")
+    assert b.holder("x") is None
+
+
+def test_dead_process_on_same_host_is_reclaimed(tmp_path):
+    board = LeaseBoard(str(tmp_path))
+    dead = subprocess.Popen([sys.executable, "-c", "pass"])
+    dead.wait()
+    with open(board._path("y"), "w", encoding="utf-8") as f:
+        json.dump({"owner": f"{board.host}:{dead.pid}", "host": board.host, "pid": dead.pid}, f)
+    assert board.acquire("y")
+    # a live process on this host keeps its lease
+    with open(board._path("z"), "w", encoding="utf-8") as f:
+        json.dump({"owner": f"{board.host}:1", "host": board.host, "pid": os.getppid()}, f)
+    assert not board.acquire("z")
+
+
+def test_heartbeat_keeps_leases_fresh(tmp_path):
+    with LeaseBoard(str(tmp_path), owner="hostA:1", ttl=60, heartbeat=0.05) as board:
+        board.acquire("x")
+        os.utime(board._path("x"), (0.0, 0.0))
+        time.sleep(0.3)
+        assert time.time() - os.path.getmtime(board._path("x")) < 60
+    assert not os.path.exists(board._path("x"))  # close releases
+
+
+def test_two_hosts_split_one_batch(tmp_path, fake_batch):
+    videos = synthetic_videos(12)
+    fake_batch.download_delay = 0.02
+    stats = {}
+
+    def host(name):
+        with LeaseBoard(str(tmp_path / "claims"), owner=f"{name}:1") as board:
+            options = BatchOptions(prefer_captions=False, pool_size=1, max_workers=2)
+            stats[name] = fake_batch.run(videos, options, claims=board)
+
+    hosts = [threading.Thread(target=host, args=(n,)) for n in ("hostA", "hostB")]
+    for t in hosts:
+        t.start()
+    for t in hosts:
+        t.join()
+
+    done = fake_batch.transcribed
+    assert sorted(done) == sorted(set(done)) and len(done) == len(videos)
+    assert sum(s["whisper"] for s in stats.values()) == len(videos)
+    assert sum(s["claimed"] for s in stats.values()) == len(videos)
+    assert os.listdir(tmp_path / "claims") == []
+
+
+def test_failed_download_hands_the_lease_back(tmp_path, fake_batch):
+    videos = synthetic_videos(4)
+    fake_batch.download_errors = {
+        v["id"]: "ERROR: unable to download video data: HTTP Error 404" for v in videos
+    }
+
+    whisper_only = BatchOptions(prefer_captions=False)
+    # host A is still running (board open) when host B gets to the same videos
+    with LeaseBoard(str(tmp_path / "claims"), owner="hostA:1") as board_a:
+        a = fake_batch.run(videos, whisper_only, claims=board_a)
+        assert a["error"] == len(videos) and board_a.held() == []
+        fake_batch.download_errors = {}
+        with LeaseBoard(str(tmp_path / "claims"), owner="hostB:1") as board_b:
+            b = fake_batch.run(videos, whisper_only, claims=board_b)
+    assert b["whisper"] == len(videos) and b["claimed"] == 0
+
+
+def test_model_pool_failure_hands_leases_back(tmp_path, fake_batch, monkeypatch):
+    videos = synthetic_videos(4)
+
+    def broken_pool(name, n, **kw):
+        raise RuntimeError("CUDA out of memory")
+
+    monkeypatch.setattr("suxxtext.jobs.ModelPool", broken_pool)
+    journal = RunJournal(str(tmp_path / "journal.jsonl"))
+    with LeaseBoard(str(tmp_path / "claims"), owner="hostA:1") as board:
+        stats = fake_batch.run(
+            videos, BatchOptions(prefer_captions=False), journal=journal, claims=board
+        )
+        assert board.held() == []
+    journal.close()
+    assert stats["error"] == len(videos) and not fake_batch.transcribed
+    states = journal.states()
+    assert all(states[v["id"]]["stage"] == FAILED for v in videos)
+    assert all(resume_action(states[v["id"]]) != "done" for v in videos)
+
+
+def test_exception_in_asr_hands_the_lease_back(tmp_path, fake_batch, monkeypatch):
+    videos = synthetic_videos(3)
+
+    def crash(*a, **kw):
+        raise OSError("disk full")
+
+    monkeypatch.setattr("suxxtext.jobs.transcribe_audio_task", crash)
+    journal = RunJournal(str(tmp_path / "journal.jsonl"))
+    with LeaseBoard(str(tmp_path / "claims"), owner="hostA:1") as board:
+        stats = fake_batch.run(
+            videos, BatchOptions(prefer_captions=False), journal=journal, claims=board
+        )
+        assert board.held() == []
+    journal.close()
+    assert stats["error"] == len(videos)
+    states = journal.states()
+    assert all(resume_action(states[v["id"]]) == "asr" for v in videos)
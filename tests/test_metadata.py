@@ -0,0 +1,64 @@
+"""Channel metadata store tests (no network)."""
+
+from __future__ import annotations
+
+import json
+
+from suxxtext.bench import synthetic_videos
+from suxxtext.metadata import MetadataStore, load_history
+
+
+def _lines(path):
+    with open(path, encoding="utf-8") as f:
+        return sum(1 for line in f if line.strip())
+
+
+def test_upsert_appends_only_changes(tmp_path):
+    store = MetadataStore("Chan", str(tmp_path))
+    videos = synthetic_videos(50)
+    assert store.upsert(videos, {"channel": "Chan", "entries": videos}) == (50, 0)
+    assert _lines(store.videos_path) == 50
+
+    again = MetadataStore("Chan", str(tmp_path))
+    assert again.upsert(videos) == (0, 0)
+    assert _lines(store.videos_path) == 50
+
+    new = synthetic_videos(2, seed=5)
+    changed = dict(videos[10], view_count=videos[10]["view_count"] + 1)
+    compact = {"id": videos[20]["id"], "title": videos[20]["title"]}  # cursor-style entry
+    assert again.upsert(new + [changed, compact]) == (2, 1)
+    assert _lines(store.videos_path) == 53
+
+    reread = MetadataStore("Chan", str(tmp_path))
+    assert [v["id"] for v in reread.entries()] == [v["id"] for v in new + videos]
+    assert reread.get(videos[10]["id"])["view_count"] == changed["view_count"]
+    assert reread.get(videos[20]["id"])["duration"] == videos[20]["duration"]
+    assert reread.channel() == {"channel": "Chan"}
+
+
+def test_legacy_import_and_export(tmp_path):
+    videos = synthetic_videos(5)
+    legacy = tmp_path / "Chan" / "Chan-full-history.json"
+    legacy.parent.mkdir()
+    legacy.write_text(json.dumps({"channel": "Chan", "entries": videos}), encoding="utf-8")
+
+    store = MetadataStore("Chan", str(tmp_path))
+    assert len(store) == 5  # seeded from the legacy dump
+    out = store.export_legacy(str(tmp_path / "out.json"))
+    with open(out, encoding="utf-8") as f:
+        data = json.load(f)
+    assert data["channel"] == "Chan" and data["entries"] == videos
+
+    entries, channel = load_history(store.videos_path)
+    assert entries == videos and channel == {"channel": "Chan"}
+    assert load_history(str(legacy))[0] == videos
+
+
+def test_compact_keeps_latest_rows(tmp_path):
+    store = MetadataStore("Chan", str(tmp_path))
+    videos = synthetic_videos(3)
+    store.upsert(videos)
+    store.upsert([dict(videos[0], title="renamed")])
+    store.compact()
+    assert _lines(store.videos_path) == 3
+    assert MetadataStore("Chan", str(tmp_path)).get(videos[0]["id"])["title"] == "renamed"
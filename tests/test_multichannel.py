@@ -0,0 +1,68 @@
+"""Multi-channel batch: one model pool, interleaved caption sweeps (no network)."""
+
+from __future__ import annotations
+
+import os
+from unittest.mock import patch
+
+from fakes import FakePool
+from suxxtext.bench import synthetic_videos
+from suxxtext.jobs import BatchOptions, process_channel_videos
+from suxxtext.journal import TRANSCRIBED, RunJournal
+
+CHANNELS = {
+    "https://www.youtube.com/@ChanA/videos": synthetic_videos(4, seed=1),
+    "https://www.youtube.com/@ChanB/videos": synthetic_videos(4, seed=2),
+}
+
+
+def test_channels_share_one_pool_and_interleave(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    misses = {videos[i]["id"] for videos in CHANNELS.values() for i in (0, 3)}
+    caption_calls, pools = [], []
+
+    def fake_listing(channel_url):
+        return list(CHANNELS[channel_url]), None
+
+    def fake_fetch(video_id, languages=None):
+        caption_calls.append(video_id)
+        if video_id in misses:
+            return {"error": "No transcript found for this video."}
+        return {"success": True, "full_text": "caption words " * 10, "language": "en"}
+
+    def fake_download(url, output_file, *a, **kw):
+        open(output_file, "wb").close()
+        return True, None
+
+    def fake_transcribe(audio_file, model, output_file, lock=None):
+        with open(output_file, "w", encoding="utf-8") as f:
+            f.write("whisper\n")
+        return True, None
+
+    def fake_pool(name, n):
+        pools.append(name)
+        return FakePool(name, n)
+
+    with patch("suxxtext.discovery.get_channel_videos", fake_listing), patch(
+        "suxxtext.jobs.fetch_captions", fake_fetch
+    ), patch("suxxtext.jobs.download_audio", fake_download), patch(
+        "suxxtext.jobs.transcribe_audio", fake_transcribe
+    ), patch("suxxtext.jobs.ModelPool", fake_pool):
+        process_channel_videos(
+            url=["@ChanA", "@ChanB"],
+            limit="all",
+            workers=2,
+            model_instances=1,
+            # serial requests: call order is the sweep order
+            options=BatchOptions(caption_delay=0.0, caption_concurrency=1),
+        )
+
+    assert pools == ["base"]  # model load paid once for both channels
+    a_ids = [v["id"] for v in CHANNELS["https://www.youtube.com/@ChanA/videos"]]
+    b_ids = [v["id"] for v in CHANNELS["https://www.youtube.com/@ChanB/videos"]]
+    assert caption_calls == [x for pair in zip(a_ids, b_ids) for x in pair]
+    for folder, ids in (("ChanA", a_ids), ("ChanB", b_ids)):
+        trans = os.listdir(os.path.join("channels", folder, "transcriptions"))
+        assert sorted(i for i in ids if any(i in t for t in trans)) == sorted(ids)
+        states = RunJournal.for_channel(folder).states()
+        assert all(states[i]["stage"] == TRANSCRIBED for i in ids)
@@ -9,10 +9,12 @@ if ROOT not in sys.path:
     sys.path.insert(0, ROOT)
 
 from suxxtext.paths import (
+    TranscriptIndex,
     alnum_related,
     channel_handle_from_url,
     resolve_channel_folder,
     sanitize_filename,
+    list_existing_transcript_ids,
     transcript_exists_for_id,
 )
 
@@ -57,3 +59,22 @@ def test_transcript_exists(tmp_path):
     (tmp_path / "foo_AbCdEfGhIjK.txt").write_text("hi")
     assert transcript_exists_for_id(str(tmp_path), "AbCdEfGhIjK")
     assert transcript_exists_for_id(str(tmp_path), "nope1234567") is None
+
+
+def test_transcript_index(tmp_path):
+    (tmp_path / "Title_123views_AbCdEfGhIjK.txt").write_text("hi")
+    (tmp_path / "ZyXwVuTsRqP_legacy.txt").write_text("hi")
+    (tmp_path / "Other_QqQqQqQqQqQ.m4a").write_text("")
+    (tmp_path / "X_abcdefghijk_Title.txt").write_text("hi")
+    (tmp_path / "Clip - x_Y-z_12345 - notes.txt").write_text("hi")
+    index = TranscriptIndex.load(str(tmp_path))
+    # legacy names with the id in the middle, not at an 11-char aligned offset
+    assert index.find("abcdefghijk") == "X_abcdefghijk_Title.txt"
+    assert index.find("x_Y-z_12345") == "Clip - x_Y-z_12345 - notes.txt"
+    assert index.find("AbCdEfGhIjK") == "Title_123views_AbCdEfGhIjK.txt"
+    assert "ZyXwVuTsRqP" in index
+    assert index.find("QqQqQqQqQqQ") is None
+    index.add("NeWvIdEo123", str(tmp_path / "New_NeWvIdEo123.txt"))
+    assert index.find("NeWvIdEo123") == "New_NeWvIdEo123.txt"
+    assert {"AbCdEfGhIjK", "ZyXwVuTsRqP"} <= list_existing_transcript_ids(str(tmp_path))
+    assert len(TranscriptIndex.load(str(tmp_path / "missing"))) == 0
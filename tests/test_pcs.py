@@ -1,10 +1,13 @@
 """Unit tests for PCS parsing / path helpers (no Ollama required)."""
 
 from pathlib import Path
+from unittest.mock import patch
 
 import pytest
 
+from suxxtext.events import events_path, read_events
 from suxxtext.pcs import (
+    batch_summarize_channel,
     parse_pcs_response,
     title_from_transcript_path,
     video_id_from_transcript_path,
@@ -100,3 +103,15 @@ def test_index_search(tmp_path: Path):
     assert hits[0]["related"] == ["uric acid", "fructose"]
     assert search_index(sdir, "fructose")  # related bucket is searchable
     assert search_index(sdir, "zzzz-nope") == []
+
+
+def test_batch_closes_the_run_when_interrupted(tmp_path: Path):
+    trans = tmp_path / "Chan" / "transcriptions"
+    trans.mkdir(parents=True)
+    (trans / "Some_title_iEMO7vNDmJ0.txt").write_text("words\n", encoding="utf-8")
+    with patch("suxxtext.pcs.summarize_transcript_file", side_effect=KeyboardInterrupt):
+        with pytest.raises(KeyboardInterrupt):
+            batch_summarize_channel("Chan", channels_root=str(tmp_path), model="m")
+    rows, _ = read_events(events_path("Chan", str(tmp_path)))
+    assert rows[-1]["event"] == "run_end" and rows[-1]["interrupted"] is True
+    assert rows[-1]["ok"] == 0
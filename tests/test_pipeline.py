@@ -0,0 +1,236 @@
+"""Streaming caption → Whisper pipeline tests (fake captions / Whisper, no network)."""
+
+from __future__ import annotations
+
+import io
+import threading
+import time
+from unittest.mock import patch
+
+from fakes import FakePool
+from suxxtext.bench import synthetic_videos
+from suxxtext.jobs import BatchOptions, run_batch_phases
+from suxxtext.pipeline import BatchStats, WhisperStage, interleave
+
+
+def _run(tmp_path, videos, misses, pipelined, events=None, pool_factory=None):
+    mp3_dir = tmp_path / "mp3"
+    trans_dir = tmp_path / "trans"
+    mp3_dir.mkdir(parents=True, exist_ok=True)
+    trans_dir.mkdir(parents=True, exist_ok=True)
+    events = events if events is not None else []
+
+    def fake_fetch(video_id, languages=None):
+        events.append(("caption", video_id))
+        if video_id in misses:
+            return {"error": "No transcript found for this video."}
+        return {"success": True, "full_text": "caption words " * 10, "language": "en"}
+
+    def fake_download(url, output_file, *a, **kw):
+        return True, None
+
+    def fake_transcribe(audio_file, model, output_file, lock=None):
+        events.append(("whisper", audio_file))
+        with open(output_file, "w", encoding="utf-8") as f:
+            f.write("whisper\n")
+        return True, None
+
+    with patch("suxxtext.jobs.fetch_captions", fake_fetch), patch(
+        "suxxtext.jobs.download_audio", fake_download
+    ), patch("suxxtext.jobs.transcribe_audio", fake_transcribe), patch(
+        "suxxtext.jobs.ModelPool", pool_factory or (lambda name, n: FakePool(name, n))
+    ):
+        return run_batch_phases(
+            videos,
+            len(videos),
+            str(mp3_dir),
+            str(trans_dir),
+            io.StringIO(),
+            BatchOptions(pool_size=1, max_workers=2, caption_delay=0.0, pipelined=pipelined),
+        )
+
+
+def test_two_phase_and_pipelined_same_counts(tmp_path):
+    videos = synthetic_videos(12)
+    misses = {v["id"] for v in videos[::3]}
+    a = _run(tmp_path / "a", videos, misses, pipelined=False)
+    b = _run(tmp_path / "b", videos, misses, pipelined=True)
+    for stats in (a, b):
+        assert stats["captions"] == 8
+        assert stats["whisper"] == 4
+        assert stats["error"] == 0
+        assert stats.time_to_first_whisper is not None
+    assert a.mode == "two-phase" and b.mode == "pipelined"
+
+
+def test_pipelined_whisper_overlaps_captions(tmp_path):
+    videos = synthetic_videos(30)
+    first_miss = videos[0]["id"]
+    gate = threading.Event()
+    events = []
+
+    def fake_fetch_wait(video_id, languages=None):
+        # later caption calls wait until Whisper has started on the first miss
+        if video_id != first_miss:
+            assert gate.wait(timeout=5), "the first miss queued behind the lookahead"
+        events.append(("caption", video_id))
+        if video_id == first_miss:
+            return {"error": "none"}
+        return {"success": True, "full_text": "caption words " * 10, "language": "en"}
+
+    def fake_transcribe(audio_file, model, output_file, lock=None):
+        events.append(("whisper", audio_file))
+        gate.set()
+        return True, None
+
+    (tmp_path / "mp3").mkdir()
+    (tmp_path / "trans").mkdir()
+    with patch("suxxtext.jobs.fetch_captions", fake_fetch_wait), patch(
+        "suxxtext.jobs.download_audio", return_value=(True, None)
+    ), patch("suxxtext.jobs.transcribe_audio", fake_transcribe), patch(
+        "suxxtext.jobs.ModelPool", lambda name, n: FakePool(name, n)
+    ):
+        stats = run_batch_phases(
+            videos,
+            len(videos),
+            str(tmp_path / "mp3"),
+            str(tmp_path / "trans"),
+            io.StringIO(),
+            BatchOptions(pool_size=1, max_workers=1, caption_delay=0.0, pipelined=True),
+        )
+    kinds = [k for k, _ in events]
+    assert kinds.index("whisper") < len(kinds) - 1  # Whisper ran mid-sweep
+    assert stats["whisper"] == 1
+    assert stats["captions"] == 29
+
+
+def test_pool_not_loaded_when_captions_cover_all(tmp_path):
+    loads = []
+
+    def factory(name, n):
+        loads.append(n)
+        return FakePool(name, n)
+
+    stats = _run(tmp_path, synthetic_videos(5), set(), pipelined=True, pool_factory=factory)
+    assert stats["captions"] == 5
+    assert loads == []
+
+
+def test_pool_failure_counts_errors(tmp_path):
+    def factory(name, n):
+        raise RuntimeError("no gpu")
+
+    videos = synthetic_videos(4)
+    stats = _run(
+        tmp_path, videos, {v["id"] for v in videos}, pipelined=True, pool_factory=factory
+    )
+    assert stats["error"] == 4
+    assert stats["whisper"] == 0
+
+
+def test_whisper_stage_two_stages():
+    stats = BatchStats()
+    stage = WhisperStage(
+        lambda video: (True, ""),
+        lambda video, pool: ("whisper", ""),
+        lambda: object(),
+        stats,
+        io.StringIO(),
+        download_workers=3,
+        asr_workers=2,
+        prefetch=5,
+    )
+    assert stage.downloads.workers == 3
+    assert stage.ready.workers == 2
+    assert stage.ready.queue.maxsize == 5
+    with stage:
+        for v in synthetic_videos(20):
+            stage.put(v)
+    assert stats["whisper"] == 20
+    assert stats["downloaded"] == 20
+    assert stage.submitted == 20
+
+
+def test_prefetch_caps_audio_on_disk():
+    lock = threading.Lock()
+    on_disk = [0, 0]  # current, peak
+    asr_gate = threading.Event()
+
+    def download(video):
+        with lock:
+            on_disk[0] += 1
+            on_disk[1] = max(on_disk[1], on_disk[0])
+        return True, ""
+
+    def transcribe(video, pool):
+        asr_gate.wait(timeout=5)
+        with lock:
+            on_disk[0] -= 1
+        return "whisper", ""
+
+    stats = BatchStats()
+    stage = WhisperStage(
+        download, transcribe, lambda: object(), stats, io.StringIO(),
+        download_workers=4, asr_workers=1, prefetch=2,
+    )
+    stage.start()
+    feeder = threading.Thread(
+        target=lambda: [stage.put(v) for v in synthetic_videos(30)]
+    )
+    feeder.start()
+    feeder.join(timeout=0.3)
+    # models blocked: at most 1 in ASR + 2 prefetched + 4 finished downloads waiting
+    assert on_disk[1] <= 1 + 2 + 4
+    asr_gate.set()
+    feeder.join()
+    stage.close()
+    assert stats["whisper"] == 30
+
+
+def test_download_failure_skips_asr():
+    stats = BatchStats()
+    seen = []
+    stage = WhisperStage(
+        lambda video: (video["id"].endswith("0"), ""),
+        lambda video, pool: (seen.append(video["id"]) or "whisper", ""),
+        lambda: object(),
+        stats,
+        io.StringIO(),
+        download_workers=2,
+        asr_workers=1,
+    )
+    with stage:
+        for v in synthetic_videos(10):
+            stage.put(v)
+    assert stats["whisper"] == len(seen) == 1
+    assert stats["error"] == 9
+
+
+def test_stop_drops_pending_retries_without_waiting():
+    stats = BatchStats()
+    stage = WhisperStage(
+        lambda video: (False, "HTTP Error 429"),
+        lambda video, pool: ("whisper", ""),
+        lambda: object(),
+        stats,
+        io.StringIO(),
+        retry=lambda video, message: 60.0,
+    )
+    videos = synthetic_videos(3)
+    start = time.monotonic()
+    with stage:
+        for v in videos:
+            stage.put(v)
+        stage.downloads.join()
+        stage.stop()  # Ctrl-C while every video waits out its back-off
+    assert time.monotonic() - start < 5
+    assert stats["retried"] == stats["interrupted"] == 3
+    assert sorted(v["id"] for v in stage.dropped) == sorted(v["id"] for v in videos)
+
+
+def test_interleave_round_robin_and_weighted():
+    assert list(interleave(["aaa", "b", "cc"])) == list("abcaca")
+    out = list(interleave(["aaaaaa", "bb"], weights=[3, 1]))
+    assert sorted(out) == sorted("aaaaaabb")
+    assert out[:4].count("b") == 1  # b spread out, not starved to the end
+    assert list(interleave([])) == []
@@ -0,0 +1,141 @@
+"""Batch planner / dry-run tests (no network)."""
+
+from __future__ import annotations
+
+import os
+from unittest.mock import patch
+
+import pytest
+
+from suxxtext.bench import synthetic_videos
+from suxxtext.discovery import cursor_path, save_cursor
+from suxxtext.events import EventSink, events_path
+from suxxtext.jobs import BatchOptions, plan_channel_videos
+from suxxtext.journal import CAPTION_MISS, FAILED, TRANSCRIBED, RunJournal
+from suxxtext.metadata import MetadataStore
+from suxxtext.paths import TranscriptIndex
+from suxxtext.plan import ChannelPlan, RunPlan, stage_seconds
+from suxxtext.schedule import RuntimeModel
+
+
+def _v(vid, duration):
+    return {"id": vid, "duration": duration}
+
+
+def test_channel_plan_classifies_and_weights(tmp_path):
+    (tmp_path / "Title_aaaaaaaaaaa.txt").write_text("x", encoding="utf-8")
+    index = TranscriptIndex.load(str(tmp_path))
+    videos = [
+        _v("aaaaaaaaaaa", 100),
+        _v("bbbbbbbbbbb", 3600),
+        _v("ccccccccccc", 1800),
+        _v("ddddddddddd", 1800),
+        _v("eeeeeeeeeee", 60),
+    ]
+    # history: one hit, three misses → 75% miss rate
+    plan = ChannelPlan("Ch", videos, 4, index, {"h1"}, {"bbbbbbbbbbb", "m2", "m3"})
+    assert [v["id"] for v in plan.archived] == ["aaaaaaaaaaa"]
+    assert [v["id"] for v in plan.known_miss] == ["bbbbbbbbbbb"]
+    assert [v["id"] for v in plan.untried] == ["ccccccccccc", "ddddddddddd"]
+    assert plan.miss_rate == pytest.approx(0.75)
+    assert plan.likely_whisper == pytest.approx(2.5)
+    assert plan.audio_seconds == pytest.approx(3600 + 0.75 * 3600)
+
+    run = RunPlan(
+        [plan],
+        RuntimeModel({"base": (1.0, 10.0)}),
+        {"captions": 2.0, "download": 10.0},
+        model_name="base",
+        workers=2,
+        pool_size=1,
+    )
+    assert run.gpu_seconds == pytest.approx(630)
+    assert run.caption_seconds() == pytest.approx(4.0)
+    assert run.download_seconds() == pytest.approx(12.5)
+    assert run.eta(1) == pytest.approx(630)
+    assert run.eta(2) < run.eta(1)
+    assert any("GPU-hour" in line for line in run.lines())
+
+    no_history = ChannelPlan("Ch", videos, 5, index, set(), set())
+    assert no_history.likely_whisper == 4
+    captions_only = ChannelPlan("Ch", videos, 5, index, set(), set(), whisper_fallback=False)
+    assert captions_only.likely_whisper == 0 and captions_only.caption_checks == 4
+
+
+def test_stage_seconds_from_events(tmp_path):
+    path = tmp_path / "events.jsonl"
+    with EventSink(str(path)) as sink:
+        sink.emit("done", id="a", stage="captions", outcome="ok", seconds=1.0)
+        sink.emit("done", id="b", stage="captions", outcome="miss", seconds=3.0)
+        sink.emit("done", id="b", stage="download", outcome="ok", seconds=8.0)
+        sink.emit("done", id="c", stage="download", outcome="error", seconds=100.0)
+    means = stage_seconds([str(path)])
+    assert means == {"captions": 2.0, "download": 8.0}
+    assert stage_seconds([str(tmp_path / "missing.jsonl")])["download"] > 0
+
+
+def test_plan_touches_no_captions_or_audio(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    videos = synthetic_videos(6, seed=3)
+    folder = "PlanCh"
+    trans = tmp_path / "channels" / folder / "transcriptions"
+    trans.mkdir(parents=True)
+    (trans / f"Done_{videos[0]['id']}.txt").write_text("x", encoding="utf-8")
+    with RunJournal.for_channel(folder) as journal:
+        journal.record(videos[1]["id"], CAPTION_MISS, reason="none")
+        journal.record(videos[1]["id"], FAILED, at="download", reason="403")
+        journal.record("zzzzzzzzzzz", TRANSCRIBED, via="captions")
+    with EventSink(events_path(folder)) as sink:
+        sink.emit("run_start", kind="batch", model="base")
+        sink.emit("done", id="x", stage="transcribe", outcome="ok", seconds=50, audio_seconds=1000)
+
+    def forbidden(*a, **kw):
+        raise AssertionError("plan must not fetch captions or audio")
+
+    with patch(
+        "suxxtext.discovery.get_channel_videos", lambda url, **kw: (list(videos), None)
+    ), patch("suxxtext.jobs.fetch_captions", forbidden), patch(
+        "suxxtext.jobs.download_audio", forbidden
+    ):
+        plan = plan_channel_videos(
+            url="@PlanCh", limit="all", options=BatchOptions(caption_delay=0.0)
+        )
+
+    ch = plan.channels[0]
+    assert len(ch.archived) == 1 and len(ch.known_miss) == 1 and len(ch.untried) == 4
+    assert ch.miss_rate == pytest.approx(0.5)
+    assert plan.runtime.rtf("base") == pytest.approx(0.05)
+    assert not (tmp_path / "channels" / folder / "mp3").exists()
+
+
+def _snapshot(root):
+    return {
+        str(p.relative_to(root)): p.read_bytes()
+        for p in sorted(root.rglob("*"))
+        if p.is_file()
+    }
+
+
+def test_plan_changes_nothing_on_disk(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    videos = synthetic_videos(8, seed=5)
+    folder = "PlanCh"
+    # a previous run: cursor with the older half, metadata store, journal
+    save_cursor(cursor_path(folder), "https://www.youtube.com/@PlanCh/videos", videos[4:])
+    MetadataStore(folder).upsert(videos[4:], {"channel": "PlanCh"})
+    with RunJournal.for_channel(folder) as journal:
+        journal.record(videos[5]["id"], CAPTION_MISS, reason="none")
+    before = _snapshot(tmp_path)
+
+    def no_prompt(*a, **kw):
+        raise AssertionError("plan must not prompt")
+
+    with patch(
+        "suxxtext.discovery.get_channel_videos", lambda url, **kw: (list(videos), None)
+    ), patch("builtins.input", no_prompt):
+        plan = plan_channel_videos(
+            url="@PlanCh", limit=None, options=BatchOptions(caption_delay=0.0)
+        )
+
+    assert plan.channels[0].target == len(videos)
+    assert _snapshot(tmp_path) == before
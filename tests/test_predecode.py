@@ -0,0 +1,62 @@
+"""Pre-decoding queued audio to .npy before the model takes it."""
+
+from __future__ import annotations
+
+import os
+import time
+from unittest.mock import patch
+
+import numpy as np
+
+from suxxtext.bench import _write_wav, synthetic_videos
+from suxxtext.events import EventSink, read_events
+from suxxtext.jobs import BatchOptions
+from suxxtext.predecode import PreDecoder, npy_path_for
+from suxxtext.whisper_runtime import load_audio, transcribe_audio
+
+
+def test_predecoder_round_trip(tmp_path):
+    wav = tmp_path / "clip.wav"
+    _write_wav(str(wav), 1.5, rate=8000)
+    missing = tmp_path / "missing.m4a"
+    with PreDecoder(1) as pre:
+        pre.submit(str(wav))
+        pre.submit(str(missing))
+        path = pre.take(str(wav))
+        assert path == npy_path_for(str(wav)) and os.path.exists(path)
+        audio = load_audio(path)
+        assert isinstance(audio, np.memmap) and audio.dtype == np.float32
+        assert len(audio) == 24000
+        # a failed decode hands back the original file
+        assert pre.take(str(missing)) == str(missing)
+        assert pre.take(str(tmp_path / "never-submitted.m4a")).endswith("never-submitted.m4a")
+        pre.discard(str(wav))
+        assert not os.path.exists(path)
+    assert (pre.decoded, pre.failed) == (1, 1) and pre.audio_seconds == 1.5
+
+
+def test_batch_hands_the_model_decoded_arrays(tmp_path, monkeypatch, fake_batch, whisper_pool):
+    wav = tmp_path / "clip.wav"
+    _write_wav(str(wav), 1.0, rate=16000)
+    videos = synthetic_videos(3)
+    fake_batch.audio = wav.read_bytes()
+    monkeypatch.setattr("suxxtext.jobs.transcribe_audio", transcribe_audio)  # the real one
+    monkeypatch.setattr("suxxtext.jobs.ModelPool", lambda *a, **kw: whisper_pool)
+    take = PreDecoder.take
+
+    def slow_take(self, audio_file):
+        time.sleep(0.3)  # a decode the ASR stage has to wait for
+        return take(self, audio_file)
+
+    with patch.object(PreDecoder, "take", slow_take), EventSink(
+        str(tmp_path / "events.jsonl")
+    ) as events:
+        options = BatchOptions(prefer_captions=False, predecode_workers=1)
+        stats = fake_batch.run(videos, options, events=events)
+    assert stats["whisper"] == 3
+    assert all(isinstance(a, np.ndarray) and len(a) == 16000 for a, _ in whisper_pool.model.calls)
+    assert not os.listdir(tmp_path / "mp3" / ".predecode")
+    rows, _ = read_events(str(tmp_path / "events.jsonl"))
+    done = [r for r in rows if r["event"] == "done" and r["stage"] == "transcribe"]
+    # decode waits stay out of the transcribe stage (and so out of the RTF)
+    assert len(done) == 3 and all(r["predecoded"] and r["seconds"] < 0.3 for r in done)
@@ -0,0 +1,62 @@
+"""Token-bucket rate limiter tests (no network)."""
+
+from __future__ import annotations
+
+import threading
+import time
+
+from suxxtext.ratelimit import CAPTIONS, DOWNLOAD, RateLimiter, TokenBucket, per_second
+
+
+def test_per_second():
+    assert per_second(0.5) == 2.0
+    assert per_second(0) is None
+    assert per_second(None) is None
+
+
+def test_unlimited_bucket_never_waits():
+    bucket = TokenBucket(None)
+    assert all(bucket.acquire() == 0.0 for _ in range(1000))
+
+
+def test_bucket_spacing_and_burst():
+    bucket = TokenBucket(rate=20.0, burst=3)
+    start = time.monotonic()
+    for _ in range(3):
+        assert bucket.try_acquire()
+    assert not bucket.try_acquire()
+    bucket.acquire()
+    bucket.acquire()
+    elapsed = time.monotonic() - start
+    assert 0.08 <= elapsed < 0.5  # two tokens at 20/s after the burst
+
+
+def test_budget_is_shared_across_threads():
+    limiter = RateLimiter({CAPTIONS: 50.0, DOWNLOAD: None})
+    stamps = []
+    lock = threading.Lock()
+
+    def worker():
+        for _ in range(5):
+            limiter.acquire(CAPTIONS)
+            with lock:
+                stamps.append(time.monotonic())
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    start = time.monotonic()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    # 20 requests at 50/s with burst 1: ~0.38 s total, regardless of threads
+    assert len(stamps) == 20
+    assert max(stamps) - start >= 0.3
+    assert limiter.acquire(DOWNLOAD) == 0.0
+
+
+def test_configure_replaces_rate():
+    limiter = RateLimiter({})
+    limiter.configure(CAPTIONS, None)
+    assert limiter.bucket(CAPTIONS).rate is None
+    limiter.configure(CAPTIONS, per_second(2.0))
+    assert limiter.bucket(CAPTIONS).rate == 0.5
@@ -0,0 +1,200 @@
+"""Whisper order policies + runtime model tests (no network)."""
+
+from __future__ import annotations
+
+import io
+import threading
+import time
+from datetime import datetime
+
+import pytest
+
+from suxxtext.bench import synthetic_videos
+from suxxtext.events import EventSink, read_events
+from suxxtext.jobs import BatchOptions
+from suxxtext.pipeline import Stage
+from suxxtext.schedule import (
+    DEFAULT_DURATION,
+    RuntimeModel,
+    TimeBudget,
+    order_videos,
+    parse_duration,
+    parse_until,
+    predict_makespan,
+    video_duration,
+)
+
+
+def _v(vid, duration, views=0):
+    return {"id": vid, "duration": duration, "view_count": views}
+
+
+def test_order_policies():
+    videos = [_v("a", 600, 600), _v("b", 60, 10), _v("c", 3600, 1_000_000), _v("d", None, 5)]
+    assert [v["id"] for v in order_videos(videos, "listing")] == ["a", "b", "c", "d"]
+    assert [v["id"] for v in order_videos(videos, "shortest")] == ["b", "a", "d", "c"]
+    assert [v["id"] for v in order_videos(videos, "longest")] == ["c", "a", "d", "b"]
+    assert [v["id"] for v in order_videos(videos, "views")][0] == "c"
+    assert video_duration(videos[3]) == DEFAULT_DURATION
+    with pytest.raises(ValueError):
+        order_videos(videos, "random")
+
+
+def test_predict_makespan_list_scheduling():
+    assert predict_makespan([], 2) == 0.0
+    assert predict_makespan([10, 10, 10, 10], 2) == 20.0
+    # one long job last: it starts once a worker frees up
+    assert predict_makespan([1, 1, 1, 1, 8], 2) == 10.0
+    # LPT puts it first
+    assert predict_makespan([8, 1, 1, 1, 1], 2) == 8.0
+
+
+def test_runtime_model_from_events(tmp_path):
+    path = tmp_path / "events.jsonl"
+    with EventSink(str(path), run_id="r1") as sink:
+        sink.emit("run_start", kind="batch", model="small")
+        sink.emit("done", id="a", stage="transcribe", outcome="ok", seconds=30, audio_seconds=300)
+        sink.emit("done", id="b", stage="transcribe", outcome="ok", seconds=90, audio_seconds=900)
+        sink.emit("done", id="c", stage="transcribe", outcome="error", seconds=5, audio_seconds=900)
+    rt = RuntimeModel.from_events([str(path)])
+    assert rt.rtf("small") == pytest.approx(0.1)
+    assert rt.samples("small") == 1200
+    assert rt.samples("base") == 0 and rt.rtf("base") > 0
+    assert rt.seconds(_v("x", 600), "small") == pytest.approx(60)
+
+
+def test_streamed_rows_count_inference_time_only(tmp_path):
+    path = tmp_path / "events.jsonl"
+    with EventSink(str(path), run_id="r1") as sink:
+        sink.emit("run_start", kind="batch", model="small")
+        sink.emit("done", id="a", stage="transcribe", outcome="ok", seconds=30, audio_seconds=300)
+    before = RuntimeModel.from_events([str(path)]).rtf("small")
+    with EventSink(str(path), run_id="r1") as sink:
+        # a slow download inside the stage: 600s wall, 60s in the model
+        sink.emit(
+            "done", id="b", stage="transcribe", outcome="ok", seconds=600,
+            audio_seconds=600, streamed=True, asr_seconds=60,
+        )
+        # streamed row from before asr_seconds was recorded: ignored
+        sink.emit(
+            "done", id="c", stage="transcribe", outcome="ok", seconds=900,
+            audio_seconds=600, streamed=True,
+        )
+    rt = RuntimeModel.from_events([str(path)])
+    assert rt.rtf("small") == pytest.approx(before) == pytest.approx(0.1)
+    assert rt.samples("small") == 900
+
+
+def test_batched_runs_have_their_own_history(tmp_path):
+    path = tmp_path / "events.jsonl"
+    with EventSink(str(path), run_id="plain") as sink:
+        sink.emit("run_start", kind="batch", model="small")
+        sink.emit("done", id="a", stage="transcribe", outcome="ok", seconds=30, audio_seconds=300)
+    with EventSink(str(path), run_id="batched") as sink:
+        sink.emit("run_start", kind="batch", model="small", whisper_batch=8)
+        sink.emit("done", id="b", stage="transcribe", outcome="ok", seconds=6, audio_seconds=300)
+    assert RuntimeModel.from_events([str(path)]).rtf("small") == pytest.approx(0.1)
+    assert RuntimeModel.from_events([str(path)], 1).rtf("small") == pytest.approx(0.1)
+    assert RuntimeModel.from_events([str(path)], 8).rtf("small") == pytest.approx(0.02)
+    # no history for batch 16 yet: the model's default estimate
+    assert RuntimeModel.from_events([str(path)], 16).samples("small") == 0
+
+
+def test_priority_stage_drains_lowest_first():
+    seen = []
+    taken, gate = threading.Event(), threading.Event()
+
+    def handler(item):
+        taken.set()
+        gate.wait()
+        seen.append(item)
+
+    stage = Stage("t", handler, workers=1, maxsize=0, priority=lambda x: x)
+    stage.start()
+    stage.put(99)  # the worker takes it and blocks on the gate
+    taken.wait()
+    for x in (5, 3, 9, 1):
+        stage.put(x)
+    gate.set()
+    stage.close()
+    assert seen[1:] == [1, 3, 5, 9]
+
+
+def test_batch_order_and_makespan_report(tmp_path, fake_batch):
+    videos = synthetic_videos(8)
+
+    path = tmp_path / "events.jsonl"
+    sink = EventSink(str(path))
+    sink.emit("run_start", kind="batch", model="base")
+    logf = io.StringIO()
+    fake_batch.run(
+        videos,
+        BatchOptions(
+            prefer_captions=False, pipelined=False, pool_size=1, max_workers=1, order="shortest"
+        ),
+        logf=logf,
+        events=sink,
+    )
+    sink.close()
+    by_id = {v["id"]: v["duration"] for v in videos}
+    durations = [by_id[vid] for vid in fake_batch.transcribed]
+    assert len(durations) == 8
+    assert durations == sorted(durations)
+    assert "Makespan (shortest, 8 video(s)" in logf.getvalue()
+    rows, _ = read_events(str(path))
+    span = [r for r in rows if r["event"] == "makespan"]
+    assert span and span[0]["predicted"] > 0 and span[0]["actual"] >= 0
+    audio = [r["audio_seconds"] for r in rows if r.get("stage") == "transcribe" and r["event"] == "done"]
+    assert sorted(audio) == sorted(float(v["duration"]) for v in videos)
+
+
+def test_parse_duration_and_until():
+    assert parse_duration("90m") == 5400
+    assert parse_duration("1h30m") == 5400
+    assert parse_duration("2h") == 7200
+    assert parse_duration("45") == 45
+    with pytest.raises(ValueError):
+        parse_duration("soon")
+    now = datetime(2024, 1, 1, 23, 0)
+    assert parse_until("07:00", now) == datetime(2024, 1, 2, 7, 0).timestamp()
+    assert parse_until("23:30", now) == datetime(2024, 1, 1, 23, 30).timestamp()
+    with pytest.raises(ValueError):
+        parse_until("7am", now)
+
+
+def test_time_budget_admits_what_fits():
+    clock = [0.0]
+    rt = RuntimeModel({"m": (1.0, 10.0)})  # 0.1 s per audio second
+    budget = TimeBudget(1000.0, rt, "m", workers=2, margin=100.0, clock=lambda: clock[0])
+    assert not budget.admit(_v("long", 10_000))  # 1000 s alone
+    assert budget.admit(_v("a", 7000))  # 700 s
+    assert budget.admit(_v("b", 7000))  # (700 + 700) / 2
+    assert not budget.admit(_v("c", 7000))  # (1400 + 700) / 2 + 100 > 1000
+    budget.release(_v("a", 7000))
+    assert budget.admit(_v("c", 7000))
+    clock[0] = 950.0
+    assert budget.expired
+
+
+def _run_with_deadline(fake_batch, videos, deadline):
+    options = BatchOptions(
+        model_name="large", prefer_captions=False, pool_size=1, deadline=deadline
+    )
+    return fake_batch.run(videos, options)
+
+
+def test_deadline_defers_work_that_cannot_finish(fake_batch):
+    # default "large" estimate: 0.35 s per audio second, 280 s usable
+    videos = [_v(f"vid{i:08d}", d) for i, d in enumerate([3600, 60, 1800, 300, 900])]
+    stats = _run_with_deadline(fake_batch, videos, time.time() + 400)
+    done = fake_batch.transcribed
+    assert stats["whisper"] == len(done) > 0
+    assert stats["whisper"] + stats["deferred"] == 5
+    assert not {"vid00000000", "vid00000002", "vid00000004"} & set(done)
+
+
+def test_deadline_stops_caption_sweep(fake_batch):
+    videos = [_v(f"vid{i:08d}", 60) for i in range(5)]
+    stats = _run_with_deadline(fake_batch, videos, time.time() + 60)
+    assert stats["checked"] == 1
+    assert stats["deferred"] == 1 and not fake_batch.transcribed
@@ -0,0 +1,74 @@
+"""Ctrl-C drain / abort and atomic transcript writes (no network)."""
+
+from __future__ import annotations
+
+import json
+import os
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from suxxtext.bench import synthetic_videos
+from suxxtext.jobs import BatchOptions
+from suxxtext.journal import RunJournal, resume_action
+from suxxtext.paths import atomic_write_text
+from suxxtext.shutdown import GracefulShutdown
+
+
+def test_atomic_write_leaves_no_partial_file(tmp_path):
+    path = str(tmp_path / "T_aaaaaaaaaaa.txt")
+    atomic_write_text(path, "first\n")
+
+    with patch("os.replace", side_effect=KeyboardInterrupt):
+        with pytest.raises(KeyboardInterrupt):
+            atomic_write_text(path, "second\n")
+    assert os.listdir(tmp_path) == ["T_aaaaaaaaaaa.txt"]
+    assert open(path, encoding="utf-8").read() == "first\n"
+
+
+def test_second_request_aborts():
+    exit_ = MagicMock()
+    drained, aborted = [], []
+    shutdown = GracefulShutdown(exit=exit_)
+    shutdown.on_drain(lambda: drained.append(1))
+    shutdown.on_abort(lambda: aborted.append(1))
+    shutdown.request()
+    assert shutdown.draining and drained == [1] and not exit_.called
+    shutdown.on_drain(lambda: drained.append(2))  # late registration runs at once
+    assert drained == [1, 2]
+    shutdown.request()
+    assert aborted == [1]
+    exit_.assert_called_once_with(130)
+
+
+def test_drain_finishes_in_flight_and_checkpoints(tmp_path, fake_batch):
+    videos = synthetic_videos(10)
+    shutdown = GracefulShutdown(exit=MagicMock())
+    fake_batch.download_delay = 0.05
+
+    def ctrl_c(video_id, cookies):
+        if len(fake_batch.downloaded) == 1:
+            shutdown.request()  # Ctrl-C while the first download runs
+
+    fake_batch.on_download = ctrl_c
+    journal = RunJournal(str(tmp_path / "journal.jsonl"))
+    stats = fake_batch.run(
+        videos,
+        BatchOptions(prefer_captions=False, pool_size=1, max_workers=1),
+        journal=journal,
+        shutdown=shutdown,
+    )
+    journal.close()
+
+    assert len(fake_batch.downloaded) == 1 and stats["whisper"] == 1
+    assert stats["interrupted"] + (len(videos) - stats["checked"]) == len(videos) - 1
+    assert not [n for n in os.listdir(tmp_path / "trans") if n.endswith(".part")]
+    with open(journal.path, encoding="utf-8") as f:
+        rows = [json.loads(line) for line in f]
+    mark = [r for r in rows if r.get("event") == "interrupted"]
+    assert len(mark) == 1
+    assert len(mark[0]["pending"]) == stats["interrupted"]
+    assert mark[0]["unchecked"] == len(videos) - stats["checked"]
+    # nothing dropped is marked done, so --resume picks it up again
+    states = journal.states()
+    assert all(resume_action(states.get(vid)) != "done" for vid in mark[0]["pending"])
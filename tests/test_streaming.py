@@ -0,0 +1,101 @@
+"""Streaming audio into Whisper: yt-dlp → decoder → windows (local HTTP only)."""
+
+from __future__ import annotations
+
+import os
+import sys
+from unittest.mock import patch
+
+import numpy as np
+
+from suxxtext.bench import serve_directory, synthetic_videos
+from suxxtext.jobs import BatchOptions, _paths_for_video
+from suxxtext.streaming import SAMPLE_RATE, AudioStream, pcm_windows, transcribe_stream
+
+# Stands in for ffmpeg: the served file is already 16 kHz s16le PCM
+PASSTHROUGH = [
+    sys.executable,
+    "-c",
+    "import shutil, sys; shutil.copyfileobj(sys.stdin.buffer, sys.stdout.buffer)",
+]
+
+
+def _tone(seconds):
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    return (0.5 * np.sin(2 * np.pi * 440 * t)).astype(np.float32)
+
+
+def test_windows_are_cut_in_the_quiet_part():
+    audio = _tone(10)
+    audio[int(4.2 * SAMPLE_RATE) : int(4.6 * SAMPLE_RATE)] = 0.0
+    chunks = np.array_split(audio, 25)
+    windows = list(pcm_windows(chunks, window_seconds=5, search_seconds=2))
+    assert 4.2 * SAMPLE_RATE <= len(windows[0]) <= 4.6 * SAMPLE_RATE
+    assert sum(len(w) for w in windows) == len(audio)
+
+
+def test_stream_from_http_server_into_windows(tmp_path, whisper_pool):
+    pcm = (_tone(3) * 32767).astype("<i2").tobytes()
+    src = tmp_path / "src"
+    src.mkdir()
+    (src / "clip.m4a").write_bytes(pcm)
+    keep = tmp_path / "kept.m4a"
+    pool = whisper_pool
+    with serve_directory(str(src)) as base:
+        source = [sys.executable, "-m", "yt_dlp", "--quiet", "--no-progress", "-o", "-"]
+        with AudioStream([*source, f"{base}/clip.m4a"], PASSTHROUGH, str(keep)) as stream:
+            ok, err = transcribe_stream(
+                stream, pool, str(tmp_path / "t.txt"), window_seconds=1
+            )
+        assert ok and err is None
+        assert stream.bytes_in == len(pcm) and stream.seconds == 3.0
+        assert keep.read_bytes() == pcm
+        calls = pool.model.calls
+        assert len(calls) in (3, 4) and sum(len(a) for a, _ in calls) == 3 * SAMPLE_RATE
+        words = " ".join(f"window{i + 1}" for i in range(len(calls)))
+        assert (tmp_path / "t.txt").read_text() == words
+        assert "initial_prompt" not in calls[0][1] and calls[-1][1]["initial_prompt"]
+
+        missing = [*source, f"{base}/missing.m4a"]
+        with AudioStream(missing, PASSTHROUGH, str(tmp_path / "x")) as bad:
+            ok, err = transcribe_stream(bad, pool, str(tmp_path / "bad.txt"))
+    assert not ok and "yt-dlp exited" in err and "404" in err
+    assert not (tmp_path / "bad.txt").exists()
+    assert not [p for p in os.listdir(tmp_path) if p.startswith("x")]
+
+
+def test_batch_streams_whisper_videos_without_download_stage(fake_batch, whisper_pool):
+    videos = synthetic_videos(3)
+    opened = []
+
+    class _FakeStream:
+        error = None
+        bytes_in = 1234
+
+        def __init__(self, url, cookies=None, keep_file=None):
+            opened.append(keep_file)
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            pass
+
+        def __iter__(self):
+            return iter([_tone(1)])
+
+    def forbidden(*a, **kw):
+        raise AssertionError("streamed videos must not be downloaded first")
+
+    with patch("suxxtext.jobs.download_audio", forbidden), patch(
+        "suxxtext.jobs.open_audio_stream", _FakeStream
+    ), patch("suxxtext.jobs.ModelPool", lambda *a, **kw: whisper_pool):
+        stats = fake_batch.run(
+            videos, BatchOptions(caption_delay=0.0, caption_concurrency=1, stream_audio=True)
+        )
+    assert stats["streamed"] == 3 and stats["whisper"] == 3
+    assert stats["downloaded"] == 0
+    for video in videos:
+        mp3_path, txt_path = _paths_for_video(video, fake_batch.mp3_dir, fake_batch.trans_dir)[3:]
+        assert mp3_path in opened  # audio cache keeps audio: written while streaming
+        assert open(txt_path, encoding="utf-8").read().startswith("window")
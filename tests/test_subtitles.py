@@ -0,0 +1,109 @@
+"""Bulk yt-dlp subtitles: parsers and the caption-API fallback (no network)."""
+
+from __future__ import annotations
+
+import io
+import json
+import os
+from unittest.mock import patch
+
+from suxxtext.bench import synthetic_videos
+from suxxtext.jobs import IP_BLOCK_STREAK_LIMIT, BatchOptions, run_batch_phases
+from suxxtext.subtitles import fetch_subtitles_bulk, parse_json3, parse_vtt
+
+JSON3 = {
+    "events": [
+        {"tStartMs": 0, "dDurationMs": 5000, "id": 1, "wpWinPosId": 1},
+        {
+            "tStartMs": 120,
+            "dDurationMs": 2000,
+            "segs": [{"utf8": "hello"}, {"utf8": " world", "tOffsetMs": 400}],
+        },
+        {"tStartMs": 2100, "dDurationMs": 10, "aAppend": 1, "segs": [{"utf8": "\n"}]},
+        {"tStartMs": 2120, "dDurationMs": 1500, "segs": [{"utf8": "second line"}]},
+    ]
+}
+
+VTT = """WEBVTT
+Kind: captions
+Language: en
+
+00:00:00.120 --> 00:00:02.110 align:start position:0%
+
+hello<00:00:00.520><c> world</c>
+
+00:00:02.110 --> 00:00:02.120 align:start position:0%
+hello world
+
+
+00:00:02.120 --> 00:00:03.620 align:start position:0%
+hello world
+second<00:00:02.500><c> line &amp; more</c>
+"""
+
+
+def test_parsers_match_fetch_captions_segments():
+    segs = parse_json3(json.dumps(JSON3))
+    assert [s["text"] for s in segs] == ["hello world", "second line"]
+    assert segs[1]["start"] == 2.12 and segs[1]["duration"] == 1.5
+    vtt = parse_vtt(VTT)
+    assert [s["text"] for s in vtt] == ["hello world", "second line & more"]
+    assert vtt[1]["start"] == 2.12
+
+
+def test_bulk_fetch_uses_one_process_and_maps_results(tmp_path):
+    calls = []
+
+    def fake_download(ids, out_dir, languages, cookies=None, sleep_seconds=0.0):
+        calls.append(list(ids))
+        with open(os.path.join(out_dir, "aaaaaaaaaaa.en.json3"), "w", encoding="utf-8") as f:
+            json.dump(JSON3, f)
+        with open(os.path.join(out_dir, "bbbbbbbbbbb.en-orig.vtt"), "w", encoding="utf-8") as f:
+            f.write(VTT)
+        return False, "ERROR: [youtube] ccccccccccc: Video unavailable"
+
+    with patch("suxxtext.subtitles.download_subtitles", fake_download):
+        out = fetch_subtitles_bulk(["aaaaaaaaaaa", "bbbbbbbbbbb", "ccccccccccc"])
+    assert calls == [["aaaaaaaaaaa", "bbbbbbbbbbb", "ccccccccccc"]]
+    assert out["aaaaaaaaaaa"]["full_text"] == "hello world second line"
+    assert out["aaaaaaaaaaa"]["language"] == "en"
+    assert out["bbbbbbbbbbb"]["success"] and out["bbbbbbbbbbb"]["language"] == "en-orig"
+    assert "Video unavailable" in out["ccccccccccc"]["error"]
+
+
+def test_batch_switches_to_bulk_subtitles_on_ip_block(tmp_path):
+    (tmp_path / "mp3").mkdir()
+    (tmp_path / "trans").mkdir()
+    videos = synthetic_videos(12)
+    chunks = []
+
+    def blocked(video_id, languages=None):
+        return {"error": "YouTube is blocking requests from your IP"}
+
+    def fake_bulk(ids, **kw):
+        chunks.append(list(ids))
+        return {
+            vid: {"success": True, "full_text": "subtitle words " * 10, "language": "en"}
+            for vid in ids
+        }
+
+    with patch("suxxtext.jobs.fetch_captions", blocked), patch(
+        "suxxtext.jobs.fetch_subtitles_bulk", fake_bulk
+    ):
+        stats = run_batch_phases(
+            videos,
+            len(videos),
+            str(tmp_path / "mp3"),
+            str(tmp_path / "trans"),
+            io.StringIO(),
+            BatchOptions(
+                whisper_fallback=False,
+                caption_delay=0.0,
+                caption_concurrency=1,
+                subtitle_fallback=True,
+            ),
+        )
+    rest = [v["id"] for v in videos[IP_BLOCK_STREAK_LIMIT:]]
+    assert chunks == [rest]  # one yt-dlp run for everything after the block
+    assert stats["subtitles"] == len(rest) and stats["captions"] == len(rest)
+    assert stats["error"] == IP_BLOCK_STREAK_LIMIT
@@ -0,0 +1,117 @@
+"""Model pool backends (synthetic model, no downloads)."""
+
+from __future__ import annotations
+
+import io
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+from fakes import FakePool
+from suxxtext import whisper_runtime as wr
+from suxxtext.bench import (
+    _busy_loader,
+    _GpuModel,
+    _GpuPipeline,
+    run_cpu_pool_once,
+    run_whisper_batch_once,
+    synthetic_videos,
+)
+from suxxtext.jobs import BatchOptions, run_batch_phases
+from suxxtext.whisper_runtime import ProcessModelPool, transcribe_audio
+
+
+def test_process_pool_transcribes_in_workers(tmp_path):
+    audio = tmp_path / "a.mp3"
+    audio.write_bytes(b"\0")
+    pool = ProcessModelPool("busy:1000", 2, cpu_threads=1, loader=_busy_loader)
+    try:
+        assert pool.pool_size == 2 and pool.device == "cpu"
+
+        def one(i):
+            out = tmp_path / f"{i}.txt"
+            with pool.get_model() as model:
+                ok, err = transcribe_audio(str(audio), model, str(out))
+            return ok, out.read_text(encoding="utf-8")
+
+        with ThreadPoolExecutor(max_workers=2) as ex:
+            results = list(ex.map(one, range(4)))
+    finally:
+        pool.close()
+    assert all(ok for ok, _ in results)
+    assert all(text.startswith("busy ") for _, text in results)
+
+
+def test_cpu_bench_runs_both_backends():
+    for backend in ("thread", "process"):
+        r = run_cpu_pool_once(
+            backend, model_name="busy:1000", audio=None, jobs=3, model_instances=1, cpu_threads=0
+        )
+        assert r["ok"] == 3 and r["per_hour"] > 0
+
+
+def test_batched_pool_packs_chunks_per_pass(tmp_path):
+    passes = []
+
+    class _Counting(_GpuModel):
+        def forward(self, chunks):
+            passes.append(chunks)
+
+    with patch.object(wr, "WhisperModel", _Counting), patch(
+        "faster_whisper.BatchedInferencePipeline", _GpuPipeline
+    ):
+        assert wr.batched("model", 1) == "model"
+        pool = wr.ModelPool("gpu:0:0", 1, batch_size=4)
+        audio = np.zeros(10 * 30 * 16000, dtype=np.float32)  # ten 30 s chunks
+        with pool.get_model() as model:
+            assert isinstance(model, wr.BatchedModel) and model.batch_size == 4
+            ok, err = transcribe_audio(audio, model, str(tmp_path / "t.txt"))
+    assert ok and err is None and passes == [4, 4, 2]
+    assert (tmp_path / "t.txt").read_text(encoding="utf-8") == " words"
+
+    r = run_whisper_batch_once(
+        model_name="gpu:0.001:0", audio=audio, files=3, model_instances=1, batch=8
+    )
+    assert r["ok"] == 3 and r["per_model"] > 0
+
+
+def test_batched_model_needs_a_recent_faster_whisper(monkeypatch):
+    monkeypatch.delattr("faster_whisper.BatchedInferencePipeline")  # faster-whisper < 1.1
+    assert wr.batched("model", 1) == "model"
+    with pytest.raises(RuntimeError, match="faster-whisper >= 1.1"):
+        wr.batched("model", 4)
+
+
+def test_batch_run_passes_whisper_batch_to_the_pool(tmp_path):
+    (tmp_path / "mp3").mkdir()
+    (tmp_path / "trans").mkdir()
+    seen = []
+
+    def pool(name, n, **options):
+        seen.append(options)
+        return FakePool(name, n)
+
+    def fake_download(url, output_file, *a, **kw):
+        with open(output_file, "wb") as f:
+            f.write(b"\0")
+        return True, None
+
+    def fake_transcribe(audio_file, model, output_file, lock=None):
+        with open(output_file, "w", encoding="utf-8") as f:
+            f.write("words")
+        return True, None
+
+    with patch("suxxtext.jobs.download_audio", fake_download), patch(
+        "suxxtext.jobs.transcribe_audio", fake_transcribe
+    ), patch("suxxtext.jobs.ModelPool", pool):
+        stats = run_batch_phases(
+            synthetic_videos(2),
+            2,
+            str(tmp_path / "mp3"),
+            str(tmp_path / "trans"),
+            io.StringIO(),
+            BatchOptions(prefer_captions=False, whisper_batch=16),
+        )
+    assert stats["whisper"] == 2 and seen == [{"batch_size": 16}]
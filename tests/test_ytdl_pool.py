@@ -0,0 +1,47 @@
+"""In-process yt-dlp engine against a local HTTP server (no YouTube)."""
+
+from __future__ import annotations
+
+import os
+from unittest.mock import patch
+
+from suxxtext import youtube
+from suxxtext.bench import run_ytdl_once, serve_directory
+from suxxtext.ytdl_pool import YtdlPool
+
+
+def test_pool_reuses_one_instance_and_reports_progress(tmp_path):
+    src = tmp_path / "src"
+    src.mkdir()
+    payload = os.urandom(256 * 1024)
+    for i in range(3):
+        (src / f"clip{i}.m4a").write_bytes(payload)
+    pool = YtdlPool()
+    events = []
+    with serve_directory(str(src)) as base, patch.object(
+        youtube, "ytdl_pool", lambda: pool
+    ), patch.object(youtube, "_ENGINE", youtube.ENGINE_INPROCESS):
+        for i in range(3):
+            out = tmp_path / f"out{i}.m4a"
+            ok, err = youtube.download_audio(
+                f"{base}/clip{i}.m4a", str(out), progress=events.append
+            )
+            assert ok and err is None
+            assert out.read_bytes() == payload
+        ok, err = youtube.download_audio(f"{base}/missing.m4a", str(tmp_path / "x.m4a"))
+    pool.close()
+    assert pool.created == 1
+    assert not ok and "404" in err
+    finished = [e for e in events if e["status"] == "finished"]
+    assert len(finished) == 3 and finished[0]["total_bytes"] == len(payload)
+    assert any(e["status"] == "downloading" and e["downloaded_bytes"] for e in events)
+
+
+def test_engine_bench_runs_both_paths():
+    rows = {
+        engine: run_ytdl_once(engine, downloads=2, workers=1, size_kb=16)
+        for engine in youtube.YTDL_ENGINES
+    }
+    assert all(r["ok"] == 2 for r in rows.values())
+    assert rows[youtube.ENGINE_SUBPROCESS]["instances"] == 0
+    assert rows[youtube.ENGINE_INPROCESS]["instances"] == 1
@@ -7,6 +7,7 @@ import glob # Added glob
 import os # Ensure os is imported as it's used by new functions
 import sys # Import sys for sys.exit()
 import colorama # Import colorama for colored output
+from suxxtext.metadata import LEGACY_SUFFIX, VIDEOS_SUFFIX, load_history
 from suxxtext.paths import sanitize_filename
 
 colorama.init(autoreset=True) # Initialize colorama
@@ -123,6 +124,13 @@ def discover_and_select_json_file(base_dir='channels'):
     print(f"Searching for '*-full-history.json' files in '{absolute_base_dir}' and its subdirectories...")
     
     found_files = glob.glob(search_pattern, recursive=True)
+    # Prefer the incremental metadata store (<Name>-videos.jsonl) where a channel has one
+    for store_path in glob.glob(os.path.join(base_dir, '**', '*' + VIDEOS_SUFFIX), recursive=True):
+        legacy = store_path[: -len(VIDEOS_SUFFIX)] + LEGACY_SUFFIX
+        if legacy in found_files:
+            found_files[found_files.index(legacy)] = store_path
+        else:
+            found_files.append(store_path)
 
     if not found_files:
         print(f"No '*-full-history.json' files found in the '{base_dir}' directory or its subdirectories.")
@@ -176,6 +184,10 @@ def load_youtube_data(file_path):
     video_items = []
     channel_info = {}
     try:
+        if file_path.endswith(VIDEOS_SUFFIX):
+            video_items, channel_info = load_history(file_path)
+            print(f"Loaded {len(video_items)} video items from the metadata store.")
+            return video_items, channel_info
         with open(file_path, 'r', encoding='utf-8') as f:
             data = json.load(f)
 
@@ -503,7 +515,7 @@ if __name__ == "__main__":
             try:
                 raw_channel_name = os.path.basename(os.path.dirname(selected_json_path))
                 if not raw_channel_name or raw_channel_name == "." or raw_channel_name == "channels": # if dirname gives current dir or top 'channels'
-                    raw_channel_name = os.path.splitext(os.path.basename(selected_json_path))[0].replace('-full-history', '')
+                    raw_channel_name = os.path.splitext(os.path.basename(selected_json_path))[0].replace('-full-history', '').replace('-videos', '')
 
             except Exception:
                 raw_channel_name = "UnknownChannel"